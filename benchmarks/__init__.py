@@ -0,0 +1 @@
+"""Benchmarks de desempenho do servidor MCP Geodata-BR."""
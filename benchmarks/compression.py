@@ -0,0 +1,160 @@
+"""
+Benchmark de compressão dos dados e das respostas do servidor MCP Geodata-BR.
+
+Para cada estado medido compara o arquivo .json com as versões .json.gz e
+.json.zst (se zstandard estiver instalado): bytes lidos do disco e tempo de
+carregamento a frio (leitura + descompressão + parse). Também mede o tamanho
+da resposta de get_region_geojson com e sem encoding, e o tempo da primeira
+chamada comprimida e das seguintes (corpo em cache).
+
+Uso:
+    python -m benchmarks.compression [--states 14,33,35,31] [--region Sudeste]
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.geodata_br_mcp import server
+from src.geodata_br_mcp.compression import body_cache, compress_bytes
+from src.geodata_br_mcp.config import GEOJSON_DIRECTORY, get_filename_for_state
+from src.geodata_br_mcp.utils import clear_cache, load_geojson_with_cache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Estados medidos por padrão (pequeno, médio, grande, o maior)
+DEFAULT_STATES = ["14", "33", "35", "31"]
+
+
+def _median_ms(func: Callable[[], Any], rounds: int, setup: Callable[[], Any] | None = None):
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure_files(codes: list[str], rounds: int = 5) -> list[dict[str, Any]]:
+    """Mede bytes em disco e tempo de carregamento de cada variante dos arquivos.
+
+    Args:
+        codes: Códigos IBGE dos estados
+        rounds: Rodadas por medição (mediana)
+
+    Returns:
+        Uma linha por estado e codificação, com disk_bytes e load_ms
+    """
+    encodings = ["identity", "gzip"]
+    if importlib.util.find_spec("zstandard") is not None:
+        encodings.append("zstd")
+
+    rows = []
+    work_dir = Path(tempfile.mkdtemp(prefix="geodata-compression-"))
+    try:
+        for code in codes:
+            source = PROJECT_ROOT / GEOJSON_DIRECTORY / get_filename_for_state(code)
+            raw = source.read_bytes()
+            for encoding in encodings:
+                target_dir = work_dir / encoding
+                target_dir.mkdir(exist_ok=True)
+                logical = target_dir / source.name
+                if encoding == "identity":
+                    shutil.copyfile(source, logical)
+                    disk_bytes = len(raw)
+                else:
+                    suffix = ".gz" if encoding == "gzip" else ".zst"
+                    compressed = compress_bytes(raw, encoding)
+                    logical.with_name(logical.name + suffix).write_bytes(compressed)
+                    disk_bytes = len(compressed)
+
+                load_ms = _median_ms(
+                    lambda path=logical: load_geojson_with_cache(path), rounds, setup=clear_cache
+                )
+                rows.append(
+                    {
+                        "state": code,
+                        "encoding": encoding,
+                        "disk_bytes": disk_bytes,
+                        "load_ms": load_ms,
+                    }
+                )
+    finally:
+        clear_cache()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return rows
+
+
+def measure_response(region: str, rounds: int = 5) -> list[dict[str, Any]]:
+    """Mede o tamanho e o tempo de get_region_geojson por codificação.
+
+    Args:
+        region: Nome da região
+        rounds: Rodadas das chamadas com corpo em cache (mediana)
+
+    Returns:
+        Uma linha por codificação, com response_bytes (JSON serializado),
+        first_ms (primeira chamada) e cached_ms (chamadas seguintes)
+    """
+    rows = []
+    for encoding in ("identity", "gzip"):
+        body_cache.clear()
+        server.get_region_geojson(region)  # estados em memória nas duas medições
+
+        started = time.perf_counter()
+        result = server.get_region_geojson(region, encoding=encoding)
+        first_ms = (time.perf_counter() - started) * 1000
+
+        cached_ms = _median_ms(
+            lambda e=encoding: server.get_region_geojson(region, encoding=e), rounds
+        )
+        response_bytes = len(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        rows.append(
+            {
+                "encoding": encoding,
+                "response_bytes": response_bytes,
+                "first_ms": first_ms,
+                "cached_ms": cached_ms,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Mede o efeito da compressão")
+    parser.add_argument("--states", default=",".join(DEFAULT_STATES))
+    parser.add_argument("--region", default="Sudeste")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args(argv)
+    logging.getLogger("geodata-br-mcp").setLevel(logging.WARNING)
+
+    print(f"{'estado':8s} {'codificação':12s} {'disco':>12s} {'carga':>10s}")
+    for row in measure_files(args.states.split(","), args.rounds):
+        print(
+            f"{row['state']:8s} {row['encoding']:12s} "
+            f"{row['disk_bytes'] / 1e6:9.2f} MB {row['load_ms']:7.1f} ms"
+        )
+
+    print(f"\nget_region_geojson({args.region!r})")
+    print(f"{'codificação':12s} {'resposta':>12s} {'1ª chamada':>12s} {'seguintes':>10s}")
+    for row in measure_response(args.region, args.rounds):
+        print(
+            f"{row['encoding']:12s} {row['response_bytes'] / 1e6:9.2f} MB "
+            f"{row['first_ms']:9.1f} ms {row['cached_ms']:7.1f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
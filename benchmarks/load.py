@@ -0,0 +1,238 @@
+"""
+Teste de carga do modo HTTP do servidor MCP Geodata-BR.
+
+Inicia o servidor em um subprocesso (ou usa --url de um servidor já em
+execução), abre N clientes MCP concorrentes, cada um com a sua sessão, e
+dispara uma mistura de chamadas leves e médias durante um tempo fixo. Ao
+final informa vazão (chamadas/s), latências p50/p90/p99 por tool e o número
+de chamadas recusadas pela fila (backpressure).
+
+Uso:
+    python -m benchmarks.load [--clients 16] [--duration 20] [--transport streamable-http]
+    python -m benchmarks.load --url http://127.0.0.1:8000/mcp --clients 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from src.geodata_br_mcp.config import IBGE_TO_STATE, STATE_CODES
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Municípios usados nas buscas por código (capitais de estados variados)
+SAMPLE_CODES = ["3550308", "3304557", "3106200", "4314902", "2927408", "1400100", "5300108"]
+
+
+def _pick_call(rng: random.Random) -> tuple[str, dict[str, Any]]:
+    """Sorteia uma chamada da mistura de carga."""
+    roll = rng.random()
+    if roll < 0.2:
+        return "list_states", {}
+    if roll < 0.4:
+        return "get_state_info", {"uf": IBGE_TO_STATE[rng.choice(STATE_CODES)]["uf"]}
+    if roll < 0.65:
+        return "search_municipality_by_ibge", {
+            "ibge_code": rng.choice(SAMPLE_CODES),
+            "include_geometry": "bbox",
+        }
+    if roll < 0.85:
+        return "get_municipality_stats", {"ibge_code": rng.choice(SAMPLE_CODES)}
+    return "nearest_municipalities", {
+        "lat": rng.uniform(-30.0, -3.0),
+        "lon": rng.uniform(-60.0, -38.0),
+        "k": 5,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(host: str, port: int, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Servidor não respondeu em {host}:{port}")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentil q (0-100) por interpolação linear."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def _client(
+    url: str,
+    transport: str,
+    deadline: float,
+    seed: int,
+    samples: list[tuple[str, float, str]],
+):
+    """Um cliente: abre a sessão e chama tools até o fim do tempo."""
+    rng = random.Random(seed)
+    async with AsyncExitStack() as stack:
+        if transport == "sse":
+            read, write = await stack.enter_async_context(sse_client(url))
+        else:
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url))
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+
+        while time.monotonic() < deadline:
+            name, arguments = _pick_call(rng)
+            started = time.perf_counter()
+            result = await session.call_tool(name, arguments)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            status = "ok"
+            if result.isError:
+                text = result.content[0].text if result.content else ""
+                status = "busy" if "Servidor ocupado" in text else "error"
+            samples.append((name, elapsed_ms, status))
+
+
+async def run_load(url: str, transport: str, clients: int, duration: float) -> dict[str, Any]:
+    """Executa a carga e resume as latências.
+
+    Args:
+        url: Endpoint MCP (ex: http://127.0.0.1:8000/mcp ou .../sse)
+        transport: "streamable-http" ou "sse"
+        clients: Número de clientes concorrentes
+        duration: Duração em segundos
+
+    Returns:
+        Dicionário com vazão, percentis gerais e por tool
+    """
+    samples: list[tuple[str, float, str]] = []
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(
+        *(_client(url, transport, deadline, seed, samples) for seed in range(clients))
+    )
+    elapsed = time.monotonic() - started
+
+    def summarize(rows: list[tuple[str, float, str]]) -> dict[str, Any]:
+        latencies = [ms for _, ms, status in rows if status == "ok"]
+        summary: dict[str, Any] = {
+            "calls": len(rows),
+            "busy": sum(1 for row in rows if row[2] == "busy"),
+            "errors": sum(1 for row in rows if row[2] == "error"),
+        }
+        if latencies:
+            summary.update(
+                p50_ms=percentile(latencies, 50),
+                p90_ms=percentile(latencies, 90),
+                p99_ms=percentile(latencies, 99),
+                max_ms=max(latencies),
+            )
+        return summary
+
+    tools = sorted({name for name, _, _ in samples})
+    return {
+        "clients": clients,
+        "duration_s": elapsed,
+        "throughput_rps": len(samples) / elapsed,
+        "overall": summarize(samples),
+        "tools": {tool: summarize([row for row in samples if row[0] == tool]) for tool in tools},
+    }
+
+
+def _print_row(label: str, summary: dict[str, Any]):
+    if "p50_ms" not in summary:
+        print(f"{label:30s} {summary['calls']:7d}  (sem chamadas bem-sucedidas)")
+        return
+    print(
+        f"{label:30s} {summary['calls']:7d} {summary['p50_ms']:9.1f} {summary['p90_ms']:9.1f} "
+        f"{summary['p99_ms']:9.1f} {summary['max_ms']:9.1f} {summary['busy']:6d} "
+        f"{summary['errors']:6d}"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Teste de carga do modo HTTP")
+    parser.add_argument("--url", help="Servidor já em execução (padrão: inicia um)")
+    parser.add_argument(
+        "--transport", choices=("streamable-http", "sse"), default="streamable-http"
+    )
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos de aquecimento")
+    parser.add_argument("--output", help="Grava o resultado em JSON")
+    parser.add_argument(
+        "server_args", nargs="*", help="Argumentos extras do servidor (após --)", default=[]
+    )
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        path = "/sse" if args.transport == "sse" else "/mcp"
+        url = f"http://127.0.0.1:{port}{path}"
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "src.geodata_br_mcp.server",
+                "--transport",
+                args.transport,
+                "--port",
+                str(port),
+                *args.server_args,
+            ],
+            cwd=PROJECT_ROOT,
+            stderr=subprocess.DEVNULL,
+        )
+        _wait_for_port("127.0.0.1", port)
+
+    try:
+        if args.warmup > 0:
+            # Aquece os caches do servidor (carga dos estados sorteados)
+            asyncio.run(run_load(url, args.transport, args.clients, args.warmup))
+        result = asyncio.run(run_load(url, args.transport, args.clients, args.duration))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(
+        f"{result['clients']} clientes, {result['duration_s']:.1f} s: "
+        f"{result['throughput_rps']:.1f} chamadas/s"
+    )
+    print(
+        f"{'tool':30s} {'chamadas':>7s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} "
+        f"{'máx ms':>9s} {'fila':>6s} {'erros':>6s}"
+    )
+    for tool, summary in result["tools"].items():
+        _print_row(tool, summary)
+    _print_row("(total)", result["overall"])
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""
+Benchmark de memória das representações dos municípios em memória.
+
+Mede com tracemalloc a memória retida por todos os estados do Brasil em duas
+representações: o cache de dicionários de utils (_geojson_cache, como o
+json.load devolve) e as tabelas compactas de model.py (colunas + buffer de
+coordenadas). Também mede o tempo de carga e o de montar os dicionários
+GeoJSON a partir da tabela compacta.
+
+Uso:
+    python -m benchmarks.memory [--states 14,33,35,31]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from src.geodata_br_mcp.config import GEOJSON_DIRECTORY, STATE_CODES, get_filename_for_state
+from src.geodata_br_mcp.model import clear_model_cache, load_state_arrays
+from src.geodata_br_mcp.utils import clear_cache, load_geojson_with_cache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _retained_bytes(load: Callable[[], Any]) -> tuple[int, float]:
+    """Executa load e retorna (bytes retidos após o gc, tempo em ms)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        load()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, elapsed_ms
+    finally:
+        tracemalloc.stop()
+
+
+def measure_memory(codes: list[str]) -> dict[str, dict[str, float]]:
+    """Mede a memória retida pelas duas representações.
+
+    Args:
+        codes: Códigos IBGE dos estados carregados
+
+    Returns:
+        Dicionário representação -> {bytes, load_ms}; a entrada
+        "compact_to_geojson" mede a montagem dos dicionários a partir das
+        tabelas compactas
+    """
+    paths = [PROJECT_ROOT / GEOJSON_DIRECTORY / get_filename_for_state(code) for code in codes]
+
+    clear_cache()
+    dict_bytes, dict_ms = _retained_bytes(lambda: [load_geojson_with_cache(p) for p in paths])
+    clear_cache()
+
+    clear_model_cache()
+    compact_bytes, compact_ms = _retained_bytes(lambda: [load_state_arrays(p) for p in paths])
+
+    started = time.perf_counter()
+    for path in paths:
+        load_state_arrays(path).to_collection()
+    adapter_ms = (time.perf_counter() - started) * 1000
+    clear_model_cache()
+
+    return {
+        "geojson_cache": {"bytes": dict_bytes, "load_ms": dict_ms},
+        "compact": {"bytes": compact_bytes, "load_ms": compact_ms},
+        "compact_to_geojson": {"bytes": 0, "load_ms": adapter_ms},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Mede a memória das representações em memória")
+    parser.add_argument("--states", default=",".join(STATE_CODES), help="Padrão: todos")
+    args = parser.parse_args(argv)
+
+    codes = args.states.split(",")
+    results = measure_memory(codes)
+
+    print(f"{len(codes)} estados")
+    print(f"{'representação':22s} {'memória':>12s} {'tempo':>10s}")
+    for name, row in results.items():
+        memory = f"{row['bytes'] / 1e6:9.1f} MB" if row["bytes"] else f"{'-':>12s}"
+        print(f"{name:22s} {memory} {row['load_ms']:7.0f} ms")
+
+    dict_bytes = results["geojson_cache"]["bytes"]
+    compact_bytes = results["compact"]["bytes"]
+    if compact_bytes:
+        print(f"\nRedução: {dict_bytes / compact_bytes:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
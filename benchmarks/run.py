@@ -0,0 +1,328 @@
+"""
+Suite de benchmarks do servidor MCP Geodata-BR.
+
+Mede os caminhos quentes de utils.py e as tools completas (via FastMCP) sobre
+os dados reais de geojson/. Os resultados são gravados em JSON e podem ser
+comparados entre commits para detectar regressões.
+
+Uso:
+    python -m benchmarks.run [--output arquivo.json] [--filter padrão] [--quick]
+    python -m benchmarks.run --compare base.json atual.json [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.startup import measure_import
+from src.geodata_br_mcp import server
+from src.geodata_br_mcp.columnar import (
+    clear_columnar_cache,
+    get_columnar_path,
+    load_columnar_collection,
+)
+from src.geodata_br_mcp.config import GEOJSON_DIRECTORY, STATE_CODES, get_filename_for_state
+from src.geodata_br_mcp.database import MunicipalityStore, get_database_path
+from src.geodata_br_mcp.manifest import get_file_summary
+from src.geodata_br_mcp.utils import (
+    clear_cache,
+    get_feature_bounds,
+    get_geojson_summary,
+    load_geojson_with_cache,
+    search_features_by_ibge,
+    search_features_by_name,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / ".benchmarks"
+
+# Estados usados nos benchmarks por estado: pequeno, médio e os maiores
+BENCH_STATES = ["14", "33", "35", "31"]
+
+# Registro de benchmarks: nome -> (função, setup opcional executado antes de cada rodada)
+_BENCHMARKS: dict[str, tuple[Callable[[], Any], Callable[[], Any] | None]] = {}
+
+
+def benchmark(name: str, setup: Callable[[], Any] | None = None):
+    """Registra uma função como benchmark."""
+
+    def decorator(func: Callable[[], Any]) -> Callable[[], Any]:
+        _BENCHMARKS[name] = (func, setup)
+        return func
+
+    return decorator
+
+
+def _state_path(code: str) -> Path:
+    return PROJECT_ROOT / GEOJSON_DIRECTORY / get_filename_for_state(code)
+
+
+def _features(code: str) -> list[dict[str, Any]]:
+    return load_geojson_with_cache(_state_path(code))["features"]
+
+
+def _call_tool(name: str, arguments: dict[str, Any]) -> Any:
+    """Executa uma tool pelo caminho completo do FastMCP (validação + serialização)."""
+    return asyncio.run(server.app.call_tool(name, arguments))
+
+
+def _register_benchmarks():
+    """Registra os benchmarks de utils e das tools."""
+    for code in BENCH_STATES:
+        path = _state_path(code)
+
+        benchmark(f"load/cold/{code}", setup=clear_cache)(
+            lambda path=path: load_geojson_with_cache(path)
+        )
+        benchmark(f"load/warm/{code}", setup=lambda path=path: load_geojson_with_cache(path))(
+            lambda path=path: load_geojson_with_cache(path)
+        )
+        benchmark(f"search/name/{code}")(
+            lambda code=code: search_features_by_name(_features(code), "santa")
+        )
+        benchmark(f"search/ibge/{code}")(
+            lambda code=code: search_features_by_ibge(_features(code), f"{code}99999")
+        )
+        benchmark(f"bounds/all/{code}")(
+            lambda code=code: [get_feature_bounds(f) for f in _features(code)]
+        )
+        benchmark(f"summary/{code}")(
+            lambda code=code: get_geojson_summary(load_geojson_with_cache(_state_path(code)))
+        )
+        benchmark(f"summary/manifest/{code}")(
+            lambda path=path: get_file_summary(path, server._get_cache_dir())
+        )
+
+    benchmark("load/cold/all-states", setup=clear_cache)(
+        lambda: [load_geojson_with_cache(_state_path(code)) for code in STATE_CODES]
+    )
+
+    tool_calls: dict[str, tuple[str, dict[str, Any]]] = {
+        "tool/list_states": ("list_states", {}),
+        "tool/get_state_info/SP": ("get_state_info", {"uf": "SP"}),
+        "tool/list_municipalities/SP": ("list_municipalities", {"uf": "SP"}),
+        "tool/get_municipality_geojson/SP": (
+            "get_municipality_geojson",
+            {"uf": "SP", "municipality_name": "Campinas"},
+        ),
+        "tool/search_municipality_by_ibge/SP": (
+            "search_municipality_by_ibge",
+            {"ibge_code": "3550308"},
+        ),
+        "tool/get_municipality_stats/SP": ("get_municipality_stats", {"ibge_code": "3550308"}),
+        "tool/nearest_municipalities": ("nearest_municipalities", {"lat": -23.2, "lon": -45.0}),
+        "tool/distance_matrix/RJxES": (
+            "distance_matrix",
+            {"codes_a": ["33"], "codes_b": ["32"]},
+        ),
+        "tool/distance_matrix/SPxMG-50km": (
+            "distance_matrix",
+            {"codes_a": ["35"], "codes_b": ["31"], "max_km": 50},
+        ),
+        "tool/get_region_geojson/Sul": ("get_region_geojson", {"region": "Sul"}),
+        "tool/get_vector_tile/z7": ("get_vector_tile", {"z": 7, "x": 47, "y": 72}),
+        "tool/search_municipality_by_ibge_batch/SP-100": (
+            "search_municipality_by_ibge_batch",
+            {"ibge_codes": [f["properties"]["id"] for f in _features("35")[:100]]},
+        ),
+        "tool/get_municipality_geojson_batch/SP-100": (
+            "get_municipality_geojson_batch",
+            {"queries": [["SP", f["properties"]["name"]] for f in _features("35")[:100]]},
+        ),
+    }
+    for bench_name, (tool_name, arguments) in tool_calls.items():
+        benchmark(bench_name)(lambda t=tool_name, a=arguments: _call_tool(t, a))
+
+    # Modos de geometria (include_geometry): o custo da serialização cai junto
+    for mode in ("none", "bbox", "centroid", "simplified"):
+        benchmark(f"tool/search_municipality_by_ibge/SP/{mode}")(
+            lambda m=mode: _call_tool(
+                "search_municipality_by_ibge", {"ibge_code": "3550308", "include_geometry": m}
+            )
+        )
+
+    # Busca a frio: sem o estado em memória, lê só a feature pelo índice de offsets
+    for code, ibge_code in (("14", "1400100"), ("35", "3550308"), ("31", "3106200")):
+        benchmark(f"tool/search_municipality_by_ibge/cold/{code}", setup=clear_cache)(
+            lambda i=ibge_code: _call_tool("search_municipality_by_ibge", {"ibge_code": i})
+        )
+
+    # Backend colunar (apenas se o arquivo já foi gerado com `make export-columnar`)
+    columnar_path = get_columnar_path(server._get_cache_dir())
+    if columnar_path.exists() and importlib.util.find_spec("pyarrow") is not None:
+        for code in BENCH_STATES:
+            benchmark(f"load/columnar/cold/{code}", setup=clear_columnar_cache)(
+                lambda code=code: load_columnar_collection(columnar_path, code)
+            )
+
+    # Backend SQLite (apenas se o banco já foi gerado com `make database`)
+    database_path = get_database_path(server._get_cache_dir())
+    if database_path.exists():
+        store = MunicipalityStore(database_path)
+        for code in BENCH_STATES:
+            benchmark(f"load/sqlite/{code}")(lambda code=code: store.state_collection(code))
+        benchmark("search/sqlite/ibge")(lambda: store.get_by_id("3550308"))
+        benchmark("search/sqlite/name")(lambda: store.find_by_name("35", "campinas"))
+
+    # Processo novo importando o servidor (o que um host MCP faz a cada sessão)
+    benchmark("startup/import_server")(measure_import)
+
+
+def run_benchmark(
+    func: Callable[[], Any],
+    setup: Callable[[], Any] | None,
+    min_rounds: int,
+    min_time: float,
+) -> dict[str, float]:
+    """Executa um benchmark e retorna estatísticas em milissegundos."""
+    # Aquecimento (também popula caches para os benchmarks "warm")
+    if setup:
+        setup()
+    func()
+
+    timings: list[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - t0) * 1000)
+        if len(timings) >= 10_000:
+            break
+
+    timings.sort()
+    return {
+        "rounds": len(timings),
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "mean_ms": statistics.fmean(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max_ms": timings[-1],
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(pattern: str = "*", quick: bool = False) -> dict[str, Any]:
+    """Executa todos os benchmarks que casam com o padrão (fnmatch)."""
+    _register_benchmarks()
+    min_rounds, min_time = (3, 0.2) if quick else (5, 1.0)
+
+    results = {}
+    for name, (func, setup) in _BENCHMARKS.items():
+        if not fnmatch.fnmatch(name, pattern):
+            continue
+        stats = run_benchmark(func, setup, min_rounds, min_time)
+        results[name] = stats
+        print(f"{name:45s} median {stats['median_ms']:10.3f} ms  ({stats['rounds']} rodadas)")
+
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.2
+) -> list[dict[str, Any]]:
+    """Compara dois resultados pela mediana.
+
+    Args:
+        baseline: Resultado de referência
+        current: Resultado atual
+        threshold: Aumento relativo a partir do qual há regressão (0.2 = 20%)
+
+    Returns:
+        Lista de comparações (nome, medianas, razão e status)
+    """
+    rows = []
+    for name, stats in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            rows.append({"name": name, "status": "new", "current_ms": stats["median_ms"]})
+            continue
+
+        ratio = stats["median_ms"] / base["median_ms"] if base["median_ms"] > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "baseline_ms": base["median_ms"],
+                "current_ms": stats["median_ms"],
+                "ratio": ratio,
+            }
+        )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Benchmarks do Geodata-BR MCP Server")
+    parser.add_argument(
+        "--output", help="Arquivo JSON de saída (padrão: .benchmarks/<commit>.json)"
+    )
+    parser.add_argument("--filter", default="*", help="Padrão fnmatch dos benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Menos rodadas (para CI)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ATUAL"))
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(Path(p).read_text()) for p in args.compare)
+        rows = compare_results(baseline, current, args.threshold)
+        for row in rows:
+            if row["status"] == "new":
+                print(f"{row['name']:45s} novo      {row['current_ms']:10.3f} ms")
+            else:
+                print(
+                    f"{row['name']:45s} {row['status']:11s} "
+                    f"{row['baseline_ms']:10.3f} -> {row['current_ms']:10.3f} ms "
+                    f"(x{row['ratio']:.2f})"
+                )
+        regressions = [row for row in rows if row["status"] == "regression"]
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    # Logs das tools atrapalham a leitura dos resultados
+    server.logger.disabled = True
+    result = run_suite(args.filter, args.quick)
+
+    output = Path(args.output) if args.output else None
+    if output is None:
+        DEFAULT_OUTPUT_DIR.mkdir(exist_ok=True)
+        output = DEFAULT_OUTPUT_DIR / f"{result['commit'] or 'local'}.json"
+    output.write_text(json.dumps(result, indent=2))
+    print(f"\nResultados gravados em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Benchmark de inicialização do servidor MCP Geodata-BR.
+
+Os hosts MCP iniciam um processo do servidor por sessão (stdio), então o tempo
+de import é latência visível para o usuário. Este módulo importa o servidor em
+um processo novo com `python -X importtime` e separa o tempo gasto nos módulos
+do projeto do tempo das dependências (FastMCP, pydantic).
+
+Uso:
+    python -m benchmarks.startup [--module src.geodata_br_mcp.server] [--top 15]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Módulo importado pelos hosts MCP
+SERVER_MODULE = "src.geodata_br_mcp.server"
+
+# Prefixo dos módulos do projeto
+PACKAGE_PREFIX = "src.geodata_br_mcp"
+
+# Orçamentos verificados pela suíte de testes (tests/test_startup.py)
+PACKAGE_IMPORT_BUDGET_MS = 150.0
+TOTAL_IMPORT_BUDGET_MS = 3000.0
+
+# Módulos que só devem ser importados na primeira tool que os usa
+DEFERRED_MODULES = (
+    f"{PACKAGE_PREFIX}.attributes",
+    f"{PACKAGE_PREFIX}.columnar",
+    f"{PACKAGE_PREFIX}.database",
+    f"{PACKAGE_PREFIX}.dissolve",
+    f"{PACKAGE_PREFIX}.geometry",
+    f"{PACKAGE_PREFIX}.model",
+    f"{PACKAGE_PREFIX}.overlay",
+    f"{PACKAGE_PREFIX}.parallel",
+    f"{PACKAGE_PREFIX}.serving",
+    f"{PACKAGE_PREFIX}.spatial",
+    f"{PACKAGE_PREFIX}.tiles",
+    "cProfile",
+    "sqlite3",
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Interpreta a saída de `python -X importtime`.
+
+    Args:
+        stderr: Saída de erro do processo
+
+    Returns:
+        Dicionário módulo -> (tempo próprio, tempo acumulado) em microssegundos
+    """
+    modules: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # Linha de cabeçalho
+            continue
+        modules[parts[2].strip()] = (self_us, cumulative_us)
+    return modules
+
+
+def measure_import(module: str = SERVER_MODULE) -> dict[str, Any]:
+    """Importa um módulo em um processo novo e mede o tempo de import.
+
+    Args:
+        module: Nome do módulo a importar
+
+    Returns:
+        Dicionário com wall_ms (processo inteiro), import_ms (acumulado do
+        módulo), package_ms (tempo próprio dos módulos do projeto) e modules
+        (tempos por módulo, em microssegundos)
+
+    Raises:
+        RuntimeError: Se o import falhar
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if completed.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {module}:\n{completed.stderr}")
+
+    modules = parse_importtime(completed.stderr)
+    package_us = sum(
+        self_us for name, (self_us, _) in modules.items() if name.startswith(PACKAGE_PREFIX)
+    )
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": modules.get(module, (0, 0))[1] / 1000,
+        "package_ms": package_us / 1000,
+        "modules": modules,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Mede o tempo de import do servidor")
+    parser.add_argument("--module", default=SERVER_MODULE)
+    parser.add_argument("--top", type=int, default=15, help="Módulos mais lentos a listar")
+    args = parser.parse_args(argv)
+
+    result = measure_import(args.module)
+
+    print(f"processo:          {result['wall_ms']:8.1f} ms")
+    print(f"import {args.module}: {result['import_ms']:8.1f} ms")
+    print(
+        f"módulos do projeto: {result['package_ms']:7.1f} ms "
+        f"(orçamento {PACKAGE_IMPORT_BUDGET_MS:.0f} ms)"
+    )
+    print()
+    slowest = sorted(result["modules"].items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[: args.top]:
+        print(f"{self_us / 1000:8.2f} ms  {cumulative_us / 1000:8.2f} ms  {name}")
+
+    deferred = [name for name in DEFERRED_MODULES if name in result["modules"]]
+    if deferred:
+        print(f"\nMódulos que deveriam ser tardios: {', '.join(deferred)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,6 @@
 """Ponto de entrada para o servidor MCP Geodata-BR."""
 
-from src.geodata_br_mcp.server import app
+from src.geodata_br_mcp.server import main
 
 if __name__ == "__main__":
-    app.run()
+    main()
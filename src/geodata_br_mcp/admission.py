@@ -0,0 +1,236 @@
+"""
+Controle de admissão das tools pesadas do servidor MCP Geodata-BR.
+
+Uma única chamada de get_brazil_geojson monta centenas de MB de JSON no
+servidor e no cliente MCP, e algumas chamadas simultâneas bastam para esgotar
+a memória do processo. Antes de carregar ou serializar qualquer coisa:
+
+- tamanho: a resposta é estimada a partir dos metadados (content_bytes do
+  manifesto ou, sem entrada em dia, o tamanho do arquivo / rodapé gzip) e do
+  modo de geometria. Acima de GEODATA_BR_MAX_RESPONSE_BYTES (padrão 32 MB;
+  0 desativa) a chamada falha com ResponseTooLargeError, que traz as
+  alternativas (modo leve, compressão, consultas por estado ou em lotes);
+- concorrência: cada tool pesada tem um limite próprio (limit_concurrency),
+  verificado depois da estimativa de tamanho. No modo HTTP a espera por uma
+  vaga acontece no event loop (serving.ToolLimiter), antes de ocupar uma das
+  vagas globais de execução, por até GEODATA_BR_HEAVY_TOOL_TIMEOUT segundos;
+  na chamada síncrona a tool no limite falha na hora com ServerBusyError.
+  GEODATA_BR_HEAVY_TOOL_CONCURRENCY substitui o limite de todas as tools
+  pesadas.
+"""
+
+import functools
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .compression import content_size, resolve_data_file
+from .config import env_number
+from .manifest import get_manifest
+from .metrics import registry
+
+# Variáveis de ambiente
+ENV_MAX_RESPONSE_BYTES = "GEODATA_BR_MAX_RESPONSE_BYTES"
+ENV_HEAVY_TOOL_CONCURRENCY = "GEODATA_BR_HEAVY_TOOL_CONCURRENCY"
+ENV_HEAVY_TOOL_TIMEOUT = "GEODATA_BR_HEAVY_TOOL_TIMEOUT"
+
+# Limite padrão do tamanho estimado de uma resposta
+DEFAULT_MAX_RESPONSE_BYTES = 32 * 1024 * 1024
+
+# Espera padrão por uma vaga em uma tool pesada (segundos)
+DEFAULT_HEAVY_TOOL_TIMEOUT = 30.0
+
+# Fração do JSON completo em cada modo de geometria (medida em SP, MG e RR,
+# arredondada para cima: a estimativa deve errar para mais)
+MODE_SIZE_RATIOS = {
+    "full": 1.0,
+    "simplified": 0.4,
+    "centroid": 0.08,
+    "bbox": 0.08,
+    "none": 0.05,
+}
+
+# Corpo comprimido em base64 (gzip ou zstd ~15-20% do JSON, +33% do base64)
+COMPRESSED_SIZE_RATIO = 0.3
+
+# Razão de compressão presumida quando o arquivo .zst não registra o tamanho
+FALLBACK_COMPRESSION_RATIO = 10
+
+
+class ServerBusyError(ValueError):
+    """Chamada recusada porque o servidor (ou a tool) está no limite."""
+
+
+class ResponseTooLargeError(ValueError):
+    """Resposta estimada acima do limite configurado.
+
+    A mensagem é legível e termina com os detalhes em JSON (campo
+    "error": "response_too_large"), para clientes que queiram tratá-los.
+    """
+
+    def __init__(self, tool: str, estimated_bytes: int, limit_bytes: int, suggestions: list[str]):
+        self.tool = tool
+        self.estimated_bytes = estimated_bytes
+        self.limit_bytes = limit_bytes
+        self.suggestions = suggestions
+        super().__init__(
+            f"Resposta muito grande para {tool}: ~{estimated_bytes / 1e6:.1f} MB estimados "
+            f"(limite {limit_bytes / 1e6:.1f} MB). Use paginação ou simplificação: "
+            f"{'; '.join(suggestions)}. Detalhes: {json.dumps(self.details, ensure_ascii=False)}"
+        )
+
+    @property
+    def details(self) -> dict[str, Any]:
+        """Detalhes estruturados do erro."""
+        return {
+            "error": "response_too_large",
+            "tool": self.tool,
+            "estimated_bytes": self.estimated_bytes,
+            "limit_bytes": self.limit_bytes,
+            "suggestions": self.suggestions,
+        }
+
+
+def get_heavy_tool_timeout() -> float:
+    """Espera máxima, em segundos, por uma vaga em uma tool pesada."""
+    return max(0.0, env_number(ENV_HEAVY_TOOL_TIMEOUT, DEFAULT_HEAVY_TOOL_TIMEOUT))
+
+
+def get_max_response_bytes() -> int:
+    """Limite do tamanho estimado das respostas (0: sem limite)."""
+    return max(0, int(env_number(ENV_MAX_RESPONSE_BYTES, DEFAULT_MAX_RESPONSE_BYTES)))
+
+
+def source_content_bytes(file_path: Path, cache_dir: Path) -> int:
+    """Tamanho do JSON descomprimido de um arquivo de dados, sem o parse.
+
+    Usa o content_bytes do manifesto quando a entrada está em dia; senão os
+    metadados do próprio arquivo (veja compression.content_size).
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON (.json lógico)
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Tamanho em bytes (0 se o arquivo não existir)
+    """
+    source = resolve_data_file(file_path)
+    try:
+        manifest = get_manifest(cache_dir)
+        if manifest.is_current(source):
+            content_bytes = manifest.get(source).get("content_bytes")
+            if content_bytes is not None:
+                return int(content_bytes)
+
+        size = content_size(source)
+        if size is None:
+            size = int(source.stat().st_size * FALLBACK_COMPRESSION_RATIO)
+        return size
+    except FileNotFoundError:
+        # A própria tool informa o arquivo ausente
+        return 0
+
+
+def estimate_response_bytes(
+    content_bytes: int, mode: str = "full", encoding: str = "identity"
+) -> int:
+    """Estima o tamanho da resposta a partir do JSON de origem.
+
+    Args:
+        content_bytes: Bytes do JSON completo dos municípios incluídos
+        mode: Modo de geometria (full, simplified, centroid, bbox, none)
+        encoding: "identity" ou uma codificação comprimida (corpo em base64)
+
+    Returns:
+        Tamanho estimado em bytes
+    """
+    estimate = content_bytes * MODE_SIZE_RATIOS.get(mode, 1.0)
+    if encoding != "identity":
+        estimate *= COMPRESSED_SIZE_RATIO
+    return int(estimate)
+
+
+def check_response_size(tool: str, estimated_bytes: int, suggestions: list[str]):
+    """Recusa a chamada se a resposta estimada passar do limite.
+
+    Args:
+        tool: Nome da tool
+        estimated_bytes: Tamanho estimado da resposta
+        suggestions: Alternativas sugeridas ao cliente
+
+    Raises:
+        ResponseTooLargeError: Se o tamanho estimado passar do limite
+    """
+    limit = get_max_response_bytes()
+    if limit and estimated_bytes > limit:
+        registry.inc("tool_rejected_total", tool=tool, reason="too_large")
+        raise ResponseTooLargeError(tool, estimated_bytes, limit, suggestions)
+
+
+@dataclass(frozen=True)
+class ToolAdmission:
+    """Limite de uma tool pesada, exposto ao modo HTTP (atributo admission da tool)."""
+
+    tool: str
+    max_calls: int
+    admit: Callable[..., Any] | None = None
+
+
+def limit_concurrency(
+    max_calls: int, admit: Callable[..., Any] | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator que limita as chamadas simultâneas de uma tool pesada.
+
+    A verificação admit (estimativa de tamanho) roda antes de ocupar a vaga:
+    uma resposta grande demais é recusada sem esperar. Sem vaga livre a
+    chamada falha na hora; a espera com tempo limite fica no event loop do
+    modo HTTP (veja serving.ToolLimiter), para não prender uma thread.
+
+    Args:
+        max_calls: Chamadas simultâneas permitidas (GEODATA_BR_HEAVY_TOOL_CONCURRENCY,
+            se definida, substitui este valor)
+        admit: Verificação prévia, chamada com os mesmos argumentos da tool
+            (deve levantar a exceção de recusa)
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        tool_name = func.__name__
+        limit = max(1, int(env_number(ENV_HEAVY_TOOL_CONCURRENCY, max_calls)))
+        semaphore = threading.BoundedSemaphore(limit)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if admit is not None:
+                admit(*args, **kwargs)
+            if not semaphore.acquire(blocking=False):
+                registry.inc("tool_rejected_total", tool=tool_name, reason="tool_limit")
+                raise ServerBusyError(
+                    f"Servidor ocupado: {tool_name} já tem {limit} chamadas em execução. "
+                    "Tente novamente em instantes"
+                )
+            try:
+                return func(*args, **kwargs)
+            finally:
+                semaphore.release()
+
+        wrapper.admission = ToolAdmission(tool_name, limit, admit)  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "ServerBusyError",
+    "ResponseTooLargeError",
+    "ToolAdmission",
+    "get_heavy_tool_timeout",
+    "get_max_response_bytes",
+    "source_content_bytes",
+    "estimate_response_bytes",
+    "check_response_size",
+    "limit_concurrency",
+]
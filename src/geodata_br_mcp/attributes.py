@@ -0,0 +1,320 @@
+"""
+Atributos derivados dos municípios para o servidor MCP Geodata-BR.
+
+Este módulo calcula, uma única vez por estado, a área geodésica, o perímetro,
+o centroide e o bounding box de cada município. A tabela resultante fica em
+cache junto com o GeoJSON do estado e alimenta tanto as consultas por
+município quanto os agregados estaduais.
+
+Os modos leves de include_geometry (none, bbox, centroid, simplified) também
+são servidos daqui: bbox e centroide vêm da tabela de atributos e as geometrias
+simplificadas ficam em um cache próprio, calculado uma vez por estado.
+
+Com um diretório de cache, as duas tabelas também são gravadas em disco
+(index_cache.py) e sobrevivem a reinicializações do servidor.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .config import GEOMETRY_MODES
+from .geometry import (
+    geometry_area_km2,
+    geometry_bounds,
+    geometry_centroid,
+    geometry_perimeter_km,
+    simplify_geometry,
+)
+from .utils import load_geojson_with_cache
+
+# Tolerância da geometria simplificada (~500 m no equador): os arquivos do IBGE
+# têm vértices a cada ~1 km, então tolerâncias menores quase não reduzem nada
+SIMPLIFY_TOLERANCE_DEG = 0.005
+
+# Casas decimais das coordenadas simplificadas (~1 m)
+SIMPLIFY_PRECISION = 5
+
+# Casas decimais de área (km²) e perímetro (km) na tabela de atributos
+ATTRIBUTE_DECIMALS = 3
+
+# Cache em memória das tabelas de atributos (chave: caminho do arquivo)
+_attributes_cache: dict[str, list[dict[str, Any]]] = {}
+
+# Cache em memória das geometrias simplificadas (chave: caminho do arquivo)
+_simplified_cache: dict[str, list[dict[str, Any] | None]] = {}
+
+
+def compute_feature_attributes(feature: dict[str, Any]) -> dict[str, Any]:
+    """Calcula os atributos derivados de uma feature.
+
+    Args:
+        feature: Feature GeoJSON
+
+    Returns:
+        Dicionário com id, nome, área (km²), perímetro (km), centroide e bbox
+    """
+    props = feature.get("properties", {})
+    geometry = feature.get("geometry") or {}
+    centroid = geometry_centroid(geometry)
+    bounds = geometry_bounds(geometry)
+
+    return {
+        "id": props.get("id", ""),
+        "name": props.get("name", ""),
+        "area_km2": round(geometry_area_km2(geometry), ATTRIBUTE_DECIMALS),
+        "perimeter_km": round(geometry_perimeter_km(geometry), ATTRIBUTE_DECIMALS),
+        "centroid": list(centroid) if centroid else None,
+        "bbox": list(bounds) if bounds else None,
+    }
+
+
+def build_attributes_table(features: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Calcula os atributos derivados de uma lista de features.
+
+    Args:
+        features: Lista de features GeoJSON
+
+    Returns:
+        Lista de atributos, na mesma ordem das features
+    """
+    return [compute_feature_attributes(feature) for feature in features]
+
+
+def _load_derived(
+    kind: str,
+    file_path: Path,
+    cache_dir: Path | None,
+    build: Callable[[], Any],
+    params: dict[str, Any],
+) -> Any:
+    """Constrói uma tabela derivada, passando pelo cache em disco se configurado.
+
+    Os parâmetros do construtor entram na chave do cache: mudar a tolerância ou
+    a precisão não reaproveita tabelas gravadas com os valores antigos.
+    """
+    if cache_dir is None:
+        return build()
+
+    from .index_cache import get_index_cache
+
+    return get_index_cache(cache_dir).get_or_build(kind, [file_path], build, params=params)
+
+
+def load_attributes_with_cache(
+    file_path: Path, cache_dir: Path | None = None
+) -> list[dict[str, Any]]:
+    """Retorna a tabela de atributos de um arquivo GeoJSON (com cache).
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+        cache_dir: Diretório de cache para persistir a tabela (opcional)
+
+    Returns:
+        Lista de atributos, na mesma ordem das features do arquivo
+    """
+    file_str = str(file_path)
+
+    if file_str not in _attributes_cache:
+
+        def build() -> list[dict[str, Any]]:
+            geojson_data = load_geojson_with_cache(file_path)
+            return build_attributes_table(geojson_data.get("features", []))
+
+        _attributes_cache[file_str] = _load_derived(
+            "attributes", file_path, cache_dir, build, {"decimals": ATTRIBUTE_DECIMALS}
+        )
+
+    return _attributes_cache[file_str]
+
+
+def get_cached_attributes(file_path: Path) -> list[dict[str, Any]] | None:
+    """Retorna a tabela de atributos se já estiver em cache (sem calcular)."""
+    return _attributes_cache.get(str(file_path))
+
+
+def simplify_feature_geometry(feature: dict[str, Any]) -> dict[str, Any] | None:
+    """Retorna a geometria simplificada de uma feature (ou None se não houver)."""
+    geometry = feature.get("geometry")
+    if not geometry:
+        return None
+    return simplify_geometry(geometry, SIMPLIFY_TOLERANCE_DEG, SIMPLIFY_PRECISION)
+
+
+def load_simplified_with_cache(
+    file_path: Path, cache_dir: Path | None = None
+) -> list[dict[str, Any] | None]:
+    """Retorna as geometrias simplificadas de um arquivo GeoJSON (com cache).
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+        cache_dir: Diretório de cache para persistir as geometrias (opcional)
+
+    Returns:
+        Lista de geometrias, na mesma ordem das features do arquivo
+    """
+    file_str = str(file_path)
+
+    if file_str not in _simplified_cache:
+
+        def build() -> list[dict[str, Any] | None]:
+            geojson_data = load_geojson_with_cache(file_path)
+            return [
+                simplify_feature_geometry(feature) for feature in geojson_data.get("features", [])
+            ]
+
+        params = {"tolerance_deg": SIMPLIFY_TOLERANCE_DEG, "precision": SIMPLIFY_PRECISION}
+        _simplified_cache[file_str] = _load_derived(
+            "simplified", file_path, cache_dir, build, params
+        )
+
+    return _simplified_cache[file_str]
+
+
+def get_cached_simplified(file_path: Path) -> list[dict[str, Any] | None] | None:
+    """Retorna as geometrias simplificadas se já estiverem em cache (sem calcular)."""
+    return _simplified_cache.get(str(file_path))
+
+
+def clear_attributes_cache():
+    """Limpa o cache de tabelas de atributos e de geometrias simplificadas."""
+    _attributes_cache.clear()
+    _simplified_cache.clear()
+
+
+def validate_geometry_mode(mode: str) -> str:
+    """Normaliza e valida o modo de geometria pedido em uma tool.
+
+    Raises:
+        ValueError: Se o modo não for suportado
+    """
+    normalized = mode.strip().lower()
+    if normalized not in GEOMETRY_MODES:
+        raise ValueError(f"Modo de geometria inválido: {mode}. Opções: {', '.join(GEOMETRY_MODES)}")
+    return normalized
+
+
+def build_light_feature(
+    properties: dict[str, Any],
+    mode: str,
+    row: dict[str, Any] | None = None,
+    simplified: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Monta uma feature GeoJSON em um dos modos leves de geometria.
+
+    Args:
+        properties: Propriedades da feature original (não são copiadas)
+        mode: "none", "bbox", "centroid" ou "simplified"
+        row: Atributos da feature (obrigatório em bbox e centroid)
+        simplified: Geometria simplificada (usada no modo simplified)
+
+    Returns:
+        Feature com geometria nula, bbox, Point no centroide ou geometria
+        simplificada
+    """
+    feature: dict[str, Any] = {"type": "Feature", "properties": properties, "geometry": None}
+    if mode == "bbox" and row is not None and row["bbox"]:
+        feature["bbox"] = row["bbox"]
+    elif mode == "centroid" and row is not None and row["centroid"]:
+        feature["geometry"] = {"type": "Point", "coordinates": row["centroid"]}
+    elif mode == "simplified":
+        feature["geometry"] = simplified
+    return feature
+
+
+def build_light_collection(
+    file_path: Path,
+    mode: str,
+    cache_dir: Path | None = None,
+    properties: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Monta o FeatureCollection de um arquivo em um dos modos leves.
+
+    As propriedades vêm do GeoJSON em cache (ou do backend, se informadas) e o
+    restante das tabelas pré-calculadas, sem serializar as geometrias originais.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+        mode: "none", "bbox", "centroid" ou "simplified"
+        cache_dir: Diretório de cache das tabelas derivadas (opcional)
+        properties: Propriedades das features, na ordem do arquivo (opcional)
+
+    Returns:
+        GeoJSON FeatureCollection
+    """
+    if properties is None:
+        features = load_geojson_with_cache(file_path).get("features", [])
+        properties = [feature.get("properties", {}) for feature in features]
+    rows: list[Any] = [None] * len(properties)
+    geometries: list[Any] = [None] * len(properties)
+    if mode in ("bbox", "centroid"):
+        rows = load_attributes_with_cache(file_path, cache_dir)
+    elif mode == "simplified":
+        geometries = load_simplified_with_cache(file_path, cache_dir)
+
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            build_light_feature(props, mode, row, geometry)
+            for props, row, geometry in zip(properties, rows, geometries, strict=True)
+        ],
+    }
+
+
+def find_attributes_by_ibge(table: list[dict[str, Any]], ibge_code: str) -> dict[str, Any] | None:
+    """Busca os atributos de um município pelo código IBGE.
+
+    Args:
+        table: Tabela de atributos
+        ibge_code: Código IBGE do município
+
+    Returns:
+        Atributos encontrados ou None
+    """
+    for row in table:
+        if row["id"] == ibge_code:
+            return row
+    return None
+
+
+def summarize_attributes(table: list[dict[str, Any]]) -> dict[str, Any]:
+    """Calcula agregados de uma tabela de atributos (área total, maior e menor).
+
+    Args:
+        table: Tabela de atributos
+
+    Returns:
+        Dicionário com área total, área média e maior/menor município
+    """
+    if not table:
+        return {"municipality_count": 0, "total_area_km2": 0.0}
+
+    largest = max(table, key=lambda row: row["area_km2"])
+    smallest = min(table, key=lambda row: row["area_km2"])
+    total_area = sum(row["area_km2"] for row in table)
+
+    return {
+        "municipality_count": len(table),
+        "total_area_km2": round(total_area, 3),
+        "mean_area_km2": round(total_area / len(table), 3),
+        "largest": {key: largest[key] for key in ("id", "name", "area_km2")},
+        "smallest": {key: smallest[key] for key in ("id", "name", "area_km2")},
+    }
+
+
+# Exporta as principais funções
+__all__ = [
+    "compute_feature_attributes",
+    "build_attributes_table",
+    "load_attributes_with_cache",
+    "get_cached_attributes",
+    "simplify_feature_geometry",
+    "load_simplified_with_cache",
+    "get_cached_simplified",
+    "clear_attributes_cache",
+    "validate_geometry_mode",
+    "build_light_feature",
+    "build_light_collection",
+    "find_attributes_by_ibge",
+    "summarize_attributes",
+]
@@ -0,0 +1,218 @@
+"""
+Catálogo dos arquivos de dados para o servidor MCP Geodata-BR.
+
+O catálogo lista uma única vez o diretório geojson/ e guarda, para cada código
+IBGE, o caminho, tamanho e mtime do arquivo. O número de municípios é obtido
+sob demanda por uma varredura dos bytes do arquivo (sem parse do JSON) e fica
+em cache enquanto tamanho e mtime não mudarem.
+
+As tools consultam o catálogo em memória; o sistema de arquivos só é lido de
+novo quando o catálogo expira (GEODATA_BR_CATALOG_TTL segundos, padrão 5) ou
+quando é invalidado explicitamente.
+"""
+
+import mmap
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .compression import is_compressed, open_data_file
+from .config import GEOJSON_DIRECTORY, IBGE_TO_STATE, env_number
+
+# Variável de ambiente com o tempo de validade do catálogo (segundos)
+ENV_CATALOG_TTL = "GEODATA_BR_CATALOG_TTL"
+DEFAULT_CATALOG_TTL = 5.0
+
+# Nome dos arquivos de estado: geojs-XX-mun.json (ou .json.gz / .json.zst)
+_FILENAME_RE = re.compile(r"^geojs-(\d+)-mun\.json(\.gz|\.zst)?$")
+
+# Preferência quando há mais de uma variante do mesmo estado (menor = preferida)
+_VARIANT_PRIORITY = {None: 0, ".gz": 1, ".zst": 2}
+
+# Marcador de início de cada feature no arquivo
+_FEATURE_RE = re.compile(rb'"type"\s*:\s*"Feature"')
+
+
+@dataclass
+class CatalogEntry:
+    """Metadados de um arquivo de estado (ou do arquivo nacional)."""
+
+    code: str
+    path: Path
+    size: int
+    mtime_ns: int
+    feature_count: int | None = field(default=None, compare=False)
+
+    @property
+    def state_info(self) -> dict[str, str]:
+        """Retorna UF, nome e região do código."""
+        return IBGE_TO_STATE[self.code]
+
+
+def count_features_in_file(file_path: Path) -> int:
+    """Conta as features de um arquivo GeoJSON sem fazer o parse.
+
+    Conta as ocorrências de `"type": "Feature"` nos bytes do arquivo (mapeado
+    em memória), o que é muito mais barato que json.load. Arquivos comprimidos
+    são descomprimidos antes da contagem.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+
+    Returns:
+        Número de features
+    """
+    if is_compressed(file_path):
+        with open_data_file(file_path) as stream:
+            return sum(1 for _ in _FEATURE_RE.finditer(stream.read()))
+
+    with file_path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return sum(1 for _ in _FEATURE_RE.finditer(data))
+
+
+class DataCatalog:
+    """Catálogo em memória dos arquivos geojs-XX-mun.json de um diretório."""
+
+    def __init__(self, data_root: Path, ttl: float | None = None):
+        self.data_root = data_root
+        if ttl is None:
+            ttl = env_number(ENV_CATALOG_TTL, DEFAULT_CATALOG_TTL)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, CatalogEntry] = {}
+        self._root_exists = False
+        self._geojson_dir_exists = False
+        self._built_at: float | None = None
+
+    def _scan(self):
+        """Lista o diretório de dados e atualiza as entradas."""
+        geojson_dir = self.data_root / GEOJSON_DIRECTORY
+        entries: dict[str, CatalogEntry] = {}
+        priorities: dict[str, int] = {}
+
+        try:
+            with os.scandir(geojson_dir) as it:
+                for dir_entry in it:
+                    match = _FILENAME_RE.match(dir_entry.name)
+                    if not match or match.group(1) not in IBGE_TO_STATE:
+                        continue
+                    code = match.group(1)
+                    priority = _VARIANT_PRIORITY[match.group(2)]
+                    if priorities.get(code, priority + 1) <= priority:
+                        continue
+                    priorities[code] = priority
+                    stat = dir_entry.stat()
+                    entry = CatalogEntry(code, Path(dir_entry.path), stat.st_size, stat.st_mtime_ns)
+
+                    # Mantém a contagem se o arquivo não mudou
+                    previous = self._entries.get(code)
+                    if previous is not None and previous == entry:
+                        entry.feature_count = previous.feature_count
+                    entries[code] = entry
+            self._geojson_dir_exists = True
+        except (FileNotFoundError, NotADirectoryError):
+            self._geojson_dir_exists = False
+
+        self._root_exists = self.data_root.is_dir()
+        self._entries = dict(sorted(entries.items()))
+        self._built_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._built_at is None or time.monotonic() - self._built_at >= self.ttl:
+            with self._lock:
+                if self._built_at is None or time.monotonic() - self._built_at >= self.ttl:
+                    self._scan()
+
+    def invalidate(self):
+        """Força uma nova listagem do diretório na próxima consulta."""
+        with self._lock:
+            self._built_at = None
+
+    @property
+    def root_exists(self) -> bool:
+        """Indica se o diretório de dados existe."""
+        self._ensure_fresh()
+        return self._root_exists
+
+    @property
+    def geojson_dir_exists(self) -> bool:
+        """Indica se o diretório geojson/ existe."""
+        self._ensure_fresh()
+        return self._geojson_dir_exists
+
+    def codes(self) -> list[str]:
+        """Retorna os códigos IBGE com arquivo disponível (ordenados)."""
+        self._ensure_fresh()
+        return list(self._entries)
+
+    def get(self, code: str) -> CatalogEntry | None:
+        """Retorna a entrada de um código IBGE (ou None se não houver arquivo)."""
+        self._ensure_fresh()
+        return self._entries.get(code)
+
+    def feature_count(self, code: str) -> int | None:
+        """Retorna o número de features do arquivo de um código IBGE.
+
+        Args:
+            code: Código IBGE do estado
+
+        Returns:
+            Número de features, ou None se não houver arquivo
+        """
+        entry = self.get(code)
+        if entry is None:
+            return None
+        if entry.feature_count is None:
+            entry.feature_count = count_features_in_file(entry.path)
+        return entry.feature_count
+
+    def states(self) -> list[dict[str, Any]]:
+        """Retorna as informações dos estados com arquivo disponível.
+
+        Returns:
+            Lista de dicionários com código IBGE, UF, nome e região
+        """
+        self._ensure_fresh()
+        return [{**entry.state_info, "ibge_code": code} for code, entry in self._entries.items()]
+
+
+# Catálogos por diretório de dados
+_catalogs: dict[str, DataCatalog] = {}
+
+
+def get_catalog(data_root: Path) -> DataCatalog:
+    """Retorna o catálogo de um diretório de dados (criado na primeira chamada).
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+
+    Returns:
+        Catálogo do diretório
+    """
+    key = str(data_root)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = DataCatalog(data_root)
+    return catalog
+
+
+def clear_catalogs():
+    """Remove todos os catálogos em memória."""
+    _catalogs.clear()
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "CatalogEntry",
+    "DataCatalog",
+    "count_features_in_file",
+    "get_catalog",
+    "clear_catalogs",
+]
@@ -0,0 +1,510 @@
+"""
+Exportação colunar (Parquet / Arrow) dos municípios para o servidor MCP Geodata-BR.
+
+Gera uma tabela com uma linha por município e as colunas id, name,
+description, state (UF), state_code, region e geometry (WKB). Cada estado é
+convertido em um processo separado (parallel.py, maiores arquivos primeiro) e
+gravado como um row group, então a memória fica limitada a alguns estados por
+vez. O arquivo Parquet inclui os metadados "geo" do GeoParquet, para ser lido
+diretamente por GeoPandas/DuckDB.
+
+O mesmo arquivo pode ser usado pelo servidor como backend de carregamento
+(GEODATA_BR_BACKEND=columnar): cada estado é lido filtrando o row group pelo
+código e a geometria WKB é convertida de volta para GeoJSON.
+
+Requer o pacote opcional pyarrow (pip install "geodata-br-mcp[columnar]").
+A codificação WKB não depende dele.
+
+Uso:
+    python -m src.geodata_br_mcp.columnar [--output arquivo.parquet] [--workers N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, cast
+
+from .compression import open_data_file, resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+)
+from .metrics import record_cache_lookup, record_file_load
+from .parallel import find_state_files, imap_states, resolve_workers
+
+# Variável de ambiente com o caminho do arquivo colunar usado como backend
+ENV_COLUMNAR_PATH = "GEODATA_BR_COLUMNAR_PATH"
+
+# Nome padrão do arquivo dentro do diretório de cache
+COLUMNAR_FILENAME = "municipalities.parquet"
+
+# Colunas da tabela (geometry em WKB)
+COLUMNS = ("id", "name", "description", "state", "state_code", "region", "geometry")
+
+# Tipos de geometria WKB
+_WKB_POINT = 1
+_WKB_LINESTRING = 2
+_WKB_POLYGON = 3
+_WKB_MULTIPOINT = 4
+_WKB_MULTILINESTRING = 5
+_WKB_MULTIPOLYGON = 6
+
+_GEOJSON_TO_WKB = {
+    "Point": _WKB_POINT,
+    "LineString": _WKB_LINESTRING,
+    "Polygon": _WKB_POLYGON,
+    "MultiPoint": _WKB_MULTIPOINT,
+    "MultiLineString": _WKB_MULTILINESTRING,
+    "MultiPolygon": _WKB_MULTIPOLYGON,
+}
+_WKB_TO_GEOJSON = {code: name for name, code in _GEOJSON_TO_WKB.items()}
+
+# Cache em memória das coleções lidas do arquivo colunar
+_columnar_cache: dict[tuple[str, str], dict[str, Any]] = {}
+
+# Serializa a exportação sob demanda (uma por processo)
+_export_lock = threading.Lock()
+
+logger = logging.getLogger("geodata-br-mcp")
+
+
+def _require_pyarrow():
+    """Importa pyarrow ou explica como instalá-lo."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            'A exportação colunar requer pyarrow: pip install "geodata-br-mcp[columnar]"'
+        ) from e
+
+
+# ---------------------------------------------------------------------------
+# WKB (Well-Known Binary, little-endian, 2D)
+# ---------------------------------------------------------------------------
+
+
+def _pack_points(points: list[list[float]]) -> bytes:
+    flat = [c for point in points for c in point[:2]]
+    return struct.pack(f"<I{len(flat)}d", len(points), *flat)
+
+
+def _pack_rings(rings: list[list[list[float]]]) -> bytes:
+    return struct.pack("<I", len(rings)) + b"".join(_pack_points(ring) for ring in rings)
+
+
+def encode_wkb(geometry: dict[str, Any]) -> bytes:
+    """Codifica uma geometria GeoJSON em WKB (little-endian, 2D).
+
+    Args:
+        geometry: Geometria GeoJSON (Point, LineString, Polygon e Multi*)
+
+    Returns:
+        Bytes WKB
+
+    Raises:
+        ValueError: Se o tipo de geometria não for suportado
+    """
+    geom_type = geometry.get("type")
+    wkb_type = _GEOJSON_TO_WKB.get(geom_type or "")
+    if wkb_type is None:
+        raise ValueError(f"Tipo de geometria não suportado em WKB: {geom_type}")
+
+    coords = geometry.get("coordinates") or []
+    header = struct.pack("<BI", 1, wkb_type)
+
+    if wkb_type == _WKB_POINT:
+        return header + struct.pack("<2d", *coords[:2])
+    if wkb_type == _WKB_LINESTRING:
+        return header + _pack_points(coords)
+    if wkb_type == _WKB_POLYGON:
+        return header + _pack_rings(coords)
+
+    # Multi*: cada parte é uma geometria WKB completa
+    part_type = _WKB_TO_GEOJSON[wkb_type - 3]
+    parts = [encode_wkb({"type": part_type, "coordinates": part}) for part in coords]
+    return header + struct.pack("<I", len(parts)) + b"".join(parts)
+
+
+def _decode(data: bytes, offset: int) -> tuple[dict[str, Any], int]:
+    """Decodifica uma geometria WKB a partir de um offset."""
+    endian = "<" if data[offset] == 1 else ">"
+    (wkb_type,) = struct.unpack_from(f"{endian}I", data, offset + 1)
+    offset += 5
+
+    def read_points(offset: int) -> tuple[list[list[float]], int]:
+        (count,) = struct.unpack_from(f"{endian}I", data, offset)
+        values = iter(struct.unpack_from(f"{endian}{2 * count}d", data, offset + 4))
+        points = [[x, y] for x, y in zip(values, values, strict=True)]
+        return points, offset + 4 + 16 * count
+
+    def read_rings(offset: int) -> tuple[list[list[list[float]]], int]:
+        (count,) = struct.unpack_from(f"{endian}I", data, offset)
+        offset += 4
+        rings = []
+        for _ in range(count):
+            ring, offset = read_points(offset)
+            rings.append(ring)
+        return rings, offset
+
+    geom_type = _WKB_TO_GEOJSON.get(wkb_type)
+    if geom_type is None:
+        raise ValueError(f"Tipo WKB não suportado: {wkb_type}")
+
+    coords: Any
+    if wkb_type == _WKB_POINT:
+        coords = list(struct.unpack_from(f"{endian}2d", data, offset))
+        offset += 16
+    elif wkb_type == _WKB_LINESTRING:
+        coords, offset = read_points(offset)
+    elif wkb_type == _WKB_POLYGON:
+        coords, offset = read_rings(offset)
+    else:
+        (count,) = struct.unpack_from(f"{endian}I", data, offset)
+        offset += 4
+        coords = []
+        for _ in range(count):
+            part, offset = _decode(data, offset)
+            coords.append(part["coordinates"])
+
+    return {"type": geom_type, "coordinates": coords}, offset
+
+
+def decode_wkb(data: bytes) -> dict[str, Any]:
+    """Decodifica WKB (2D) em uma geometria GeoJSON.
+
+    Args:
+        data: Bytes WKB
+
+    Returns:
+        Geometria GeoJSON
+    """
+    return _decode(data, 0)[0]
+
+
+# ---------------------------------------------------------------------------
+# Exportação
+# ---------------------------------------------------------------------------
+
+
+def convert_state(file_path: str, code: str) -> dict[str, list[Any]]:
+    """Converte o arquivo de um estado em colunas (executado em um processo do pool).
+
+    O arquivo é lido diretamente, sem o cache em memória do servidor.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        code: Código IBGE do estado
+
+    Returns:
+        Dicionário coluna -> lista de valores
+    """
+    with open_data_file(resolve_data_file(Path(file_path))) as f:
+        data = json.load(f)
+
+    state = IBGE_TO_STATE[code]
+    columns: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        geometry = feature.get("geometry")
+        columns["id"].append(str(props.get("id", "")))
+        columns["name"].append(props.get("name", ""))
+        columns["description"].append(props.get("description", ""))
+        columns["state"].append(state["uf"])
+        columns["state_code"].append(code)
+        columns["region"].append(state["region"])
+        columns["geometry"].append(encode_wkb(geometry) if geometry else None)
+    return columns
+
+
+def _schema(with_geo_metadata: bool = False):
+    import pyarrow as pa
+
+    metadata = {"geo": _geo_metadata()} if with_geo_metadata else None
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("name", pa.string()),
+            ("description", pa.string()),
+            ("state", pa.string()),
+            ("state_code", pa.string()),
+            ("region", pa.string()),
+            ("geometry", pa.binary()),
+        ],
+        metadata=metadata,
+    )
+
+
+def _geo_metadata() -> bytes:
+    """Metadados GeoParquet (coluna geometry em WKB, WGS84, tipos variados)."""
+    return json.dumps(
+        {
+            "version": "1.0.0",
+            "primary_column": "geometry",
+            "columns": {"geometry": {"encoding": "WKB", "geometry_types": []}},
+        }
+    ).encode("utf-8")
+
+
+def export_columnar(
+    data_root: Path,
+    output_path: Path,
+    workers: int | None = None,
+    codes: list[str] | None = None,
+) -> dict[str, int]:
+    """Exporta os municípios de todos os estados para um arquivo colunar.
+
+    O formato é escolhido pela extensão: .parquet (GeoParquet) ou .arrow
+    (Arrow IPC). Os estados são convertidos em paralelo, mas no máximo
+    2 × workers ficam em memória; cada um vira um row group (Parquet) ou um
+    record batch (Arrow), na ordem em que terminam. A leitura filtra pelo
+    código do estado, então a ordem dos row groups não importa.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        output_path: Arquivo de saída
+        workers: Número de processos (padrão: número de CPUs)
+        codes: Códigos IBGE dos estados (padrão: todos)
+
+    Returns:
+        Dicionário código IBGE -> número de municípios exportados
+
+    Raises:
+        ImportError: Se pyarrow não estiver instalado
+        ValueError: Se a extensão do arquivo não for suportada
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+
+    suffix = output_path.suffix.lower()
+    if suffix not in (".parquet", ".arrow"):
+        raise ValueError(f"Extensão não suportada: {suffix}. Use .parquet ou .arrow")
+
+    files = find_state_files(data_root, codes)
+
+    schema = _schema(with_geo_metadata=suffix == ".parquet")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    counts: dict[str, int] = {}
+
+    workers = resolve_workers(workers, len(files))
+
+    writer: Any
+    try:
+        if suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(str(tmp_path), schema, compression="zstd")
+        else:
+            import pyarrow.ipc as ipc
+
+            writer = ipc.new_file(str(tmp_path), schema)
+
+        try:
+            states = imap_states(convert_state, files, workers=workers, window=2 * workers)
+            for code, columns in states:
+                # Um row group (Parquet) ou record batch (Arrow) por estado
+                batch = pa.record_batch([columns[name] for name in COLUMNS], schema=schema)
+                writer.write_batch(batch)
+                counts[code] = batch.num_rows
+                del columns, batch
+        finally:
+            writer.close()
+
+        tmp_path.replace(output_path)
+    finally:
+        # Conversão interrompida: não deixa o arquivo parcial para trás
+        tmp_path.unlink(missing_ok=True)
+    return {code: counts[code] for code in files}
+
+
+# ---------------------------------------------------------------------------
+# Leitura (backend do servidor)
+# ---------------------------------------------------------------------------
+
+
+def _read_table(path: Path, code: str | None):
+    """Lê o arquivo colunar, opcionalmente filtrando por código de estado."""
+    import pyarrow.compute as pc
+
+    if path.suffix.lower() == ".arrow":
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(str(path)) as reader:
+            table = reader.read_all()
+        if code is not None:
+            table = table.filter(pc.equal(table["state_code"], code))
+        return table
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(str(path))
+    if code is None:
+        return parquet_file.read()
+
+    # Cada estado é um row group: escolhe pelos min/max da coluna state_code
+    column_index = parquet_file.schema_arrow.get_field_index("state_code")
+    metadata = parquet_file.metadata
+    groups = []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column_index).statistics
+        if stats is None or not stats.has_min_max or stats.min <= code <= stats.max:
+            groups.append(i)
+
+    if not groups:
+        return parquet_file.schema_arrow.empty_table()
+    table = parquet_file.read_row_groups(groups)
+    return table.filter(pa.compute.equal(table["state_code"], code))
+
+
+def table_to_features(table) -> list[dict[str, Any]]:
+    """Converte uma tabela colunar em features GeoJSON.
+
+    Args:
+        table: Tabela pyarrow com as colunas de COLUMNS
+
+    Returns:
+        Lista de features GeoJSON (mesmas propriedades dos arquivos originais)
+    """
+    ids = table.column("id").to_pylist()
+    names = table.column("name").to_pylist()
+    descriptions = table.column("description").to_pylist()
+    geometries = table.column("geometry").to_pylist()
+
+    return [
+        {
+            "type": "Feature",
+            "properties": {"id": fid, "name": name, "description": description},
+            "geometry": decode_wkb(wkb) if wkb is not None else None,
+        }
+        for fid, name, description, wkb in zip(ids, names, descriptions, geometries, strict=True)
+    ]
+
+
+def load_columnar_collection(path: Path, code: str) -> dict[str, Any]:
+    """Retorna a FeatureCollection de um estado a partir do arquivo colunar (com cache).
+
+    Args:
+        path: Arquivo .parquet ou .arrow gerado por export_columnar
+        code: Código IBGE do estado, ou "100" para o Brasil inteiro
+
+    Returns:
+        GeoJSON FeatureCollection
+
+    Raises:
+        FileNotFoundError: Se o arquivo colunar não existir
+        ImportError: Se pyarrow não estiver instalado
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Arquivo colunar não encontrado: {path}")
+
+    stat = path.stat()
+    key = (str(path), code)
+    cached = _columnar_cache.get(key)
+    hit = cached is not None and cached["signature"] == (stat.st_size, stat.st_mtime_ns)
+    record_cache_lookup("columnar", hit)
+    if cached is not None and hit:
+        return cast(dict[str, Any], cached["data"])
+
+    _require_pyarrow()
+    started = time.perf_counter()
+    table = _read_table(path, None if code == "100" else code)
+    data = {"type": "FeatureCollection", "features": table_to_features(table)}
+    record_file_load(f"{path.name}:{code}", (time.perf_counter() - started) * 1000, table.nbytes)
+
+    _columnar_cache[key] = {"signature": (stat.st_size, stat.st_mtime_ns), "data": data}
+    return data
+
+
+def ensure_columnar_file(data_root: Path, path: Path) -> Path:
+    """Retorna o arquivo colunar, exportando-o na primeira chamada se não existir.
+
+    Assim o backend colunar funciona sem uma exportação manual prévia, como o
+    backend sqlite, que ingere o banco na primeira consulta.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        path: Arquivo .parquet ou .arrow usado como backend
+
+    Returns:
+        O próprio caminho, já existente
+
+    Raises:
+        ImportError: Se pyarrow não estiver instalado
+    """
+    if path.exists():
+        return path
+
+    with _export_lock:
+        if not path.exists():
+            counts = export_columnar(data_root, path)
+            logger.info(f"Arquivo colunar {path}: {sum(counts.values())} municípios")
+    return path
+
+
+def clear_columnar_cache():
+    """Limpa o cache em memória das coleções lidas do arquivo colunar."""
+    _columnar_cache.clear()
+
+
+def get_columnar_path(cache_dir: Path) -> Path:
+    """Retorna o caminho do arquivo colunar usado como backend.
+
+    Args:
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        GEODATA_BR_COLUMNAR_PATH ou municipalities.parquet dentro do cache
+    """
+    configured = os.environ.get(ENV_COLUMNAR_PATH)
+    if configured:
+        return Path(configured).expanduser()
+    return cache_dir / COLUMNAR_FILENAME
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(
+        description="Exporta os municípios para um arquivo colunar (Parquet ou Arrow)"
+    )
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument(
+        "--output", help="Arquivo .parquet ou .arrow (padrão: municipalities.parquet no cache)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+    output_path = Path(args.output) if args.output else get_columnar_path(cache_dir)
+
+    counts = export_columnar(data_root, output_path, workers=args.workers)
+    print(f"{sum(counts.values())} municípios de {len(counts)} estados em {output_path}")
+    return 0
+
+
+# Exporta as principais funções
+__all__ = [
+    "COLUMNS",
+    "encode_wkb",
+    "decode_wkb",
+    "convert_state",
+    "export_columnar",
+    "table_to_features",
+    "load_columnar_collection",
+    "ensure_columnar_file",
+    "clear_columnar_cache",
+    "get_columnar_path",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,322 @@
+"""
+Compressão de arquivos de dados e de respostas para o servidor MCP Geodata-BR.
+
+Arquivos de dados: cada geojs-XX-mun.json pode ser substituído por uma versão
+comprimida (geojs-XX-mun.json.gz ou .json.zst). A leitura é transparente: o
+caminho .json é resolvido para a variante existente e o conteúdo é
+descomprimido em streaming durante o parse.
+
+Respostas: as tools que devolvem FeatureCollections grandes aceitam
+encoding="gzip" (ou "zstd"). O corpo JSON é comprimido uma vez e guardado em
+um cache LRU em memória; as chamadas seguintes devolvem o corpo pronto, em
+base64, para transportes que repassam o conteúdo comprimido ao cliente.
+
+zstd requer o pacote opcional zstandard (pip install "geodata-br-mcp[zstd]").
+
+Uso (gera as versões comprimidas dos arquivos de dados):
+    python -m src.geodata_br_mcp.compression [--encoding gzip|zstd] [--remove-original]
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any, cast
+
+from .config import ENV_DATA_PATH, GEOJSON_DIRECTORY, env_number
+from .metrics import record_cache_lookup, registry
+
+# Extensões dos arquivos comprimidos, na ordem de preferência de leitura
+COMPRESSED_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+ENCODING_SUFFIXES = {encoding: suffix for suffix, encoding in COMPRESSED_SUFFIXES.items()}
+
+# Codificações aceitas nas respostas das tools
+RESPONSE_ENCODINGS = ("identity", "gzip", "zstd")
+
+# Níveis de compressão: no GeoJSON, gzip 9 reduz menos de 0,1% além do nível 6
+# e leva quase 3x mais tempo (a primeira resposta comprimida espera por isso)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 9
+
+# Número de corpos comprimidos mantidos em memória
+ENV_BODY_CACHE_SIZE = "GEODATA_BR_COMPRESSED_CACHE_SIZE"
+DEFAULT_BODY_CACHE_SIZE = 8
+
+# Content types das respostas
+GEOJSON_CONTENT_TYPE = "application/geo+json"
+
+
+def _require_zstandard():
+    """Importa zstandard ou explica como instalá-lo."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            'Arquivos e respostas zstd requerem zstandard: pip install "geodata-br-mcp[zstd]"'
+        ) from e
+    return zstandard
+
+
+def is_compressed(file_path: Path) -> bool:
+    """Indica se o caminho é de um arquivo comprimido (.gz ou .zst)."""
+    return file_path.suffix in COMPRESSED_SUFFIXES
+
+
+def resolve_data_file(file_path: Path) -> Path:
+    """Resolve um caminho .json para a variante existente no disco.
+
+    Procura, nesta ordem, o próprio arquivo, file.json.gz e file.json.zst.
+    Caminhos que já apontam para um arquivo comprimido são devolvidos como
+    estão.
+
+    Args:
+        file_path: Caminho do arquivo (ex: geojson/geojs-35-mun.json)
+
+    Returns:
+        Caminho existente, ou o próprio file_path se nenhuma variante existir
+    """
+    if is_compressed(file_path) or file_path.exists():
+        return file_path
+    for suffix in COMPRESSED_SUFFIXES:
+        candidate = file_path.with_name(file_path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return file_path
+
+
+def open_data_file(file_path: Path) -> IO[bytes]:
+    """Abre um arquivo de dados para leitura binária, descomprimindo em streaming.
+
+    Args:
+        file_path: Caminho .json, .json.gz ou .json.zst
+
+    Returns:
+        Stream binário com o conteúdo descomprimido
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        ImportError: Se o arquivo for .zst e zstandard não estiver instalado
+    """
+    if file_path.suffix == ".gz":
+        return cast(IO[bytes], gzip.open(file_path, "rb"))
+    if file_path.suffix == ".zst":
+        zstandard = _require_zstandard()
+        raw = file_path.open("rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return cast(IO[bytes], reader)
+    return file_path.open("rb")
+
+
+def content_size(file_path: Path) -> int | None:
+    """Tamanho do conteúdo descomprimido, lido só dos metadados do arquivo.
+
+    .json usa o tamanho em disco; .json.gz, o campo ISIZE do rodapé (tamanho
+    módulo 2^32); .json.zst, o tamanho gravado no cabeçalho do frame.
+
+    Args:
+        file_path: Caminho .json, .json.gz ou .json.zst (já resolvido)
+
+    Returns:
+        Tamanho em bytes, ou None se o arquivo não o registrar (zstd sem
+        content size ou sem zstandard instalado)
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+    """
+    if file_path.suffix == ".gz":
+        with file_path.open("rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+    if file_path.suffix == ".zst":
+        with file_path.open("rb") as f:
+            header = f.read(18)
+        try:
+            size = _require_zstandard().frame_content_size(header)
+        except (ImportError, ValueError):
+            return None
+        return size if size >= 0 else None
+    return file_path.stat().st_size
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    """Comprime bytes com a codificação pedida.
+
+    Args:
+        data: Conteúdo original
+        encoding: "gzip" ou "zstd"
+
+    Returns:
+        Conteúdo comprimido
+
+    Raises:
+        ValueError: Se a codificação não for suportada
+    """
+    if encoding == "gzip":
+        # mtime=0: a mesma entrada gera sempre os mesmos bytes
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "zstd":
+        compressor = _require_zstandard().ZstdCompressor(level=ZSTD_LEVEL)
+        return cast(bytes, compressor.compress(data))
+    raise ValueError(f"Codificação inválida: {encoding}. Use gzip ou zstd")
+
+
+def validate_encoding(encoding: str) -> str:
+    """Normaliza e valida a codificação pedida em uma tool.
+
+    Raises:
+        ValueError: Se a codificação não for suportada
+    """
+    normalized = encoding.strip().lower()
+    if normalized not in RESPONSE_ENCODINGS:
+        raise ValueError(
+            f"Codificação inválida: {encoding}. Opções: {', '.join(RESPONSE_ENCODINGS)}"
+        )
+    return normalized
+
+
+class CompressedBodyCache:
+    """Cache LRU de corpos JSON comprimidos, por chave, assinatura e codificação."""
+
+    def __init__(self, max_entries: int | None = None):
+        if max_entries is None:
+            max_entries = int(env_number(ENV_BODY_CACHE_SIZE, DEFAULT_BODY_CACHE_SIZE))
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: str,
+        signature: Any,
+        encoding: str,
+        build: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Retorna o corpo comprimido, gerando-o se ausente ou desatualizado.
+
+        Args:
+            key: Identificador da resposta (ex: "region:Sul")
+            signature: Valor que muda quando os dados mudam (ex: tamanhos e mtimes)
+            encoding: "gzip" ou "zstd"
+            build: Função que gera a resposta sem compressão
+
+        Returns:
+            Dicionário com encoding, content_type, size_bytes,
+            uncompressed_bytes e data_base64
+        """
+        cache_key = (key, encoding)
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            if cached is not None and cached[0] == signature:
+                self._entries.move_to_end(cache_key)
+                record_cache_lookup("compressed_bodies", True)
+                return cached[1]
+
+        record_cache_lookup("compressed_bodies", False)
+        raw = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        body = compress_bytes(raw, encoding)
+        payload = {
+            "encoding": encoding,
+            "content_type": GEOJSON_CONTENT_TYPE,
+            "size_bytes": len(body),
+            "uncompressed_bytes": len(raw),
+            "data_base64": base64.b64encode(body).decode("ascii"),
+        }
+        registry.inc("compressed_bytes_saved_total", len(raw) - len(body), encoding=encoding)
+
+        with self._lock:
+            self._entries[cache_key] = (signature, payload)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        """Remove todos os corpos em cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache global das respostas comprimidas
+body_cache = CompressedBodyCache()
+
+
+def compress_data_files(
+    data_root: Path, encoding: str = "gzip", remove_original: bool = False
+) -> dict[str, tuple[int, int]]:
+    """Gera as versões comprimidas dos arquivos geojs-*.json.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        encoding: "gzip" ou "zstd"
+        remove_original: Se True, remove o .json após gravar a versão comprimida
+
+    Returns:
+        Dicionário nome do arquivo -> (bytes originais, bytes comprimidos)
+    """
+    suffix = ENCODING_SUFFIXES.get(encoding)
+    if suffix is None:
+        raise ValueError(f"Codificação inválida: {encoding}. Use gzip ou zstd")
+
+    results = {}
+    for file_path in sorted((data_root / GEOJSON_DIRECTORY).glob("geojs-*-mun.json")):
+        raw = file_path.read_bytes()
+        target = file_path.with_name(file_path.name + suffix)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(compress_bytes(raw, encoding))
+        tmp_path.replace(target)
+        results[file_path.name] = (len(raw), target.stat().st_size)
+        if remove_original:
+            file_path.unlink()
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Comprime os arquivos GeoJSON de dados")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--encoding", choices=sorted(ENCODING_SUFFIXES), default="gzip")
+    parser.add_argument(
+        "--remove-original", action="store_true", help="Remove os .json após comprimir"
+    )
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    results = compress_data_files(data_root, args.encoding, args.remove_original)
+
+    total_raw = sum(raw for raw, _ in results.values())
+    total_compressed = sum(compressed for _, compressed in results.values())
+    for name, (raw, compressed) in results.items():
+        print(f"{name}: {raw / 1e6:.1f} MB -> {compressed / 1e6:.1f} MB")
+    if total_raw:
+        print(
+            f"Total: {total_raw / 1e6:.1f} MB -> {total_compressed / 1e6:.1f} MB "
+            f"({total_compressed / total_raw:.0%})"
+        )
+    return 0
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "RESPONSE_ENCODINGS",
+    "is_compressed",
+    "resolve_data_file",
+    "open_data_file",
+    "content_size",
+    "compress_bytes",
+    "validate_encoding",
+    "CompressedBodyCache",
+    "body_cache",
+    "compress_data_files",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
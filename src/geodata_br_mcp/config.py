@@ -5,6 +5,8 @@ Este módulo contém todos os mapeamentos de códigos IBGE para estados brasilei
 organizados por região e com informações completas.
 """
 
+import os
+
 # Mapeamento completo de códigos IBGE para estados brasileiros
 # Formato: código IBGE -> {uf, nome completo, região}
 IBGE_TO_STATE: dict[str, dict[str, str]] = {
@@ -44,6 +46,9 @@ IBGE_TO_STATE: dict[str, dict[str, str]] = {
     "100": {"uf": "BR", "name": "Brasil", "region": "Brasil"},
 }
 
+# Códigos IBGE dos 27 estados (sem o arquivo nacional "100")
+STATE_CODES: list[str] = sorted(code for code in IBGE_TO_STATE if code != "100")
+
 # Mapeamento reverso: UF -> código IBGE
 # Exemplo: "SP" -> "35", "RJ" -> "33"
 STATE_TO_IBGE: dict[str, str] = {v["uf"]: k for k, v in IBGE_TO_STATE.items()}
@@ -73,8 +78,31 @@ MCP_SERVER_DESCRIPTION = (
     "Servidor MCP para acesso a dados geográficos do Brasil (GeoJSON de municípios por estado)"
 )
 
+# Diretório de cache para dados derivados (contornos, índices)
+# Relativo a GEODATA_BR_PATH, a menos que GEODATA_BR_CACHE_PATH seja definido
+CACHE_DIRECTORY = ".geodata-cache"
+
 # Variáveis de ambiente
 ENV_DATA_PATH = "GEODATA_BR_PATH"
+ENV_CACHE_PATH = "GEODATA_BR_CACHE_PATH"
+ENV_BACKEND = "GEODATA_BR_BACKEND"
+
+# Backends de carregamento dos municípios (GEODATA_BR_BACKEND)
+# - geojson: arquivos geojs-XX-mun.json (padrão)
+# - columnar: arquivo Parquet/Arrow gerado por `python -m src.geodata_br_mcp.columnar`
+# - sqlite: banco SQLite com índices e R*Tree (`python -m src.geodata_br_mcp.database`)
+# - compact: arquivos geojs-XX-mun.json em colunas e buffer de coordenadas (model.py)
+BACKENDS = ("geojson", "columnar", "sqlite", "compact")
+DEFAULT_BACKEND = "geojson"
+
+# Modos de geometria das tools que retornam features (include_geometry)
+# - none: apenas as propriedades
+# - bbox: propriedades + bbox da feature (sem geometria)
+# - centroid: geometria Point no centroide
+# - simplified: geometria simplificada (Douglas-Peucker, ~500 m)
+# - full: geometria original (padrão)
+GEOMETRY_MODES = ("none", "bbox", "centroid", "simplified", "full")
+DEFAULT_GEOMETRY_MODE = "full"
 
 
 # Validação básica
@@ -176,6 +204,22 @@ def get_filename_for_state(uf_or_code: str) -> str:
     return GEOJSON_FILENAME_PATTERN.format(code=code)
 
 
+def env_number(name: str, default: float) -> float:
+    """Lê um número de uma variável de ambiente (valores inválidos usam o padrão).
+
+    Args:
+        name: Nome da variável de ambiente
+        default: Valor usado se a variável estiver ausente ou inválida
+
+    Returns:
+        Valor lido ou o padrão
+    """
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
 # Informações úteis para debug
 def get_all_states() -> list[dict[str, str]]:
     """Retorna informações de todos os estados.
@@ -199,20 +243,29 @@ def get_total_states() -> int:
 __all__ = [
     "IBGE_TO_STATE",
     "STATE_TO_IBGE",
+    "STATE_CODES",
     "STATES_BY_REGION",
     "REGION_TO_IBGE_CODES",
     "GEOJSON_FILENAME_PATTERN",
     "GEOJSON_DIRECTORY",
+    "CACHE_DIRECTORY",
     "MCP_SERVER_NAME",
     "MCP_SERVER_VERSION",
     "MCP_SERVER_DESCRIPTION",
     "ENV_DATA_PATH",
+    "ENV_CACHE_PATH",
+    "ENV_BACKEND",
+    "BACKENDS",
+    "DEFAULT_BACKEND",
+    "GEOMETRY_MODES",
+    "DEFAULT_GEOMETRY_MODE",
     "validate_uf",
     "validate_ibge_code",
     "get_state_code",
     "get_state_info",
     "get_states_by_region",
     "get_filename_for_state",
+    "env_number",
     "get_all_states",
     "get_total_states",
 ]
@@ -0,0 +1,544 @@
+"""
+Banco SQLite local dos municípios para o servidor MCP Geodata-BR.
+
+Alternativa ao carregamento dos arquivos JSON inteiros em memória: o diretório
+geojson/ é ingerido uma vez em um banco SQLite com
+
+- municipalities: código IBGE, nome, nome normalizado (indexados), UF, ordem
+  no arquivo original, propriedades (JSON) e geometria (WKB);
+- municipality_bbox: tabela virtual R*Tree com o bbox de cada município;
+- sources: tamanho e mtime de cada arquivo ingerido (ingestão incremental).
+
+As consultas usam um pool de conexões somente leitura; o banco fica em modo
+WAL e pode ser compartilhado por vários processos do servidor. Com
+GEODATA_BR_BACKEND=sqlite as tools consultam o banco em vez de carregar os
+arquivos, então o servidor inicia sem ler os dados e mantém pouca memória.
+
+Uso (ingestão ou atualização do banco):
+    python -m src.geodata_br_mcp.database [--data-path DIR] [--database arquivo.sqlite] [--workers N]
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .columnar import decode_wkb, encode_wkb
+from .compression import open_data_file, resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+    env_number,
+)
+from .parallel import find_state_files, imap_states, resolve_workers
+from .utils import get_feature_bounds, normalize_text
+
+logger = logging.getLogger("geodata-br-mcp")
+
+# Variáveis de ambiente: caminho do banco e tamanho do pool de conexões
+ENV_DATABASE_PATH = "GEODATA_BR_DATABASE_PATH"
+ENV_POOL_SIZE = "GEODATA_BR_DB_POOL_SIZE"
+DEFAULT_POOL_SIZE = 4
+
+# Nome padrão do banco dentro do diretório de cache
+DATABASE_FILENAME = "municipalities.sqlite"
+
+# Versão do esquema (bancos de versões diferentes são recriados)
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    state_code TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    feature_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS municipalities (
+    pk INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    state_code TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_normalized TEXT NOT NULL,
+    properties TEXT NOT NULL,
+    geometry BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_municipalities_id ON municipalities (id);
+CREATE INDEX IF NOT EXISTS idx_municipalities_state ON municipalities (state_code, position);
+CREATE INDEX IF NOT EXISTS idx_municipalities_name ON municipalities (name_normalized);
+CREATE VIRTUAL TABLE IF NOT EXISTS municipality_bbox USING rtree (
+    pk, min_lon, max_lon, min_lat, max_lat
+);
+"""
+
+
+def get_database_path(cache_dir: Path) -> Path:
+    """Retorna o caminho do banco SQLite.
+
+    Args:
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        GEODATA_BR_DATABASE_PATH ou municipalities.sqlite dentro do cache
+    """
+    configured = os.environ.get(ENV_DATABASE_PATH)
+    if configured:
+        return Path(configured).expanduser()
+    return cache_dir / DATABASE_FILENAME
+
+
+# ---------------------------------------------------------------------------
+# Ingestão
+# ---------------------------------------------------------------------------
+
+
+def _connect_writer(db_path: Path) -> sqlite3.Connection:
+    """Abre uma conexão de escrita, criando o esquema se necessário."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    row = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    except sqlite3.OperationalError:
+        # Banco novo: a tabela meta ainda não existe
+        pass
+
+    if row is not None and int(row[0]) != SCHEMA_VERSION:
+        for table in ("municipality_bbox", "municipalities", "sources", "meta"):
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+
+    conn.executescript(_SCHEMA)
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+    return conn
+
+
+def _delete_state(conn: sqlite3.Connection, code: str):
+    """Remove os municípios de um estado (tabela principal e R*Tree)."""
+    conn.execute(
+        "DELETE FROM municipality_bbox WHERE pk IN "
+        "(SELECT pk FROM municipalities WHERE state_code = ?)",
+        (code,),
+    )
+    conn.execute("DELETE FROM municipalities WHERE state_code = ?", (code,))
+    conn.execute("DELETE FROM sources WHERE state_code = ?", (code,))
+
+
+def encode_state_rows(file_path: str, code: str) -> list[tuple[Any, ...]]:
+    """Lê um arquivo de estado e prepara as linhas do banco (executado no pool).
+
+    O parse, a normalização dos nomes e a codificação WKB ficam no processo
+    filho; só as tuplas (strings, WKB e bbox) voltam ao processo que grava.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        code: Código IBGE do estado
+
+    Returns:
+        Uma tupla por município: (id, nome, nome normalizado, propriedades em
+        JSON, geometria WKB, bbox ou None)
+    """
+    with open_data_file(resolve_data_file(Path(file_path))) as f:
+        data = json.load(f)
+
+    rows = []
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        name = props.get("name", "")
+        geometry = feature.get("geometry")
+        rows.append(
+            (
+                str(props.get("id", "")),
+                name,
+                normalize_text(name),
+                json.dumps(props, ensure_ascii=False),
+                encode_wkb(geometry) if geometry else None,
+                get_feature_bounds(feature),
+            )
+        )
+    return rows
+
+
+def _ingest_state(
+    conn: sqlite3.Connection,
+    file_name: str,
+    code: str,
+    stat: os.stat_result,
+    rows: list[tuple[Any, ...]],
+):
+    """Insere os municípios de um arquivo de estado (linhas de encode_state_rows)."""
+    for position, (ibge_id, name, normalized, properties, wkb, bounds) in enumerate(rows):
+        cursor = conn.execute(
+            "INSERT INTO municipalities "
+            "(id, state_code, position, name, name_normalized, properties, geometry) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (ibge_id, code, position, name, normalized, properties, wkb),
+        )
+        if bounds is not None:
+            min_lon, min_lat, max_lon, max_lat = bounds
+            conn.execute(
+                "INSERT INTO municipality_bbox VALUES (?, ?, ?, ?, ?)",
+                (cursor.lastrowid, min_lon, max_lon, min_lat, max_lat),
+            )
+
+    conn.execute(
+        "INSERT INTO sources (state_code, file_name, size, mtime_ns, feature_count) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (code, file_name, stat.st_size, stat.st_mtime_ns, len(rows)),
+    )
+
+
+def build_database(data_root: Path, db_path: Path, workers: int | None = None) -> dict[str, int]:
+    """Ingere (ou atualiza) os arquivos de estado no banco SQLite.
+
+    A ingestão é incremental: apenas os estados cujo arquivo mudou (tamanho ou
+    mtime) são reinseridos, e estados sem arquivo são removidos. Os arquivos
+    alterados são lidos e codificados em paralelo (parallel.py); a gravação
+    fica neste processo, com uma transação por estado, e processos
+    concorrentes esperam o lock de escrita.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        db_path: Caminho do banco SQLite
+        workers: Número de processos de leitura (padrão: número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> número de municípios no banco
+    """
+    conn = _connect_writer(db_path)
+    try:
+        files = find_state_files(data_root)
+        present = set(files)
+        stats = {code: resolve_data_file(path).stat() for code, path in files.items()}
+        stored = {
+            code: (size, mtime_ns)
+            for code, size, mtime_ns in conn.execute(
+                "SELECT state_code, size, mtime_ns FROM sources"
+            ).fetchall()
+        }
+        changed = {
+            code: path
+            for code, path in files.items()
+            if stored.get(code) != (stats[code].st_size, stats[code].st_mtime_ns)
+        }
+
+        workers = resolve_workers(workers, len(changed))
+        for code, rows in imap_states(
+            encode_state_rows, changed, workers=workers, window=2 * workers
+        ):
+            stat = stats[code]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Outro processo pode ter ingerido o estado enquanto este lia o arquivo
+                row = conn.execute(
+                    "SELECT size, mtime_ns FROM sources WHERE state_code = ?", (code,)
+                ).fetchone()
+                if row != (stat.st_size, stat.st_mtime_ns):
+                    _delete_state(conn, code)
+                    _ingest_state(conn, resolve_data_file(files[code]).name, code, stat, rows)
+                    logger.info(f"Banco SQLite: estado {code} ingerido")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        stale = [
+            code
+            for (code,) in conn.execute("SELECT state_code FROM sources").fetchall()
+            if code not in present
+        ]
+        if stale:
+            conn.execute("BEGIN IMMEDIATE")
+            for code in stale:
+                _delete_state(conn, code)
+            conn.execute("COMMIT")
+
+        return dict(
+            conn.execute(
+                "SELECT state_code, feature_count FROM sources ORDER BY state_code"
+            ).fetchall()
+        )
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+
+class ConnectionPool:
+    """Pool de conexões SQLite somente leitura, compartilhado entre threads."""
+
+    def __init__(self, db_path: Path, size: int | None = None):
+        if size is None:
+            size = int(env_number(ENV_POOL_SIZE, DEFAULT_POOL_SIZE))
+        self.db_path = db_path
+        self.size = max(1, size)
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Empresta uma conexão do pool (cria até `size` conexões; depois espera).
+
+        Yields:
+            Conexão somente leitura
+        """
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    conn = self._open()
+        if conn is None:
+            conn = self._idle.get()
+
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        """Fecha as conexões ociosas (as emprestadas são fechadas ao voltar)."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _row_to_feature(properties: str, geometry: bytes | None) -> dict[str, Any]:
+    return {
+        "type": "Feature",
+        "properties": json.loads(properties),
+        "geometry": decode_wkb(geometry) if geometry is not None else None,
+    }
+
+
+class MunicipalityStore:
+    """Consultas aos municípios no banco SQLite."""
+
+    def __init__(self, db_path: Path, pool_size: int | None = None):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, pool_size)
+
+    def close(self):
+        """Fecha as conexões do pool."""
+        self.pool.close()
+
+    def has_state(self, code: str) -> bool:
+        """Indica se o estado foi ingerido no banco."""
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT 1 FROM sources WHERE state_code = ?", (code,)).fetchone()
+        return row is not None
+
+    def count(self, code: str | None = None) -> int:
+        """Retorna o número de municípios de um estado (ou de todos, se None)."""
+        with self.pool.connection() as conn:
+            if code is None:
+                (total,) = conn.execute("SELECT COUNT(*) FROM municipalities").fetchone()
+            else:
+                (total,) = conn.execute(
+                    "SELECT COUNT(*) FROM municipalities WHERE state_code = ?", (code,)
+                ).fetchone()
+        return int(total)
+
+    def state_collection(self, code: str) -> dict[str, Any]:
+        """Retorna a FeatureCollection de um estado, na ordem do arquivo original.
+
+        Args:
+            code: Código IBGE do estado, ou "100" para o Brasil inteiro
+
+        Returns:
+            GeoJSON FeatureCollection
+        """
+        with self.pool.connection() as conn:
+            if code == "100":
+                rows = conn.execute(
+                    "SELECT properties, geometry FROM municipalities ORDER BY state_code, position"
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT properties, geometry FROM municipalities "
+                    "WHERE state_code = ? ORDER BY position",
+                    (code,),
+                ).fetchall()
+        return {
+            "type": "FeatureCollection",
+            "features": [_row_to_feature(props, geom) for props, geom in rows],
+        }
+
+    def list_properties(self, code: str) -> list[dict[str, Any]]:
+        """Retorna as propriedades dos municípios de um estado (sem geometria)."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT properties FROM municipalities WHERE state_code = ? ORDER BY position",
+                (code,),
+            ).fetchall()
+        return [json.loads(props) for (props,) in rows]
+
+    def get_by_id(self, ibge_code: str) -> dict[str, Any] | None:
+        """Retorna a feature de um município pelo código IBGE (ou None)."""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT properties, geometry FROM municipalities "
+                "WHERE id = ? ORDER BY state_code, position LIMIT 1",
+                (ibge_code,),
+            ).fetchone()
+        return _row_to_feature(*row) if row else None
+
+    def find_by_name(self, code: str, name: str) -> dict[str, Any] | None:
+        """Retorna o primeiro município do estado cujo nome casa com a busca.
+
+        Mesma regra de search_features_by_name: nomes normalizados, um contido
+        no outro.
+
+        Args:
+            code: Código IBGE do estado
+            name: Nome (ou parte do nome) do município
+
+        Returns:
+            Feature GeoJSON ou None
+        """
+        normalized = normalize_text(name)
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT properties, geometry FROM municipalities "
+                "WHERE state_code = ? "
+                "AND (instr(name_normalized, ?) > 0 OR instr(?, name_normalized) > 0) "
+                "ORDER BY position LIMIT 1",
+                (code, normalized, normalized),
+            ).fetchone()
+        return _row_to_feature(*row) if row else None
+
+    def query_bbox(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> list[str]:
+        """Retorna os códigos IBGE cujo bbox intercepta a janela (pela R*Tree).
+
+        Args:
+            min_lon: Longitude mínima
+            min_lat: Latitude mínima
+            max_lon: Longitude máxima
+            max_lat: Latitude máxima
+
+        Returns:
+            Códigos IBGE, na ordem de estado e posição no arquivo
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT m.id FROM municipality_bbox b JOIN municipalities m ON m.pk = b.pk "
+                "WHERE b.max_lon >= ? AND b.min_lon <= ? AND b.max_lat >= ? AND b.min_lat <= ? "
+                "ORDER BY m.state_code, m.position",
+                (min_lon, max_lon, min_lat, max_lat),
+            ).fetchall()
+        return [fid for (fid,) in rows]
+
+
+# Bancos abertos (chave: caminho do arquivo)
+_stores: dict[str, MunicipalityStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(data_root: Path, db_path: Path) -> MunicipalityStore:
+    """Retorna o banco de um diretório de dados, ingerindo-o na primeira chamada.
+
+    A ingestão incremental roda uma vez por processo; se o banco já está em
+    dia, ela só compara tamanho e mtime dos arquivos.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        db_path: Caminho do banco SQLite
+
+    Returns:
+        Banco pronto para consultas
+    """
+    key = str(db_path)
+    store = _stores.get(key)
+    if store is not None:
+        return store
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            counts = build_database(data_root, db_path)
+            logger.info(f"Banco SQLite {db_path}: {sum(counts.values())} municípios")
+            store = _stores[key] = MunicipalityStore(db_path)
+    return store
+
+
+def close_stores():
+    """Fecha e descarta todos os bancos abertos."""
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Ingere os arquivos GeoJSON no banco SQLite")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument("--database", help="Arquivo do banco (padrão: no diretório de cache)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+    db_path = Path(args.database) if args.database else get_database_path(cache_dir)
+
+    counts = build_database(data_root, db_path, args.workers)
+    for code, feature_count in counts.items():
+        print(f"{IBGE_TO_STATE[code]['uf']}: {feature_count} municípios")
+    print(f"Banco: {db_path}")
+    return 0
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "SCHEMA_VERSION",
+    "get_database_path",
+    "build_database",
+    "ConnectionPool",
+    "MunicipalityStore",
+    "get_store",
+    "close_stores",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+"""
+Dissolução de municípios em contornos de estado para o servidor MCP Geodata-BR.
+
+Municípios vizinhos compartilham exatamente os mesmos vértices na fronteira
+comum. Em vez de uma união geral de polígonos, cada aresta é indexada por um
+hash não orientado: arestas que aparecem duas vezes são internas e se
+cancelam, e as que sobram formam o contorno externo, que é então costurado
+de volta em anéis. O resultado é persistido em um diretório de cache e
+invalidado quando o arquivo de origem muda.
+
+Uso (pré-geração de todos os contornos, um estado por processo):
+    python -m src.geodata_br_mcp.dissolve [--data-path DIR] [--cache-path DIR] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, cast
+
+from .compression import resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+)
+from .geometry import iter_polygons, ring_signed_area, split_polygon_rings
+from .parallel import find_state_files, map_states
+from .utils import load_geojson_with_cache
+
+# Casas decimais usadas para identificar vértices iguais (~1 cm)
+COORDINATE_PRECISION = 7
+
+# Subdiretório do cache com os contornos
+OUTLINES_SUBDIRECTORY = "outlines"
+
+Point = tuple[float, float]
+
+# Cache em memória dos contornos (chave: caminho do arquivo de origem)
+_outline_cache: dict[str, dict[str, Any]] = {}
+
+
+def _edge_key(a: Point, b: Point) -> tuple[Point, Point]:
+    """Retorna a chave não orientada de uma aresta."""
+    return (a, b) if a <= b else (b, a)
+
+
+def _boundary_edges(
+    rings: list[list[list[float]]],
+) -> dict[tuple[Point, Point], tuple[Point, Point]]:
+    """Retorna as arestas que aparecem um número ímpar de vezes.
+
+    Args:
+        rings: Anéis de todas as geometrias a dissolver
+
+    Returns:
+        Dicionário chave não orientada -> aresta orientada original
+    """
+    edges: dict[tuple[Point, Point], tuple[Point, Point]] = {}
+    for ring in rings:
+        points = [
+            (round(p[0], COORDINATE_PRECISION), round(p[1], COORDINATE_PRECISION)) for p in ring
+        ]
+        for i in range(len(points) - 1):
+            a, b = points[i], points[i + 1]
+            if a == b:
+                continue
+            key = _edge_key(a, b)
+            # Cancelamento: a segunda ocorrência remove a primeira
+            if key in edges:
+                del edges[key]
+            else:
+                edges[key] = (a, b)
+    return edges
+
+
+def _stitch_rings(edges: dict[tuple[Point, Point], tuple[Point, Point]]) -> list[list[list[float]]]:
+    """Costura as arestas de contorno em anéis fechados.
+
+    Args:
+        edges: Arestas de contorno (chave não orientada -> aresta)
+
+    Returns:
+        Lista de anéis fechados
+    """
+    adjacency: dict[Point, list[Point]] = {}
+    for a, b in edges.values():
+        adjacency.setdefault(a, []).append(b)
+        adjacency.setdefault(b, []).append(a)
+
+    used: set[tuple[Point, Point]] = set()
+    rings: list[list[list[float]]] = []
+
+    for start_a, start_b in edges.values():
+        if _edge_key(start_a, start_b) in used:
+            continue
+
+        used.add(_edge_key(start_a, start_b))
+        ring = [start_a, start_b]
+        current = start_b
+
+        while current != start_a:
+            next_point = None
+            for candidate in adjacency[current]:
+                key = _edge_key(current, candidate)
+                if key not in used:
+                    used.add(key)
+                    next_point = candidate
+                    break
+            if next_point is None:
+                # Contorno aberto (dados com lacunas): descarta o trecho
+                break
+            ring.append(next_point)
+            current = next_point
+
+        if current == start_a and len(ring) >= 4:
+            rings.append([[x, y] for x, y in ring])
+
+    return rings
+
+
+def dissolve_geometries(geometries: list[dict[str, Any]]) -> dict[str, Any]:
+    """Dissolve geometrias adjacentes em uma única geometria de contorno.
+
+    Args:
+        geometries: Geometrias GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Geometria MultiPolygon com exteriores anti-horários e buracos horários
+    """
+    rings = [
+        ring for geometry in geometries for polygon in iter_polygons(geometry) for ring in polygon
+    ]
+    stitched = _stitch_rings(_boundary_edges(rings))
+
+    polygons = []
+    for polygon in split_polygon_rings(stitched):
+        oriented = []
+        for index, ring in enumerate(polygon):
+            # RFC 7946: exterior anti-horário, buracos horários
+            is_ccw = ring_signed_area(ring) > 0
+            if is_ccw != (index == 0):
+                ring = ring[::-1]
+            oriented.append(ring)
+        polygons.append(oriented)
+
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+def dissolve_features(features: list[dict[str, Any]]) -> dict[str, Any]:
+    """Dissolve as features de um estado em um único contorno.
+
+    Args:
+        features: Lista de features GeoJSON
+
+    Returns:
+        Geometria MultiPolygon do contorno
+    """
+    return dissolve_geometries([feature.get("geometry") or {} for feature in features])
+
+
+def _source_signature(file_path: Path) -> dict[str, int]:
+    """Retorna tamanho e mtime do arquivo de origem (para invalidação)."""
+    stat = resolve_data_file(file_path).stat()
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+def get_outline_path(file_path: Path, cache_dir: Path) -> Path:
+    """Retorna o caminho do contorno em cache para um arquivo GeoJSON.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Caminho do arquivo outline-XX.json
+    """
+    code = file_path.name.split("-")[1]
+    return cache_dir / OUTLINES_SUBDIRECTORY / f"outline-{code}.json"
+
+
+def _store_outline(outline_path: Path, payload: dict[str, Any]):
+    """Grava um contorno no cache (escrita atômica).
+
+    O arquivo temporário é único por processo e thread, já que o mesmo
+    contorno pode ser gerado ao mesmo tempo por chamadas concorrentes. Erros de
+    escrita são ignorados: o contorno continua válido em memória.
+    """
+    tmp_path = outline_path.with_name(
+        f".{outline_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        outline_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        tmp_path.replace(outline_path)
+    except OSError:
+        # Cache somente leitura ou disco cheio
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def load_outline_with_cache(file_path: Path, cache_dir: Path) -> dict[str, Any]:
+    """Retorna o contorno dissolvido de um arquivo GeoJSON.
+
+    Procura primeiro em memória, depois no diretório de cache; se o cache
+    estiver ausente ou desatualizado, dissolve o arquivo e grava o resultado.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Geometria MultiPolygon do contorno
+    """
+    file_str = str(file_path)
+    signature = _source_signature(file_path)
+
+    cached = _outline_cache.get(file_str)
+    if cached is not None and cached["signature"] == signature:
+        return cast(dict[str, Any], cached["geometry"])
+
+    outline_path = get_outline_path(file_path, cache_dir)
+    geometry: dict[str, Any] | None = None
+
+    if outline_path.exists():
+        try:
+            with outline_path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if {k: stored.get(k) for k in signature} == signature:
+                geometry = stored["geometry"]
+        except (OSError, ValueError, KeyError):
+            geometry = None
+
+    if geometry is None:
+        geojson_data = load_geojson_with_cache(file_path)
+        geometry = dissolve_features(geojson_data.get("features", []))
+
+        _store_outline(outline_path, {**signature, "geometry": geometry})
+
+    _outline_cache[file_str] = {"signature": signature, "geometry": geometry}
+    return geometry
+
+
+def load_region_outline_with_cache(
+    region: str, file_paths: list[Path], cache_dir: Path
+) -> dict[str, Any]:
+    """Retorna o contorno dissolvido de uma região (união dos contornos estaduais).
+
+    Estados vizinhos também compartilham vértices na divisa, então o mesmo
+    cancelamento de arestas é aplicado sobre os contornos estaduais.
+
+    Args:
+        region: Nome da região (usado como chave do cache)
+        file_paths: Arquivos geojs-XX-mun.json dos estados da região
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Geometria MultiPolygon do contorno da região
+    """
+    sources = {path.name: _source_signature(path) for path in file_paths}
+    cache_key = f"region:{region}"
+
+    cached = _outline_cache.get(cache_key)
+    if cached is not None and cached["signature"] == sources:
+        return cast(dict[str, Any], cached["geometry"])
+
+    slug = "".join(char if char.isalnum() else "-" for char in region.lower())
+    outline_path = cache_dir / OUTLINES_SUBDIRECTORY / f"region-{slug}.json"
+    geometry: dict[str, Any] | None = None
+
+    if outline_path.exists():
+        try:
+            with outline_path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("sources") == sources:
+                geometry = stored["geometry"]
+        except (OSError, ValueError, KeyError):
+            geometry = None
+
+    if geometry is None:
+        state_outlines = [load_outline_with_cache(path, cache_dir) for path in file_paths]
+        geometry = dissolve_geometries(state_outlines)
+
+        _store_outline(outline_path, {"sources": sources, "geometry": geometry})
+
+    _outline_cache[cache_key] = {"signature": sources, "geometry": geometry}
+    return geometry
+
+
+def clear_outline_cache():
+    """Limpa o cache em memória de contornos."""
+    _outline_cache.clear()
+
+
+def _outline_state(file_path: str, code: str, cache_dir: str) -> int:
+    """Gera ou valida o contorno de um estado (executado em um processo do pool)."""
+    return len(load_outline_with_cache(Path(file_path), Path(cache_dir))["coordinates"])
+
+
+def build_outlines(data_root: Path, cache_dir: Path, workers: int | None = None) -> dict[str, int]:
+    """Gera (ou valida) os contornos de todos os estados.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        cache_dir: Diretório raiz do cache
+        workers: Número de processos (padrão: número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> número de polígonos do contorno
+    """
+    files = find_state_files(data_root)
+    return map_states(_outline_state, files, str(cache_dir), workers=workers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera os contornos dissolvidos dos estados")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+
+    for code, polygon_count in build_outlines(data_root, cache_dir, args.workers).items():
+        print(f"{IBGE_TO_STATE[code]['uf']}: {polygon_count} polígono(s)")
+    return 0
+
+
+# Exporta as principais funções
+__all__ = [
+    "dissolve_geometries",
+    "dissolve_features",
+    "get_outline_path",
+    "load_outline_with_cache",
+    "load_region_outline_with_cache",
+    "clear_outline_cache",
+    "build_outlines",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,218 @@
+"""
+Índice de offsets de features para o servidor MCP Geodata-BR.
+
+Para cada arquivo geojs-XX-mun.json o índice registra, por código IBGE, os
+offsets em bytes do início e do fim de cada feature no arquivo. Com ele, a
+busca de um único município lê e faz o parse apenas do trecho daquela
+feature, em vez do arquivo inteiro do estado.
+
+O índice é gerado uma vez (um parse completo do arquivo) e persistido no
+cache de índices em disco (index_cache.py), com o checksum do arquivo na
+chave; em memória, é invalidado quando o tamanho ou o mtime do arquivo mudam.
+
+Uso (pré-geração dos índices de todos os estados, um por processo):
+    python -m src.geodata_br_mcp.feature_index [--data-path DIR] [--cache-path DIR] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, cast
+
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+)
+from .index_cache import get_index_cache
+
+# Tipo do índice de offsets no cache de índices
+OFFSETS_INDEX = "offsets"
+
+# Início do array de features e separadores entre features
+_FEATURES_START_RE = re.compile(r'"features"\s*:\s*\[')
+_SEPARATOR_RE = re.compile(r"[\s,]*")
+
+# Cache em memória dos índices (chave: caminho do arquivo de origem)
+_offsets_cache: dict[str, dict[str, Any]] = {}
+
+
+def build_feature_offsets(file_path: Path) -> dict[str, list[int]]:
+    """Varre um arquivo GeoJSON e registra os offsets de cada feature.
+
+    O arquivo é decodificado como latin-1, que mapeia cada byte em exatamente
+    um caractere: assim as posições devolvidas por raw_decode são offsets em
+    bytes. Os nomes ficam ilegíveis nessa decodificação, mas apenas o "id"
+    (ASCII) é usado.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+
+    Returns:
+        Dicionário código IBGE -> [início, fim] em bytes
+    """
+    text = file_path.read_bytes().decode("latin-1")
+    match = _FEATURES_START_RE.search(text)
+    if match is None:
+        return {}
+
+    decoder = json.JSONDecoder()
+    offsets: dict[str, list[int]] = {}
+    pos = match.end()
+    length = len(text)
+
+    while True:
+        separator = _SEPARATOR_RE.match(text, pos)
+        if separator is None:
+            raise ValueError(f"Lista de features malformada em {file_path.name} (byte {pos})")
+        pos = separator.end()
+        if pos >= length or text[pos] == "]":
+            break
+        feature, end = decoder.raw_decode(text, pos)
+        feature_id = (feature.get("properties") or {}).get("id")
+        if feature_id is not None:
+            offsets[str(feature_id)] = [pos, end]
+        pos = end
+
+    return offsets
+
+
+def _source_signature(file_path: Path) -> dict[str, int]:
+    """Retorna tamanho e mtime do arquivo de origem (para invalidação)."""
+    stat = file_path.stat()
+    return {"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns}
+
+
+def get_offsets_path(file_path: Path, cache_dir: Path) -> Path:
+    """Retorna o caminho do índice em cache para um arquivo GeoJSON.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Caminho da entrada no cache de índices (muda com o checksum do arquivo)
+    """
+    return get_index_cache(cache_dir).entry_path(OFFSETS_INDEX, [file_path])
+
+
+def load_feature_offsets(file_path: Path, cache_dir: Path) -> dict[str, list[int]]:
+    """Retorna o índice de offsets de um arquivo GeoJSON.
+
+    Procura primeiro em memória, depois no cache de índices em disco; se o
+    índice estiver ausente ou desatualizado, varre o arquivo e grava o
+    resultado.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Dicionário código IBGE -> [início, fim] em bytes
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+    """
+    file_str = str(file_path)
+    signature = _source_signature(file_path)
+
+    cached = _offsets_cache.get(file_str)
+    if cached is not None and cached["signature"] == signature:
+        return cast(dict[str, list[int]], cached["offsets"])
+
+    offsets = get_index_cache(cache_dir).get_or_build(
+        OFFSETS_INDEX, [file_path], lambda: build_feature_offsets(file_path)
+    )
+
+    _offsets_cache[file_str] = {"signature": signature, "offsets": offsets}
+    return offsets
+
+
+def read_feature(file_path: Path, ibge_code: str, cache_dir: Path) -> dict[str, Any] | None:
+    """Lê uma única feature do arquivo usando o índice de offsets.
+
+    Args:
+        file_path: Caminho do arquivo geojs-XX-mun.json
+        ibge_code: Código IBGE do município
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Feature GeoJSON ou None se o código não estiver no arquivo
+    """
+    span = load_feature_offsets(file_path, cache_dir).get(ibge_code)
+    if span is None:
+        return None
+
+    start, end = span
+    with file_path.open("rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    feature: dict[str, Any] = json.loads(data)
+    return feature
+
+
+def clear_offsets_cache():
+    """Limpa o cache em memória dos índices de offsets."""
+    _offsets_cache.clear()
+
+
+def _index_state(file_path: str, code: str, cache_dir: str) -> int:
+    """Gera ou valida o índice de um estado (executado em um processo do pool)."""
+    return len(load_feature_offsets(Path(file_path), Path(cache_dir)))
+
+
+def build_all_offsets(
+    data_root: Path, cache_dir: Path, workers: int | None = None
+) -> dict[str, int]:
+    """Gera (ou valida) os índices de offsets de todos os estados.
+
+    Só os arquivos .json sem compressão são indexados (os offsets são
+    posições no arquivo).
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        cache_dir: Diretório raiz do cache
+        workers: Número de processos (padrão: número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> número de features indexadas
+    """
+    # Importado aqui: o servidor carrega este módulo na inicialização
+    from .parallel import find_state_files, map_states
+
+    files = find_state_files(data_root, sorted(IBGE_TO_STATE), compressed=False)
+    return map_states(_index_state, files, str(cache_dir), workers=workers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera os índices de offsets das features")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+
+    for code, feature_count in build_all_offsets(data_root, cache_dir, args.workers).items():
+        print(f"{IBGE_TO_STATE[code]['uf']}: {feature_count} features indexadas")
+    return 0
+
+
+# Exporta as principais funções
+__all__ = [
+    "build_feature_offsets",
+    "get_offsets_path",
+    "load_feature_offsets",
+    "read_feature",
+    "clear_offsets_cache",
+    "build_all_offsets",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,507 @@
+"""
+Funções geométricas para o servidor MCP Geodata-BR.
+
+Este módulo contém cálculos sobre as geometrias dos municípios (Polygon e
+MultiPolygon em lon/lat WGS84): centroides, pontos representativos,
+ponto-em-polígono e distâncias de grande círculo. Usa apenas a biblioteca
+padrão, para não adicionar dependências ao servidor.
+"""
+
+import math
+from collections.abc import Iterator
+from typing import Any
+
+# Raio médio da Terra (km), usado nas distâncias de grande círculo
+EARTH_RADIUS_KM = 6371.0088
+
+Ring = list[list[float]]
+Polygon = list[Ring]
+
+
+def _ring_bounds(ring: Ring) -> tuple[float, float, float, float]:
+    """Retorna o bbox (min_lon, min_lat, max_lon, max_lat) de um anel."""
+    lons = [point[0] for point in ring]
+    lats = [point[1] for point in ring]
+    return (min(lons), min(lats), max(lons), max(lats))
+
+
+def split_polygon_rings(rings: list[Ring]) -> list[Polygon]:
+    """Separa os anéis de um Polygon em polígonos independentes.
+
+    Nos arquivos do IBGE, muitos municípios com ilhas vêm como Polygon com
+    vários anéis disjuntos, em vez de MultiPolygon. Cada anel é classificado
+    pela profundidade de aninhamento: profundidade par é exterior, ímpar é
+    buraco do exterior que o contém.
+
+    Args:
+        rings: Anéis de uma geometria Polygon
+
+    Returns:
+        Lista de polígonos (exterior seguido dos seus buracos)
+    """
+    rings = [ring for ring in rings if ring]
+    if len(rings) <= 1:
+        return [rings] if rings else []
+
+    bounds = [_ring_bounds(ring) for ring in rings]
+    parents: list[list[int]] = []
+    for i, ring in enumerate(rings):
+        lon, lat = ring[0][0], ring[0][1]
+        containing = []
+        for j, other in enumerate(rings):
+            if i == j:
+                continue
+            min_lon, min_lat, max_lon, max_lat = bounds[j]
+            if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                continue
+            if point_in_ring(lon, lat, other):
+                containing.append(j)
+        parents.append(containing)
+
+    polygons: dict[int, Polygon] = {}
+    for i, containing in enumerate(parents):
+        if len(containing) % 2 == 0:
+            polygons[i] = [rings[i]]
+
+    for i, containing in enumerate(parents):
+        if len(containing) % 2 == 1:
+            # O exterior imediato é o que contém o buraco com profundidade depth - 1
+            depth = len(containing)
+            owner = next(
+                (j for j in containing if j in polygons and len(parents[j]) == depth - 1),
+                None,
+            )
+            if owner is not None:
+                polygons[owner].append(rings[i])
+
+    return [polygons[i] for i in sorted(polygons)]
+
+
+def iter_polygons(geometry: dict[str, Any]) -> Iterator[Polygon]:
+    """Itera sobre os polígonos de uma geometria Polygon ou MultiPolygon.
+
+    Anéis disjuntos dentro de um Polygon são tratados como polígonos
+    separados (veja split_polygon_rings).
+
+    Args:
+        geometry: Geometria GeoJSON
+
+    Yields:
+        Listas de anéis (o primeiro é o exterior, os demais são buracos)
+    """
+    geom_type = geometry.get("type")
+    coordinates = geometry.get("coordinates") or []
+
+    if geom_type == "Polygon":
+        if len(coordinates) == 1:
+            yield coordinates
+        else:
+            yield from split_polygon_rings(coordinates)
+    elif geom_type == "MultiPolygon":
+        for polygon in coordinates:
+            if len(polygon) == 1:
+                yield polygon
+            elif polygon:
+                yield from split_polygon_rings(polygon)
+
+
+def ring_signed_area(ring: Ring) -> float:
+    """Calcula a área planar com sinal de um anel (fórmula do laço).
+
+    Args:
+        ring: Lista de coordenadas [lon, lat]
+
+    Returns:
+        Área em graus² (positiva se anti-horário)
+    """
+    total = 0.0
+    for i in range(len(ring) - 1):
+        x0, y0 = ring[i][0], ring[i][1]
+        x1, y1 = ring[i + 1][0], ring[i + 1][1]
+        total += x0 * y1 - x1 * y0
+    return total / 2.0
+
+
+def _ring_centroid_terms(ring: Ring) -> tuple[float, float, float]:
+    """Retorna (área com sinal, soma x, soma y) para o centroide de um anel."""
+    area2 = 0.0
+    cx = 0.0
+    cy = 0.0
+    for i in range(len(ring) - 1):
+        x0, y0 = ring[i][0], ring[i][1]
+        x1, y1 = ring[i + 1][0], ring[i + 1][1]
+        cross = x0 * y1 - x1 * y0
+        area2 += cross
+        cx += (x0 + x1) * cross
+        cy += (y0 + y1) * cross
+    return area2 / 2.0, cx, cy
+
+
+def geometry_centroid(geometry: dict[str, Any]) -> tuple[float, float] | None:
+    """Calcula o centroide planar (ponderado por área) de uma geometria.
+
+    Buracos são descontados da área. Para geometrias degeneradas (área
+    zero), retorna a média dos vértices.
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Tupla (lon, lat) ou None se a geometria não tiver coordenadas
+    """
+    total_area = 0.0
+    sum_x = 0.0
+    sum_y = 0.0
+    vertex_x = 0.0
+    vertex_y = 0.0
+    vertex_count = 0
+
+    for polygon in iter_polygons(geometry):
+        for index, ring in enumerate(polygon):
+            if len(ring) < 3:
+                continue
+            area, cx, cy = _ring_centroid_terms(ring)
+            # Exterior soma, buracos subtraem (independente da orientação)
+            sign = 1.0 if index == 0 else -1.0
+            if area < 0:
+                area, cx, cy = -area, -cx, -cy
+            total_area += sign * area
+            sum_x += sign * cx
+            sum_y += sign * cy
+            if index == 0:
+                for point in ring:
+                    vertex_x += point[0]
+                    vertex_y += point[1]
+                vertex_count += len(ring)
+
+    if vertex_count == 0:
+        return None
+
+    if abs(total_area) < 1e-15:
+        return (vertex_x / vertex_count, vertex_y / vertex_count)
+
+    return (sum_x / (6.0 * total_area), sum_y / (6.0 * total_area))
+
+
+def point_in_ring(lon: float, lat: float, ring: Ring) -> bool:
+    """Verifica se um ponto está dentro de um anel (ray casting).
+
+    Args:
+        lon: Longitude do ponto
+        lat: Latitude do ponto
+        ring: Lista de coordenadas [lon, lat]
+
+    Returns:
+        True se o ponto estiver dentro do anel
+    """
+    inside = False
+    count = len(ring)
+    j = count - 1
+    for i in range(count):
+        xi, yi = ring[i][0], ring[i][1]
+        xj, yj = ring[j][0], ring[j][1]
+        if (yi > lat) != (yj > lat):
+            x_cross = (xj - xi) * (lat - yi) / (yj - yi) + xi
+            if lon < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+def point_in_geometry(lon: float, lat: float, geometry: dict[str, Any]) -> bool:
+    """Verifica se um ponto está dentro de uma geometria (considerando buracos).
+
+    Args:
+        lon: Longitude do ponto
+        lat: Latitude do ponto
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        True se o ponto estiver dentro da geometria
+    """
+    for polygon in iter_polygons(geometry):
+        if not point_in_ring(lon, lat, polygon[0]):
+            continue
+        if not any(point_in_ring(lon, lat, hole) for hole in polygon[1:]):
+            return True
+    return False
+
+
+def representative_point(geometry: dict[str, Any]) -> tuple[float, float] | None:
+    """Retorna um ponto garantidamente dentro da geometria.
+
+    Usa o centroide quando ele cai dentro da geometria (caso comum). Caso
+    contrário (municípios em forma de "C", por exemplo), traça uma linha
+    horizontal na latitude do centroide e usa o meio do trecho interno mais
+    largo.
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Tupla (lon, lat) ou None se a geometria não tiver coordenadas
+    """
+    centroid = geometry_centroid(geometry)
+    if centroid is None:
+        return None
+
+    lon, lat = centroid
+    if point_in_geometry(lon, lat, geometry):
+        return centroid
+
+    crossings: list[float] = []
+    first_vertex: tuple[float, float] | None = None
+    for polygon in iter_polygons(geometry):
+        for ring in polygon:
+            if first_vertex is None and ring:
+                first_vertex = (ring[0][0], ring[0][1])
+            for i in range(len(ring) - 1):
+                x0, y0 = ring[i][0], ring[i][1]
+                x1, y1 = ring[i + 1][0], ring[i + 1][1]
+                if (y0 > lat) != (y1 > lat):
+                    crossings.append(x0 + (x1 - x0) * (lat - y0) / (y1 - y0))
+
+    crossings.sort()
+    best: tuple[float, float] | None = None
+    best_width = -1.0
+    for i in range(0, len(crossings) - 1, 2):
+        width = crossings[i + 1] - crossings[i]
+        if width > best_width:
+            best_width = width
+            best = ((crossings[i] + crossings[i + 1]) / 2.0, lat)
+
+    return best if best is not None else first_vertex
+
+
+def ring_geodesic_area_km2(ring: Ring) -> float:
+    """Calcula a área de um anel sobre a esfera (excesso esférico).
+
+    Usa a aproximação de Chamberlain & Duquette, a mesma do turf/d3, com
+    erro desprezível na escala de municípios.
+
+    Args:
+        ring: Lista de coordenadas [lon, lat]
+
+    Returns:
+        Área em km² (sempre positiva)
+    """
+    count = len(ring)
+    if count < 4:
+        return 0.0
+
+    total = 0.0
+    lon0 = math.radians(ring[0][0])
+    sin0 = math.sin(math.radians(ring[0][1]))
+    for i in range(1, count):
+        lon1 = math.radians(ring[i][0])
+        sin1 = math.sin(math.radians(ring[i][1]))
+        total += (lon1 - lon0) * (2.0 + sin0 + sin1)
+        lon0, sin0 = lon1, sin1
+
+    return abs(total) * EARTH_RADIUS_KM * EARTH_RADIUS_KM / 2.0
+
+
+def ring_length_km(ring: Ring) -> float:
+    """Calcula o comprimento de um anel pela soma das distâncias haversine.
+
+    Args:
+        ring: Lista de coordenadas [lon, lat]
+
+    Returns:
+        Comprimento em km
+    """
+    total = 0.0
+    for i in range(len(ring) - 1):
+        total += haversine_km(ring[i][1], ring[i][0], ring[i + 1][1], ring[i + 1][0])
+    return total
+
+
+def geometry_area_km2(geometry: dict[str, Any]) -> float:
+    """Calcula a área geodésica de uma geometria (buracos descontados).
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Área em km²
+    """
+    total = 0.0
+    for polygon in iter_polygons(geometry):
+        total += ring_geodesic_area_km2(polygon[0])
+        for hole in polygon[1:]:
+            total -= ring_geodesic_area_km2(hole)
+    return total
+
+
+def geometry_perimeter_km(geometry: dict[str, Any]) -> float:
+    """Calcula o perímetro de uma geometria (todos os anéis).
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Perímetro em km
+    """
+    return sum(ring_length_km(ring) for polygon in iter_polygons(geometry) for ring in polygon)
+
+
+def geometry_bounds(geometry: dict[str, Any]) -> tuple[float, float, float, float] | None:
+    """Calcula o bounding box de uma geometria Polygon ou MultiPolygon.
+
+    Args:
+        geometry: Geometria GeoJSON
+
+    Returns:
+        Tupla (min_lon, min_lat, max_lon, max_lat) ou None se vazia
+    """
+    min_lon = min_lat = math.inf
+    max_lon = max_lat = -math.inf
+    for polygon in iter_polygons(geometry):
+        # Os buracos estão contidos no anel exterior
+        for point in polygon[0]:
+            lon, lat = point[0], point[1]
+            if lon < min_lon:
+                min_lon = lon
+            if lon > max_lon:
+                max_lon = lon
+            if lat < min_lat:
+                min_lat = lat
+            if lat > max_lat:
+                max_lat = lat
+
+    if min_lon == math.inf:
+        return None
+    return (min_lon, min_lat, max_lon, max_lat)
+
+
+def simplify_points(points: list[Any], tolerance: float) -> list[Any]:
+    """Simplifica um anel aberto com Douglas-Peucker (iterativo).
+
+    Args:
+        points: Vértices do anel (sem repetir o primeiro no final)
+        tolerance: Distância máxima descartada, na unidade das coordenadas
+
+    Returns:
+        Vértices mantidos, na ordem original
+    """
+    count = len(points)
+    if count <= 4 or tolerance <= 0:
+        return points
+
+    keep = [False] * count
+    keep[0] = keep[count - 1] = True
+    # O ponto mais distante do primeiro divide o anel em duas cadeias
+    fx, fy = points[0][0], points[0][1]
+    far = max(range(1, count), key=lambda i: (points[i][0] - fx) ** 2 + (points[i][1] - fy) ** 2)
+    keep[far] = True
+
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, far), (far, count - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        ax, ay = points[start][0], points[start][1]
+        bx, by = points[end][0], points[end][1]
+        dx, dy = bx - ax, by - ay
+        length_sq = dx * dx + dy * dy
+
+        max_dist = -1.0
+        index = start
+        for i in range(start + 1, end):
+            px, py = points[i][0], points[i][1]
+            if length_sq == 0:
+                dist = (px - ax) ** 2 + (py - ay) ** 2
+            else:
+                cross = dx * (py - ay) - dy * (px - ax)
+                dist = cross * cross / length_sq
+            if dist > max_dist:
+                max_dist = dist
+                index = i
+
+        if max_dist > tolerance_sq:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+
+    return [point for point, kept in zip(points, keep, strict=True) if kept]
+
+
+def _simplify_polygon(polygon: Polygon, tolerance: float, precision: int) -> Polygon:
+    """Simplifica os anéis de um polígono (anéis com até 4 vértices ficam intactos)."""
+    rings: Polygon = []
+    for ring in polygon:
+        open_ring = [[round(p[0], precision), round(p[1], precision)] for p in ring[:-1]]
+        simplified = simplify_points(open_ring, tolerance)
+        rings.append(simplified + [simplified[0]])
+    return rings
+
+
+def simplify_geometry(
+    geometry: dict[str, Any], tolerance: float, precision: int = 5
+) -> dict[str, Any]:
+    """Simplifica uma geometria Polygon ou MultiPolygon (Douglas-Peucker por anel).
+
+    O tipo e a estrutura da geometria são mantidos; as coordenadas são
+    arredondadas para reduzir o tamanho do JSON.
+
+    Args:
+        geometry: Geometria GeoJSON
+        tolerance: Distância máxima descartada, em graus
+        precision: Casas decimais das coordenadas
+
+    Returns:
+        Nova geometria GeoJSON simplificada
+    """
+    geom_type = geometry.get("type")
+    coordinates = geometry.get("coordinates") or []
+
+    simplified: list[Any]
+    if geom_type == "Polygon":
+        simplified = _simplify_polygon(coordinates, tolerance, precision)
+    elif geom_type == "MultiPolygon":
+        simplified = [_simplify_polygon(polygon, tolerance, precision) for polygon in coordinates]
+    else:
+        return geometry
+    return {"type": geom_type, "coordinates": simplified}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Calcula a distância de grande círculo entre dois pontos.
+
+    Args:
+        lat1: Latitude do primeiro ponto
+        lon1: Longitude do primeiro ponto
+        lat2: Latitude do segundo ponto
+        lon2: Longitude do segundo ponto
+
+    Returns:
+        Distância em quilômetros
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# Exporta as principais funções
+__all__ = [
+    "EARTH_RADIUS_KM",
+    "split_polygon_rings",
+    "iter_polygons",
+    "ring_signed_area",
+    "geometry_centroid",
+    "point_in_ring",
+    "point_in_geometry",
+    "representative_point",
+    "ring_geodesic_area_km2",
+    "ring_length_km",
+    "geometry_area_km2",
+    "geometry_perimeter_km",
+    "geometry_bounds",
+    "simplify_points",
+    "simplify_geometry",
+    "haversine_km",
+]
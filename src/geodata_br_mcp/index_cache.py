@@ -0,0 +1,345 @@
+"""
+Cache em disco dos índices derivados para o servidor MCP Geodata-BR.
+
+Os índices calculados a partir dos arquivos de dados (tabelas de atributos,
+geometrias simplificadas, representação compacta, offsets das features e
+índice de centroides) ficam só em memória e seriam refeitos a cada
+inicialização. Este módulo os grava em <cache>/indexes/<versão>/ para que as
+inicializações seguintes os leiam diretamente, sem o parse do GeoJSON:
+
+- chave: tipo do índice, nome (código do estado) e checksum do arquivo de
+  origem, o mesmo do manifesto (só é recalculado quando tamanho ou mtime
+  mudam). Índices nacionais usam o checksum combinado de todos os estados, e
+  índices que dependem de parâmetros do construtor (ex: a tolerância das
+  geometrias simplificadas) incluem esses parâmetros no hash e no nome da
+  entrada, de modo que entradas com parâmetros diferentes convivem;
+- versão: o diretório inclui a versão do pacote e INDEX_CACHE_VERSION, então
+  uma atualização ignora os índices gravados por versões anteriores;
+- formato: pickle (protocolo mais alto), que carrega arrays, listas e
+  dicionários bem mais rápido que JSON. O diretório é local e gravado pelo
+  próprio servidor; não aponte GEODATA_BR_CACHE_PATH para arquivos de terceiros;
+- concorrência: a escrita é atômica (arquivo temporário + os.replace) e cada
+  entrada tem um lock (fcntl.flock, onde existir). Leitores nunca veem um
+  arquivo pela metade, e processos que precisam do mesmo índice esperam quem
+  já o está construindo em vez de repetir o trabalho.
+
+Uso (pré-geração dos índices de todos os estados):
+    python -m src.geodata_br_mcp.index_cache [--workers N] [--prune]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+    MCP_SERVER_VERSION,
+)
+from .manifest import get_manifest
+from .metrics import record_cache_lookup
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos, a escrita continua atômica
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("geodata-br-mcp")
+
+# Versão do formato (mudanças na estrutura de algum índice incrementam)
+INDEX_CACHE_VERSION = 1
+
+# Subdiretório do cache com os índices
+INDEXES_SUBDIRECTORY = "indexes"
+
+T = TypeVar("T")
+
+
+def get_indexes_directory(cache_dir: Path) -> Path:
+    """Diretório dos índices da versão atual (<cache>/indexes/<versão>)."""
+    return cache_dir / INDEXES_SUBDIRECTORY / f"{MCP_SERVER_VERSION}-v{INDEX_CACHE_VERSION}"
+
+
+def _params_tag(params: dict[str, Any]) -> str:
+    """Identificador curto dos parâmetros do construtor (parte do nome da entrada)."""
+    encoded = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=4).hexdigest()
+
+
+@contextmanager
+def _entry_lock(path: Path) -> Iterator[None]:
+    """Lock exclusivo entre processos para a construção de uma entrada."""
+    if fcntl is None:
+        yield
+        return
+
+    lock_path = path.with_name(f".{path.name}.lock")
+    try:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = lock_path.open("a")
+    except OSError:
+        # Cache somente leitura: constrói sem lock (e sem gravar)
+        yield
+        return
+
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class IndexCache:
+    """Índices derivados persistidos em disco, por checksum dos arquivos de origem."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.directory = get_indexes_directory(cache_dir)
+        self._lock = threading.Lock()
+        self._entry_locks: dict[Path, threading.Lock] = {}
+
+    def key_for(self, sources: list[Path], params: dict[str, Any] | None = None) -> str:
+        """Chave de um conjunto de arquivos de origem (hex do checksum).
+
+        Args:
+            sources: Arquivos de origem
+            params: Parâmetros do construtor do índice (entram no hash)
+
+        Raises:
+            FileNotFoundError: Se algum arquivo não existir
+        """
+        manifest = get_manifest(self.cache_dir)
+        checksums = [manifest.checksum(source) for source in sources]
+        if len(checksums) == 1 and not params:
+            return checksums[0].split(":", 1)[-1]
+
+        digest = hashlib.blake2b(digest_size=16)
+        for checksum in checksums:
+            digest.update(checksum.encode("ascii"))
+        if params:
+            digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def entry_path(
+        self,
+        kind: str,
+        sources: list[Path],
+        name: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Path:
+        """Caminho da entrada de um índice.
+
+        Args:
+            kind: Tipo do índice (ex: "attributes", "offsets")
+            sources: Arquivos de origem
+            name: Nome da entrada (padrão: código do estado do primeiro arquivo)
+            params: Parâmetros do construtor do índice (mudam a chave)
+
+        Returns:
+            Caminho <diretório>/<kind>/<name>-<chave>.pickle, ou
+            <name>.<parâmetros>-<chave>.pickle quando há parâmetros
+        """
+        if name is None:
+            name = sources[0].name.split("-")[1]
+        if params:
+            name = f"{name}.{_params_tag(params)}"
+        return self.directory / kind / f"{name}-{self.key_for(sources, params)}.pickle"
+
+    def load(self, path: Path) -> Any | None:
+        """Lê uma entrada; entradas ausentes ou ilegíveis retornam None."""
+        try:
+            with path.open("rb") as f:
+                stored = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Arquivo truncado ou de uma versão incompatível: será refeito
+            logger.warning(f"Índice em cache ilegível, refazendo: {path.name} ({e})")
+            return None
+
+        if not isinstance(stored, dict) or stored.get("version") != INDEX_CACHE_VERSION:
+            return None
+        return stored.get("value")
+
+    def store(self, path: Path, value: Any):
+        """Grava uma entrada (escrita atômica) e remove as versões anteriores dela.
+
+        Só são removidas as entradas de mesmo nome e parâmetros, com outra
+        chave (arquivo de origem alterado). Erros de escrita são ignorados: o
+        índice continua válido em memória.
+        """
+        name = path.name.rsplit("-", 1)[0]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with tmp_path.open("wb") as f:
+                pickle.dump(
+                    {"version": INDEX_CACHE_VERSION, "value": value},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            tmp_path.replace(path)
+
+            for stale in path.parent.glob(f"{name}-*.pickle"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError:
+            # Cache somente leitura
+            pass
+
+    def get_or_build(
+        self,
+        kind: str,
+        sources: list[Path],
+        build: Callable[[], T],
+        name: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> T:
+        """Retorna um índice do disco, construindo-o e gravando-o se necessário.
+
+        Args:
+            kind: Tipo do índice
+            sources: Arquivos de origem (a chave muda quando o conteúdo muda)
+            build: Função que constrói o índice
+            name: Nome da entrada (padrão: código do estado do primeiro arquivo)
+            params: Parâmetros do construtor (a chave muda quando algum muda)
+
+        Returns:
+            O índice lido do disco ou recém-construído
+        """
+        path = self.entry_path(kind, sources, name, params)
+        value = self.load(path)
+        record_cache_lookup("index_cache", value is not None)
+        if value is not None:
+            return cast(T, value)
+
+        with self._lock:
+            thread_lock = self._entry_locks.setdefault(path, threading.Lock())
+
+        # Um processo (e uma thread) constrói; os demais esperam e leem o resultado
+        with thread_lock, _entry_lock(path):
+            value = self.load(path)
+            if value is None:
+                value = build()
+                self.store(path, value)
+        return value
+
+
+# Caches de índices em memória (chave: diretório de cache)
+_index_caches: dict[str, IndexCache] = {}
+
+
+def get_index_cache(cache_dir: Path) -> IndexCache:
+    """Retorna o cache de índices de um diretório de cache (criado uma vez)."""
+    key = str(cache_dir)
+    index_cache = _index_caches.get(key)
+    if index_cache is None:
+        index_cache = _index_caches[key] = IndexCache(cache_dir)
+    return index_cache
+
+
+def prune_index_cache(cache_dir: Path) -> list[str]:
+    """Remove os diretórios de índices de outras versões.
+
+    Args:
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Nomes dos diretórios removidos
+    """
+    root = cache_dir / INDEXES_SUBDIRECTORY
+    current = get_indexes_directory(cache_dir)
+    removed = []
+    if root.is_dir():
+        for directory in sorted(root.iterdir()):
+            if directory.is_dir() and directory != current:
+                shutil.rmtree(directory, ignore_errors=True)
+                removed.append(directory.name)
+    return removed
+
+
+def _build_state_indexes(file_path: str, code: str, cache_dir: str) -> dict[str, int]:
+    """Gera ou valida os índices de um estado (executado em um processo do pool)."""
+    from .attributes import load_attributes_with_cache, load_simplified_with_cache
+    from .feature_index import load_feature_offsets
+    from .model import load_state_arrays
+
+    path, cache = Path(file_path), Path(cache_dir)
+    counts = {
+        "attributes": len(load_attributes_with_cache(path, cache)),
+        "simplified": len(load_simplified_with_cache(path, cache)),
+        "compact": len(load_state_arrays(path, cache)),
+    }
+    if path.exists():
+        # Offsets só existem para arquivos sem compressão
+        counts["offsets"] = len(load_feature_offsets(path, cache))
+    return counts
+
+
+def build_indexes(
+    data_root: Path, cache_dir: Path, workers: int | None = None
+) -> dict[str, dict[str, int]]:
+    """Gera (ou valida) os índices em disco de todos os estados.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        cache_dir: Diretório raiz do cache
+        workers: Número de processos (padrão: número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> {tipo do índice: número de entradas}
+    """
+    from .parallel import find_state_files, map_states
+
+    files = find_state_files(data_root)
+    return map_states(_build_state_indexes, files, str(cache_dir), workers=workers)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera os índices derivados em disco")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    parser.add_argument("--prune", action="store_true", help="Remove os índices de outras versões")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+
+    if args.prune:
+        for name in prune_index_cache(cache_dir):
+            print(f"Removido: {name}")
+
+    for code, counts in build_indexes(data_root, cache_dir, args.workers).items():
+        summary = ", ".join(f"{kind} {count}" for kind, count in counts.items())
+        print(f"{IBGE_TO_STATE[code]['uf']}: {summary}")
+    print(f"Índices: {get_indexes_directory(cache_dir)}")
+    return 0
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "INDEX_CACHE_VERSION",
+    "get_indexes_directory",
+    "IndexCache",
+    "get_index_cache",
+    "prune_index_cache",
+    "build_indexes",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,402 @@
+"""
+Manifesto de metadados dos arquivos GeoJSON para o servidor MCP Geodata-BR.
+
+Para cada arquivo geojs-XX-mun.json o manifesto guarda o número de features,
+os tipos de geometria, as chaves de propriedades, o bbox, o tamanho do JSON
+descomprimido e um checksum do conteúdo. Ele é gravado como JSON no diretório de cache (manifest.json) e
+permite responder contagens e resumos sem fazer o parse da geometria.
+
+Validação de cada entrada:
+1. tamanho e mtime iguais aos registrados: a entrada é usada diretamente;
+2. caso contrário o checksum é recalculado; se for igual (arquivo apenas
+   tocado), só tamanho e mtime são atualizados;
+3. se o checksum mudou, a entrada é regenerada a partir do arquivo.
+
+Na pré-geração, as entradas desatualizadas são calculadas em paralelo, um
+estado por processo (veja parallel.py), e o manifesto é gravado uma vez.
+
+Uso (pré-geração do manifesto de todos os estados):
+    python -m src.geodata_br_mcp.manifest [--data-path DIR] [--cache-path DIR] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from .compression import open_data_file, resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    IBGE_TO_STATE,
+)
+
+# Versão do formato (entradas de versões diferentes são regeneradas)
+MANIFEST_VERSION = 2
+
+# Nome do arquivo do manifesto dentro do diretório de cache
+MANIFEST_FILENAME = "manifest.json"
+
+# Tamanho dos blocos lidos no cálculo do checksum
+_CHECKSUM_CHUNK_SIZE = 1 << 20
+
+
+def file_checksum(file_path: Path) -> str:
+    """Calcula o checksum (BLAKE2b, 128 bits) do conteúdo de um arquivo.
+
+    Args:
+        file_path: Caminho do arquivo
+
+    Returns:
+        String no formato "blake2b:<hex>"
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with file_path.open("rb") as f:
+        while chunk := f.read(_CHECKSUM_CHUNK_SIZE):
+            digest.update(chunk)
+    return f"blake2b:{digest.hexdigest()}"
+
+
+def _extend_bounds(bounds: list[float] | None, coords: Any) -> list[float] | None:
+    """Expande um bbox com todas as posições de uma lista de coordenadas aninhada."""
+    stack = [coords]
+    while stack:
+        item = stack.pop()
+        if not item:
+            continue
+        if isinstance(item[0], (int, float)):
+            x, y = item[0], item[1]
+            if bounds is None:
+                bounds = [x, y, x, y]
+            else:
+                if x < bounds[0]:
+                    bounds[0] = x
+                if y < bounds[1]:
+                    bounds[1] = y
+                if x > bounds[2]:
+                    bounds[2] = x
+                if y > bounds[3]:
+                    bounds[3] = y
+        else:
+            stack.extend(item)
+    return bounds
+
+
+def build_file_manifest(file_path: Path) -> dict[str, Any]:
+    """Gera a entrada de manifesto de um arquivo GeoJSON.
+
+    O arquivo é lido diretamente (sem passar pelo cache em memória), para que
+    gerar o manifesto de todos os estados não mantenha todos carregados.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+
+    Returns:
+        Dicionário com type, feature_count, geometry_types, property_keys, bbox,
+        content_bytes (JSON descomprimido), checksum, size e mtime_ns
+    """
+    stat = file_path.stat()
+    checksum = file_checksum(file_path)
+    with open_data_file(file_path) as f:
+        raw = f.read()
+    data = json.loads(raw)
+
+    features = data.get("features", []) if data.get("type") == "FeatureCollection" else []
+    geometry_types: dict[str, int] = {}
+    property_keys: dict[str, None] = {}
+    bounds: list[float] | None = None
+
+    for feature in features:
+        geometry = feature.get("geometry") or {}
+        geom_type = geometry.get("type")
+        if geom_type:
+            geometry_types[geom_type] = geometry_types.get(geom_type, 0) + 1
+        for key in feature.get("properties") or {}:
+            property_keys.setdefault(key, None)
+        bounds = _extend_bounds(bounds, geometry.get("coordinates"))
+
+    return {
+        "version": MANIFEST_VERSION,
+        "type": data.get("type", "Unknown"),
+        "feature_count": len(features),
+        "geometry_types": dict(sorted(geometry_types.items())),
+        "property_keys": list(property_keys),
+        "bbox": bounds,
+        "content_bytes": len(raw),
+        "checksum": checksum,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _is_current(entry: dict[str, Any] | None, size: int, mtime_ns: int) -> bool:
+    """Indica se a entrada corresponde ao tamanho e mtime atuais do arquivo."""
+    return entry is not None and entry["size"] == size and entry["mtime_ns"] == mtime_ns
+
+
+def refresh_entry(
+    file_path: Path, entry: dict[str, Any] | None, size: int, mtime_ns: int
+) -> dict[str, Any]:
+    """Valida uma entrada do manifesto, regenerando-a se necessário.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON (já resolvido)
+        entry: Entrada registrada (ou None)
+        size: Tamanho atual do arquivo
+        mtime_ns: mtime atual do arquivo
+
+    Returns:
+        A própria entrada se ainda válida; senão uma entrada nova
+    """
+    if _is_current(entry, size, mtime_ns):
+        return entry  # type: ignore[return-value]
+    if entry is not None and entry.get("checksum") == file_checksum(file_path):
+        # Conteúdo igual (arquivo apenas tocado): atualiza só a assinatura
+        return {**entry, "size": size, "mtime_ns": mtime_ns}
+    return build_file_manifest(file_path)
+
+
+def _refresh_state_entry(
+    file_path: str, code: str, entries: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Entrada atualizada de um estado (executado em um processo do pool)."""
+    source = resolve_data_file(Path(file_path))
+    stat = source.stat()
+    return refresh_entry(source, entries.get(source.name), stat.st_size, stat.st_mtime_ns)
+
+
+class Manifest:
+    """Manifesto dos arquivos de dados, persistido em um JSON no cache."""
+
+    def __init__(self, manifest_path: Path):
+        self.path = manifest_path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        # Checksums calculados sem gerar a entrada (nome -> (tamanho, mtime, checksum))
+        self._checksums: dict[str, tuple[int, int, str]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored.get("version") == MANIFEST_VERSION:
+                self._entries = stored.get("files", {})
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def save(self):
+        """Grava o manifesto (escrita atômica). Erros de escrita são ignorados."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "files": self._entries}, f, indent=1)
+            tmp_path.replace(self.path)
+        except OSError:
+            # Cache somente leitura: o manifesto continua válido em memória
+            pass
+
+    def get(
+        self, file_path: Path, size: int | None = None, mtime_ns: int | None = None
+    ) -> dict[str, Any]:
+        """Retorna a entrada de um arquivo, regenerando-a se necessário.
+
+        Args:
+            file_path: Caminho do arquivo GeoJSON
+            size: Tamanho atual do arquivo, se já conhecido (evita um stat)
+            mtime_ns: mtime atual do arquivo, se já conhecido
+
+        Returns:
+            Entrada do manifesto
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+        """
+        file_path = resolve_data_file(file_path)
+        if size is None or mtime_ns is None:
+            stat = file_path.stat()
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+
+        key = file_path.name
+        entry = self._entries.get(key)
+        if _is_current(entry, size, mtime_ns):
+            return entry  # type: ignore[return-value]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if _is_current(entry, size, mtime_ns):
+                return entry  # type: ignore[return-value]
+
+            entry = refresh_entry(file_path, entry, size, mtime_ns)
+            self._entries[key] = entry
+            self.save()
+            return entry
+
+    def checksum(self, file_path: Path) -> str:
+        """Retorna o checksum atual de um arquivo.
+
+        Usa a entrada do manifesto quando ela está em dia; senão calcula só o
+        checksum (sem o parse do arquivo) e o guarda em memória.
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+        """
+        file_path = resolve_data_file(file_path)
+        stat = file_path.stat()
+        key = file_path.name
+
+        entry = self._entries.get(key)
+        if entry is not None and _is_current(entry, stat.st_size, stat.st_mtime_ns):
+            return str(entry["checksum"])
+
+        known = self._checksums.get(key)
+        if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+            return known[2]
+
+        checksum = file_checksum(file_path)
+        self._checksums[key] = (stat.st_size, stat.st_mtime_ns, checksum)
+        return checksum
+
+    def is_current(self, file_path: Path) -> bool:
+        """Indica se a entrada de um arquivo está em dia (sem recalcular nada)."""
+        file_path = resolve_data_file(file_path)
+        stat = file_path.stat()
+        return _is_current(self._entries.get(file_path.name), stat.st_size, stat.st_mtime_ns)
+
+    def update(self, entries: dict[str, dict[str, Any]]):
+        """Registra várias entradas (nome do arquivo -> entrada) e grava uma vez."""
+        if not entries:
+            return
+        with self._lock:
+            self._entries.update(entries)
+            self.save()
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        """Retorna uma cópia das entradas carregadas (nome do arquivo -> entrada)."""
+        return dict(self._entries)
+
+
+# Manifestos em memória (chave: caminho do manifest.json)
+_manifests: dict[str, Manifest] = {}
+
+
+def get_manifest(cache_dir: Path) -> Manifest:
+    """Retorna o manifesto de um diretório de cache (carregado uma vez).
+
+    Args:
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Manifesto
+    """
+    manifest_path = cache_dir / MANIFEST_FILENAME
+    key = str(manifest_path)
+    manifest = _manifests.get(key)
+    if manifest is None:
+        manifest = _manifests[key] = Manifest(manifest_path)
+    return manifest
+
+
+def clear_manifest_cache():
+    """Remove os manifestos em memória (serão relidos do disco)."""
+    _manifests.clear()
+
+
+def summary_from_manifest(entry: dict[str, Any]) -> dict[str, Any]:
+    """Converte uma entrada do manifesto no formato de get_geojson_summary.
+
+    Args:
+        entry: Entrada do manifesto
+
+    Returns:
+        Dicionário com type, feature_count, available_properties e geometry_types
+    """
+    summary: dict[str, Any] = {"type": entry["type"], "feature_count": entry["feature_count"]}
+    if entry["type"] == "FeatureCollection" and entry["feature_count"]:
+        summary["available_properties"] = list(entry["property_keys"])
+        summary["geometry_types"] = list(entry["geometry_types"])
+    return summary
+
+
+def get_file_summary(file_path: Path, cache_dir: Path) -> dict[str, Any]:
+    """Retorna o resumo de um arquivo GeoJSON a partir do manifesto.
+
+    Equivalente a get_geojson_summary(load_geojson_with_cache(file_path)), sem
+    carregar o arquivo quando o manifesto está válido.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+        cache_dir: Diretório raiz do cache
+
+    Returns:
+        Dicionário com o resumo
+    """
+    return summary_from_manifest(get_manifest(cache_dir).get(file_path))
+
+
+def build_manifest(data_root: Path, cache_dir: Path, workers: int | None = None) -> dict[str, int]:
+    """Gera (ou valida) o manifesto de todos os arquivos de estado.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        cache_dir: Diretório raiz do cache
+        workers: Número de processos para as entradas desatualizadas (padrão:
+            número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> número de features
+    """
+    # Importado aqui: o servidor carrega este módulo na inicialização
+    from .parallel import find_state_files, map_states
+
+    manifest = get_manifest(cache_dir)
+    files = find_state_files(data_root, sorted(IBGE_TO_STATE))
+
+    stale = {code: path for code, path in files.items() if not manifest.is_current(path)}
+    refreshed = map_states(_refresh_state_entry, stale, manifest.entries(), workers=workers)
+    manifest.update(
+        {resolve_data_file(stale[code]).name: entry for code, entry in refreshed.items()}
+    )
+
+    return {code: manifest.get(path)["feature_count"] for code, path in files.items()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera o manifesto dos arquivos GeoJSON")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+
+    for code, feature_count in build_manifest(data_root, cache_dir, args.workers).items():
+        print(f"{IBGE_TO_STATE[code]['uf']}: {feature_count} features")
+    print(f"Manifesto: {cache_dir / MANIFEST_FILENAME}")
+    return 0
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "MANIFEST_VERSION",
+    "file_checksum",
+    "build_file_manifest",
+    "refresh_entry",
+    "Manifest",
+    "get_manifest",
+    "clear_manifest_cache",
+    "summary_from_manifest",
+    "get_file_summary",
+    "build_manifest",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,399 @@
+"""
+Métricas de instrumentação para o servidor MCP Geodata-BR.
+
+Este módulo mantém contadores e histogramas em memória (latência por tool,
+tamanho das respostas, acertos do cache e tempo de parse dos arquivos). O
+custo por observação é uma busca em dicionário e um incremento sob lock, então
+a instrumentação fica sempre ligada. As métricas podem ser lidas pela tool
+get_server_metrics, em JSON ou no formato texto do Prometheus, e gravadas
+periodicamente em arquivo (GEODATA_BR_METRICS_FILE).
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Variáveis de ambiente
+ENV_METRICS_FILE = "GEODATA_BR_METRICS_FILE"
+ENV_METRICS_DUMP_INTERVAL = "GEODATA_BR_METRICS_DUMP_INTERVAL"
+ENV_METRICS_PAYLOAD_SAMPLE = "GEODATA_BR_METRICS_PAYLOAD_SAMPLE"
+
+# Prefixo dos nomes das métricas
+METRIC_PREFIX = "geodata"
+
+# Limites dos buckets (latência em ms e tamanho em bytes)
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SIZE_BUCKETS_BYTES = (
+    256,
+    1024,
+    4096,
+    16384,
+    65536,
+    262144,
+    1048576,
+    4194304,
+    16777216,
+    67108864,
+)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Histograma com buckets fixos (compatível com o Prometheus)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Registra uma observação."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, q: float) -> float | None:
+        """Estima um percentil por interpolação linear dentro do bucket.
+
+        Args:
+            q: Percentil entre 0 e 1 (ex: 0.99)
+
+        Returns:
+            Valor estimado ou None se não houver observações
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index >= len(self.buckets):
+                    # Acima do último bucket: o melhor que dá para dizer é o limite
+                    return float(self.buckets[-1])
+                upper = self.buckets[index]
+                fraction = (rank - cumulative) / bucket_count
+                return lower + (upper - lower) * fraction
+            cumulative += bucket_count
+        return float(self.buckets[-1])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Retorna um resumo do histograma."""
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Registro de contadores e histogramas com rótulos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._histograms: dict[str, dict[LabelKey, Histogram]] = {}
+        self._histogram_buckets: dict[str, tuple[float, ...]] = {}
+        self.started_at = time.time()
+
+    @staticmethod
+    def _label_key(labels: dict[str, str]) -> LabelKey:
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        """Incrementa um contador."""
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: tuple[float, ...], **labels: str):
+        """Registra uma observação em um histograma."""
+        key = self._label_key(labels)
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(buckets)
+                self._histogram_buckets[name] = buckets
+            histogram.observe(value)
+
+    def get_counter(self, name: str, **labels: str) -> float:
+        """Retorna o valor atual de um contador (0 se não existir)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(self._label_key(labels), 0)
+
+    def get_histogram(self, name: str, **labels: str) -> Histogram | None:
+        """Retorna um histograma (ou None se não existir)."""
+        with self._lock:
+            return self._histograms.get(name, {}).get(self._label_key(labels))
+
+    def reset(self):
+        """Remove todas as métricas."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._histogram_buckets.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Retorna todas as métricas em um dicionário serializável em JSON."""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [{"labels": dict(key), **hist.to_dict()} for key, hist in by_label.items()]
+                for name, by_label in self._histograms.items()
+            }
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def render_prometheus(self) -> str:
+        """Retorna as métricas no formato texto de exposição do Prometheus."""
+
+        def fmt_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ""
+            escaped = (
+                f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                for k, v in pairs
+            )
+            return "{" + ",".join(escaped) + "}"
+
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                for key, value in series.items():
+                    lines.append(f"{full_name}{fmt_labels(key)} {value}")
+
+            for name, histograms in sorted(self._histograms.items()):
+                full_name = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, hist in histograms.items():
+                    cumulative = 0
+                    for bound, bucket_count in zip(hist.buckets, hist.counts, strict=False):
+                        cumulative += bucket_count
+                        labels = fmt_labels(key, (("le", f"{bound:g}"),))
+                        lines.append(f"{full_name}_bucket{labels} {cumulative}")
+                    labels = fmt_labels(key, (("le", "+Inf"),))
+                    lines.append(f"{full_name}_bucket{labels} {hist.count}")
+                    lines.append(f"{full_name}_sum{fmt_labels(key)} {hist.sum}")
+                    lines.append(f"{full_name}_count{fmt_labels(key)} {hist.count}")
+
+        lines.append(f"{METRIC_PREFIX}_uptime_seconds {round(time.time() - self.started_at, 3)}")
+        return "\n".join(lines) + "\n"
+
+
+# Registro global usado pelo servidor
+registry = MetricsRegistry()
+
+
+def _payload_sample_every() -> int:
+    """Retorna a cada quantas chamadas o tamanho da resposta é medido."""
+    try:
+        rate = float(os.environ.get(ENV_METRICS_PAYLOAD_SAMPLE, "0.1"))
+    except ValueError:
+        rate = 0.1
+    if rate <= 0:
+        return 0
+    return max(1, round(1 / min(rate, 1.0)))
+
+
+def _declared_payload_bytes(result: Any) -> int | None:
+    """Retorna o tamanho já informado pela própria resposta, sem serializá-la.
+
+    Respostas comprimidas e tiles vetoriais carregam o tamanho do corpo em
+    size_bytes; textos são medidos diretamente.
+    """
+    if isinstance(result, dict):
+        size = result.get("size_bytes")
+        if isinstance(size, int) and not isinstance(size, bool):
+            return size
+    elif isinstance(result, str):
+        return len(result.encode("utf-8"))
+    elif isinstance(result, bytes):
+        return len(result)
+    return None
+
+
+def estimate_payload_bytes(result: Any) -> int:
+    """Calcula o tamanho da resposta em bytes.
+
+    Usa o tamanho informado pela resposta quando houver (size_bytes) e, caso
+    contrário, serializa o resultado em JSON compacto (UTF-8).
+    """
+    declared = _declared_payload_bytes(result)
+    if declared is not None:
+        return declared
+    return len(json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def instrument_tool(
+    func: Callable[..., Any] | None = None, *, serialize_payload: bool = True
+) -> Callable[..., Any]:
+    """Decorator que mede latência, erros e tamanho das respostas de uma tool.
+
+    O tamanho da resposta pode exigir serializar o resultado, então é medido
+    por amostragem (GEODATA_BR_METRICS_PAYLOAD_SAMPLE, padrão 0.1): a primeira
+    chamada de cada tool e depois uma a cada 1/taxa chamadas. Tools que
+    devolvem coleções grandes usam serialize_payload=False: nelas só é
+    registrado o tamanho já conhecido (size_bytes das respostas comprimidas).
+
+    Args:
+        func: Função da tool (uso direto como @instrument_tool)
+        serialize_payload: Se False, nunca serializa o resultado para medi-lo
+
+    Returns:
+        Função instrumentada (ou o decorator, se chamado com argumentos)
+    """
+    if func is None:
+        return functools.partial(instrument_tool, serialize_payload=serialize_payload)
+
+    tool_name = func.__name__
+    sample_every = _payload_sample_every()
+    measure = estimate_payload_bytes if serialize_payload else _declared_payload_bytes
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            registry.observe("tool_latency_ms", elapsed_ms, LATENCY_BUCKETS_MS, tool=tool_name)
+            registry.inc("tool_calls_total", tool=tool_name, status=status)
+            _maybe_dump()
+
+        calls = registry.get_counter("tool_calls_total", tool=tool_name, status="ok")
+        if sample_every and (calls - 1) % sample_every == 0:
+            size = measure(result)
+            if size is not None:
+                registry.observe("tool_response_bytes", size, SIZE_BUCKETS_BYTES, tool=tool_name)
+        return result
+
+    return wrapper
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """Registra um acerto ou falha de cache."""
+    registry.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def record_file_load(file_name: str, elapsed_ms: float, size_bytes: int):
+    """Registra o carregamento (leitura + parse) de um arquivo de dados."""
+    registry.observe("file_load_ms", elapsed_ms, LATENCY_BUCKETS_MS, file=file_name)
+    registry.inc("file_load_bytes_total", size_bytes, file=file_name)
+
+
+def cache_hit_ratios() -> dict[str, float]:
+    """Retorna a taxa de acerto por cache."""
+    snapshot = registry.snapshot()["counters"].get("cache_requests_total", [])
+    totals: dict[str, dict[str, float]] = {}
+    for entry in snapshot:
+        labels = entry["labels"]
+        totals.setdefault(labels["cache"], {"hit": 0, "miss": 0})[labels["result"]] += entry[
+            "value"
+        ]
+    return {
+        cache: round(values["hit"] / (values["hit"] + values["miss"]), 4)
+        for cache, values in totals.items()
+        if values["hit"] + values["miss"]
+    }
+
+
+def dump_metrics(path: Path):
+    """Grava as métricas em formato Prometheus (escrita atômica).
+
+    Args:
+        path: Arquivo de destino (ex: para o textfile collector do node_exporter)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(registry.render_prometheus(), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _dump_interval() -> float:
+    """Retorna o intervalo mínimo entre gravações do arquivo de métricas (segundos)."""
+    try:
+        return max(0.0, float(os.environ.get(ENV_METRICS_DUMP_INTERVAL, "15")))
+    except ValueError:
+        return 15.0
+
+
+_last_dump = 0.0
+
+# Lido uma vez: _maybe_dump roda no finally de toda chamada de tool
+_dump_every = _dump_interval()
+
+
+def _maybe_dump():
+    """Grava o arquivo de métricas se configurado e se o intervalo já passou."""
+    global _last_dump
+
+    metrics_file = os.environ.get(ENV_METRICS_FILE)
+    if not metrics_file:
+        return
+
+    now = time.monotonic()
+    if now - _last_dump >= _dump_every:
+        _last_dump = now
+        try:
+            dump_metrics(Path(metrics_file))
+        except OSError:
+            pass
+
+
+def _dump_at_exit():
+    metrics_file = os.environ.get(ENV_METRICS_FILE)
+    if metrics_file:
+        try:
+            dump_metrics(Path(metrics_file))
+        except OSError:
+            pass
+
+
+atexit.register(_dump_at_exit)
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "LATENCY_BUCKETS_MS",
+    "SIZE_BUCKETS_BYTES",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+    "estimate_payload_bytes",
+    "instrument_tool",
+    "record_cache_lookup",
+    "record_file_load",
+    "cache_hit_ratios",
+    "dump_metrics",
+]
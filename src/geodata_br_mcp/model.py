@@ -0,0 +1,352 @@
+"""
+Representação compacta dos municípios em memória para o servidor MCP Geodata-BR.
+
+Cada feature carregada com json.load é um dicionário de dicionários, com as
+coordenadas em listas aninhadas: um objeto float e uma lista por vértice. Este
+módulo guarda cada estado como colunas (struct-of-arrays):
+
+- ids em array('I'), nomes e nomes normalizados em listas de str;
+- todas as coordenadas do estado em um único array('d') (lon, lat intercalados);
+- offsets em estilo CSR: feature -> polígonos -> anéis -> vértices.
+
+Municipality é um registro com __slots__ que aponta para uma linha dessas
+colunas; as geometrias só viram listas/dicionários GeoJSON quando pedidas
+(to_feature, to_collection), na mesma estrutura do arquivo original.
+
+Com um diretório de cache, as tabelas são gravadas em disco (index_cache.py)
+e as inicializações seguintes não fazem o parse do GeoJSON.
+
+Para medir a memória em relação ao cache de dicionários:
+    python -m benchmarks.memory
+"""
+
+import json
+import time
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .compression import is_compressed, open_data_file, resolve_data_file
+from .metrics import record_cache_lookup, record_file_load
+from .utils import normalize_text
+
+# Tipos de geometria por feature (array('B'))
+GEOMETRY_NONE = 0
+GEOMETRY_POLYGON = 1
+GEOMETRY_MULTIPOLYGON = 2
+
+_GEOMETRY_TYPE_CODES = {"Polygon": GEOMETRY_POLYGON, "MultiPolygon": GEOMETRY_MULTIPOLYGON}
+
+# Cache em memória das tabelas compactas (chave: caminho do arquivo)
+_arrays_cache: dict[str, "StateArrays"] = {}
+
+
+class Municipality:
+    """Registro de um município: referência a uma linha de StateArrays."""
+
+    __slots__ = ("state", "index")
+
+    def __init__(self, state: "StateArrays", index: int):
+        self.state = state
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"Municipality(id={self.id!r}, name={self.name!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Municipality):
+            return NotImplemented
+        return self.state is other.state and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.state), self.index))
+
+    @property
+    def id(self) -> str:
+        """Código IBGE de 7 dígitos."""
+        return str(self.state.ids[self.index])
+
+    @property
+    def name(self) -> str:
+        return self.state.names[self.index]
+
+    @property
+    def description(self) -> str:
+        return self.state.descriptions[self.index]
+
+    @property
+    def normalized_name(self) -> str:
+        return self.state.normalized_names[self.index]
+
+    def properties(self) -> dict[str, Any]:
+        """Propriedades GeoJSON (id, name, description e extras)."""
+        return self.state.properties(self.index)
+
+    def geometry(self) -> dict[str, Any] | None:
+        """Geometria GeoJSON, montada a partir do buffer de coordenadas."""
+        return self.state.geometry(self.index)
+
+    def to_feature(self) -> dict[str, Any]:
+        """Feature GeoJSON equivalente à do arquivo original."""
+        return self.state.to_feature(self.index)
+
+
+class StateArrays:
+    """Municípios de um estado em colunas, com as coordenadas em um buffer único.
+
+    Offsets (CSR): os polígonos da feature i são
+    polygon_offsets[i]:polygon_offsets[i + 1]; os anéis do polígono p,
+    ring_offsets[p]:ring_offsets[p + 1]; e os vértices do anel r,
+    vertex_offsets[r]:vertex_offsets[r + 1], com o vértice v em
+    coordinates[2 * v] (lon) e coordinates[2 * v + 1] (lat).
+    """
+
+    __slots__ = (
+        "code",
+        "ids",
+        "names",
+        "descriptions",
+        "normalized_names",
+        "extras",
+        "geometry_types",
+        "polygon_offsets",
+        "ring_offsets",
+        "vertex_offsets",
+        "coordinates",
+    )
+
+    def __init__(self, code: str = ""):
+        self.code = code
+        self.ids = array("I")
+        self.names: list[str] = []
+        # Mesmo objeto str do nome quando a descrição é igual (o caso comum)
+        self.descriptions: list[str] = []
+        self.normalized_names: list[str] = []
+        # Propriedades além de id, name e description (None na maioria)
+        self.extras: list[dict[str, Any] | None] = []
+        self.geometry_types = array("B")
+        self.polygon_offsets = array("I", [0])
+        self.ring_offsets = array("I", [0])
+        self.vertex_offsets = array("I", [0])
+        self.coordinates = array("d")
+
+    @classmethod
+    def from_features(cls, features: list[dict[str, Any]], code: str = "") -> "StateArrays":
+        """Converte uma lista de features GeoJSON para a representação compacta.
+
+        Args:
+            features: Features GeoJSON (Polygon, MultiPolygon ou sem geometria)
+            code: Código IBGE do estado
+
+        Returns:
+            Tabela compacta, na mesma ordem das features
+
+        Raises:
+            ValueError: Se o id não for numérico ou a geometria não for suportada
+        """
+        table = cls(code)
+        for feature in features:
+            table.append(feature)
+        return table
+
+    def append(self, feature: dict[str, Any]):
+        """Acrescenta uma feature GeoJSON ao final da tabela.
+
+        Raises:
+            ValueError: Se o id não for numérico ou a geometria não for suportada
+        """
+        props = feature.get("properties") or {}
+        feature_id = str(props.get("id", ""))
+        if not feature_id.isdigit():
+            raise ValueError(f"Código IBGE inválido na feature: {feature_id!r}")
+
+        name = props.get("name", "")
+        description = props.get("description", "")
+        self.ids.append(int(feature_id))
+        self.names.append(name)
+        self.descriptions.append(name if description == name else description)
+        self.normalized_names.append(normalize_text(name))
+        extra = {k: v for k, v in props.items() if k not in ("id", "name", "description")}
+        self.extras.append(extra or None)
+
+        geometry = feature.get("geometry")
+        polygons: list[Any]
+        if not geometry:
+            self.geometry_types.append(GEOMETRY_NONE)
+            polygons = []
+        else:
+            geom_type = geometry.get("type")
+            type_code = _GEOMETRY_TYPE_CODES.get(geom_type)
+            if type_code is None:
+                raise ValueError(f"Geometria não suportada: {geom_type}")
+            self.geometry_types.append(type_code)
+            coordinates = geometry.get("coordinates") or []
+            polygons = [coordinates] if type_code == GEOMETRY_POLYGON else coordinates
+
+        coords = self.coordinates
+        for polygon in polygons:
+            for ring in polygon:
+                for point in ring:
+                    coords.append(point[0])
+                    coords.append(point[1])
+                self.vertex_offsets.append(len(coords) // 2)
+            self.ring_offsets.append(len(self.vertex_offsets) - 1)
+        self.polygon_offsets.append(len(self.ring_offsets) - 1)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Municipality:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return Municipality(self, index % len(self))
+
+    def __iter__(self) -> Iterator[Municipality]:
+        for index in range(len(self)):
+            yield Municipality(self, index)
+
+    def vertex_count(self) -> int:
+        """Número total de vértices do estado."""
+        return len(self.coordinates) // 2
+
+    def ring(self, ring_index: int) -> list[list[float]]:
+        """Coordenadas de um anel como lista GeoJSON [[lon, lat], ...]."""
+        coords = self.coordinates
+        start = self.vertex_offsets[ring_index]
+        end = self.vertex_offsets[ring_index + 1]
+        return [[coords[2 * v], coords[2 * v + 1]] for v in range(start, end)]
+
+    def properties(self, index: int) -> dict[str, Any]:
+        """Propriedades GeoJSON da feature (id, name, description e extras)."""
+        props: dict[str, Any] = {
+            "id": str(self.ids[index]),
+            "name": self.names[index],
+            "description": self.descriptions[index],
+        }
+        extra = self.extras[index]
+        if extra:
+            props.update(extra)
+        return props
+
+    def geometry(self, index: int) -> dict[str, Any] | None:
+        """Geometria GeoJSON da feature, na estrutura do arquivo original."""
+        type_code = self.geometry_types[index]
+        if type_code == GEOMETRY_NONE:
+            return None
+
+        polygons = [
+            [self.ring(r) for r in range(self.ring_offsets[p], self.ring_offsets[p + 1])]
+            for p in range(self.polygon_offsets[index], self.polygon_offsets[index + 1])
+        ]
+        if type_code == GEOMETRY_POLYGON:
+            return {"type": "Polygon", "coordinates": polygons[0] if polygons else []}
+        return {"type": "MultiPolygon", "coordinates": polygons}
+
+    def to_feature(self, index: int) -> dict[str, Any]:
+        """Feature GeoJSON equivalente à do arquivo original."""
+        return {
+            "type": "Feature",
+            "properties": self.properties(index),
+            "geometry": self.geometry(index),
+        }
+
+    def to_collection(self) -> dict[str, Any]:
+        """FeatureCollection GeoJSON com todos os municípios do estado."""
+        return {
+            "type": "FeatureCollection",
+            "features": [self.to_feature(index) for index in range(len(self))],
+        }
+
+    def find_by_id(self, ibge_code: str) -> Municipality | None:
+        """Busca um município pelo código IBGE (busca linear no array de ids)."""
+        if not ibge_code.isdigit():
+            return None
+        try:
+            return Municipality(self, self.ids.index(int(ibge_code)))
+        except (ValueError, OverflowError):
+            return None
+
+    def match_name(self, search_term: str) -> Municipality | None:
+        """Primeiro município cujo nome casa com a busca (na ordem do arquivo)."""
+        normalized_search = normalize_text(search_term)
+        for index, normalized_name in enumerate(self.normalized_names):
+            if normalized_search in normalized_name or normalized_name in normalized_search:
+                return Municipality(self, index)
+        return None
+
+    def find_by_name(self, search_term: str) -> list[Municipality]:
+        """Busca municípios pelo nome (mesma regra de utils.search_features_by_name)."""
+        normalized_search = normalize_text(search_term)
+        return [
+            Municipality(self, index)
+            for index, normalized_name in enumerate(self.normalized_names)
+            if normalized_search in normalized_name or normalized_name in normalized_search
+        ]
+
+
+def _read_state_arrays(source_path: Path) -> StateArrays:
+    """Lê e converte um arquivo GeoJSON (sem cache)."""
+    started = time.perf_counter()
+    with open_data_file(source_path) as f:
+        raw = f.read()
+    data = json.loads(raw)
+    code = source_path.name.split("-")[1] if source_path.name.startswith("geojs-") else ""
+    table = StateArrays.from_features(data.get("features", []), code)
+    disk_bytes = source_path.stat().st_size if is_compressed(source_path) else len(raw)
+    record_file_load(source_path.name, (time.perf_counter() - started) * 1000, disk_bytes)
+    return table
+
+
+def load_state_arrays(file_path: Path, cache_dir: Path | None = None) -> StateArrays:
+    """Carrega um arquivo GeoJSON direto para a representação compacta (com cache).
+
+    Os dicionários do json.load são descartados após a conversão: o arquivo
+    não entra no cache de GeoJSON de utils.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON (.json, .json.gz ou .json.zst)
+        cache_dir: Diretório de cache para persistir a tabela (opcional)
+
+    Returns:
+        Tabela compacta do estado
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+    """
+    file_str = str(file_path)
+
+    cached = _arrays_cache.get(file_str)
+    record_cache_lookup("model", cached is not None)
+    if cached is not None:
+        return cached
+
+    source_path = resolve_data_file(file_path)
+    if not source_path.exists():
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+
+    if cache_dir is None:
+        table = _read_state_arrays(source_path)
+    else:
+        from .index_cache import get_index_cache
+
+        table = get_index_cache(cache_dir).get_or_build(
+            "compact", [file_path], lambda: _read_state_arrays(source_path)
+        )
+
+    _arrays_cache[file_str] = table
+    return table
+
+
+def clear_model_cache():
+    """Limpa o cache de tabelas compactas."""
+    _arrays_cache.clear()
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "Municipality",
+    "StateArrays",
+    "load_state_arrays",
+    "clear_model_cache",
+]
@@ -0,0 +1,391 @@
+"""
+Interseção de polígonos para o servidor MCP Geodata-BR.
+
+Calcula a área de sobreposição entre um polígono qualquer (área de atendimento
+enviada pelo usuário) e os municípios, sem dependências externas:
+
+- a área da interseção sai do teorema de Green: é a soma, ao longo da borda
+  de A que fica dentro de B e da borda de B que fica dentro de A, do mesmo
+  termo do cálculo de área. As arestas são cortadas nos pontos em que cruzam
+  a outra borda e cada trecho é classificado pelo seu ponto médio. Trechos
+  sobre a borda comum (consulta igual ao contorno de um estado, municípios
+  vizinhos) contam uma vez se as bordas têm o mesmo sentido e nenhuma se têm
+  sentidos opostos;
+- as coordenadas de área são as da projeção cilíndrica equivalente
+  (lon em radianos, seno da latitude), a mesma fórmula de
+  geometry.ring_geodesic_area_km2: um município inteiramente coberto tem
+  fração de sobreposição exatamente 1;
+- PreparedPolygon guarda as arestas em listas paralelas, com dois índices
+  montados sob demanda: uma grade regular (arestas próximas de uma janela) e
+  faixas horizontais (ponto-em-polígono só com as arestas da faixa do ponto).
+  Um município sem nenhuma aresta da consulta no seu bbox está inteiro dentro
+  ou inteiro fora, decidido por um único ponto; só os municípios da borda
+  passam pelo corte das arestas. Ao longo de um anel a situação
+  (dentro/fora) só muda nos cortes, então trechos sem corte herdam a do
+  trecho anterior sem novo teste de ponto-em-polígono.
+"""
+
+import math
+from collections.abc import Collection
+from typing import Any
+
+from .geometry import EARTH_RADIUS_KM, iter_polygons, ring_signed_area
+
+# Arestas por célula da grade e por faixa do ponto-em-polígono (em média)
+EDGES_PER_CELL = 8
+EDGES_PER_STRIP = 16
+
+# Tolerância relativa dos testes de paralelismo e colinearidade
+_EPSILON = 1e-12
+
+_RADIANS = math.pi / 180.0
+
+# Trecho sobre a borda do outro polígono: (início, fim, mesmo sentido)
+Shared = tuple[float, float, bool]
+
+
+def _edge_term(ax: float, ay: float, bx: float, by: float) -> float:
+    """Termo de área de um trecho de aresta (projeção cilíndrica equivalente)."""
+    return (bx - ax) * _RADIANS * (math.sin(ay * _RADIANS) + math.sin(by * _RADIANS))
+
+
+def _term_to_km2(total: float) -> float:
+    """Converte a soma dos termos em km² (positiva para anéis anti-horários)."""
+    return -total * EARTH_RADIUS_KM * EARTH_RADIUS_KM / 2.0
+
+
+class PreparedPolygon:
+    """Polígono ou multipolígono preparado para interseções repetidas.
+
+    Os anéis são orientados com o interior à esquerda (exteriores
+    anti-horários, buracos horários) e as arestas de comprimento zero são
+    descartadas.
+    """
+
+    __slots__ = (
+        "x0",
+        "y0",
+        "x1",
+        "y1",
+        "bbox",
+        "area_km2",
+        "first_point",
+        "_side",
+        "_cell_w",
+        "_cell_h",
+        "_cells",
+        "_strip_h",
+        "_strips",
+    )
+
+    def __init__(self, geometry: dict[str, Any]):
+        """
+        Args:
+            geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+        Raises:
+            ValueError: Se a geometria não tiver nenhum anel válido
+        """
+        self.x0: list[float] = []
+        self.y0: list[float] = []
+        self.x1: list[float] = []
+        self.y1: list[float] = []
+
+        for polygon in iter_polygons(geometry):
+            for position, ring in enumerate(polygon):
+                if len(ring) < 4:
+                    continue
+                if (ring_signed_area(ring) > 0) != (position == 0):
+                    ring = ring[::-1]
+                for i in range(len(ring) - 1):
+                    ax, ay = ring[i][0], ring[i][1]
+                    bx, by = ring[i + 1][0], ring[i + 1][1]
+                    if ax != bx or ay != by:
+                        self.x0.append(ax)
+                        self.y0.append(ay)
+                        self.x1.append(bx)
+                        self.y1.append(by)
+
+        if not self.x0:
+            raise ValueError("Geometria sem anéis válidos (mínimo de 4 posições por anel)")
+
+        self.first_point = (self.x0[0], self.y0[0])
+        self.area_km2 = _term_to_km2(sum(map(_edge_term, self.x0, self.y0, self.x1, self.y1)))
+        self.bbox = (
+            min(min(self.x0), min(self.x1)),
+            min(min(self.y0), min(self.y1)),
+            max(max(self.x0), max(self.x1)),
+            max(max(self.y0), max(self.y1)),
+        )
+        self._cells: list[list[int]] | None = None
+        self._strips: list[list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.x0)
+
+    def _build_grid(self) -> list[list[int]]:
+        """Monta a grade de arestas (na primeira busca por janela) e a retorna."""
+        x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
+        min_x, min_y, max_x, max_y = self.bbox
+        side = max(1, math.isqrt(len(x0) // EDGES_PER_CELL))
+        cell_w = (max_x - min_x) / side or 1.0
+        cell_h = (max_y - min_y) / side or 1.0
+        last = side - 1
+
+        cells: list[list[int]] = [[] for _ in range(side * side)]
+        for e in range(len(x0)):
+            cx0 = min(int((min(x0[e], x1[e]) - min_x) / cell_w), last)
+            cx1 = min(int((max(x0[e], x1[e]) - min_x) / cell_w), last)
+            cy0 = min(int((min(y0[e], y1[e]) - min_y) / cell_h), last)
+            cy1 = min(int((max(y0[e], y1[e]) - min_y) / cell_h), last)
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    cells[cy * side + cx].append(e)
+
+        self._side, self._cell_w, self._cell_h = side, cell_w, cell_h
+        self._cells = cells
+        return cells
+
+    def _build_strips(self) -> list[list[int]]:
+        """Monta as faixas horizontais (no primeiro ponto-em-polígono) e as retorna."""
+        y0, y1 = self.y0, self.y1
+        min_y, max_y = self.bbox[1], self.bbox[3]
+        count = max(1, len(y0) // EDGES_PER_STRIP)
+        strip_h = (max_y - min_y) / count or 1.0
+        last = count - 1
+
+        strips: list[list[int]] = [[] for _ in range(count)]
+        for e in range(len(y0)):
+            s0 = min(int((min(y0[e], y1[e]) - min_y) / strip_h), last)
+            s1 = min(int((max(y0[e], y1[e]) - min_y) / strip_h), last)
+            for s in range(s0, s1 + 1):
+                strips[s].append(e)
+
+        self._strip_h = strip_h
+        self._strips = strips
+        return strips
+
+    def edges_near(self, min_x: float, min_y: float, max_x: float, max_y: float) -> list[int]:
+        """Arestas cujo bbox intersecta a janela (bordas inclusive)."""
+        bbox = self.bbox
+        if min_x > bbox[2] or max_x < bbox[0] or min_y > bbox[3] or max_y < bbox[1]:
+            return []
+        cells = self._cells
+        if cells is None:
+            cells = self._build_grid()
+
+        side, last = self._side, self._side - 1
+        cx0 = min(max(int((min_x - bbox[0]) / self._cell_w), 0), last)
+        cx1 = min(max(int((max_x - bbox[0]) / self._cell_w), 0), last)
+        cy0 = min(max(int((min_y - bbox[1]) / self._cell_h), 0), last)
+        cy1 = min(max(int((max_y - bbox[1]) / self._cell_h), 0), last)
+        candidates: Collection[int]
+        if cx0 == cx1 and cy0 == cy1:
+            candidates = cells[cy0 * side + cx0]
+        else:
+            candidates = {
+                e
+                for cy in range(cy0, cy1 + 1)
+                for cell in cells[cy * side + cx0 : cy * side + cx1 + 1]
+                for e in cell
+            }
+
+        x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
+        found: list[int] = []
+        for e in candidates:
+            ax, bx = x0[e], x1[e]
+            if (ax < min_x and bx < min_x) or (ax > max_x and bx > max_x):
+                continue
+            ay, by = y0[e], y1[e]
+            if (ay < min_y and by < min_y) or (ay > max_y and by > max_y):
+                continue
+            found.append(e)
+        return found
+
+    def contains(self, x: float, y: float) -> bool:
+        """Ponto-em-polígono (par-ímpar, buracos descontados)."""
+        bbox = self.bbox
+        if x < bbox[0] or x > bbox[2] or y < bbox[1] or y > bbox[3]:
+            return False
+        strips = self._strips
+        if strips is None:
+            strips = self._build_strips()
+
+        strip = min(int((y - bbox[1]) / self._strip_h), len(strips) - 1)
+        x0, y0, x1, y1 = self.x0, self.y0, self.x1, self.y1
+        inside = False
+        for e in strips[strip]:
+            ay, by = y0[e], y1[e]
+            if (ay > y) != (by > y):
+                ax = x0[e]
+                if x < (x1[e] - ax) * (y - ay) / (by - ay) + ax:
+                    inside = not inside
+        return inside
+
+
+def _clipped_sum(
+    p: PreparedPolygon,
+    edges: list[int] | range,
+    q: PreparedPolygon,
+    cuts: dict[int, list[float]],
+    shared: dict[int, list[Shared]],
+    keep_shared: bool,
+) -> float:
+    """Soma dos termos de área dos trechos das arestas de p que ficam dentro de q.
+
+    Args:
+        p: Polígono cujas arestas são percorridas
+        edges: Índices das arestas de p, em ordem crescente
+        q: Polígono de referência
+        cuts: Parâmetros (0-1) de corte de cada aresta de p
+        shared: Trechos de cada aresta de p sobre a borda de q
+        keep_shared: Se True, trechos sobre a borda de q com o mesmo sentido contam
+
+    Returns:
+        Soma dos termos (veja _edge_term)
+    """
+    x0, y0, x1, y1 = p.x0, p.y0, p.x1, p.y1
+    total = 0.0
+    # Situação (dentro de q) no fim da aresta anterior, quando ela termina
+    # onde a atual começa
+    inside: bool | None = None
+    previous = -2
+
+    for e in edges:
+        ax, ay, bx, by = x0[e], y0[e], x1[e], y1[e]
+        if previous != e - 1 or x1[previous] != ax or y1[previous] != ay:
+            inside = None
+        previous = e
+
+        edge_cuts = cuts.get(e)
+        if edge_cuts is None:
+            # Sem cortes a situação não muda ao longo da aresta
+            if inside is None:
+                inside = q.contains((ax + bx) / 2.0, (ay + by) / 2.0)
+            if inside:
+                total += _edge_term(ax, ay, bx, by)
+            continue
+
+        dx, dy = bx - ax, by - ay
+        edge_shared = shared.get(e, ())
+        ta = 0.0
+        for tb in sorted(edge_cuts + [1.0]):
+            if tb - ta <= _EPSILON:
+                continue
+            tm = (ta + tb) / 2.0
+            same = next((same for lo, hi, same in edge_shared if lo < tm < hi), None)
+            if same is None:
+                include = inside = q.contains(ax + dx * tm, ay + dy * tm)
+            else:
+                include = keep_shared and same
+                inside = None
+            if include:
+                total += _edge_term(ax + dx * ta, ay + dy * ta, ax + dx * tb, ay + dy * tb)
+            ta = tb
+
+    return total
+
+
+def intersection_area_km2(query: PreparedPolygon, other: PreparedPolygon) -> float:
+    """Área da interseção entre dois polígonos preparados.
+
+    Args:
+        query: Polígono de consulta (a grade de arestas é montada nele)
+        other: Polígono comparado (ex: um município)
+
+    Returns:
+        Área em km² (0 se só se tocam ou são disjuntos)
+    """
+    near = query.edges_near(*other.bbox)
+    if not near:
+        # Nenhuma aresta da consulta no bbox: inteiro dentro ou inteiro fora
+        return other.area_km2 if query.contains(*other.first_point) else 0.0
+
+    # Cortes das duas bordas, achados em uma única passada pelas arestas de other
+    cuts_q: dict[int, list[float]] = {}
+    cuts_o: dict[int, list[float]] = {}
+    shared_q: dict[int, list[Shared]] = {}
+    shared_o: dict[int, list[Shared]] = {}
+    qx0, qy0, qx1, qy1 = query.x0, query.y0, query.x1, query.y1
+    ox0, oy0, ox1, oy1 = other.x0, other.y0, other.x1, other.y1
+
+    for e in range(len(other)):
+        ax, ay, bx, by = ox0[e], oy0[e], ox1[e], oy1[e]
+        dx, dy = bx - ax, by - ay
+        scale_d = abs(dx) + abs(dy)
+        for f in query.edges_near(min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)):
+            cx, cy = qx0[f], qy0[f]
+            fx, fy = qx1[f] - cx, qy1[f] - cy
+            wx, wy = cx - ax, cy - ay
+            denom = dx * fy - dy * fx
+            if abs(denom) > _EPSILON * scale_d * (abs(fx) + abs(fy)):
+                t = (wx * fy - wy * fx) / denom
+                u = (wx * dy - wy * dx) / denom
+                if -_EPSILON <= t <= 1.0 + _EPSILON and -_EPSILON <= u <= 1.0 + _EPSILON:
+                    cuts_o.setdefault(e, []).append(min(max(t, 0.0), 1.0))
+                    cuts_q.setdefault(f, []).append(min(max(u, 0.0), 1.0))
+            elif abs(wx * dy - wy * dx) <= _EPSILON * scale_d * (abs(wx) + abs(wy) + scale_d):
+                # Colinear: cada aresta é cortada nas extremidades da outra
+                length_d, length_f = dx * dx + dy * dy, fx * fx + fy * fy
+                t0 = (wx * dx + wy * dy) / length_d
+                t1 = ((wx + fx) * dx + (wy + fy) * dy) / length_d
+                if max(t0, t1) <= 0.0 or min(t0, t1) >= 1.0:
+                    continue
+                u0 = -(wx * fx + wy * fy) / length_f
+                u1 = ((dx - wx) * fx + (dy - wy) * fy) / length_f
+                same = dx * fx + dy * fy > 0
+                cuts_o.setdefault(e, []).extend(t for t in (t0, t1) if 0.0 < t < 1.0)
+                cuts_q.setdefault(f, []).extend(u for u in (u0, u1) if 0.0 < u < 1.0)
+                shared_o.setdefault(e, []).append((min(t0, t1), max(t0, t1), same))
+                shared_q.setdefault(f, []).append((min(u0, u1), max(u0, u1), same))
+
+    total = _clipped_sum(query, sorted(near), other, cuts_q, shared_q, keep_shared=True)
+    total += _clipped_sum(other, range(len(other)), query, cuts_o, shared_o, keep_shared=False)
+    return min(max(_term_to_km2(total), 0.0), other.area_km2, query.area_km2)
+
+
+def intersects(query: PreparedPolygon, other: PreparedPolygon) -> bool:
+    """Indica se dois polígonos preparados se intersectam (tocar a borda conta).
+
+    Args:
+        query: Polígono de consulta
+        other: Polígono comparado
+
+    Returns:
+        True se as bordas se tocam ou se um contém o outro
+    """
+    if not query.edges_near(*other.bbox):
+        return query.contains(*other.first_point)
+
+    qx0, qy0, qx1, qy1 = query.x0, query.y0, query.x1, query.y1
+    for e in range(len(other)):
+        ax, ay, bx, by = other.x0[e], other.y0[e], other.x1[e], other.y1[e]
+        dx, dy = bx - ax, by - ay
+        for f in query.edges_near(min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)):
+            cx, cy = qx0[f], qy0[f]
+            fx, fy = qx1[f] - cx, qy1[f] - cy
+            wx, wy = cx - ax, cy - ay
+            denom = dx * fy - dy * fx
+            if denom == 0.0:
+                if wx * dy - wy * dx == 0.0:
+                    # Colinear: intersectam se as projeções se sobrepõem
+                    length2 = dx * dx + dy * dy
+                    t0 = (wx * dx + wy * dy) / length2
+                    t1 = ((wx + fx) * dx + (wy + fy) * dy) / length2
+                    if max(t0, t1) >= 0.0 and min(t0, t1) <= 1.0:
+                        return True
+                continue
+            t = (wx * fy - wy * fx) / denom
+            u = (wx * dy - wy * dx) / denom
+            if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0:
+                return True
+
+    return query.contains(*other.first_point) or other.contains(*query.first_point)
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "PreparedPolygon",
+    "intersection_area_km2",
+    "intersects",
+]
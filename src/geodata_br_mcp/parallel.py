@@ -0,0 +1,168 @@
+"""
+Execução paralela por estado para o servidor MCP Geodata-BR.
+
+As etapas que percorrem o país inteiro (manifesto, índices de offsets,
+contornos, validação, exportação colunar, banco SQLite) aplicam uma função a
+cada arquivo geojs-XX-mun.json. Este módulo distribui essas chamadas em um
+pool de processos:
+
+- maior primeiro: os arquivos são enviados em ordem decrescente de tamanho em
+  disco. MG, SP e RS concentram boa parte dos vértices; começando por eles, os
+  estados pequenos preenchem os processos no fim e o tempo total fica perto
+  de max(maior estado, total / processos);
+- processos spawn: o processo pai pode ter threads (servidor, pyarrow,
+  testes), e fork com threads ativas pode travar os filhos;
+- resultados compactos: a função de cada estado roda no processo filho e
+  devolve só o necessário (contagens, entradas de manifesto, colunas ou
+  linhas já codificadas), que volta ao pai por pickle. O GeoJSON carregado
+  fica no filho.
+
+Com um único processo (ou um único arquivo) as chamadas rodam no próprio
+processo, sem o custo de iniciar o pool.
+"""
+
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from .compression import resolve_data_file
+from .config import GEOJSON_DIRECTORY, GEOJSON_FILENAME_PATTERN, STATE_CODES
+
+
+def find_state_files(
+    data_root: Path, codes: list[str] | None = None, compressed: bool = True
+) -> dict[str, Path]:
+    """Lista os arquivos de estado existentes em geojson/.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        codes: Códigos IBGE (padrão: os 27 estados)
+        compressed: Se False, considera só os arquivos .json sem compressão
+
+    Returns:
+        Dicionário código IBGE -> caminho .json (lógico; a variante comprimida
+        é resolvida na leitura), na ordem dos códigos
+    """
+    files = {}
+    for code in codes or STATE_CODES:
+        file_path = data_root / GEOJSON_DIRECTORY / GEOJSON_FILENAME_PATTERN.format(code=code)
+        source = resolve_data_file(file_path) if compressed else file_path
+        if source.exists():
+            files[code] = file_path
+    return files
+
+
+def largest_first(files: dict[str, Path]) -> list[str]:
+    """Ordena os códigos pelo tamanho do arquivo em disco, do maior para o menor.
+
+    Args:
+        files: Dicionário código IBGE -> caminho do arquivo
+
+    Returns:
+        Códigos IBGE (empates pelo código)
+    """
+    sizes = {code: resolve_data_file(path).stat().st_size for code, path in files.items()}
+    return sorted(files, key=lambda code: (-sizes[code], code))
+
+
+def resolve_workers(workers: int | None, jobs: int) -> int:
+    """Número de processos para um conjunto de tarefas.
+
+    Args:
+        workers: Número pedido (padrão: número de CPUs)
+        jobs: Número de tarefas
+
+    Returns:
+        Entre 1 e o número de tarefas
+    """
+    return max(1, min(workers or os.cpu_count() or 1, jobs))
+
+
+def imap_states(
+    func: Callable[..., Any],
+    files: dict[str, Path],
+    *args: Any,
+    workers: int | None = None,
+    window: int | None = None,
+) -> Iterator[tuple[str, Any]]:
+    """Aplica func(caminho, código, *args) a cada estado, maior arquivo primeiro.
+
+    func precisa ser uma função de módulo (é enviada por pickle aos processos)
+    e recebe o caminho como str.
+
+    Args:
+        files: Dicionário código IBGE -> caminho do arquivo (veja find_state_files)
+        *args: Argumentos extras repassados a func
+        workers: Número de processos (padrão: número de CPUs; 1 executa no
+            próprio processo)
+        window: Máximo de tarefas em andamento ou com resultado não consumido
+            (padrão: sem limite). Limita a memória quando os resultados são grandes
+
+    Yields:
+        Tuplas (código IBGE, resultado) na ordem em que terminam
+    """
+    order = largest_first(files)
+    workers = resolve_workers(workers, len(order))
+
+    if workers == 1:
+        for code in order:
+            yield code, func(str(files[code]), code, *args)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        queue = iter(order)
+        running: dict[Future, str] = {}
+
+        def submit_next():
+            code = next(queue, None)
+            if code is not None:
+                running[executor.submit(func, str(files[code]), code, *args)] = code
+
+        for _ in range(max(window or len(order), workers)):
+            submit_next()
+
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                code = running.pop(future)
+                result = future.result()
+                submit_next()
+                yield code, result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def map_states(
+    func: Callable[..., Any],
+    files: dict[str, Path],
+    *args: Any,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """Aplica func(caminho, código, *args) a cada estado e reúne os resultados.
+
+    Args:
+        func: Função de módulo executada por estado
+        files: Dicionário código IBGE -> caminho do arquivo
+        *args: Argumentos extras repassados a func
+        workers: Número de processos (padrão: número de CPUs)
+
+    Returns:
+        Dicionário código IBGE -> resultado, na ordem de files
+    """
+    results = dict(imap_states(func, files, *args, workers=workers))
+    return {code: results[code] for code in files}
+
+
+# Exporta as principais funções
+__all__ = [
+    "find_state_files",
+    "largest_first",
+    "resolve_workers",
+    "imap_states",
+    "map_states",
+]
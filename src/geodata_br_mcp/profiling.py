@@ -0,0 +1,335 @@
+"""
+Profiling opcional de requisições lentas para o servidor MCP Geodata-BR.
+
+Ativado pela variável GEODATA_BR_PROFILE_THRESHOLD_MS: toda chamada de tool
+que passar do limite grava um perfil em um diretório rotativo. Há dois modos:
+
+- "sampler" (padrão): uma thread de amostragem lê a pilha da thread da
+  requisição a cada GEODATA_BR_PROFILE_INTERVAL_MS (padrão 5 ms) e, se a
+  chamada for lenta, grava as pilhas no formato "folded" (uma linha por pilha,
+  compatível com flamegraph.pl e speedscope). O custo fica na thread de
+  amostragem, então o modo pode ficar ligado permanentemente.
+- "cprofile": uma fração das chamadas (GEODATA_BR_PROFILE_SAMPLE_RATE) roda sob
+  cProfile e grava um arquivo .prof (abrir com pstats ou snakeviz). Mais
+  detalhado, porém deixa a chamada perfilada sensivelmente mais lenta.
+
+Os perfis vão para GEODATA_BR_PROFILE_DIR (padrão: profiles/ dentro do
+diretório de cache) e apenas os GEODATA_BR_PROFILE_KEEP mais recentes são
+mantidos.
+"""
+
+import functools
+import itertools
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import CACHE_DIRECTORY, ENV_CACHE_PATH, ENV_DATA_PATH, env_number
+from .metrics import registry
+
+# Variáveis de ambiente
+ENV_PROFILE_THRESHOLD_MS = "GEODATA_BR_PROFILE_THRESHOLD_MS"
+ENV_PROFILE_MODE = "GEODATA_BR_PROFILE_MODE"
+ENV_PROFILE_SAMPLE_RATE = "GEODATA_BR_PROFILE_SAMPLE_RATE"
+ENV_PROFILE_INTERVAL_MS = "GEODATA_BR_PROFILE_INTERVAL_MS"
+ENV_PROFILE_DIR = "GEODATA_BR_PROFILE_DIR"
+ENV_PROFILE_KEEP = "GEODATA_BR_PROFILE_KEEP"
+
+# Subdiretório do cache com os perfis
+PROFILES_SUBDIRECTORY = "profiles"
+
+# Tempo ocioso após o qual a thread de amostragem termina
+SAMPLER_IDLE_SECONDS = 1.0
+
+# Modos de profiling suportados
+PROFILE_MODES = ("sampler", "cprofile")
+
+logger = logging.getLogger("geodata-br-mcp")
+
+# Resolve o diretório de cache do servidor (registrado por server.py)
+_cache_dir_resolver: Callable[[], Path] | None = None
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """Configuração do profiling (lida das variáveis de ambiente)."""
+
+    threshold_ms: float
+    mode: str = "sampler"
+    sample_rate: float = 1.0
+    interval_ms: float = 5.0
+    directory: Path | None = None
+    keep: int = 50
+
+
+def set_cache_dir_resolver(resolver: Callable[[], Path] | None):
+    """Registra a função que resolve o diretório de cache do servidor.
+
+    O servidor registra a mesma função usada pelos contornos e índices, de
+    modo que os perfis fiquem no mesmo cache (DATA_ROOT/.geodata-cache ou
+    GEODATA_BR_CACHE_PATH).
+
+    Args:
+        resolver: Função sem argumentos que retorna o diretório de cache
+    """
+    global _cache_dir_resolver
+    _cache_dir_resolver = resolver
+
+
+def _default_cache_dir() -> Path:
+    """Diretório de cache registrado pelo servidor, ou o do ambiente (uso avulso)."""
+    if _cache_dir_resolver is not None:
+        return _cache_dir_resolver()
+
+    cache_path = os.environ.get(ENV_CACHE_PATH)
+    if cache_path:
+        return Path(cache_path).expanduser().resolve()
+    return Path(os.environ.get(ENV_DATA_PATH, ".")).expanduser().resolve() / CACHE_DIRECTORY
+
+
+def get_profile_dir(cache_dir: Path | None = None) -> Path:
+    """Retorna o diretório dos perfis.
+
+    Args:
+        cache_dir: Diretório de cache (padrão: o registrado pelo servidor)
+
+    Returns:
+        GEODATA_BR_PROFILE_DIR, ou profiles/ dentro do diretório de cache
+    """
+    profile_dir = os.environ.get(ENV_PROFILE_DIR)
+    if profile_dir:
+        return Path(profile_dir).expanduser()
+
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+    return cache_dir / PROFILES_SUBDIRECTORY
+
+
+def load_profiling_config() -> ProfilingConfig | None:
+    """Lê a configuração do ambiente.
+
+    Returns:
+        Configuração, ou None se o profiling estiver desativado
+    """
+    raw_threshold = os.environ.get(ENV_PROFILE_THRESHOLD_MS)
+    if not raw_threshold:
+        return None
+    try:
+        threshold_ms = float(raw_threshold)
+    except ValueError:
+        return None
+
+    mode = os.environ.get(ENV_PROFILE_MODE, "sampler").lower()
+    if mode not in PROFILE_MODES:
+        mode = "sampler"
+
+    return ProfilingConfig(
+        threshold_ms=threshold_ms,
+        mode=mode,
+        sample_rate=min(1.0, max(0.0, env_number(ENV_PROFILE_SAMPLE_RATE, 1.0))),
+        interval_ms=max(0.5, env_number(ENV_PROFILE_INTERVAL_MS, 5.0)),
+        directory=get_profile_dir(),
+        keep=max(1, int(env_number(ENV_PROFILE_KEEP, 50))),
+    )
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Amostrador estatístico de pilhas das threads registradas.
+
+    Uma única thread daemon acorda a cada intervalo e, para cada thread com
+    requisição em andamento, conta a pilha atual. Sem requisições ativas o
+    custo é um teste de dicionário vazio por intervalo, e a thread termina
+    depois de SAMPLER_IDLE_SECONDS ociosa.
+    """
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval = interval_ms / 1000
+        self._active: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self, thread_id: int):
+        """Começa a amostrar uma thread."""
+        with self._lock:
+            self._active[thread_id] = Counter()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="geodata-profile-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, thread_id: int) -> Counter:
+        """Para de amostrar uma thread e retorna uma cópia das pilhas contadas.
+
+        A cópia é feita sob o lock: a thread de amostragem não a altera mais.
+        """
+        with self._lock:
+            stacks = self._active.pop(thread_id, None)
+            return Counter(stacks) if stacks else Counter()
+
+    def _run(self):
+        idle_since = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    # Encerra após um tempo ocioso (não deixa threads vivas em fork)
+                    if time.monotonic() - idle_since > SAMPLER_IDLE_SECONDS:
+                        self._thread = None
+                        return
+                    continue
+                active = list(self._active)
+            idle_since = time.monotonic()
+
+            # As pilhas são montadas fora do lock; só a contagem fica sob ele
+            frames = sys._current_frames()
+            samples = []
+            for thread_id in active:
+                frame = frames.get(thread_id)
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                if labels:
+                    samples.append((thread_id, ";".join(reversed(labels))))
+            del frames
+
+            with self._lock:
+                for thread_id, stack in samples:
+                    stacks = self._active.get(thread_id)
+                    if stacks is not None:
+                        stacks[stack] += 1
+
+
+# Sequência para nomes únicos de arquivos de perfil
+_sequence = itertools.count()
+
+# Amostrador compartilhado (criado na primeira requisição perfilada)
+_sampler: StackSampler | None = None
+
+
+def _get_sampler(interval_ms: float) -> StackSampler:
+    global _sampler
+    if _sampler is None or _sampler.interval != interval_ms / 1000:
+        _sampler = StackSampler(interval_ms)
+    return _sampler
+
+
+def _rotate(directory: Path, keep: int):
+    """Remove os perfis mais antigos, mantendo os `keep` mais recentes."""
+    profiles = sorted(
+        (p for p in directory.iterdir() if p.suffix in (".prof", ".folded")),
+        key=lambda p: (p.stat().st_mtime_ns, p.name),
+    )
+    for old in profiles[:-keep]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _profile_path(directory: Path, tool_name: str, elapsed_ms: float, suffix: str) -> Path:
+    now = time.time()
+    timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f"{now % 1:.6f}"[1:]
+    name = f"{timestamp}-{tool_name}-{int(elapsed_ms)}ms-{os.getpid()}-{next(_sequence)}"
+    return directory / f"{name}{suffix}"
+
+
+def write_folded(path: Path, stacks: Counter):
+    """Grava pilhas amostradas no formato folded ("pilha;pilha contagem")."""
+    lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _save_profile(config: ProfilingConfig, tool_name: str, elapsed_ms: float, writer) -> Path:
+    directory = config.directory or get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    suffix = ".prof" if config.mode == "cprofile" else ".folded"
+    path = _profile_path(directory, tool_name, elapsed_ms, suffix)
+    writer(path)
+    _rotate(directory, config.keep)
+
+    registry.inc("profiles_written_total", tool=tool_name)
+    logger.warning(f"Chamada lenta de {tool_name} ({elapsed_ms:.0f} ms), perfil gravado em {path}")
+    return path
+
+
+def profile_tool(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator que grava um perfil das chamadas acima do limite configurado.
+
+    Sem GEODATA_BR_PROFILE_THRESHOLD_MS o custo é uma leitura do ambiente.
+    Falhas ao gravar o perfil são registradas no log e nunca afetam a tool.
+    """
+    tool_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        config = load_profiling_config()
+        if config is None or random.random() >= config.sample_rate:
+            return func(*args, **kwargs)
+
+        if config.mode == "cprofile":
+            import cProfile
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Outro profiler já ativo (chamadas concorrentes): segue sem perfil
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if elapsed_ms >= config.threshold_ms:
+                    try:
+                        _save_profile(config, tool_name, elapsed_ms, profiler.dump_stats)
+                    except OSError as e:
+                        logger.error(f"Erro ao gravar perfil de {tool_name}: {e}")
+
+        sampler = _get_sampler(config.interval_ms)
+        thread_id = threading.get_ident()
+        sampler.start(thread_id)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stacks = sampler.stop(thread_id)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= config.threshold_ms and stacks:
+                try:
+                    _save_profile(
+                        config, tool_name, elapsed_ms, lambda path: write_folded(path, stacks)
+                    )
+                except OSError as e:
+                    logger.error(f"Erro ao gravar perfil de {tool_name}: {e}")
+
+    return wrapper
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "PROFILE_MODES",
+    "ProfilingConfig",
+    "StackSampler",
+    "set_cache_dir_resolver",
+    "get_profile_dir",
+    "load_profiling_config",
+    "write_folded",
+    "profile_tool",
+]
@@ -1,33 +1,76 @@
+import base64
 import logging
 import os
 import sys
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Annotated, Any
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 
+# Importa o catálogo de arquivos de dados
+from .admission import (
+    check_response_size,
+    estimate_response_bytes,
+    limit_concurrency,
+    source_content_bytes,
+)
+from .catalog import DataCatalog, get_catalog
+
+# Importa a leitura de arquivos comprimidos (.json.gz / .json.zst)
+from .compression import body_cache, is_compressed, validate_encoding
+
 # Importa configurações do módulo config
 from .config import (
+    BACKENDS,
+    CACHE_DIRECTORY,
+    DEFAULT_BACKEND,
+    DEFAULT_GEOMETRY_MODE,
+    ENV_BACKEND,
+    ENV_CACHE_PATH,
     ENV_DATA_PATH,
     GEOJSON_DIRECTORY,
     GEOJSON_FILENAME_PATTERN,
     IBGE_TO_STATE,
     MCP_SERVER_NAME,
+    STATE_CODES,
+    STATES_BY_REGION,
     get_state_code,
 )
 
+# Importa o índice de offsets (leitura de uma única feature)
+from .feature_index import read_feature
+
+# Importa o manifesto de metadados dos arquivos (contagens, bbox, checksum)
+from .manifest import get_manifest
+
+# Importa a instrumentação (latência, tamanho das respostas, caches)
+from .metrics import cache_hit_ratios, instrument_tool, registry
+
+# Importa o profiling de chamadas lentas (opcional, via env)
+from .profiling import profile_tool, set_cache_dir_resolver
+
 # Importa funções utilitárias
 from .utils import (
+    get_cache_size,
+    get_cached_geojson,
+    load_geojson_files_parallel,
     load_geojson_with_cache,
+    normalize_text,
     search_features_by_ibge,
     search_features_by_name,
 )
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Módulos pesados (atributos, contornos, índices, tiles) são importados dentro
+# das tools que os usam, para que o processo inicie rápido
+if TYPE_CHECKING:
+    from .database import MunicipalityStore
+    from .model import Municipality, StateArrays
+    from .spatial import BBoxIndex, CentroidIndex
+    from .tiles import TileCache
+
 logger = logging.getLogger("geodata-br-mcp")
 
 # Caminho do repositório local geodata-br (configure via env)
@@ -37,10 +80,38 @@ DATA_ROOT = Path(os.environ.get(ENV_DATA_PATH, str(DEFAULT_PATH))).expanduser().
 
 app = FastMCP(MCP_SERVER_NAME, dependencies=["mcp"])
 
+# Número máximo de itens nas tools em lote
+BATCH_MAX_ITEMS = 5000
+
+# Número máximo de vértices do polígono de consulta de intersect_municipalities
+INTERSECT_MAX_VERTICES = 200_000
+
+# Sobreposições menores que isto (1 m²) são só bordas que se tocam
+INTERSECT_MIN_OVERLAP_KM2 = 1e-6
+
+# Descrição do parâmetro include_geometry (modos em config.GEOMETRY_MODES)
+_GEOMETRY_MODE_DESCRIPTION = (
+    "Geometria retornada: none, bbox, centroid, simplified ou full (padrão)"
+)
+
+# Índice de vizinhos mais próximos (construído na primeira consulta)
+_centroid_index: "CentroidIndex | None" = None
+
+# Cache de vector tiles (criado na primeira requisição de tile)
+_tile_cache: "TileCache | None" = None
+
+# Índices de bbox dos municípios por estado: código -> (tabela de atributos, índice)
+_state_bbox_indexes: dict[str, tuple[list[dict[str, Any]], "BBoxIndex"]] = {}
+
+
+def _get_catalog() -> DataCatalog:
+    """Retorna o catálogo de arquivos do DATA_ROOT atual."""
+    return get_catalog(DATA_ROOT)
+
 
 def _assert_data_root():
-    """Verifica se o diretório de dados existe."""
-    if not DATA_ROOT.exists():
+    """Verifica se o diretório de dados existe (consulta o catálogo em memória)."""
+    if not _get_catalog().root_exists:
         logger.error(f"DATA_ROOT não encontrado: {DATA_ROOT}")
         raise RuntimeError(
             f"GEODATA_BR_PATH inválido ou não encontrado: {DATA_ROOT}\n"
@@ -63,13 +134,256 @@ def _get_state_file(uf_or_code: str) -> Path:
     return DATA_ROOT / GEOJSON_DIRECTORY / filename
 
 
+def _get_cache_dir() -> Path:
+    """Retorna o diretório de cache de dados derivados (contornos, índices)."""
+    cache_path = os.environ.get(ENV_CACHE_PATH)
+    if cache_path:
+        return Path(cache_path).expanduser().resolve()
+    return DATA_ROOT / CACHE_DIRECTORY
+
+
+# Os perfis de chamadas lentas ficam no mesmo diretório de cache
+set_cache_dir_resolver(_get_cache_dir)
+
+
+def _get_backend() -> str:
+    """Retorna o backend de carregamento configurado (GEODATA_BR_BACKEND).
+
+    Raises:
+        ValueError: Se o backend configurado for desconhecido
+    """
+    backend = os.environ.get(ENV_BACKEND, DEFAULT_BACKEND).strip().lower() or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Backend inválido em {ENV_BACKEND}: {backend}. Opções: {', '.join(BACKENDS)}"
+        )
+    return backend
+
+
+def _get_store() -> "MunicipalityStore":
+    """Retorna o banco SQLite dos municípios (ingerido na primeira chamada)."""
+    from .database import get_database_path, get_store
+
+    return get_store(DATA_ROOT, get_database_path(_get_cache_dir()))
+
+
+def _get_state_arrays(uf_or_code: str) -> "StateArrays":
+    """Retorna a tabela compacta de um estado (backend compact, com cache)."""
+    from .model import load_state_arrays
+
+    return load_state_arrays(_get_state_file(uf_or_code), _get_cache_dir())
+
+
+def _compact_lookup(
+    find: Callable[[str], "Municipality | None"], query: str
+) -> dict[str, Any] | None:
+    """Busca na tabela compacta e converte o registro em Feature GeoJSON."""
+    municipality = find(query)
+    return municipality.to_feature() if municipality is not None else None
+
+
 def _load_state_geojson(uf_or_code: str) -> dict[str, Any]:
     """Carrega o GeoJSON completo de um estado (com cache)."""
+    backend = _get_backend()
+    if backend == "sqlite":
+        return _get_store().state_collection(get_state_code(uf_or_code))
+    if backend == "compact":
+        # Os dicionários são montados a cada chamada; em cache fica só a tabela
+        return _get_state_arrays(uf_or_code).to_collection()
+    if backend == "columnar":
+        from .columnar import ensure_columnar_file, get_columnar_path, load_columnar_collection
+
+        code = get_state_code(uf_or_code)
+        path = ensure_columnar_file(DATA_ROOT, get_columnar_path(_get_cache_dir()))
+        return load_columnar_collection(path, code)
+
     file_path = _get_state_file(uf_or_code)
     return load_geojson_with_cache(file_path)
 
 
+def _load_state_collections(ufs_or_codes: list[str]) -> list[dict[str, Any]]:
+    """Carrega o GeoJSON de vários estados pelo backend configurado.
+
+    No backend geojson os arquivos são lidos em paralelo; no colunar cada
+    estado é um row group do mesmo arquivo e no sqlite, uma consulta.
+    """
+    if _get_backend() != "geojson":
+        return [_load_state_geojson(uf_or_code) for uf_or_code in ufs_or_codes]
+    return load_geojson_files_parallel([_get_state_file(c) for c in ufs_or_codes])
+
+
+def _load_state_properties(uf_or_code: str) -> list[dict[str, Any]]:
+    """Retorna as propriedades dos municípios de um estado, na ordem do arquivo.
+
+    No sqlite e no compact as geometrias não são decodificadas.
+    """
+    backend = _get_backend()
+    if backend == "sqlite":
+        return _get_store().list_properties(get_state_code(uf_or_code))
+    if backend == "compact":
+        table = _get_state_arrays(uf_or_code)
+        return [table.properties(index) for index in range(len(table))]
+    geojson_data = _load_state_geojson(uf_or_code)
+    return [f.get("properties", {}) for f in geojson_data.get("features", [])]
+
+
+def _resolve_region(region: str) -> str:
+    """Retorna o nome canônico de uma região (aceita variações sem acento/caixa).
+
+    Raises:
+        ValueError: Se a região for inválida
+    """
+    normalized = normalize_text(region).replace(" ", "-")
+    for name in STATES_BY_REGION:
+        if normalize_text(name) == normalized:
+            return name
+
+    valid_regions = ", ".join(STATES_BY_REGION.keys())
+    raise ValueError(f"Região inválida: {region}. Regiões válidas: {valid_regions}")
+
+
+def _state_code_from_ibge(ibge_code: str) -> str:
+    """Extrai e valida o código do estado (2 primeiros dígitos) de um código IBGE.
+
+    Raises:
+        ValueError: Se o código for curto demais ou o estado for inválido
+    """
+    if len(ibge_code) < 2:
+        logger.error(f"Código IBGE inválido (muito curto): {ibge_code}")
+        raise ValueError("Código IBGE deve ter pelo menos 2 dígitos")
+
+    state_code = ibge_code[:2]
+
+    if state_code not in IBGE_TO_STATE:
+        logger.error(f"Código de estado inválido: {state_code}")
+        raise ValueError(f"Código de estado inválido: {state_code}")
+
+    return state_code
+
+
+def _load_all_state_features() -> list[dict[str, Any]]:
+    """Carrega as features de todos os estados (sem o arquivo nacional)."""
+    features: list[dict[str, Any]] = []
+    for collection in _load_state_collections(STATE_CODES):
+        features.extend(collection.get("features", []))
+    return features
+
+
+def _get_centroid_index() -> "CentroidIndex":
+    """Retorna o índice de centroides de todos os municípios (com cache)."""
+    global _centroid_index
+
+    if _centroid_index is None:
+        from .index_cache import get_index_cache
+        from .spatial import CentroidIndex
+
+        # Chave: checksum combinado dos arquivos de todos os estados
+        sources = [_get_state_file(code) for code in STATE_CODES]
+        _centroid_index = get_index_cache(_get_cache_dir()).get_or_build(
+            "centroids",
+            sources,
+            lambda: CentroidIndex(_load_all_state_features()),
+            name="brazil",
+        )
+        logger.info(f"Índice de centroides carregado: {len(_centroid_index)} municípios")
+
+    return _centroid_index
+
+
+def _get_tile_cache() -> "TileCache":
+    """Retorna o cache de vector tiles (memória + disco)."""
+    global _tile_cache
+
+    if _tile_cache is None:
+        from .tiles import TileCache, TileSource, data_signature
+
+        _tile_cache = TileCache(
+            lambda: TileSource(_load_all_state_features()),
+            _get_cache_dir(),
+            data_signature(DATA_ROOT),
+        )
+
+    return _tile_cache
+
+
+def _get_state_bbox_index(code: str) -> tuple[list[dict[str, Any]], "BBoxIndex"]:
+    """Retorna a tabela de atributos de um estado e o índice dos bbox dos municípios.
+
+    O índice é refeito quando a tabela em cache muda (arquivo alterado).
+    """
+    from .attributes import load_attributes_with_cache
+    from .spatial import BBoxIndex
+
+    table = load_attributes_with_cache(_get_state_file(code), _get_cache_dir())
+    cached = _state_bbox_indexes.get(code)
+    if cached is None or cached[0] is not table:
+        cached = (table, BBoxIndex([row["bbox"] for row in table], cell_size=0.25))
+        _state_bbox_indexes[code] = cached
+    return cached
+
+
+def _parse_query_geometry(geometry: dict[str, Any]) -> dict[str, Any]:
+    """Valida o polígono de consulta de intersect_municipalities.
+
+    Args:
+        geometry: Geometria Polygon/MultiPolygon ou Feature que a contenha
+
+    Returns:
+        A geometria (sem o envelope da Feature)
+
+    Raises:
+        ValueError: Se não for um polígono válido em lon/lat ou tiver vértices demais
+    """
+    if geometry.get("type") == "Feature":
+        geometry = geometry.get("geometry") or {}
+
+    geometry_type = geometry.get("type")
+    if geometry_type not in ("Polygon", "MultiPolygon"):
+        raise ValueError(
+            f"Geometria inválida: {geometry_type}. Use Polygon, MultiPolygon ou uma Feature"
+        )
+
+    coordinates = geometry.get("coordinates")
+    if not isinstance(coordinates, list):
+        raise ValueError("Coordenadas inválidas: esperado [[[lon, lat], ...], ...]")
+    polygons: list[Any] = coordinates if geometry_type == "MultiPolygon" else [coordinates]
+    vertices = 0
+    try:
+        for polygon in polygons:
+            for ring in polygon:
+                if len(ring) < 4:
+                    raise ValueError("Cada anel deve ter pelo menos 4 posições (fechado)")
+                for position in ring:
+                    lon, lat = float(position[0]), float(position[1])
+                    if not (-180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0):
+                        raise ValueError(f"Coordenada fora de lon/lat: {position}")
+                vertices += len(ring)
+    except (TypeError, IndexError, KeyError):
+        raise ValueError("Coordenadas inválidas: esperado [[[lon, lat], ...], ...]") from None
+
+    if vertices > INTERSECT_MAX_VERTICES:
+        raise ValueError(
+            f"Polígono com {vertices} vértices (máximo {INTERSECT_MAX_VERTICES}). "
+            "Simplifique a geometria antes da consulta"
+        )
+    return geometry
+
+
+def _validate_nearest_args(lat: float, lon: float, k: int, max_km: float | None):
+    """Valida os argumentos das consultas de vizinhos mais próximos."""
+    if not -90.0 <= lat <= 90.0:
+        raise ValueError(f"Latitude inválida: {lat}")
+    if not -180.0 <= lon <= 180.0:
+        raise ValueError(f"Longitude inválida: {lon}")
+    if k < 1:
+        raise ValueError("k deve ser maior ou igual a 1")
+    if max_km is not None and max_km <= 0:
+        raise ValueError("max_km deve ser positivo")
+
+
 @app.tool()
+@instrument_tool
+@profile_tool
 def list_states() -> list[dict[str, str]]:
     """Lista todos os estados disponíveis no repositório geodata-br.
 
@@ -79,45 +393,45 @@ def list_states() -> list[dict[str, str]]:
     logger.info("Tool list_states() chamada")
     _assert_data_root()
 
-    states = []
-    geojson_dir = DATA_ROOT / "geojson"
-
-    if not geojson_dir.exists():
-        logger.warning(f"Diretório geojson não encontrado: {geojson_dir}")
+    catalog = _get_catalog()
+    if not catalog.geojson_dir_exists:
+        logger.warning(f"Diretório geojson não encontrado: {DATA_ROOT / GEOJSON_DIRECTORY}")
         return []
 
-    # Lista os arquivos geojs-XX-mun.json
-    for file in sorted(geojson_dir.glob("geojs-*-mun.json")):
-        # Extrai o código IBGE do nome do arquivo
-        code = file.stem.split("-")[1]
-
-        if code in IBGE_TO_STATE:
-            state_info = IBGE_TO_STATE[code].copy()
-            state_info["ibge_code"] = code
-            states.append(state_info)
+    # Estados com arquivo geojs-XX-mun.json (listagem em cache no catálogo)
+    states = catalog.states()
 
     logger.info(f"Retornando {len(states)} estados")
     return states
 
 
 @app.tool()
+@instrument_tool
+@profile_tool
 def get_state_info(
     uf: str = Field(description="Sigla da UF (ex: SP, RJ) ou código IBGE"),
+    include_stats: Annotated[
+        bool, Field(description="Inclui área total e maior/menor município")
+    ] = False,
+    include_geometry: Annotated[
+        bool, Field(description="Inclui o contorno do estado (MultiPolygon dissolvido)")
+    ] = False,
 ) -> dict[str, Any]:
     """Obtém informações detalhadas sobre um estado.
 
     Args:
         uf: Sigla da UF (ex: "SP") ou código IBGE (ex: "35")
+        include_stats: Se True, inclui agregados de área (total, maior e menor município)
+        include_geometry: Se True, inclui o contorno do estado, dissolvido a partir
+            dos municípios e mantido em cache no disco
 
     Returns:
         Dicionário com informações do estado incluindo quantidade de municípios
+        e bbox [min_lon, min_lat, max_lon, max_lat]
     """
     logger.info(f"Tool get_state_info() chamada com uf={uf}")
     _assert_data_root()
 
-    # Carrega o GeoJSON
-    geojson_data = _load_state_geojson(uf)
-
     # Obtém informações do estado usando config
     from .config import get_state_info as config_get_state_info
 
@@ -126,22 +440,43 @@ def get_state_info(
     # Converte para dict[str, Any] para permitir diferentes tipos de valores
     result: dict[str, Any] = dict(state_info)
 
-    # Conta municípios
-    if "features" in geojson_data:
-        result["total_municipalities"] = len(geojson_data["features"])
-        logger.info(f"Estado {uf}: {result['total_municipalities']} municípios")
+    # Conta municípios pelo manifesto (sem fazer o parse do GeoJSON)
+    entry = _get_catalog().get(get_state_code(uf))
+    if entry is None:
+        raise FileNotFoundError(f"Arquivo não encontrado: {_get_state_file(uf)}")
+    file_info = get_manifest(_get_cache_dir()).get(entry.path, entry.size, entry.mtime_ns)
+    result["total_municipalities"] = file_info["feature_count"]
+    result["bbox"] = file_info["bbox"]
+    logger.info(f"Estado {uf}: {result['total_municipalities']} municípios")
+
+    if include_stats:
+        from .attributes import load_attributes_with_cache, summarize_attributes
+
+        table = load_attributes_with_cache(_get_state_file(uf), _get_cache_dir())
+        result["stats"] = summarize_attributes(table)
+
+    if include_geometry:
+        from .dissolve import load_outline_with_cache
+
+        result["geometry"] = load_outline_with_cache(_get_state_file(uf), _get_cache_dir())
 
     return result
 
 
 @app.tool()
+@instrument_tool
+@profile_tool
 def list_municipalities(
     uf: str = Field(description="Sigla da UF (ex: SP, RJ) ou código IBGE"),
-) -> list[dict[str, str]]:
+    include_stats: Annotated[
+        bool, Field(description="Inclui área, perímetro, centroide e bbox")
+    ] = False,
+) -> list[dict[str, Any]]:
     """Lista todos os municípios de um estado.
 
     Args:
         uf: Sigla da UF (ex: "SP") ou código IBGE (ex: "35")
+        include_stats: Se True, inclui área (km²), perímetro (km), centroide e bbox
 
     Returns:
         Lista de municípios com id (código IBGE), nome e descrição
@@ -149,33 +484,97 @@ def list_municipalities(
     logger.info(f"Tool list_municipalities() chamada com uf={uf}")
     _assert_data_root()
 
-    geojson_data = _load_state_geojson(uf)
+    properties = _load_state_properties(uf)
 
-    municipalities = []
-    for feature in geojson_data.get("features", []):
-        props = feature.get("properties", {})
-        municipalities.append(
-            {
-                "id": props.get("id", ""),
-                "name": props.get("name", ""),
-                "description": props.get("description", ""),
-            }
-        )
+    table = None
+    if include_stats:
+        from .attributes import load_attributes_with_cache
+
+        table = load_attributes_with_cache(_get_state_file(uf), _get_cache_dir())
+
+    municipalities: list[dict[str, Any]] = []
+    for index, props in enumerate(properties):
+        municipality: dict[str, Any] = {
+            "id": props.get("id", ""),
+            "name": props.get("name", ""),
+            "description": props.get("description", ""),
+        }
+        if table is not None:
+            row = table[index]
+            for key in ("area_km2", "perimeter_km", "centroid", "bbox"):
+                municipality[key] = row[key]
+        municipalities.append(municipality)
 
     logger.info(f"Retornando {len(municipalities)} municípios de {uf}")
     return municipalities
 
 
+def _shape_feature(
+    feature: dict[str, Any], include_geometry: str, file_path: Path
+) -> dict[str, Any]:
+    """Aplica o modo include_geometry a uma única feature.
+
+    Com o estado em memória, bbox, centroide e geometria simplificada vêm das
+    tabelas pré-calculadas do estado; nas leituras a frio (uma única feature)
+    são calculados só para ela.
+
+    Raises:
+        ValueError: Se o modo for inválido
+    """
+    if include_geometry == DEFAULT_GEOMETRY_MODE:
+        return feature
+
+    from .attributes import (
+        build_light_feature,
+        compute_feature_attributes,
+        load_attributes_with_cache,
+        load_simplified_with_cache,
+        simplify_feature_geometry,
+        validate_geometry_mode,
+    )
+
+    mode = validate_geometry_mode(include_geometry)
+    if mode == "full":
+        return feature
+    properties = feature.get("properties", {})
+    if mode == "none":
+        return build_light_feature(properties, mode)
+
+    geojson_data = get_cached_geojson(file_path) if _get_backend() == "geojson" else None
+    features = geojson_data.get("features", []) if geojson_data else []
+    index = next((i for i, f in enumerate(features) if f is feature), None)
+
+    row = simplified = None
+    if mode == "simplified":
+        if index is None:
+            simplified = simplify_feature_geometry(feature)
+        else:
+            simplified = load_simplified_with_cache(file_path, _get_cache_dir())[index]
+    elif index is None:
+        row = compute_feature_attributes(feature)
+    else:
+        row = load_attributes_with_cache(file_path, _get_cache_dir())[index]
+    return build_light_feature(properties, mode, row, simplified)
+
+
 @app.tool()
+@instrument_tool
+@profile_tool
 def get_municipality_geojson(
     uf: str = Field(description="Sigla da UF (ex: SP, RJ) ou código IBGE"),
     municipality_name: str = Field(description="Nome do município (ex: São Paulo, Campinas)"),
+    include_geometry: Annotated[
+        str, Field(description=_GEOMETRY_MODE_DESCRIPTION)
+    ] = DEFAULT_GEOMETRY_MODE,
 ) -> dict[str, Any]:
     """Obtém o GeoJSON de um município específico.
 
     Args:
         uf: Sigla da UF (ex: "SP") ou código IBGE (ex: "35")
         municipality_name: Nome do município (busca case-insensitive e normalizada)
+        include_geometry: "full" retorna a geometria original; "simplified" uma
+            versão simplificada; "centroid" um Point; "bbox" apenas o membro
+            bbox; "none" apenas as propriedades
 
     Returns:
         Feature GeoJSON do município
@@ -185,29 +584,45 @@ def get_municipality_geojson(
     )
     _assert_data_root()
 
-    geojson_data = _load_state_geojson(uf)
-    features = geojson_data.get("features", [])
-
-    # Usa a função de busca do utils (com normalização de texto)
-    results = search_features_by_name(features, municipality_name)
+    backend = _get_backend()
+    if backend == "sqlite":
+        # Mesma regra de busca, pelo nome normalizado indexado no banco
+        found = _get_store().find_by_name(get_state_code(uf), municipality_name)
+        results = [found] if found else []
+    elif backend == "compact":
+        found = _compact_lookup(_get_state_arrays(uf).match_name, municipality_name)
+        results = [found] if found else []
+    else:
+        geojson_data = _load_state_geojson(uf)
+        features = geojson_data.get("features", [])
+
+        # Usa a função de busca do utils (com normalização de texto)
+        results = search_features_by_name(features, municipality_name)
 
     if results:
         result_name = results[0].get("properties", {}).get("name", "")
         logger.info(f"Município encontrado: {result_name}")
-        return results[0]  # Retorna o primeiro resultado
+        # Retorna o primeiro resultado
+        return _shape_feature(results[0], include_geometry, _get_state_file(uf))
 
     logger.warning(f"Município '{municipality_name}' não encontrado em {uf.upper()}")
     raise ValueError(f"Município '{municipality_name}' não encontrado em {uf.upper()}")
 
 
 @app.tool()
+@instrument_tool
+@profile_tool
 def search_municipality_by_ibge(
     ibge_code: str = Field(description="Código IBGE do município (7 dígitos)"),
+    include_geometry: Annotated[
+        str, Field(description=_GEOMETRY_MODE_DESCRIPTION)
+    ] = DEFAULT_GEOMETRY_MODE,
 ) -> dict[str, Any]:
     """Busca um município pelo código IBGE.
 
     Args:
         ibge_code: Código IBGE de 7 dígitos do município
+        include_geometry: "full" (padrão), "simplified", "centroid", "bbox" ou "none"
 
     Returns:
         Feature GeoJSON do município
@@ -216,58 +631,962 @@ def search_municipality_by_ibge(
     _assert_data_root()
 
     # Os 2 primeiros dígitos são o código do estado
-    if len(ibge_code) < 2:
-        logger.error(f"Código IBGE inválido (muito curto): {ibge_code}")
-        raise ValueError("Código IBGE deve ter pelo menos 2 dígitos")
+    state_code = _state_code_from_ibge(ibge_code)
+    file_path = _get_state_file(state_code)
+
+    geojson_data = get_cached_geojson(file_path)
+    backend = _get_backend()
+    if backend == "sqlite":
+        store = _get_store()
+        if not store.has_state(state_code):
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        result = store.get_by_id(ibge_code)
+    elif backend == "compact":
+        result = _compact_lookup(_get_state_arrays(state_code).find_by_id, ibge_code)
+    elif geojson_data is not None:
+        # Estado já carregado: usa a função de busca do utils
+        result = search_features_by_ibge(geojson_data.get("features", []), ibge_code)
+    else:
+        # Estado frio: lê apenas o trecho da feature pelo índice de offsets
+        entry = _get_catalog().get(state_code)
+        if entry is None:
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        if is_compressed(entry.path):
+            # Offsets não valem para arquivos comprimidos: carrega o estado
+            features = load_geojson_with_cache(file_path).get("features", [])
+            result = search_features_by_ibge(features, ibge_code)
+        else:
+            result = read_feature(file_path, ibge_code, _get_cache_dir())
 
-    state_code = ibge_code[:2]
+    if result:
+        result_name = result.get("properties", {}).get("name", "")
+        logger.info(f"Município encontrado: {result_name} ({ibge_code})")
+        return _shape_feature(result, include_geometry, file_path)
 
-    if state_code not in IBGE_TO_STATE:
-        logger.error(f"Código de estado inválido: {state_code}")
-        raise ValueError(f"Código de estado inválido: {state_code}")
+    logger.warning(f"Município com código IBGE {ibge_code} não encontrado")
+    raise ValueError(f"Município com código IBGE {ibge_code} não encontrado")
 
-    geojson_data = _load_state_geojson(state_code)
-    features = geojson_data.get("features", [])
 
-    # Usa a função de busca do utils
-    result = search_features_by_ibge(features, ibge_code)
+def _estimate_response(
+    codes: list[str],
+    mode: str = "full",
+    encoding: str = "identity",
+    counts: dict[str, int] | None = None,
+) -> int:
+    """Estima o tamanho de uma resposta com municípios dos estados, sem carregá-los.
 
-    if result:
-        result_name = result.get("properties", {}).get("name", "")
-        logger.info(f"Município encontrado: {result_name} ({ibge_code})")
+    Args:
+        codes: Códigos IBGE dos arquivos de origem
+        mode: Modo de geometria
+        encoding: Codificação da resposta
+        counts: Municípios pedidos por estado (padrão: todos os do arquivo)
+
+    Returns:
+        Tamanho estimado em bytes
+    """
+    cache_dir = _get_cache_dir()
+    total = 0.0
+    for code in codes:
+        content_bytes: float = source_content_bytes(_get_state_file(code), cache_dir)
+        if counts is not None and content_bytes:
+            feature_count = _get_catalog().feature_count(code) or 1
+            content_bytes = content_bytes * min(1.0, counts[code] / feature_count)
+        total += content_bytes
+    return estimate_response_bytes(int(total), mode, encoding)
+
+
+def _check_batch_geometry_size(tool: str, counts: dict[str, int]):
+    """Recusa um lote com geometrias cuja resposta estimada passe do limite."""
+    check_response_size(
+        tool,
+        _estimate_response(list(counts), counts=counts),
+        [
+            "include_geometry=false (só id e nome)",
+            "divida o lote em chamadas menores",
+            "get_municipality_stats para área, centroide e bbox",
+        ],
+    )
+
+
+def _admit_ibge_batch(ibge_codes: list[str], include_geometry: bool = False):
+    """Verificação prévia de search_municipality_by_ibge_batch (antes da vaga da tool)."""
+    if not include_geometry:
+        return
+    counts: dict[str, int] = {}
+    for ibge_code in ibge_codes:
+        if len(ibge_code) >= 2 and ibge_code[:2] in STATE_CODES:
+            counts[ibge_code[:2]] = counts.get(ibge_code[:2], 0) + 1
+    _check_batch_geometry_size("search_municipality_by_ibge_batch", counts)
+
+
+def _admit_name_batch(queries: list[list[str]], include_geometry: bool = False):
+    """Verificação prévia de get_municipality_geojson_batch (antes da vaga da tool)."""
+    if not include_geometry:
+        return
+    counts: dict[str, int] = {}
+    for query in queries:
+        if len(query) != 2:
+            continue
+        try:
+            state_code = get_state_code(query[0])
+        except ValueError:
+            continue
+        counts[state_code] = counts.get(state_code, 0) + 1
+    _check_batch_geometry_size("get_municipality_geojson_batch", counts)
+
+
+def _check_batch_size(items: list[Any]):
+    """Valida o tamanho de uma requisição em lote.
+
+    Raises:
+        ValueError: Se a lista estiver vazia ou passar de BATCH_MAX_ITEMS
+    """
+    if not items:
+        raise ValueError("A lista de consultas está vazia")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(
+            f"Lote grande demais: {len(items)} itens (máximo {BATCH_MAX_ITEMS}). "
+            "Divida a lista em várias chamadas."
+        )
+
+
+def _batch_found(query: Any, feature: dict[str, Any], include_geometry: bool) -> dict[str, Any]:
+    """Monta o item de resultado de um município encontrado."""
+    props = feature.get("properties", {})
+    item = {
+        "query": query,
+        "found": True,
+        "id": props.get("id", ""),
+        "name": props.get("name", ""),
+        "description": props.get("description", ""),
+    }
+    if include_geometry:
+        item["geometry"] = feature.get("geometry")
+    return item
+
+
+def _match_normalized_name(
+    names: list[tuple[str, dict[str, Any]]], name: str
+) -> dict[str, Any] | None:
+    """Primeira feature cujo nome casa com a busca (regra de search_features_by_name).
+
+    Args:
+        names: Pares (nome normalizado, feature) na ordem do arquivo
+        name: Termo de busca
+
+    Returns:
+        Feature ou None
+    """
+    term = normalize_text(name)
+    return next((f for n, f in names if term in n or n in term), None)
+
+
+def _batch_error(query: Any, message: str) -> dict[str, Any]:
+    """Monta o item de resultado de uma consulta sem município."""
+    return {"query": query, "found": False, "error": message}
+
+
+@app.tool()
+@instrument_tool(serialize_payload=False)
+@limit_concurrency(2, admit=_admit_ibge_batch)
+@profile_tool
+def search_municipality_by_ibge_batch(
+    ibge_codes: list[str] = Field(description="Lista de códigos IBGE de municípios (7 dígitos)"),
+    include_geometry: Annotated[
+        bool, Field(description="Inclui a geometria de cada município")
+    ] = False,
+) -> list[dict[str, Any]]:
+    """Busca vários municípios por código IBGE em uma única chamada.
+
+    As consultas são agrupadas por estado: cada estado é carregado e indexado
+    uma vez. Erros de um item (código inválido, município inexistente) não
+    interrompem o lote.
+
+    Args:
+        ibge_codes: Códigos IBGE de 7 dígitos
+        include_geometry: Se True, inclui a geometria de cada município
+
+    Returns:
+        Um item por código, na mesma ordem da entrada, com query, found e
+        id/name/description (e geometry) ou error
+    """
+    logger.info(f"Tool search_municipality_by_ibge_batch() chamada com {len(ibge_codes)} códigos")
+    _assert_data_root()
+    _check_batch_size(ibge_codes)
+
+    results: list[dict[str, Any]] = [{} for _ in ibge_codes]
+    by_state: dict[str, list[int]] = {}
+    for i, ibge_code in enumerate(ibge_codes):
+        state_code = ibge_code[:2]
+        if len(ibge_code) < 2 or state_code not in STATE_CODES:
+            results[i] = _batch_error(ibge_code, f"Código IBGE inválido: {ibge_code}")
+        else:
+            by_state.setdefault(state_code, []).append(i)
+
+    backend = _get_backend()
+    find: Callable[[str], dict[str, Any] | None]
+    for state_code, indices in by_state.items():
+        try:
+            if backend == "sqlite":
+                store = _get_store()
+                if not store.has_state(state_code):
+                    raise FileNotFoundError(
+                        f"Arquivo não encontrado: {_get_state_file(state_code)}"
+                    )
+                find = store.get_by_id
+            elif backend == "compact":
+                table = _get_state_arrays(state_code)
+                find = partial(_compact_lookup, table.find_by_id)
+            else:
+                features = _load_state_geojson(state_code).get("features", [])
+                by_id: dict[str, dict[str, Any]] = {
+                    f.get("properties", {}).get("id"): f for f in reversed(features)
+                }
+                find = by_id.get
+        except FileNotFoundError as e:
+            for i in indices:
+                results[i] = _batch_error(ibge_codes[i], str(e))
+            continue
+
+        for i in indices:
+            feature = find(ibge_codes[i])
+            if feature is None:
+                message = f"Município com código IBGE {ibge_codes[i]} não encontrado"
+                results[i] = _batch_error(ibge_codes[i], message)
+            else:
+                results[i] = _batch_found(ibge_codes[i], feature, include_geometry)
+
+    found = sum(1 for item in results if item["found"])
+    logger.info(f"Lote por código IBGE: {found} de {len(results)} encontrados")
+    return results
+
+
+@app.tool()
+@instrument_tool(serialize_payload=False)
+@limit_concurrency(2, admit=_admit_name_batch)
+@profile_tool
+def get_municipality_geojson_batch(
+    queries: list[list[str]] = Field(
+        description='Lista de pares [uf, nome do município] (ex: [["SP", "Campinas"]])'
+    ),
+    include_geometry: Annotated[
+        bool, Field(description="Inclui a geometria de cada município")
+    ] = False,
+) -> list[dict[str, Any]]:
+    """Busca vários municípios por UF e nome em uma única chamada.
+
+    Mesma regra de busca de get_municipality_geojson (nome normalizado, sem
+    acentos/caixa). As consultas são agrupadas por estado e os nomes de cada
+    estado são normalizados uma vez. Erros de um item não interrompem o lote.
+
+    Args:
+        queries: Pares [uf, nome] (uf pode ser a sigla ou o código IBGE)
+        include_geometry: Se True, inclui a geometria de cada município
+
+    Returns:
+        Um item por par, na mesma ordem da entrada, com query, found e
+        id/name/description (e geometry) ou error
+    """
+    logger.info(f"Tool get_municipality_geojson_batch() chamada com {len(queries)} consultas")
+    _assert_data_root()
+    _check_batch_size(queries)
+
+    results: list[dict[str, Any]] = [{} for _ in queries]
+    by_state: dict[str, list[int]] = {}
+    for i, query in enumerate(queries):
+        if len(query) != 2:
+            results[i] = _batch_error(query, f"Consulta inválida (esperado [uf, nome]): {query}")
+            continue
+        try:
+            state_code = get_state_code(query[0])
+        except ValueError as e:
+            results[i] = _batch_error(query, str(e))
+            continue
+        by_state.setdefault(state_code, []).append(i)
+
+    backend = _get_backend()
+    for state_code, indices in by_state.items():
+        try:
+            if backend == "sqlite":
+                store = _get_store()
+                if not store.has_state(state_code):
+                    raise FileNotFoundError(
+                        f"Arquivo não encontrado: {_get_state_file(state_code)}"
+                    )
+                find = partial(store.find_by_name, state_code)
+            elif backend == "compact":
+                table = _get_state_arrays(state_code)
+                find = partial(_compact_lookup, table.match_name)
+            else:
+                features = _load_state_geojson(state_code).get("features", [])
+                names = [
+                    (normalize_text(f.get("properties", {}).get("name", "")), f) for f in features
+                ]
+                find = partial(_match_normalized_name, names)
+        except FileNotFoundError as e:
+            for i in indices:
+                results[i] = _batch_error(queries[i], str(e))
+            continue
+
+        for i in indices:
+            uf, name = queries[i]
+            feature = find(name)
+            if feature is None:
+                message = f"Município '{name}' não encontrado em {uf.upper()}"
+                results[i] = _batch_error(queries[i], message)
+            else:
+                results[i] = _batch_found(queries[i], feature, include_geometry)
+
+    found = sum(1 for item in results if item["found"])
+    logger.info(f"Lote por nome: {found} de {len(results)} encontrados")
+    return results
+
+
+def _response_signature(codes: list[str]) -> tuple[Any, ...]:
+    """Assinatura dos arquivos de origem de uma resposta (muda quando algum muda)."""
+    catalog = _get_catalog()
+    files = []
+    for code in codes:
+        entry = catalog.get(code)
+        files.append((entry.path.name, entry.size, entry.mtime_ns) if entry else None)
+    return (_get_backend(), tuple(files))
+
+
+def _encode_response(
+    key: str, codes: list[str], encoding: str, build: Callable[[], dict[str, Any]]
+) -> dict[str, Any]:
+    """Retorna a resposta sem compressão ou o corpo comprimido em cache.
+
+    Args:
+        key: Identificador da resposta no cache de corpos comprimidos
+        codes: Códigos IBGE dos arquivos de origem (para invalidação)
+        encoding: "identity", "gzip" ou "zstd"
+        build: Função que gera a resposta sem compressão
+
+    Raises:
+        ValueError: Se a codificação for inválida
+    """
+    encoding = validate_encoding(encoding)
+    if encoding == "identity":
+        return build()
+    return body_cache.get(key, _response_signature(codes), encoding, build)
+
+
+def _brazil_geometry_mode(include_geometry: str) -> str:
+    """Valida o modo de geometria de get_brazil_geojson."""
+    if include_geometry == DEFAULT_GEOMETRY_MODE:
+        return DEFAULT_GEOMETRY_MODE
+
+    from .attributes import validate_geometry_mode
+
+    return validate_geometry_mode(include_geometry)
+
+
+def _brazil_source_codes(mode: str) -> list[str]:
+    """Arquivos de origem de get_brazil_geojson.
+
+    O modo full serve o arquivo nacional; os modos leves são montados a partir
+    das tabelas de cada estado, sem carregar o arquivo nacional (~60MB).
+    """
+    return ["100"] if mode == "full" else STATE_CODES
+
+
+def _build_brazil_light_collection(mode: str) -> dict[str, Any]:
+    """Monta o FeatureCollection nacional em um modo leve, estado por estado."""
+    from .attributes import build_light_collection
+
+    cache_dir = _get_cache_dir()
+    features: list[dict[str, Any]] = []
+    for code in STATE_CODES:
+        collection = build_light_collection(
+            _get_state_file(code), mode, cache_dir, _load_state_properties(code)
+        )
+        features.extend(collection["features"])
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _admit_brazil_geojson(
+    encoding: str = "identity", include_geometry: str = DEFAULT_GEOMETRY_MODE
+):
+    """Verificação prévia de get_brazil_geojson (antes da vaga da tool)."""
+    mode = _brazil_geometry_mode(include_geometry)
+    check_response_size(
+        "get_brazil_geojson",
+        _estimate_response(_brazil_source_codes(mode), mode, validate_encoding(encoding)),
+        [
+            'include_geometry="simplified", "centroid", "bbox" ou "none"',
+            'encoding="gzip"',
+            "get_region_geojson ou list_municipalities por região/estado",
+        ],
+    )
+
+
+@app.tool()
+@instrument_tool(serialize_payload=False)
+@limit_concurrency(1, admit=_admit_brazil_geojson)
+@profile_tool
+def get_brazil_geojson(
+    encoding: Annotated[
+        str,
+        Field(description="identity (padrão), gzip ou zstd: corpo comprimido em base64"),
+    ] = "identity",
+    include_geometry: Annotated[
+        str, Field(description=_GEOMETRY_MODE_DESCRIPTION)
+    ] = DEFAULT_GEOMETRY_MODE,
+) -> dict[str, Any]:
+    """Obtém o GeoJSON completo do Brasil com todos os municípios.
+
+    Respostas estimadas acima do limite (GEODATA_BR_MAX_RESPONSE_BYTES, padrão
+    32 MB) são recusadas antes de carregar os dados: use um modo de geometria
+    leve, encoding comprimido ou consultas por região.
+
+    Args:
+        encoding: "identity" retorna o FeatureCollection; "gzip" ou "zstd"
+            retornam o JSON comprimido (gerado uma vez e mantido em cache)
+        include_geometry: "full" (padrão) ou um modo leve: "simplified",
+            "centroid", "bbox" ou "none", servidos das tabelas pré-calculadas
+
+    Returns:
+        GeoJSON FeatureCollection com todos os municípios do Brasil, ou
+        dicionário com encoding, content_type, size_bytes, uncompressed_bytes
+        e data_base64
+    """
+    logger.info(
+        f"Tool get_brazil_geojson() chamada com encoding={encoding}, "
+        f"include_geometry={include_geometry}"
+    )
+    _assert_data_root()
+    mode = _brazil_geometry_mode(include_geometry)
+
+    def build() -> dict[str, Any]:
+        if mode == "full":
+            logger.warning("Carregando arquivo grande (~60MB)")
+            result = _load_state_geojson("100")
+        else:
+            result = _build_brazil_light_collection(mode)
+        feature_count = len(result.get("features", []))
+        logger.info(f"GeoJSON do Brasil carregado: {feature_count} municípios ({mode})")
         return result
 
+    key = "brazil" if mode == "full" else f"brazil:{mode}"
+    return _encode_response(key, _brazil_source_codes(mode), encoding, build)
+
+
+def _build_region_geojson(region_name: str, outlines_only: bool) -> dict[str, Any]:
+    """Monta o FeatureCollection de uma região (municípios ou contornos)."""
+    ufs = STATES_BY_REGION[region_name]
+    file_paths = [_get_state_file(uf) for uf in ufs]
+
+    if outlines_only:
+        from .dissolve import load_outline_with_cache, load_region_outline_with_cache
+
+        cache_dir = _get_cache_dir()
+        outline_features = []
+        for uf, file_path in zip(ufs, file_paths, strict=True):
+            outline_features.append(
+                {
+                    "type": "Feature",
+                    "properties": {"id": get_state_code(uf), "name": uf, "level": "state"},
+                    "geometry": load_outline_with_cache(file_path, cache_dir),
+                }
+            )
+        outline_features.append(
+            {
+                "type": "Feature",
+                "properties": {"id": region_name, "name": region_name, "level": "region"},
+                "geometry": load_region_outline_with_cache(region_name, file_paths, cache_dir),
+            }
+        )
+        logger.info(f"Região {region_name}: contornos de {len(ufs)} estados")
+        return {
+            "type": "FeatureCollection",
+            "region": region_name,
+            "states": list(ufs),
+            "features": outline_features,
+        }
+
+    collections = _load_state_collections(ufs)
+
+    features: list[dict[str, Any]] = []
+    for collection in collections:
+        features.extend(collection.get("features", []))
+
+    logger.info(f"Região {region_name}: {len(features)} municípios de {len(ufs)} estados")
+    return {
+        "type": "FeatureCollection",
+        "region": region_name,
+        "states": list(ufs),
+        "features": features,
+    }
+
+
+def _admit_region_geojson(region: str, outlines_only: bool = False, encoding: str = "identity"):
+    """Verificação prévia de get_region_geojson (antes da vaga da tool)."""
+    encoding = validate_encoding(encoding)
+    if outlines_only:
+        return
+
+    region_name = _resolve_region(region)
+    codes = [get_state_code(uf) for uf in STATES_BY_REGION[region_name]]
+    check_response_size(
+        "get_region_geojson",
+        _estimate_response(codes, encoding=encoding),
+        [
+            "outlines_only=true (contornos dos estados e da região)",
+            'encoding="gzip"',
+            "get_brazil_geojson com include_geometry leve, ou uma chamada por estado",
+        ],
+    )
+
+
+@app.tool()
+@instrument_tool(serialize_payload=False)
+@limit_concurrency(2, admit=_admit_region_geojson)
+@profile_tool
+def get_region_geojson(
+    region: str = Field(description="Região (Norte, Nordeste, Sudeste, Sul, Centro-Oeste)"),
+    outlines_only: Annotated[
+        bool, Field(description="Retorna apenas os contornos dos estados e da região")
+    ] = False,
+    encoding: Annotated[
+        str,
+        Field(description="identity (padrão), gzip ou zstd: corpo comprimido em base64"),
+    ] = "identity",
+) -> dict[str, Any]:
+    """Obtém o GeoJSON de todos os municípios de uma região.
+
+    Os arquivos dos estados da região são carregados em paralelo (e ficam no
+    mesmo cache usado pelas demais tools), evitando o arquivo nacional de ~60MB.
+    Regiões cuja resposta estimada passe do limite (GEODATA_BR_MAX_RESPONSE_BYTES)
+    são recusadas antes da carga; use outlines_only ou encoding comprimido.
+
+    Args:
+        region: Nome da região (ex: "Nordeste", "centro-oeste")
+        outlines_only: Se True, retorna uma feature por estado (contorno dissolvido)
+            e uma para a região inteira, em vez dos municípios
+        encoding: "identity" retorna o FeatureCollection; "gzip" ou "zstd"
+            retornam o JSON comprimido (gerado uma vez e mantido em cache)
+
+    Returns:
+        GeoJSON FeatureCollection com os municípios da região, mais os campos
+        "region" e "states" (UFs incluídas), ou o corpo comprimido
+    """
+    logger.info(f"Tool get_region_geojson() chamada com region={region}, encoding={encoding}")
+    _assert_data_root()
+
+    region_name = _resolve_region(region)
+    codes = [get_state_code(uf) for uf in STATES_BY_REGION[region_name]]
+    return _encode_response(
+        f"region:{region_name}:{'outlines' if outlines_only else 'municipalities'}",
+        codes,
+        encoding,
+        lambda: _build_region_geojson(region_name, outlines_only),
+    )
+
+
+@app.tool()
+@instrument_tool
+@profile_tool
+def get_municipality_stats(
+    ibge_code: str = Field(description="Código IBGE do município (7 dígitos)"),
+) -> dict[str, Any]:
+    """Obtém atributos derivados de um município sem retornar a geometria.
+
+    Args:
+        ibge_code: Código IBGE de 7 dígitos do município
+
+    Returns:
+        Dicionário com id, nome, área (km²), perímetro (km), centroide [lon, lat]
+        e bbox [min_lon, min_lat, max_lon, max_lat]
+    """
+    logger.info(f"Tool get_municipality_stats() chamada com ibge_code={ibge_code}")
+    _assert_data_root()
+
+    from .attributes import find_attributes_by_ibge, load_attributes_with_cache
+
+    state_code = _state_code_from_ibge(ibge_code)
+    table = load_attributes_with_cache(_get_state_file(state_code), _get_cache_dir())
+    row = find_attributes_by_ibge(table, ibge_code)
+
+    if row:
+        logger.info(f"Atributos encontrados: {row['name']} ({ibge_code})")
+        return dict(row)
+
     logger.warning(f"Município com código IBGE {ibge_code} não encontrado")
     raise ValueError(f"Município com código IBGE {ibge_code} não encontrado")
 
 
 @app.tool()
-def get_brazil_geojson() -> dict[str, Any]:
-    """Obtém o GeoJSON completo do Brasil com todos os municípios.
+@instrument_tool
+@profile_tool
+def nearest_municipalities(
+    lat: float = Field(description="Latitude do ponto (graus decimais)"),
+    lon: float = Field(description="Longitude do ponto (graus decimais)"),
+    k: Annotated[int, Field(description="Número de municípios a retornar")] = 5,
+    max_km: Annotated[float | None, Field(description="Distância máxima em km (opcional)")] = None,
+) -> list[dict[str, Any]]:
+    """Busca os municípios mais próximos de um ponto pelo centroide.
+
+    Útil para pontos no mar ou em lacunas entre fronteiras, onde a busca
+    ponto-em-polígono não retorna nada.
+
+    Args:
+        lat: Latitude do ponto
+        lon: Longitude do ponto
+        k: Número de municípios a retornar
+        max_km: Distância máxima em km (opcional)
 
     Returns:
-        GeoJSON FeatureCollection com todos os municípios do Brasil
+        Lista de municípios (id, nome, distância em km, centroide e ponto
+        representativo) ordenada por distância
     """
-    logger.info("Tool get_brazil_geojson() chamada")
-    logger.warning("Carregando arquivo grande (~60MB)")
+    logger.info(f"Tool nearest_municipalities() chamada com lat={lat}, lon={lon}, k={k}")
     _assert_data_root()
+    _validate_nearest_args(lat, lon, k, max_km)
+
+    results = _get_centroid_index().nearest(lat, lon, k=k, max_km=max_km)
+
+    logger.info(f"Retornando {len(results)} municípios próximos")
+    return results
 
-    result = _load_state_geojson("100")
-    feature_count = len(result.get("features", []))
-    logger.info(f"GeoJSON do Brasil carregado: {feature_count} municípios")
 
+@app.tool()
+@instrument_tool
+@profile_tool
+def nearest_municipalities_batch(
+    points: list[list[float]] = Field(description="Lista de pontos [[lat, lon], ...]"),
+    k: Annotated[int, Field(description="Número de municípios por ponto")] = 5,
+    max_km: Annotated[float | None, Field(description="Distância máxima em km (opcional)")] = None,
+) -> list[list[dict[str, Any]]]:
+    """Busca os municípios mais próximos para vários pontos de uma vez.
+
+    Args:
+        points: Lista de pontos no formato [lat, lon]
+        k: Número de municípios por ponto
+        max_km: Distância máxima em km (opcional)
+
+    Returns:
+        Uma lista de resultados por ponto, na mesma ordem da entrada
+    """
+    logger.info(f"Tool nearest_municipalities_batch() chamada com {len(points)} pontos, k={k}")
+    _assert_data_root()
+
+    for point in points:
+        if len(point) != 2:
+            raise ValueError(f"Ponto inválido (esperado [lat, lon]): {point}")
+        _validate_nearest_args(point[0], point[1], k, max_km)
+
+    index = _get_centroid_index()
+    results = [index.nearest(lat, lon, k=k, max_km=max_km) for lat, lon in points]
+
+    logger.info(f"Retornando resultados para {len(results)} pontos")
+    return results
+
+
+@app.tool()
+@instrument_tool
+@profile_tool
+def distance_matrix(
+    codes_a: list[str] = Field(
+        description="Códigos IBGE das linhas (municípios, ou estados com 2 dígitos)"
+    ),
+    codes_b: list[str] = Field(
+        description="Códigos IBGE das colunas (municípios, ou estados com 2 dígitos)"
+    ),
+    max_km: Annotated[
+        float | None,
+        Field(description="Se informado, retorna só os pares a até max_km (em vez da matriz)"),
+    ] = None,
+) -> dict[str, Any]:
+    """Calcula as distâncias em linha reta entre os centroides de dois grupos de municípios.
+
+    Distância de grande círculo (sem rotas), a partir dos centroides já
+    calculados no índice espacial. Sem max_km, devolve a matriz densa; com
+    max_km, devolve só os pares dentro do raio, buscados por KD-tree sem
+    calcular o produto completo.
+
+    Args:
+        codes_a: Códigos IBGE do primeiro grupo (um código de estado inclui
+            todos os seus municípios)
+        codes_b: Códigos IBGE do segundo grupo
+        max_km: Distância máxima em km (opcional)
+
+    Returns:
+        Dicionário com codes_a e codes_b (municípios, na ordem usada) e
+        distances (linhas de codes_a, colunas de codes_b, em km); com max_km,
+        pairs (a, b, distance_km) e pair_count no lugar de distances
+
+    Raises:
+        ValueError: Se algum código não existir, max_km não for positivo ou a
+            matriz densa passar de MATRIX_MAX_CELLS células
+    """
+    logger.info(
+        f"Tool distance_matrix() chamada com {len(codes_a)} x {len(codes_b)} códigos, "
+        f"max_km={max_km}"
+    )
+    _assert_data_root()
+    if not codes_a or not codes_b:
+        raise ValueError("codes_a e codes_b devem ter pelo menos um código")
+    if max_km is not None and max_km <= 0:
+        raise ValueError("max_km deve ser positivo")
+
+    from .spatial import MATRIX_MAX_CELLS
+
+    index = _get_centroid_index()
+    positions_a = index.resolve_codes([code.strip() for code in codes_a])
+    positions_b = index.resolve_codes([code.strip() for code in codes_b])
+    result: dict[str, Any] = {
+        "codes_a": [index.ids[i] for i in positions_a],
+        "codes_b": [index.ids[i] for i in positions_b],
+        "unit": "km",
+    }
+
+    if max_km is not None:
+        pairs = index.pairs_within(positions_a, positions_b, max_km)
+        result.update({"max_km": max_km, "pairs": pairs, "pair_count": len(pairs)})
+        logger.info(f"Retornando {len(pairs)} pares a até {max_km} km")
+        return result
+
+    cells = len(positions_a) * len(positions_b)
+    if cells > MATRIX_MAX_CELLS:
+        raise ValueError(
+            f"Matriz muito grande ({len(positions_a)} x {len(positions_b)} = {cells} células; "
+            f"máximo {MATRIX_MAX_CELLS}). Informe max_km para receber só os pares próximos"
+        )
+
+    result["distances"] = index.distance_matrix(positions_a, positions_b)
+    logger.info(f"Retornando matriz {len(positions_a)} x {len(positions_b)}")
     return result
 
 
-if __name__ == "__main__":
-    # Inicia o servidor MCP via stdio
+@app.tool()
+@instrument_tool
+@limit_concurrency(2)
+@profile_tool
+def intersect_municipalities(
+    geometry: dict[str, Any] = Field(
+        description="Polígono GeoJSON em lon/lat (Polygon, MultiPolygon ou Feature)"
+    ),
+    area_weighted: Annotated[
+        bool,
+        Field(
+            description="Calcula a área de sobreposição de cada município (padrão); "
+            "False só lista os municípios que intersectam o polígono"
+        ),
+    ] = True,
+) -> dict[str, Any]:
+    """Lista os municípios que intersectam um polígono qualquer (ex: área de atendimento).
+
+    Os estados e municípios candidatos saem dos bbox (manifesto e índice de
+    bbox por estado); só os candidatos passam pelo recorte exato dos
+    polígonos. A área de sobreposição usa a mesma fórmula da área dos
+    municípios: um município inteiramente coberto tem overlap_fraction 1.
+
+    Args:
+        geometry: Polygon, MultiPolygon ou Feature GeoJSON (buracos são respeitados)
+        area_weighted: Se True, calcula as áreas de sobreposição; se False, só
+            testa a interseção (tocar a borda conta)
+
+    Returns:
+        Dicionário com query_area_km2, count e municipalities: id, name e,
+        com area_weighted, area_km2, overlap_km2, overlap_fraction (fração do
+        município coberta) e query_fraction (fração do polígono naquele
+        município), em ordem decrescente de sobreposição
+
+    Raises:
+        ValueError: Se a geometria não for um polígono válido ou tiver mais de
+            INTERSECT_MAX_VERTICES vértices
+    """
+    logger.info(f"Tool intersect_municipalities() chamada com area_weighted={area_weighted}")
+    _assert_data_root()
+
+    from .overlay import PreparedPolygon, intersection_area_km2, intersects
+
+    query = PreparedPolygon(_parse_query_geometry(geometry))
+    min_lon, min_lat, max_lon, max_lat = query.bbox
+    catalog = _get_catalog()
+    manifest = get_manifest(_get_cache_dir())
+    municipalities: list[dict[str, Any]] = []
+
+    for code in STATE_CODES:
+        entry = catalog.get(code)
+        if entry is None:
+            continue
+        state_bbox = manifest.get(entry.path, entry.size, entry.mtime_ns)["bbox"]
+        if not state_bbox or (
+            state_bbox[0] > max_lon
+            or state_bbox[2] < min_lon
+            or state_bbox[1] > max_lat
+            or state_bbox[3] < min_lat
+        ):
+            continue
+
+        table, index = _get_state_bbox_index(code)
+        candidates = index.query(min_lon, min_lat, max_lon, max_lat)
+        if not candidates:
+            continue
+
+        features = {
+            str(feature.get("properties", {}).get("id", "")): feature
+            for feature in _load_state_geojson(code).get("features", [])
+        }
+        for position in candidates:
+            row = table[position]
+            feature = features.get(str(row["id"]))
+            if feature is None or not feature.get("geometry"):
+                continue
+            municipality = PreparedPolygon(feature["geometry"])
+
+            if not area_weighted:
+                if intersects(query, municipality):
+                    municipalities.append({"id": row["id"], "name": row["name"]})
+                continue
+
+            overlap = intersection_area_km2(query, municipality)
+            if overlap <= INTERSECT_MIN_OVERLAP_KM2:
+                continue
+            municipalities.append(
+                {
+                    "id": row["id"],
+                    "name": row["name"],
+                    "area_km2": row["area_km2"],
+                    "overlap_km2": round(overlap, 6),
+                    "overlap_fraction": round(overlap / municipality.area_km2, 6),
+                    "query_fraction": round(overlap / query.area_km2, 6),
+                }
+            )
+
+    if area_weighted:
+        municipalities.sort(key=lambda item: (-item["overlap_km2"], item["id"]))
+    else:
+        municipalities.sort(key=lambda item: item["id"])
+
+    logger.info(f"Polígono intersecta {len(municipalities)} municípios")
+    return {
+        "query_area_km2": round(query.area_km2, 6),
+        "area_weighted": area_weighted,
+        "count": len(municipalities),
+        "municipalities": municipalities,
+    }
+
+
+@app.tool()
+@instrument_tool
+@profile_tool
+def get_vector_tile(
+    z: int = Field(description="Zoom do tile (0 a 22)"),
+    x: int = Field(description="Coluna do tile (esquema XYZ)"),
+    y: int = Field(description="Linha do tile (esquema XYZ, origem no topo)"),
+) -> dict[str, Any]:
+    """Obtém um vector tile (Mapbox Vector Tile) com os municípios.
+
+    O tile tem uma camada "municipalities" com as propriedades id e name,
+    recortada e simplificada para o zoom. Tiles gerados ficam em cache em
+    memória e em disco (veja "make tiles-seed" para pré-gerar zoom 0 a 10).
+
+    Args:
+        z: Zoom
+        x: Coluna do tile
+        y: Linha do tile
+
+    Returns:
+        Dicionário com z, x, y, camada, tamanho e o conteúdo do tile em base64
+        (vazio quando não há municípios no tile)
+    """
+    logger.info(f"Tool get_vector_tile() chamada com z={z}, x={x}, y={y}")
+    _assert_data_root()
+
+    from .tiles import LAYER_NAME
+
+    tile = _get_tile_cache().get(z, x, y)
+
+    logger.info(f"Tile {z}/{x}/{y}: {len(tile)} bytes")
+    return {
+        "z": z,
+        "x": x,
+        "y": y,
+        "layer": LAYER_NAME,
+        "content_type": "application/vnd.mapbox-vector-tile",
+        "size_bytes": len(tile),
+        "data_base64": base64.b64encode(tile).decode("ascii"),
+    }
+
+
+@app.tool()
+@instrument_tool
+@profile_tool
+def get_server_metrics(
+    format: Annotated[
+        str, Field(description="Formato da resposta: 'json' (padrão) ou 'prometheus'")
+    ] = "json",
+) -> dict[str, Any]:
+    """Obtém as métricas de uso do servidor.
+
+    Inclui latência por tool (contagem, média, p50/p90/p99 em ms), número de
+    chamadas e erros, tamanho das respostas (amostrado), acertos dos caches e
+    tempo de leitura/parse de cada arquivo GeoJSON.
+
+    Args:
+        format: "json" para um dicionário estruturado, "prometheus" para o
+            formato texto de exposição do Prometheus
+
+    Returns:
+        Dicionário com as métricas (ou com o texto Prometheus em "text")
+
+    Raises:
+        ValueError: Se o formato for inválido
+    """
+    logger.info(f"Tool get_server_metrics() chamada com format={format}")
+
+    if format not in ("json", "prometheus"):
+        raise ValueError(f"Formato inválido: {format}. Use 'json' ou 'prometheus'")
+
+    if format == "prometheus":
+        return {"format": "prometheus", "text": registry.render_prometheus()}
+
+    caches: dict[str, Any] = {
+        "geojson_files_cached": get_cache_size(),
+        "hit_ratio": cache_hit_ratios(),
+    }
+    if _tile_cache is not None:
+        caches["tiles"] = {"hits": _tile_cache.hits, "misses": _tile_cache.misses}
+
+    return {"format": "json", **registry.snapshot(), "caches": caches}
+
+
+def main(argv: list[str] | None = None):
+    """Configura o logging e inicia o servidor MCP (stdio, streamable-http ou SSE).
+
+    Args:
+        argv: Argumentos da linha de comando (padrão: sys.argv)
+    """
+    from .serving import parse_serving_args, run_http
+
+    config = parse_serving_args(argv)
+
+    # Configuração de logging (feita aqui, e não no import, para não alterar o
+    # logging de quem apenas importa o módulo). force=True substitui o handler
+    # que o FastMCP instala ao ser criado.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        force=True,
+    )
+
     logger.info("=== Geodata-BR MCP Server Iniciando ===")
     logger.info(f"Python Path: {sys.executable}")
     logger.info(f"DATA_ROOT: {DATA_ROOT}")
     logger.info("Versão: 0.1.0")
 
     try:
-        app.run()
+        if config.transport == "stdio":
+            app.run()
+        else:
+            run_http(app, config)
     except Exception as e:
         logger.error(f"Erro fatal ao executar servidor: {e}", exc_info=True)
         raise
+
+
+if __name__ == "__main__":
+    main()
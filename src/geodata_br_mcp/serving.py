@@ -0,0 +1,324 @@
+"""
+Modo HTTP (streamable-http / SSE) do servidor MCP Geodata-BR.
+
+No transporte stdio cada cliente inicia o seu próprio processo, com os seus
+próprios caches. No modo HTTP um único processo de longa duração atende
+vários agentes ao mesmo tempo, todos sobre o mesmo cache já aquecido:
+
+- as tools são funções síncronas e o FastMCP as executaria dentro do event
+  loop, uma de cada vez. offload_tools() as envolve para rodar em threads,
+  com no máximo GEODATA_BR_MAX_CONCURRENCY chamadas em execução;
+- backpressure: chamadas além desse limite esperam em uma fila de até
+  GEODATA_BR_MAX_QUEUE posições, por no máximo GEODATA_BR_QUEUE_TIMEOUT
+  segundos. Com a fila cheia (ou o tempo esgotado) a chamada falha na hora
+  com ServerBusyError, em vez de acumular memória e latência;
+- tools pesadas (admission.limit_concurrency): a estimativa de tamanho e a
+  espera pela vaga da própria tool acontecem antes da fila global, então
+  chamadas pesadas aguardando não ocupam vagas das demais tools;
+- conexões: acima de GEODATA_BR_MAX_CONNECTIONS conexões/requisições HTTP
+  simultâneas o uvicorn responde 503. Conexões ociosas ficam abertas por
+  GEODATA_BR_KEEP_ALIVE segundos (keep-alive), e os streams SSE recebem pings
+  periódicos.
+
+Uso:
+    python -m src.geodata_br_mcp.server --transport streamable-http --port 8000
+"""
+
+import argparse
+import functools
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from .admission import ServerBusyError, ToolAdmission, get_heavy_tool_timeout
+from .config import env_number
+from .metrics import LATENCY_BUCKETS_MS, registry
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger("geodata-br-mcp")
+
+T = TypeVar("T")
+
+# Variáveis de ambiente
+ENV_TRANSPORT = "GEODATA_BR_TRANSPORT"
+ENV_HOST = "GEODATA_BR_HOST"
+ENV_PORT = "GEODATA_BR_PORT"
+ENV_MAX_CONCURRENCY = "GEODATA_BR_MAX_CONCURRENCY"
+ENV_MAX_QUEUE = "GEODATA_BR_MAX_QUEUE"
+ENV_QUEUE_TIMEOUT = "GEODATA_BR_QUEUE_TIMEOUT"
+ENV_MAX_CONNECTIONS = "GEODATA_BR_MAX_CONNECTIONS"
+ENV_KEEP_ALIVE = "GEODATA_BR_KEEP_ALIVE"
+ENV_STATELESS = "GEODATA_BR_STATELESS"
+
+# Transportes suportados (os mesmos do FastMCP)
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    """Configuração do transporte e dos limites de concorrência."""
+
+    transport: str = "stdio"
+    host: str = "127.0.0.1"
+    port: int = 8000
+    max_concurrency: int = 8
+    max_queue: int = 64
+    queue_timeout: float = 30.0
+    max_connections: int = 256
+    keep_alive: float = 30.0
+    stateless: bool = False
+
+
+def load_serving_config() -> ServingConfig:
+    """Lê a configuração do ambiente (valores inválidos usam o padrão).
+
+    Raises:
+        ValueError: Se GEODATA_BR_TRANSPORT não for um transporte suportado
+    """
+    default = ServingConfig()
+    transport = os.environ.get(ENV_TRANSPORT, default.transport).lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Transporte inválido: {transport}. Use um de: {', '.join(TRANSPORTS)}")
+
+    return ServingConfig(
+        transport=transport,
+        host=os.environ.get(ENV_HOST, default.host),
+        port=int(env_number(ENV_PORT, default.port)),
+        max_concurrency=max(1, int(env_number(ENV_MAX_CONCURRENCY, default.max_concurrency))),
+        max_queue=max(0, int(env_number(ENV_MAX_QUEUE, default.max_queue))),
+        queue_timeout=max(0.0, env_number(ENV_QUEUE_TIMEOUT, default.queue_timeout)),
+        max_connections=max(1, int(env_number(ENV_MAX_CONNECTIONS, default.max_connections))),
+        keep_alive=max(1.0, env_number(ENV_KEEP_ALIVE, default.keep_alive)),
+        stateless=os.environ.get(ENV_STATELESS, "").lower() in ("1", "true", "yes"),
+    )
+
+
+def parse_serving_args(argv: list[str] | None = None) -> ServingConfig:
+    """Lê a configuração do ambiente e aplica os argumentos da linha de comando.
+
+    Args:
+        argv: Argumentos (padrão: sys.argv)
+
+    Returns:
+        Configuração final
+    """
+    config = load_serving_config()
+    parser = argparse.ArgumentParser(description="Servidor MCP Geodata-BR")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=config.transport)
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=config.max_concurrency,
+        help="Chamadas de tools executando ao mesmo tempo",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=config.max_queue,
+        help="Chamadas aguardando execução antes de recusar",
+    )
+    parser.add_argument("--queue-timeout", type=float, default=config.queue_timeout)
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=config.max_connections,
+        help="Conexões HTTP simultâneas (acima disso: 503)",
+    )
+    parser.add_argument("--keep-alive", type=float, default=config.keep_alive)
+    parser.add_argument(
+        "--stateless",
+        action="store_true",
+        default=config.stateless,
+        help="Sem sessões no servidor (streamable-http)",
+    )
+    args = parser.parse_args(argv)
+
+    return replace(
+        config,
+        transport=args.transport,
+        host=args.host,
+        port=args.port,
+        max_concurrency=max(1, args.max_concurrency),
+        max_queue=max(0, args.max_queue),
+        queue_timeout=max(0.0, args.queue_timeout),
+        max_connections=max(1, args.max_connections),
+        keep_alive=max(1.0, args.keep_alive),
+        stateless=args.stateless,
+    )
+
+
+class ToolLimiter:
+    """Limita as chamadas em execução e a fila de espera (backpressure).
+
+    As chamadas rodam em threads; no máximo max_concurrency ao mesmo tempo.
+    Uma chamada que encontra max_queue outras esperando, ou que espera mais
+    que queue_timeout segundos, é recusada com ServerBusyError.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._semaphore = anyio.Semaphore(max_concurrency)
+        self._threads = anyio.CapacityLimiter(max_concurrency)
+        self._tool_semaphores: dict[str, anyio.Semaphore] = {}
+
+    @property
+    def active(self) -> int:
+        """Número de chamadas em execução."""
+        return self.max_concurrency - self._semaphore.value
+
+    async def run(self, tool_name: str, func: Callable[..., T], **kwargs: Any) -> T:
+        """Executa func(**kwargs) em uma thread, respeitando os limites.
+
+        Em tools pesadas (atributo admission), a verificação prévia e a espera
+        pela vaga da tool acontecem antes da fila global.
+
+        Raises:
+            ServerBusyError: Se a fila estiver cheia ou a espera expirar
+        """
+        admission: ToolAdmission | None = getattr(func, "admission", None)
+        if admission is None:
+            return await self._run_queued(tool_name, func, kwargs)
+
+        if admission.admit is not None:
+            await anyio.to_thread.run_sync(functools.partial(admission.admit, **kwargs))
+
+        semaphore = self._tool_semaphores.get(admission.tool)
+        if semaphore is None:
+            semaphore = anyio.Semaphore(admission.max_calls)
+            self._tool_semaphores[admission.tool] = semaphore
+
+        timeout = get_heavy_tool_timeout()
+        try:
+            with anyio.fail_after(timeout):
+                await semaphore.acquire()
+        except TimeoutError:
+            registry.inc("tool_rejected_total", tool=tool_name, reason="tool_limit")
+            raise ServerBusyError(
+                f"Servidor ocupado: {tool_name} já tem {admission.max_calls} chamadas em "
+                f"execução e a espera passou de {timeout:g} s. Tente novamente em instantes"
+            ) from None
+
+        try:
+            return await self._run_queued(tool_name, func, kwargs)
+        finally:
+            semaphore.release()
+
+    async def _run_queued(
+        self, tool_name: str, func: Callable[..., T], kwargs: dict[str, Any]
+    ) -> T:
+        """Espera uma vaga global (ou recusa) e executa func em uma thread."""
+        if self._semaphore.value == 0 and self.waiting >= self.max_queue:
+            registry.inc("tool_rejected_total", tool=tool_name, reason="queue_full")
+            raise ServerBusyError(
+                f"Servidor ocupado: {self.active} chamadas em execução e {self.waiting} "
+                "na fila. Tente novamente em instantes"
+            )
+
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            with anyio.fail_after(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            registry.inc("tool_rejected_total", tool=tool_name, reason="timeout")
+            raise ServerBusyError(
+                f"Servidor ocupado: a chamada esperou mais de {self.queue_timeout:g} s "
+                "na fila. Tente novamente em instantes"
+            ) from None
+        finally:
+            self.waiting -= 1
+
+        try:
+            wait_ms = (time.perf_counter() - started) * 1000
+            registry.observe("tool_queue_wait_ms", wait_ms, LATENCY_BUCKETS_MS, tool=tool_name)
+            return await anyio.to_thread.run_sync(
+                functools.partial(func, **kwargs), limiter=self._threads
+            )
+        finally:
+            self._semaphore.release()
+
+
+def offload_tools(app: "FastMCP", limiter: ToolLimiter) -> int:
+    """Faz as tools síncronas do app rodarem em threads, sob o limitador.
+
+    Args:
+        app: Servidor FastMCP com as tools já registradas
+        limiter: Limitador compartilhado por todas as tools
+
+    Returns:
+        Número de tools alteradas
+    """
+    count = 0
+    # O FastMCP não expõe as tools registradas; o gerenciador é a única via
+    for tool in app._tool_manager.list_tools():
+        if tool.is_async:
+            continue
+
+        async def offloaded(_fn=tool.fn, _name=tool.name, **kwargs: Any) -> Any:
+            return await limiter.run(_name, _fn, **kwargs)
+
+        tool.fn = offloaded
+        tool.is_async = True
+        count += 1
+    return count
+
+
+def run_http(app: "FastMCP", config: ServingConfig):
+    """Inicia o servidor HTTP (bloqueia até o encerramento).
+
+    Args:
+        app: Servidor FastMCP com as tools já registradas
+        config: Configuração com transporte "streamable-http" ou "sse"
+    """
+    import uvicorn
+
+    limiter = ToolLimiter(config.max_concurrency, config.max_queue, config.queue_timeout)
+    offload_tools(app, limiter)
+
+    app.settings.host = config.host
+    app.settings.port = config.port
+    app.settings.stateless_http = config.stateless
+    asgi_app = app.sse_app() if config.transport == "sse" else app.streamable_http_app()
+
+    logger.info(
+        f"Servidor HTTP ({config.transport}) em http://{config.host}:{config.port} - "
+        f"{config.max_concurrency} chamadas simultâneas, fila de {config.max_queue}, "
+        f"até {config.max_connections} conexões"
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(
+            asgi_app,
+            host=config.host,
+            port=config.port,
+            timeout_keep_alive=int(config.keep_alive),
+            limit_concurrency=config.max_connections,
+            log_level="warning",
+        )
+    )
+    anyio.run(server.serve)
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "TRANSPORTS",
+    "ServerBusyError",
+    "ServingConfig",
+    "load_serving_config",
+    "parse_serving_args",
+    "ToolLimiter",
+    "offload_tools",
+    "run_http",
+]
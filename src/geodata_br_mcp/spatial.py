@@ -0,0 +1,473 @@
+"""
+Índices espaciais para o servidor MCP Geodata-BR.
+
+Este módulo contém uma KD-tree sobre os centroides dos municípios, usada nas
+consultas de vizinho mais próximo. Os pontos são convertidos para vetores
+unitários 3D: a distância euclidiana entre eles (corda) é monotônica em
+relação à distância de grande círculo, então a árvore devolve exatamente os
+mesmos vizinhos que uma busca por haversine.
+
+Os mesmos vetores servem à matriz de distâncias entre grupos de municípios:
+a distância de grande círculo sai da corda entre os vetores, calculada em
+blocos de linhas, e o filtro por raio usa uma KD-tree sobre o segundo grupo.
+
+Também contém um índice de bounding boxes em grade regular, usado para
+selecionar rapidamente as features que intersectam uma janela (tiles,
+consultas por polígono).
+"""
+
+import heapq
+import math
+from collections.abc import Iterator
+from typing import Any
+
+from .geometry import EARTH_RADIUS_KM, geometry_centroid, representative_point
+
+Vector = tuple[float, float, float]
+
+# Linhas da matriz de distâncias calculadas por bloco
+DISTANCE_CHUNK_ROWS = 256
+
+# Maior matriz densa devolvida (acima disso, use o filtro por raio)
+MATRIX_MAX_CELLS = 1_000_000
+
+
+def to_unit_vector(lat: float, lon: float) -> Vector:
+    """Converte (lat, lon) em graus para um vetor unitário 3D.
+
+    Args:
+        lat: Latitude em graus
+        lon: Longitude em graus
+
+    Returns:
+        Tupla (x, y, z) sobre a esfera unitária
+    """
+    phi = math.radians(lat)
+    lam = math.radians(lon)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lam), cos_phi * math.sin(lam), math.sin(phi))
+
+
+def chord_to_km(chord: float) -> float:
+    """Converte uma distância de corda (esfera unitária) em quilômetros."""
+    return 2.0 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2.0))
+
+
+def km_to_chord(km: float) -> float:
+    """Converte quilômetros em distância de corda na esfera unitária."""
+    angle = min(math.pi, km / EARTH_RADIUS_KM)
+    return 2.0 * math.sin(angle / 2.0)
+
+
+class KDTree:
+    """KD-tree estática sobre vetores 3D.
+
+    A árvore é armazenada de forma implícita: os pontos são reordenados
+    recursivamente pela mediana do eixo de maior extensão, e cada nó guarda
+    apenas o eixo de corte.
+    """
+
+    def __init__(self, points: list[Vector]):
+        self._points = list(points)
+        self._order = list(range(len(self._points)))
+        self._axes: dict[tuple[int, int], int] = {}
+        if self._points:
+            self._build(0, len(self._points))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, start: int, end: int) -> None:
+        """Ordena recursivamente o intervalo [start, end) pela mediana."""
+        if end - start <= 1:
+            return
+
+        points = self._points
+        order = self._order
+        spans = []
+        for axis in range(3):
+            values = [points[order[i]][axis] for i in range(start, end)]
+            spans.append(max(values) - min(values))
+        axis = spans.index(max(spans))
+
+        order[start:end] = sorted(order[start:end], key=lambda i: points[i][axis])
+        self._axes[(start, end)] = axis
+
+        mid = (start + end) // 2
+        self._build(start, mid)
+        self._build(mid + 1, end)
+
+    def query(
+        self, point: Vector, k: int = 1, max_distance: float = math.inf
+    ) -> list[tuple[float, int]]:
+        """Busca os k pontos mais próximos.
+
+        Args:
+            point: Vetor de consulta
+            k: Número de vizinhos
+            max_distance: Distância euclidiana máxima (opcional)
+
+        Returns:
+            Lista de tuplas (distância, índice do ponto) ordenada por distância
+        """
+        if k <= 0 or not self._points:
+            return []
+
+        # Max-heap (distâncias negativas) com os melhores candidatos
+        heap: list[tuple[float, int]] = []
+        bound_sq = max_distance * max_distance
+        points = self._points
+        order = self._order
+        axes = self._axes
+        px, py, pz = point
+
+        stack = [(0, len(points))]
+        while stack:
+            start, end = stack.pop()
+            if start >= end:
+                continue
+
+            mid = (start + end) // 2
+            index = order[mid]
+            qx, qy, qz = points[index]
+            dist_sq = (qx - px) ** 2 + (qy - py) ** 2 + (qz - pz) ** 2
+
+            limit_sq = -heap[0][0] if len(heap) == k else bound_sq
+            if dist_sq <= limit_sq:
+                if len(heap) == k:
+                    heapq.heapreplace(heap, (-dist_sq, index))
+                else:
+                    heapq.heappush(heap, (-dist_sq, index))
+                limit_sq = -heap[0][0] if len(heap) == k else bound_sq
+
+            if end - start <= 1:
+                continue
+
+            axis = axes[(start, end)]
+            diff = point[axis] - points[index][axis]
+            near, far = (
+                ((start, mid), (mid + 1, end)) if diff < 0 else ((mid + 1, end), (start, mid))
+            )
+
+            # Empilha o lado distante primeiro para visitar o próximo antes
+            if diff * diff <= limit_sq:
+                stack.append(far)
+            stack.append(near)
+
+        return sorted((math.sqrt(-neg), index) for neg, index in heap)
+
+    def query_radius(self, point: Vector, max_distance: float) -> list[tuple[float, int]]:
+        """Busca todos os pontos a até max_distance do ponto de consulta.
+
+        Args:
+            point: Vetor de consulta
+            max_distance: Distância euclidiana máxima
+
+        Returns:
+            Lista de tuplas (distância, índice do ponto) ordenada por distância
+        """
+        if not self._points:
+            return []
+
+        bound_sq = max_distance * max_distance
+        points = self._points
+        order = self._order
+        axes = self._axes
+        px, py, pz = point
+
+        found = []
+        stack = [(0, len(points))]
+        while stack:
+            start, end = stack.pop()
+            if start >= end:
+                continue
+
+            mid = (start + end) // 2
+            index = order[mid]
+            qx, qy, qz = points[index]
+            dist_sq = (qx - px) ** 2 + (qy - py) ** 2 + (qz - pz) ** 2
+            if dist_sq <= bound_sq:
+                found.append((math.sqrt(dist_sq), index))
+
+            if end - start <= 1:
+                continue
+
+            diff = point[axes[(start, end)]] - points[index][axes[(start, end)]]
+            # O lado oposto ao do ponto só é visitado se o plano de corte está no raio
+            if diff < 0 or diff * diff <= bound_sq:
+                stack.append((start, mid))
+            if diff >= 0 or diff * diff <= bound_sq:
+                stack.append((mid + 1, end))
+
+        return sorted(found)
+
+
+def iter_distance_rows(
+    vectors_a: list[Vector], vectors_b: list[Vector], chunk_rows: int = DISTANCE_CHUNK_ROWS
+) -> Iterator[list[list[float]]]:
+    """Calcula a matriz de distâncias de grande círculo em blocos de linhas.
+
+    Cada bloco tem no máximo chunk_rows linhas de len(vectors_b) distâncias,
+    então a memória temporária não depende do tamanho de vectors_a.
+
+    Args:
+        vectors_a: Vetores unitários das linhas
+        vectors_b: Vetores unitários das colunas
+        chunk_rows: Linhas por bloco
+
+    Yields:
+        Blocos de linhas, com as distâncias em km (3 casas decimais)
+    """
+    bx = [v[0] for v in vectors_b]
+    by = [v[1] for v in vectors_b]
+    bz = [v[2] for v in vectors_b]
+    diameter = 2.0 * EARTH_RADIUS_KM
+    asin, sqrt = math.asin, math.sqrt
+
+    for start in range(0, len(vectors_a), chunk_rows):
+        yield [
+            [
+                round(
+                    diameter
+                    * asin(min(1.0, sqrt((x - ax) ** 2 + (y - ay) ** 2 + (z - az) ** 2) / 2)),
+                    3,
+                )
+                for x, y, z in zip(bx, by, bz, strict=True)
+            ]
+            for ax, ay, az in vectors_a[start : start + chunk_rows]
+        ]
+
+
+class CentroidIndex:
+    """Índice de vizinhos mais próximos sobre os centroides dos municípios."""
+
+    def __init__(self, features: list[dict[str, Any]]):
+        self.ids: list[str] = []
+        self.names: list[str] = []
+        self.centroids: list[tuple[float, float]] = []
+        self.representative_points: list[tuple[float, float]] = []
+
+        self.vectors: list[Vector] = []
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            centroid = geometry_centroid(geometry)
+            if centroid is None:
+                continue
+            rep_point = representative_point(geometry) or centroid
+            props = feature.get("properties", {})
+
+            self.ids.append(props.get("id", ""))
+            self.names.append(props.get("name", ""))
+            self.centroids.append(centroid)
+            self.representative_points.append(rep_point)
+            self.vectors.append(to_unit_vector(centroid[1], centroid[0]))
+
+        self.positions = {code: index for index, code in enumerate(self.ids)}
+        self._tree = KDTree(self.vectors)
+
+    def __len__(self) -> int:
+        return len(self._tree)
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 5, max_km: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Retorna os k municípios cujo centroide é mais próximo do ponto.
+
+        Args:
+            lat: Latitude do ponto
+            lon: Longitude do ponto
+            k: Número de municípios
+            max_km: Distância máxima em km (opcional)
+
+        Returns:
+            Lista de municípios com id, nome, distância, centroide e ponto representativo
+        """
+        max_chord = km_to_chord(max_km) if max_km is not None else math.inf
+        hits = self._tree.query(to_unit_vector(lat, lon), k=k, max_distance=max_chord)
+
+        results = []
+        for chord, index in hits:
+            results.append(
+                {
+                    "id": self.ids[index],
+                    "name": self.names[index],
+                    "distance_km": round(chord_to_km(chord), 3),
+                    "centroid": list(self.centroids[index]),
+                    "representative_point": list(self.representative_points[index]),
+                }
+            )
+        return results
+
+    def resolve_codes(self, codes: list[str]) -> list[int]:
+        """Converte códigos IBGE em posições do índice.
+
+        Códigos de 2 dígitos (estado) são expandidos para todos os municípios
+        do estado, na ordem do índice.
+
+        Args:
+            codes: Códigos IBGE de municípios (7 dígitos) ou de estados (2 dígitos)
+
+        Returns:
+            Posições dos municípios, sem repetição, na ordem pedida
+
+        Raises:
+            ValueError: Se algum código não existir no índice
+        """
+        positions: list[int] = []
+        seen: set[int] = set()
+        missing = []
+        for code in codes:
+            if len(code) == 2:
+                found = [i for i, ibge in enumerate(self.ids) if ibge.startswith(code)]
+            else:
+                found = [self.positions[code]] if code in self.positions else []
+            if not found:
+                missing.append(code)
+            for index in found:
+                if index not in seen:
+                    seen.add(index)
+                    positions.append(index)
+
+        if missing:
+            shown = ", ".join(missing[:10]) + (" ..." if len(missing) > 10 else "")
+            raise ValueError(f"Códigos IBGE não encontrados: {shown}")
+        return positions
+
+    def distance_matrix(
+        self, positions_a: list[int], positions_b: list[int], chunk_rows: int = DISTANCE_CHUNK_ROWS
+    ) -> list[list[float]]:
+        """Matriz densa de distâncias (km) entre os centroides de dois grupos.
+
+        Args:
+            positions_a: Posições das linhas (veja resolve_codes)
+            positions_b: Posições das colunas
+            chunk_rows: Linhas calculadas por bloco
+
+        Returns:
+            Lista de linhas, uma por município de positions_a
+        """
+        vectors_a = [self.vectors[i] for i in positions_a]
+        vectors_b = [self.vectors[i] for i in positions_b]
+        rows: list[list[float]] = []
+        for chunk in iter_distance_rows(vectors_a, vectors_b, chunk_rows):
+            rows.extend(chunk)
+        return rows
+
+    def pairs_within(
+        self, positions_a: list[int], positions_b: list[int], max_km: float
+    ) -> list[dict[str, Any]]:
+        """Pares (a, b) cujos centroides estão a até max_km, sem o produto completo.
+
+        Monta uma KD-tree sobre o grupo b e faz uma busca por raio para cada
+        município de a.
+
+        Args:
+            positions_a: Posições do primeiro grupo
+            positions_b: Posições do segundo grupo
+            max_km: Distância máxima em km
+
+        Returns:
+            Lista de pares com a, b e distance_km, agrupada por a e ordenada
+            por distância
+        """
+        tree = KDTree([self.vectors[i] for i in positions_b])
+        max_chord = km_to_chord(max_km)
+
+        pairs = []
+        for a in positions_a:
+            for chord, column in tree.query_radius(self.vectors[a], max_chord):
+                pairs.append(
+                    {
+                        "a": self.ids[a],
+                        "b": self.ids[positions_b[column]],
+                        "distance_km": round(chord_to_km(chord), 3),
+                    }
+                )
+        return pairs
+
+
+class BBoxIndex:
+    """Índice de bounding boxes em grade regular (lon/lat).
+
+    Cada bbox é registrado em todas as células que ele cobre; uma consulta
+    visita apenas as células da janela e confirma a interseção dos bbox.
+    """
+
+    def __init__(
+        self,
+        bboxes: list[tuple[float, float, float, float] | list[float] | None],
+        cell_size: float = 1.0,
+    ):
+        self.cell_size = cell_size
+        self.bboxes = [tuple(bbox) if bbox else None for bbox in bboxes]
+        self._cells: dict[tuple[int, int], list[int]] = {}
+
+        for index, bbox in enumerate(self.bboxes):
+            if bbox is None:
+                continue
+            for cell in self._cells_for(bbox):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self.bboxes)
+
+    def _cells_for(self, bbox: tuple[float, ...]) -> list[tuple[int, int]]:
+        """Retorna as células da grade cobertas por um bbox."""
+        size = self.cell_size
+        min_x = math.floor(bbox[0] / size)
+        min_y = math.floor(bbox[1] / size)
+        max_x = math.floor(bbox[2] / size)
+        max_y = math.floor(bbox[3] / size)
+        return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+    def query(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> list[int]:
+        """Retorna os índices cujos bbox intersectam a janela.
+
+        Args:
+            min_lon: Longitude mínima da janela
+            min_lat: Latitude mínima da janela
+            max_lon: Longitude máxima da janela
+            max_lat: Latitude máxima da janela
+
+        Returns:
+            Lista ordenada de índices
+        """
+        size = self.cell_size
+        x0, x1 = math.floor(min_lon / size), math.floor(max_lon / size)
+        y0, y1 = math.floor(min_lat / size), math.floor(max_lat / size)
+
+        # Janelas maiores que a grade ocupada: percorre só as células existentes
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            cells = [c for c in self._cells if x0 <= c[0] <= x1 and y0 <= c[1] <= y1]
+        else:
+            cells = [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+        found: set[int] = set()
+        for cell in cells:
+            for index in self._cells.get(cell, ()):
+                if index in found:
+                    continue
+                bbox = self.bboxes[index]
+                if (
+                    bbox is not None
+                    and bbox[0] <= max_lon
+                    and bbox[2] >= min_lon
+                    and bbox[1] <= max_lat
+                    and bbox[3] >= min_lat
+                ):
+                    found.add(index)
+
+        return sorted(found)
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "to_unit_vector",
+    "chord_to_km",
+    "km_to_chord",
+    "MATRIX_MAX_CELLS",
+    "KDTree",
+    "iter_distance_rows",
+    "CentroidIndex",
+    "BBoxIndex",
+]
@@ -0,0 +1,717 @@
+"""
+Vector tiles (Mapbox Vector Tile) dos municípios para o servidor MCP Geodata-BR.
+
+Este módulo gera tiles MVT sob demanda a partir das features já carregadas:
+seleciona as features do tile pelo índice de bounding boxes, projeta para
+Web Mercator, recorta no tile (com margem), simplifica de acordo com o zoom e
+codifica o protobuf sem dependências externas. Os tiles gerados ficam em um
+cache em memória (LRU) e em disco.
+
+Uso (pré-geração dos tiles, zoom 0 a 10, em paralelo):
+    python -m src.geodata_br_mcp.tiles seed [--min-zoom 0] [--max-zoom 10] [--workers N]
+"""
+
+import argparse
+import hashlib
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .compression import resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    GEOJSON_DIRECTORY,
+    STATE_CODES,
+    get_filename_for_state,
+)
+from .geometry import geometry_bounds, iter_polygons, simplify_points
+from .metrics import record_cache_lookup
+from .spatial import BBoxIndex
+from .utils import load_geojson_with_cache
+
+# Parâmetros do tile (padrões da especificação MVT)
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+LAYER_NAME = "municipalities"
+MAX_ZOOM = 22
+
+# Limite de latitude do Web Mercator
+MAX_LATITUDE = 85.0511287798
+
+# Extensão aproximada do Brasil (min_lon, min_lat, max_lon, max_lat)
+BRAZIL_BOUNDS = (-74.1, -33.8, -28.8, 5.3)
+
+# Subdiretório do cache com os tiles
+TILES_SUBDIRECTORY = "tiles"
+
+# Número máximo de tiles mantidos no cache em memória
+MEMORY_CACHE_SIZE = 1024
+
+# Comandos de geometria do MVT
+_CMD_MOVE_TO = 1
+_CMD_LINE_TO = 2
+_CMD_CLOSE_PATH = 7
+_GEOM_POLYGON = 3
+
+Point = tuple[float, float]
+
+
+# ---------------------------------------------------------------------------
+# Coordenadas de tile
+# ---------------------------------------------------------------------------
+
+
+def validate_tile(z: int, x: int, y: int):
+    """Valida as coordenadas de um tile.
+
+    Raises:
+        ValueError: Se o zoom ou as coordenadas estiverem fora do intervalo
+    """
+    if not 0 <= z <= MAX_ZOOM:
+        raise ValueError(f"Zoom inválido: {z} (0 a {MAX_ZOOM})")
+    size = 1 << z
+    if not (0 <= x < size and 0 <= y < size):
+        raise ValueError(f"Tile inválido para o zoom {z}: x={x}, y={y}")
+
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Retorna o bbox (min_lon, min_lat, max_lon, max_lat) de um tile.
+
+    Args:
+        z: Zoom
+        x: Coluna do tile
+        y: Linha do tile (origem no topo, esquema XYZ)
+
+    Returns:
+        Bounding box em graus
+    """
+    size = 1 << z
+
+    def lat_of(row: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / size))))
+
+    return (x / size * 360.0 - 180.0, lat_of(y + 1), (x + 1) / size * 360.0 - 180.0, lat_of(y))
+
+
+def tiles_for_bounds(
+    bounds: tuple[float, float, float, float], z: int
+) -> list[tuple[int, int, int]]:
+    """Lista os tiles de um zoom que cobrem um bbox.
+
+    Args:
+        bounds: Bounding box (min_lon, min_lat, max_lon, max_lat)
+        z: Zoom
+
+    Returns:
+        Lista de tuplas (z, x, y)
+    """
+    size = 1 << z
+    x0, y1 = _lonlat_to_world(bounds[0], bounds[1])
+    x1, y0 = _lonlat_to_world(bounds[2], bounds[3])
+    col0, col1 = int(x0 * size), min(size - 1, int(x1 * size))
+    row0, row1 = int(y0 * size), min(size - 1, int(y1 * size))
+    return [(z, x, y) for x in range(col0, col1 + 1) for y in range(row0, row1 + 1)]
+
+
+def _lonlat_to_world(lon: float, lat: float) -> Point:
+    """Projeta (lon, lat) para coordenadas Web Mercator normalizadas em [0, 1]."""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+# ---------------------------------------------------------------------------
+# Recorte e simplificação (coordenadas de pixel do tile)
+# ---------------------------------------------------------------------------
+
+
+def _clip_ring(ring: list[Point], low: float, high: float) -> list[Point]:
+    """Recorta um anel no quadrado [low, high]² (Sutherland-Hodgman)."""
+    for axis, bound, keep_above in (
+        (0, low, True),
+        (0, high, False),
+        (1, low, True),
+        (1, high, False),
+    ):
+        if not ring:
+            break
+        clipped: list[Point] = []
+        previous = ring[-1]
+        prev_inside = (previous[axis] >= bound) if keep_above else (previous[axis] <= bound)
+        for current in ring:
+            inside = (current[axis] >= bound) if keep_above else (current[axis] <= bound)
+            if inside != prev_inside:
+                t = (bound - previous[axis]) / (current[axis] - previous[axis])
+                crossing = (
+                    previous[0] + t * (current[0] - previous[0]),
+                    previous[1] + t * (current[1] - previous[1]),
+                )
+                clipped.append(crossing)
+            if inside:
+                clipped.append(current)
+            previous, prev_inside = current, inside
+        ring = clipped
+    return ring
+
+
+def simplify_ring(points: list[tuple[int, int]], tolerance: float) -> list[tuple[int, int]]:
+    """Simplifica um anel aberto com Douglas-Peucker (iterativo).
+
+    Args:
+        points: Vértices do anel (sem repetir o primeiro no final)
+        tolerance: Distância máxima (em pixels do tile) descartada
+
+    Returns:
+        Vértices mantidos, na ordem original
+    """
+    return simplify_points(points, tolerance)
+
+
+def _ring_area2(ring: list[tuple[int, int]]) -> int:
+    """Retorna o dobro da área com sinal de um anel aberto (coordenadas do tile)."""
+    total = 0
+    count = len(ring)
+    for i in range(count):
+        x0, y0 = ring[i]
+        x1, y1 = ring[(i + 1) % count]
+        total += x0 * y1 - x1 * y0
+    return total
+
+
+def to_world_polygons(geometry: dict[str, Any]) -> list[list[list[Point]]]:
+    """Projeta uma geometria para Web Mercator normalizado ([0, 1]²).
+
+    O resultado independe do tile, então pode ser calculado uma vez por
+    feature e reaproveitado em todos os zooms.
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+
+    Returns:
+        Lista de polígonos com anéis em coordenadas de mundo
+    """
+    return [
+        [[_lonlat_to_world(point[0], point[1]) for point in ring] for ring in polygon]
+        for polygon in iter_polygons(geometry)
+    ]
+
+
+def project_world_polygons(
+    world_polygons: list[list[list[Point]]],
+    z: int,
+    x: int,
+    y: int,
+    extent: int = TILE_EXTENT,
+    buffer: int = TILE_BUFFER,
+    tolerance: float = 1.0,
+) -> list[list[list[tuple[int, int]]]]:
+    """Recorta e simplifica polígonos já projetados para um tile.
+
+    Args:
+        world_polygons: Saída de to_world_polygons
+        z: Zoom
+        x: Coluna do tile
+        y: Linha do tile
+        extent: Resolução do tile (pixels por lado)
+        buffer: Margem de recorte em pixels
+        tolerance: Tolerância de simplificação em pixels
+
+    Returns:
+        Lista de polígonos (anéis abertos em coordenadas inteiras do tile,
+        exteriores com área positiva no sistema do tile, como exige o MVT)
+    """
+    scale = (1 << z) * extent
+    offset_x = x * extent
+    offset_y = y * extent
+    low, high = -buffer, extent + buffer
+
+    polygons = []
+    for polygon in world_polygons:
+        rings: list[list[tuple[int, int]]] = []
+        for ring_index, ring in enumerate(polygon):
+            projected = [(wx * scale - offset_x, wy * scale - offset_y) for wx, wy in ring]
+
+            xs = [point[0] for point in projected]
+            ys = [point[1] for point in projected]
+            if max(xs) < low or min(xs) > high or max(ys) < low or min(ys) > high:
+                continue
+            # Só recorta anéis que cruzam a borda (em zooms baixos, quase nenhum)
+            if min(xs) < low or max(xs) > high or min(ys) < low or max(ys) > high:
+                projected = _clip_ring(projected, low, high)
+                if len(projected) < 3:
+                    continue
+
+            quantized: list[tuple[int, int]] = []
+            for px, py in projected:
+                pixel = (round(px), round(py))
+                if not quantized or quantized[-1] != pixel:
+                    quantized.append(pixel)
+            while len(quantized) > 1 and quantized[0] == quantized[-1]:
+                quantized.pop()
+
+            simplified = simplify_ring(quantized, tolerance)
+            if len(simplified) < 3:
+                continue
+
+            area2 = _ring_area2(simplified)
+            if area2 == 0:
+                continue
+            is_exterior = ring_index == 0
+            if (area2 > 0) != is_exterior:
+                simplified.reverse()
+
+            if is_exterior or rings:
+                rings.append(simplified)
+
+        if rings:
+            polygons.append(rings)
+
+    return polygons
+
+
+def project_geometry(
+    geometry: dict[str, Any],
+    z: int,
+    x: int,
+    y: int,
+    extent: int = TILE_EXTENT,
+    buffer: int = TILE_BUFFER,
+    tolerance: float = 1.0,
+) -> list[list[list[tuple[int, int]]]]:
+    """Projeta, recorta e simplifica uma geometria para um tile.
+
+    Args:
+        geometry: Geometria GeoJSON (Polygon ou MultiPolygon)
+        z: Zoom
+        x: Coluna do tile
+        y: Linha do tile
+        extent: Resolução do tile (pixels por lado)
+        buffer: Margem de recorte em pixels
+        tolerance: Tolerância de simplificação em pixels
+
+    Returns:
+        Lista de polígonos em coordenadas inteiras do tile (veja project_world_polygons)
+    """
+    return project_world_polygons(
+        to_world_polygons(geometry), z, x, y, extent=extent, buffer=buffer, tolerance=tolerance
+    )
+
+
+# ---------------------------------------------------------------------------
+# Codificação protobuf (vector_tile.proto, versão 2)
+# ---------------------------------------------------------------------------
+
+
+def _varint(value: int) -> bytes:
+    """Codifica um inteiro sem sinal como varint."""
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    """Codifica um inteiro com sinal em zigzag."""
+    return (value << 1) ^ (value >> 31)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    """Codifica a chave de um campo protobuf."""
+    return _varint((number << 3) | wire_type)
+
+
+def _length_delimited(number: int, payload: bytes) -> bytes:
+    """Codifica um campo length-delimited (wire type 2)."""
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+
+def _packed(number: int, values: list[int]) -> bytes:
+    """Codifica um campo repeated uint32 empacotado."""
+    return _length_delimited(number, b"".join(_varint(v) for v in values))
+
+
+def encode_polygon_commands(polygons: list[list[list[tuple[int, int]]]]) -> list[int]:
+    """Converte polígonos em coordenadas de tile para comandos MVT.
+
+    Args:
+        polygons: Saída de project_geometry
+
+    Returns:
+        Lista de inteiros do campo geometry da feature
+    """
+    commands: list[int] = []
+    cursor_x = cursor_y = 0
+    for polygon in polygons:
+        for ring in polygon:
+            x0, y0 = ring[0]
+            commands.append((1 << 3) | _CMD_MOVE_TO)
+            commands.append(_zigzag(x0 - cursor_x))
+            commands.append(_zigzag(y0 - cursor_y))
+            cursor_x, cursor_y = x0, y0
+
+            commands.append(((len(ring) - 1) << 3) | _CMD_LINE_TO)
+            for px, py in ring[1:]:
+                commands.append(_zigzag(px - cursor_x))
+                commands.append(_zigzag(py - cursor_y))
+                cursor_x, cursor_y = px, py
+
+            commands.append((1 << 3) | _CMD_CLOSE_PATH)
+    return commands
+
+
+def encode_tile(features: list[dict[str, Any]], layer_name: str = LAYER_NAME) -> bytes:
+    """Codifica uma camada MVT com features já projetadas.
+
+    Args:
+        features: Lista de dicts com "id" (int), "properties" (dict de strings)
+            e "polygons" (saída de project_geometry)
+        layer_name: Nome da camada
+
+    Returns:
+        Bytes do tile (vazio se não houver features)
+    """
+    if not features:
+        return b""
+
+    keys: dict[str, int] = {}
+    values: dict[str, int] = {}
+    encoded_features = []
+
+    for feature in features:
+        tags: list[int] = []
+        for key, value in feature["properties"].items():
+            tags.append(keys.setdefault(key, len(keys)))
+            tags.append(values.setdefault(str(value), len(values)))
+
+        body = b""
+        if feature.get("id") is not None:
+            body += _field(1, 0) + _varint(feature["id"])
+        body += _packed(2, tags)
+        body += _field(3, 0) + _varint(_GEOM_POLYGON)
+        body += _packed(4, encode_polygon_commands(feature["polygons"]))
+        encoded_features.append(_length_delimited(2, body))
+
+    layer = _field(15, 0) + _varint(2)
+    layer += _length_delimited(1, layer_name.encode("utf-8"))
+    layer += b"".join(encoded_features)
+    layer += b"".join(_length_delimited(3, key.encode("utf-8")) for key in keys)
+    layer += b"".join(
+        _length_delimited(4, _length_delimited(1, value.encode("utf-8"))) for value in values
+    )
+    layer += _field(5, 0) + _varint(TILE_EXTENT)
+
+    return _length_delimited(3, layer)
+
+
+# ---------------------------------------------------------------------------
+# Fonte de dados e cache
+# ---------------------------------------------------------------------------
+
+
+class TileSource:
+    """Gera tiles MVT a partir de uma lista de features."""
+
+    def __init__(self, features: list[dict[str, Any]]):
+        self.features = features
+        self.index = BBoxIndex(
+            [geometry_bounds(feature.get("geometry") or {}) for feature in features]
+        )
+        # Coordenadas de mundo por feature, calculadas na primeira vez que aparecem
+        self._world: dict[int, list[list[list[Point]]]] = {}
+
+    def render(self, z: int, x: int, y: int) -> bytes:
+        """Gera o tile (z, x, y).
+
+        Args:
+            z: Zoom
+            x: Coluna do tile
+            y: Linha do tile
+
+        Returns:
+            Bytes do tile MVT (vazio se não houver municípios no tile)
+        """
+        validate_tile(z, x, y)
+        min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+        # Margem do recorte convertida para graus
+        margin_lon = (max_lon - min_lon) * TILE_BUFFER / TILE_EXTENT
+        margin_lat = (max_lat - min_lat) * TILE_BUFFER / TILE_EXTENT
+        candidates = self.index.query(
+            min_lon - margin_lon, min_lat - margin_lat, max_lon + margin_lon, max_lat + margin_lat
+        )
+
+        encoded = []
+        for index in candidates:
+            feature = self.features[index]
+            world = self._world.get(index)
+            if world is None:
+                world = to_world_polygons(feature.get("geometry") or {})
+                self._world[index] = world
+            polygons = project_world_polygons(world, z, x, y)
+            if not polygons:
+                continue
+            props = feature.get("properties", {})
+            feature_id = props.get("id", "")
+            encoded.append(
+                {
+                    "id": int(feature_id) if str(feature_id).isdigit() else None,
+                    "properties": {"id": feature_id, "name": props.get("name", "")},
+                    "polygons": polygons,
+                }
+            )
+
+        return encode_tile(encoded)
+
+
+def load_national_source(data_root: Path) -> TileSource:
+    """Cria uma TileSource com os municípios de todos os estados.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+
+    Returns:
+        TileSource com todas as features estaduais
+    """
+    features: list[dict[str, Any]] = []
+    for code in STATE_CODES:
+        file_path = data_root / GEOJSON_DIRECTORY / get_filename_for_state(code)
+        features.extend(load_geojson_with_cache(file_path).get("features", []))
+    return TileSource(features)
+
+
+def data_signature(data_root: Path) -> str:
+    """Retorna uma assinatura curta dos arquivos estaduais (tamanho e mtime).
+
+    Usada para versionar o cache em disco: quando algum arquivo muda, os tiles
+    passam a ser gravados em outro diretório.
+    """
+    digest = hashlib.sha1()
+    for code in STATE_CODES:
+        file_path = resolve_data_file(data_root / GEOJSON_DIRECTORY / get_filename_for_state(code))
+        if file_path.exists():
+            stat = file_path.stat()
+            digest.update(f"{code}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:12]
+
+
+class TileCache:
+    """Cache de tiles em dois níveis: memória (LRU) e disco."""
+
+    def __init__(self, source_factory, cache_dir: Path | None, signature: str):
+        self._source_factory = source_factory
+        self._source: TileSource | None = None
+        self._memory: OrderedDict[tuple[int, int, int], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._source_lock = threading.Lock()
+        self.tiles_dir = cache_dir / TILES_SUBDIRECTORY / signature if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, z: int, x: int, y: int) -> Path | None:
+        if self.tiles_dir is None:
+            return None
+        return self.tiles_dir / str(z) / str(x) / f"{y}.mvt"
+
+    def get(self, z: int, x: int, y: int) -> bytes:
+        """Retorna o tile (z, x, y), gerando e gravando se necessário."""
+        validate_tile(z, x, y)
+        key = (z, x, y)
+
+        with self._lock:
+            tile = self._memory.get(key)
+            if tile is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+        if tile is not None:
+            record_cache_lookup("tiles", True)
+            return tile
+
+        # Leitura e geração ficam fora do lock: tiles diferentes em paralelo
+        disk_path = self._disk_path(z, x, y)
+        if disk_path is not None and disk_path.exists():
+            tile = disk_path.read_bytes()
+            hit = True
+        else:
+            tile = self._get_source().render(z, x, y)
+            if disk_path is not None:
+                _write_atomic(disk_path, tile)
+            hit = False
+        record_cache_lookup("tiles", hit)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._memory[key] = tile
+            self._memory.move_to_end(key)
+            if len(self._memory) > MEMORY_CACHE_SIZE:
+                self._memory.popitem(last=False)
+        return tile
+
+    def _get_source(self) -> TileSource:
+        """Retorna a fonte de dados, criada uma única vez (mesmo com chamadas concorrentes)."""
+        with self._source_lock:
+            if self._source is None:
+                self._source = self._source_factory()
+            return self._source
+
+
+def _write_atomic(path: Path, data: bytes) -> bool:
+    """Grava um arquivo de forma atômica (arquivo temporário + rename).
+
+    O arquivo temporário é único por processo e thread, já que o mesmo tile
+    pode ser gerado ao mesmo tempo por chamadas concorrentes. Erros de escrita
+    são ignorados: o tile continua sendo servido da memória.
+
+    Returns:
+        True se o arquivo foi gravado
+    """
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    except OSError:
+        # Cache somente leitura ou disco cheio
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Pré-geração (seed) em paralelo
+# ---------------------------------------------------------------------------
+
+_worker_source: TileSource | None = None
+_worker_tiles_dir: Path | None = None
+
+
+def _init_seed_worker(data_root: str, tiles_dir: str):
+    """Inicializa um processo de seed carregando os dados uma única vez."""
+    global _worker_source, _worker_tiles_dir
+    _worker_source = load_national_source(Path(data_root))
+    _worker_tiles_dir = Path(tiles_dir)
+
+
+def _seed_chunk(tiles: list[tuple[int, int, int]]) -> tuple[int, int]:
+    """Gera um lote de tiles no processo atual.
+
+    Returns:
+        Tupla (tiles gerados, bytes gravados)
+    """
+    assert _worker_source is not None and _worker_tiles_dir is not None
+    written = 0
+    for z, x, y in tiles:
+        path = _worker_tiles_dir / str(z) / str(x) / f"{y}.mvt"
+        if path.exists():
+            continue
+        tile = _worker_source.render(z, x, y)
+        if _write_atomic(path, tile):
+            written += len(tile)
+    return len(tiles), written
+
+
+def seed_tiles(
+    data_root: Path,
+    cache_dir: Path,
+    min_zoom: int = 0,
+    max_zoom: int = 10,
+    workers: int | None = None,
+    chunk_size: int = 64,
+) -> dict[str, int]:
+    """Pré-gera os tiles que cobrem o Brasil em um pool de processos.
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        cache_dir: Diretório raiz do cache
+        min_zoom: Zoom inicial
+        max_zoom: Zoom final (inclusive)
+        workers: Número de processos (padrão: número de CPUs)
+        chunk_size: Tiles por tarefa enviada a cada processo
+
+    Returns:
+        Dicionário com o total de tiles e bytes gravados
+    """
+    tiles_dir = cache_dir / TILES_SUBDIRECTORY / data_signature(data_root)
+    tiles = [
+        tile for z in range(min_zoom, max_zoom + 1) for tile in tiles_for_bounds(BRAZIL_BOUNDS, z)
+    ]
+    chunks = [tiles[i : i + chunk_size] for i in range(0, len(tiles), chunk_size)]
+
+    total_tiles = 0
+    total_bytes = 0
+    # spawn: o processo pai pode ter threads (servidor, amostrador de profiling)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_seed_worker,
+        initargs=(str(data_root), str(tiles_dir)),
+    ) as executor:
+        for count, written in executor.map(_seed_chunk, chunks):
+            total_tiles += count
+            total_bytes += written
+
+    return {"tiles": total_tiles, "bytes": total_bytes}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando."""
+    parser = argparse.ArgumentParser(description="Vector tiles (MVT) dos municípios")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed = subparsers.add_parser("seed", help="Pré-gera os tiles no cache em disco")
+    seed.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    seed.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    seed.add_argument("--min-zoom", type=int, default=0)
+    seed.add_argument("--max-zoom", type=int, default=10)
+    seed.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+
+    result = seed_tiles(data_root, cache_dir, args.min_zoom, args.max_zoom, args.workers)
+    print(f"{result['tiles']} tiles, {result['bytes'] / 1e6:.1f} MB")
+    return 0
+
+
+# Exporta as principais classes e funções
+__all__ = [
+    "TILE_EXTENT",
+    "LAYER_NAME",
+    "validate_tile",
+    "tile_bounds",
+    "tiles_for_bounds",
+    "simplify_ring",
+    "to_world_polygons",
+    "project_world_polygons",
+    "project_geometry",
+    "encode_polygon_commands",
+    "encode_tile",
+    "TileSource",
+    "TileCache",
+    "load_national_source",
+    "data_signature",
+    "seed_tiles",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,9 +7,13 @@ cache, busca e validação de dados.
 
 import json
 import re
+import time
 from pathlib import Path
 from typing import Any
 
+from .compression import is_compressed, open_data_file, resolve_data_file
+from .metrics import record_cache_lookup, record_file_load
+
 # Cache simples em memória para arquivos GeoJSON
 _geojson_cache: dict[str, dict[str, Any]] = {}
 
@@ -17,6 +21,9 @@ _geojson_cache: dict[str, dict[str, Any]] = {}
 def load_geojson_with_cache(file_path: Path) -> dict[str, Any]:
     """Carrega um arquivo GeoJSON com cache em memória.
 
+    Se o .json não existir, usa a versão comprimida (.json.gz ou .json.zst),
+    descomprimida em streaming; o cache continua indexado pelo caminho pedido.
+
     Args:
         file_path: Caminho do arquivo GeoJSON
 
@@ -30,15 +37,22 @@ def load_geojson_with_cache(file_path: Path) -> dict[str, Any]:
     file_str = str(file_path)
 
     # Verifica se está no cache
-    if file_str in _geojson_cache:
-        return _geojson_cache[file_str]
+    cached = _geojson_cache.get(file_str)
+    record_cache_lookup("geojson", cached is not None)
+    if cached is not None:
+        return cached
 
     # Carrega do disco
-    if not file_path.exists():
+    source_path = resolve_data_file(file_path)
+    if not source_path.exists():
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-    with file_path.open("r", encoding="utf-8") as f:
-        data: dict[str, Any] = json.load(f)
+    started = time.perf_counter()
+    with open_data_file(source_path) as f:
+        raw = f.read()
+    data: dict[str, Any] = json.loads(raw)
+    disk_bytes = source_path.stat().st_size if is_compressed(source_path) else len(raw)
+    record_file_load(source_path.name, (time.perf_counter() - started) * 1000, disk_bytes)
 
     # Armazena no cache
     _geojson_cache[file_str] = data
@@ -46,6 +60,55 @@ def load_geojson_with_cache(file_path: Path) -> dict[str, Any]:
     return data
 
 
+def load_geojson_files_parallel(
+    file_paths: list[Path], max_workers: int | None = None
+) -> list[dict[str, Any]]:
+    """Carrega vários arquivos GeoJSON em paralelo (com cache em memória).
+
+    A leitura do disco libera o GIL, então threads sobrepõem o I/O de arquivos
+    que ainda não estão em cache. Arquivos já em cache retornam imediatamente.
+
+    Args:
+        file_paths: Caminhos dos arquivos GeoJSON
+        max_workers: Número máximo de threads (padrão: um por arquivo, até 8)
+
+    Returns:
+        Dados GeoJSON parseados, na mesma ordem de file_paths
+
+    Raises:
+        FileNotFoundError: Se algum arquivo não existir
+    """
+    pending = [path for path in file_paths if str(path) not in _geojson_cache]
+
+    loaded: set[str] = set()
+    if len(pending) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = max_workers or min(8, len(pending))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() propaga a primeira exceção encontrada
+            list(executor.map(load_geojson_with_cache, pending))
+        loaded = {str(path) for path in pending}
+
+    # Os recém-carregados já foram contados como falha de cache
+    return [
+        _geojson_cache[str(path)] if str(path) in loaded else load_geojson_with_cache(path)
+        for path in file_paths
+    ]
+
+
+def get_cached_geojson(file_path: Path) -> dict[str, Any] | None:
+    """Retorna os dados de um arquivo se já estiverem no cache em memória.
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON
+
+    Returns:
+        Dados GeoJSON parseados ou None se o arquivo não estiver em cache
+    """
+    return _geojson_cache.get(str(file_path))
+
+
 def clear_cache():
     """Limpa o cache de arquivos GeoJSON."""
     global _geojson_cache
@@ -385,6 +448,8 @@ def get_geojson_summary(geojson_data: dict[str, Any]) -> dict[str, Any]:
 # Exporta as principais funções
 __all__ = [
     "load_geojson_with_cache",
+    "get_cached_geojson",
+    "load_geojson_files_parallel",
     "clear_cache",
     "get_cache_size",
     "normalize_text",
@@ -0,0 +1,466 @@
+"""
+Validação e reparo das geometrias dos arquivos de dados do servidor MCP Geodata-BR.
+
+validate_geojson_structure (utils) só confere as chaves de topo. Este módulo
+verifica cada anel de cada município:
+
+- coordenadas inválidas (não finitas ou fora de lon/lat);
+- anel não fechado (último vértice diferente do primeiro);
+- vértices consecutivos duplicados;
+- anel com menos de 4 vértices;
+- Polygon com vários exteriores disjuntos (ilhas), que é reparado como
+  MultiPolygon, com um polígono por exterior;
+- orientação: buracos no sentido oposto ao do seu exterior e, com
+  rfc7946=True, exteriores anti-horários (os arquivos do IBGE usam o sentido
+  horário em todos os exteriores, então isso não é exigido por padrão);
+- autointerseção (varredura de segmentos ordenados por x).
+
+Os problemas que têm correção segura (fechar o anel, remover duplicados,
+inverter a orientação, descartar anéis degenerados) são reparados; os demais
+são apenas reportados. Cada estado é processado em um processo separado
+(parallel.py, maiores arquivos primeiro), e o resultado é gravado como um
+snapshot limpo, utilizável como diretório de dados (GEODATA_BR_PATH=<saída>),
+mais um relatório por código IBGE.
+
+As verificações operam sobre colunas de coordenadas (xs, ys) de cada anel, em
+passadas lineares, sem criar objetos por vértice além das listas de saída.
+
+Uso:
+    python -m src.geodata_br_mcp.validation [--output-dir DIR] [--report relatorio.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from .compression import open_data_file, resolve_data_file
+from .config import (
+    CACHE_DIRECTORY,
+    ENV_CACHE_PATH,
+    ENV_DATA_PATH,
+    GEOJSON_DIRECTORY,
+)
+from .geometry import ring_signed_area, split_polygon_rings
+from .parallel import find_state_files, map_states
+
+# Subdiretório do cache com os snapshots limpos (contém geojson/)
+CLEANED_SUBDIRECTORY = "cleaned"
+
+# Tipos de problema e se têm reparo automático
+ISSUE_TYPES = {
+    "invalid_id": False,
+    "missing_geometry": False,
+    "unsupported_geometry": False,
+    "multiple_exteriors": True,
+    "invalid_coordinates": False,
+    "unclosed_ring": True,
+    "duplicate_vertices": True,
+    "too_few_vertices": True,
+    "wrong_winding": True,
+    "self_intersection": False,
+}
+
+Ring = list[list[float]]
+
+
+def _issue(feature_id: str, issue: str, location: str, detail: str = "") -> dict[str, Any]:
+    """Monta o registro de um problema encontrado."""
+    record = {"id": feature_id, "issue": issue, "location": location}
+    if detail:
+        record["detail"] = detail
+    return record
+
+
+def _orientation(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+    value = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+    return (value > 0) - (value < 0)
+
+
+def _on_segment(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> bool:
+    """Indica se c (colinear com a-b) está dentro do segmento a-b."""
+    return min(ax, bx) <= cx <= max(ax, bx) and min(ay, by) <= cy <= max(ay, by)
+
+
+def _segments_intersect(
+    ax: float, ay: float, bx: float, by: float, cx: float, cy: float, dx: float, dy: float
+) -> bool:
+    """Teste de interseção de dois segmentos (inclui toques e sobreposições)."""
+    o1 = _orientation(ax, ay, bx, by, cx, cy)
+    o2 = _orientation(ax, ay, bx, by, dx, dy)
+    o3 = _orientation(cx, cy, dx, dy, ax, ay)
+    o4 = _orientation(cx, cy, dx, dy, bx, by)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (
+        (o1 == 0 and _on_segment(ax, ay, bx, by, cx, cy))
+        or (o2 == 0 and _on_segment(ax, ay, bx, by, dx, dy))
+        or (o3 == 0 and _on_segment(cx, cy, dx, dy, ax, ay))
+        or (o4 == 0 and _on_segment(cx, cy, dx, dy, bx, by))
+    )
+
+
+def find_self_intersection(xs: list[float], ys: list[float]) -> int | None:
+    """Procura um par de arestas não adjacentes que se cruzam em um anel fechado.
+
+    Varredura por x: as arestas são ordenadas pelo menor x e cada uma só é
+    comparada com as ativas cujo maior x alcança o seu menor x.
+
+    Args:
+        xs: Longitudes do anel (fechado, sem duplicados consecutivos)
+        ys: Latitudes do anel
+
+    Returns:
+        Índice de uma das arestas envolvidas, ou None se o anel for simples
+    """
+    count = len(xs) - 1
+    if count < 4:
+        return None
+
+    order = sorted(range(count), key=lambda i: min(xs[i], xs[i + 1]))
+    active: list[int] = []
+    for i in order:
+        ax, ay, bx, by = xs[i], ys[i], xs[i + 1], ys[i + 1]
+        min_x = min(ax, bx)
+        active = [j for j in active if max(xs[j], xs[j + 1]) >= min_x]
+        min_y, max_y = min(ay, by), max(ay, by)
+        for j in active:
+            # Arestas vizinhas compartilham um vértice
+            if abs(i - j) == 1 or abs(i - j) == count - 1:
+                continue
+            cy, dy = ys[j], ys[j + 1]
+            if max(cy, dy) < min_y or min(cy, dy) > max_y:
+                continue
+            if _segments_intersect(ax, ay, bx, by, xs[j], cy, xs[j + 1], dy):
+                return i
+        active.append(i)
+    return None
+
+
+def _check_ring(
+    ring: Ring,
+    expected_ccw: bool | None,
+    feature_id: str,
+    location: str,
+    issues: list[dict[str, Any]],
+) -> tuple[Ring | None, bool | None]:
+    """Verifica e repara um anel.
+
+    Args:
+        ring: Coordenadas do anel
+        expected_ccw: Orientação exigida (True = anti-horário) ou None para aceitar
+            qualquer uma
+        feature_id: Código IBGE (para o relatório)
+        location: Posição do anel na geometria (para o relatório)
+        issues: Lista que recebe os problemas encontrados
+
+    Returns:
+        Tupla (anel reparado ou None se deve ser descartado, orientação final)
+    """
+    xs = [point[0] for point in ring]
+    ys = [point[1] for point in ring]
+
+    if not all(
+        math.isfinite(x) and math.isfinite(y) and -180 <= x <= 180 and -90 <= y <= 90
+        for x, y in zip(xs, ys, strict=True)
+    ):
+        issues.append(_issue(feature_id, "invalid_coordinates", location))
+        return ring, None
+
+    if xs and (xs[0] != xs[-1] or ys[0] != ys[-1]):
+        issues.append(_issue(feature_id, "unclosed_ring", location))
+        xs.append(xs[0])
+        ys.append(ys[0])
+
+    keep = [True] + [
+        x0 != x1 or y0 != y1 for x0, y0, x1, y1 in zip(xs, ys, xs[1:], ys[1:], strict=False)
+    ]
+    duplicates = len(keep) - sum(keep)
+    if duplicates:
+        issues.append(_issue(feature_id, "duplicate_vertices", location, f"{duplicates} vértices"))
+        xs = [x for x, kept in zip(xs, keep, strict=True) if kept]
+        ys = [y for y, kept in zip(ys, keep, strict=True) if kept]
+
+    if len(xs) < 4:
+        issues.append(_issue(feature_id, "too_few_vertices", location, f"{len(xs)} vértices"))
+        return None, None
+
+    edge = find_self_intersection(xs, ys)
+    if edge is not None:
+        issues.append(_issue(feature_id, "self_intersection", location, f"aresta {edge}"))
+
+    repaired = [[x, y] for x, y in zip(xs, ys, strict=True)]
+    area = ring_signed_area(repaired)
+    if area == 0:
+        if edge is None:
+            # Vértices colineares: o anel não delimita área nenhuma
+            issues.append(_issue(feature_id, "too_few_vertices", location, "área nula"))
+            return None, None
+        ccw = None
+    else:
+        ccw = area > 0
+    if ccw is not None and expected_ccw is not None and ccw != expected_ccw:
+        issues.append(_issue(feature_id, "wrong_winding", location))
+        repaired.reverse()
+        ccw = expected_ccw
+
+    return repaired, ccw
+
+
+def _ring_groups(rings: list[Ring]) -> list[list[int]]:
+    """Agrupa os índices dos anéis de um polígono em [exterior, buracos...].
+
+    Nos arquivos do IBGE um Polygon pode ter vários exteriores disjuntos
+    (ilhas); o agrupamento segue split_polygon_rings e cada grupo vira um
+    polígono do MultiPolygon reparado.
+    """
+    if len(rings) <= 1:
+        return [list(range(len(rings)))]
+    positions = {id(ring): index for index, ring in enumerate(rings)}
+    return [[positions[id(ring)] for ring in polygon] for polygon in split_polygon_rings(rings)]
+
+
+def validate_feature(
+    feature: dict[str, Any], rfc7946: bool = False
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Valida e repara uma feature Polygon ou MultiPolygon.
+
+    Um Polygon com vários exteriores disjuntos é reportado e devolvido como
+    MultiPolygon (o mesmo vale para um polígono de um MultiPolygon).
+
+    Args:
+        feature: Feature GeoJSON (não é modificada)
+        rfc7946: Se True, exige exteriores anti-horários (e buracos horários)
+
+    Returns:
+        Tupla (feature reparada, problemas encontrados)
+    """
+    props = feature.get("properties") or {}
+    feature_id = str(props.get("id", ""))
+    issues: list[dict[str, Any]] = []
+    if not (len(feature_id) == 7 and feature_id.isdigit()):
+        issues.append(_issue(feature_id, "invalid_id", "properties.id"))
+
+    geometry = feature.get("geometry")
+    if not geometry:
+        issues.append(_issue(feature_id, "missing_geometry", "geometry"))
+        return feature, issues
+
+    geom_type = geometry.get("type")
+    coordinates = geometry.get("coordinates") or []
+    if geom_type == "Polygon":
+        polygons = [coordinates]
+    elif geom_type == "MultiPolygon":
+        polygons = coordinates
+    else:
+        issues.append(_issue(feature_id, "unsupported_geometry", "geometry", str(geom_type)))
+        return feature, issues
+
+    repaired_polygons = []
+    for p, rings in enumerate(polygons):
+        groups = _ring_groups(rings)
+        if len(groups) > 1:
+            location = "geometry" if geom_type == "Polygon" else f"{p}"
+            issues.append(
+                _issue(feature_id, "multiple_exteriors", location, f"{len(groups)} exteriores")
+            )
+        for group in groups:
+            expected_ccw = True if rfc7946 else None
+            repaired_rings = []
+            for position, r in enumerate(group):
+                location = f"{r}" if geom_type == "Polygon" else f"{p}/{r}"
+                ring, ccw = _check_ring(rings[r], expected_ccw, feature_id, location, issues)
+                if position == 0:
+                    if ring is None:
+                        # Sem exterior válido os buracos do grupo também saem
+                        break
+                    # Buracos no sentido oposto ao do exterior
+                    expected_ccw = None if ccw is None else not ccw
+                if ring is not None:
+                    repaired_rings.append(ring)
+            if repaired_rings:
+                repaired_polygons.append(repaired_rings)
+
+    if not repaired_polygons:
+        issues.append(
+            _issue(feature_id, "missing_geometry", "geometry", "todos os anéis inválidos")
+        )
+        repaired_geometry = None
+    elif geom_type == "Polygon" and len(repaired_polygons) == 1:
+        repaired_geometry = {"type": "Polygon", "coordinates": repaired_polygons[0]}
+    else:
+        repaired_geometry = {"type": "MultiPolygon", "coordinates": repaired_polygons}
+
+    if not issues:
+        return feature, issues
+    return {**feature, "geometry": repaired_geometry}, issues
+
+
+def is_repaired(issue: dict[str, Any]) -> bool:
+    """Indica se o problema foi corrigido no snapshot limpo."""
+    return ISSUE_TYPES.get(issue["issue"], False)
+
+
+def validate_state(
+    file_path: str, output_path: str | None = None, rfc7946: bool = False
+) -> dict[str, Any]:
+    """Valida e repara todas as features de um arquivo (executado em um processo).
+
+    Args:
+        file_path: Caminho do arquivo GeoJSON (.json, .json.gz ou .json.zst)
+        output_path: Caminho do snapshot limpo (.json); None para só validar
+        rfc7946: Se True, exige a orientação da RFC 7946
+
+    Returns:
+        Dicionário com file, features, issues e elapsed_ms
+    """
+    started = time.perf_counter()
+    with open_data_file(Path(file_path)) as f:
+        data = json.load(f)
+
+    features = []
+    issues: list[dict[str, Any]] = []
+    for feature in data.get("features", []):
+        repaired, found = validate_feature(feature, rfc7946)
+        features.append(repaired)
+        issues.extend(found)
+
+    if output_path is not None:
+        target = Path(output_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        cleaned = {**data, "features": features}
+        tmp_path.write_text(
+            json.dumps(cleaned, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+        )
+        tmp_path.replace(target)
+
+    return {
+        "file": Path(file_path).name,
+        "features": len(features),
+        "issues": issues,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _validate_state_job(
+    file_path: str, code: str, output_dir: str | None, rfc7946: bool
+) -> dict[str, Any]:
+    """Valida um estado (executado em um processo do pool)."""
+    output_path = str(Path(output_dir) / Path(file_path).name) if output_dir else None
+    return validate_state(str(resolve_data_file(Path(file_path))), output_path, rfc7946)
+
+
+def validate_data_directory(
+    data_root: Path,
+    output_root: Path | None = None,
+    workers: int | None = None,
+    codes: list[str] | None = None,
+    rfc7946: bool = False,
+) -> dict[str, Any]:
+    """Valida os arquivos de geojson/ em um pool de processos (um estado por tarefa).
+
+    Args:
+        data_root: Diretório que contém a pasta geojson/
+        output_root: Diretório dos snapshots limpos (recebe geojson/); None para
+            só validar
+        workers: Número de processos (padrão: número de CPUs; 1 executa no
+            próprio processo)
+        codes: Códigos IBGE dos estados (padrão: todos os arquivos existentes)
+        rfc7946: Se True, exige a orientação da RFC 7946 (exteriores anti-horários)
+
+    Returns:
+        Relatório com totais, contagem por tipo de problema e os problemas
+        agrupados por código IBGE
+    """
+    files = find_state_files(data_root, codes)
+    output_dir = str(output_root / GEOJSON_DIRECTORY) if output_root else None
+
+    started = time.perf_counter()
+    results = list(
+        map_states(_validate_state_job, files, output_dir, rfc7946, workers=workers).values()
+    )
+
+    by_ibge: dict[str, list[dict[str, Any]]] = {}
+    counts = dict.fromkeys(ISSUE_TYPES, 0)
+    unrepaired = 0
+    for result in results:
+        for issue in result["issues"]:
+            entry = {key: value for key, value in issue.items() if key != "id"}
+            entry["repaired"] = is_repaired(issue)
+            by_ibge.setdefault(issue["id"], []).append(entry)
+            counts[issue["issue"]] += 1
+            unrepaired += not entry["repaired"]
+
+    return {
+        "files": len(results),
+        "features": sum(result["features"] for result in results),
+        "issues": sum(counts.values()),
+        "unrepaired": unrepaired,
+        "counts": {issue: count for issue, count in counts.items() if count},
+        "by_ibge": dict(sorted(by_ibge.items())),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "output_root": str(output_root) if output_root else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Ponto de entrada da linha de comando (sai com 1 se houver problemas sem reparo)."""
+    parser = argparse.ArgumentParser(description="Valida e repara as geometrias dos municípios")
+    parser.add_argument("--data-path", default=os.environ.get(ENV_DATA_PATH, "."))
+    parser.add_argument("--cache-path", default=os.environ.get(ENV_CACHE_PATH))
+    parser.add_argument(
+        "--output-dir", help="Diretório dos snapshots limpos (padrão: cleaned/ no cache)"
+    )
+    parser.add_argument("--no-output", action="store_true", help="Apenas valida")
+    parser.add_argument("--report", help="Grava o relatório completo em JSON")
+    parser.add_argument("--states", help="Códigos IBGE separados por vírgula (padrão: todos)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos paralelos")
+    parser.add_argument(
+        "--rfc7946", action="store_true", help="Exige exteriores anti-horários (RFC 7946)"
+    )
+    args = parser.parse_args(argv)
+
+    data_root = Path(args.data_path).expanduser().resolve()
+    cache_dir = Path(args.cache_path) if args.cache_path else data_root / CACHE_DIRECTORY
+    output_root = None
+    if not args.no_output:
+        output_root = Path(args.output_dir) if args.output_dir else cache_dir / CLEANED_SUBDIRECTORY
+
+    codes = args.states.split(",") if args.states else None
+    report = validate_data_directory(data_root, output_root, args.workers, codes, args.rfc7946)
+
+    if args.report:
+        Path(args.report).write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    print(
+        f"{report['features']} municípios em {report['files']} arquivos, "
+        f"{report['elapsed_ms'] / 1000:.1f} s"
+    )
+    for issue, count in report["counts"].items():
+        status = "reparado" if ISSUE_TYPES[issue] else "sem reparo"
+        print(f"  {issue:22s} {count:7d}  ({status})")
+    print(f"{len(report['by_ibge'])} municípios com problemas, {report['unrepaired']} sem reparo")
+    if output_root:
+        print(f"Snapshots limpos em {output_root / GEOJSON_DIRECTORY}")
+    return 1 if report["unrepaired"] else 0
+
+
+# Exporta as principais funções
+__all__ = [
+    "ISSUE_TYPES",
+    "find_self_intersection",
+    "validate_feature",
+    "is_repaired",
+    "validate_state",
+    "validate_data_directory",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
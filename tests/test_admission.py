@@ -0,0 +1,163 @@
+"""
+Testes para o módulo admission.py
+"""
+
+import gzip
+import json
+import threading
+
+import pytest
+
+from src.geodata_br_mcp.admission import (
+    ResponseTooLargeError,
+    ServerBusyError,
+    check_response_size,
+    estimate_response_bytes,
+    limit_concurrency,
+    source_content_bytes,
+)
+from src.geodata_br_mcp.compression import content_size
+from src.geodata_br_mcp.manifest import get_manifest
+
+
+@pytest.fixture
+def geojson_file(tmp_path, sample_geojson):
+    """Cria um arquivo geojs-35-mun.json de teste."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    path = geojson_dir / "geojs-35-mun.json"
+    path.write_text(json.dumps(sample_geojson), encoding="utf-8")
+    return path
+
+
+class TestSizeEstimation:
+    """Testa a estimativa do tamanho das respostas."""
+
+    def test_content_size(self, geojson_file):
+        """Testa o tamanho descomprimido lido dos metadados do arquivo."""
+        raw = geojson_file.read_bytes()
+        compressed = geojson_file.with_name("geojs-33-mun.json.gz")
+        compressed.write_bytes(gzip.compress(raw))
+
+        assert content_size(geojson_file) == len(raw)
+        assert content_size(compressed) == len(raw)
+
+    def test_source_content_bytes(self, geojson_file, tmp_path):
+        """Testa o tamanho pelo manifesto e pelos metadados do arquivo."""
+        cache_dir = tmp_path / "cache"
+        size = geojson_file.stat().st_size
+        assert source_content_bytes(geojson_file, cache_dir) == size
+
+        entry = get_manifest(cache_dir).get(geojson_file)
+        assert entry["content_bytes"] == size
+        assert source_content_bytes(geojson_file, cache_dir) == size
+
+        missing = geojson_file.with_name("geojs-11-mun.json")
+        assert source_content_bytes(missing, cache_dir) == 0
+
+    def test_estimate_modes(self):
+        """Testa as frações por modo de geometria e compressão."""
+        full = estimate_response_bytes(1_000_000)
+        assert full == 1_000_000
+        assert estimate_response_bytes(1_000_000, "bbox") < full / 10
+        assert estimate_response_bytes(1_000_000, "full", "gzip") < full / 2
+
+
+class TestCheckResponseSize:
+    """Testa a recusa de respostas grandes."""
+
+    def test_too_large(self, monkeypatch):
+        """Testa o erro estruturado acima do limite."""
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "1000")
+
+        with pytest.raises(ResponseTooLargeError) as exc_info:
+            check_response_size("get_brazil_geojson", 5000, ['encoding="gzip"'])
+
+        error = exc_info.value
+        assert isinstance(error, ValueError)
+        assert error.details == {
+            "error": "response_too_large",
+            "tool": "get_brazil_geojson",
+            "estimated_bytes": 5000,
+            "limit_bytes": 1000,
+            "suggestions": ['encoding="gzip"'],
+        }
+        assert "Resposta muito grande" in str(error)
+        assert '"response_too_large"' in str(error)
+
+    def test_within_limit_and_disabled(self, monkeypatch):
+        """Testa respostas dentro do limite e o limite desativado."""
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "1000")
+        check_response_size("tool", 1000, [])
+
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "0")
+        check_response_size("tool", 10**12, [])
+
+
+class TestLimitConcurrency:
+    """Testa o semáforo das tools pesadas."""
+
+    def test_busy_fails_fast(self):
+        """Testa a recusa imediata quando a tool já está no limite."""
+        started, release = threading.Event(), threading.Event()
+
+        @limit_concurrency(1)
+        def heavy_tool(wait: bool) -> str:
+            if wait:
+                started.set()
+                release.wait(5)
+            return "ok"
+
+        thread = threading.Thread(target=heavy_tool, args=(True,))
+        thread.start()
+        started.wait(5)
+        try:
+            with pytest.raises(ServerBusyError, match="heavy_tool"):
+                heavy_tool(False)
+        finally:
+            release.set()
+            thread.join()
+
+        assert heavy_tool(False) == "ok"
+        assert heavy_tool.admission.max_calls == 1
+
+    def test_admit_runs_before_slot(self):
+        """Testa que a resposta grande é recusada mesmo com a tool no limite."""
+        started, release = threading.Event(), threading.Event()
+
+        def admit(wait: bool, size: int = 0):
+            check_response_size("heavy_tool", size, ["modo leve"])
+
+        @limit_concurrency(1, admit=admit)
+        def heavy_tool(wait: bool, size: int = 0) -> str:
+            if wait:
+                started.set()
+                release.wait(5)
+            return "ok"
+
+        thread = threading.Thread(target=heavy_tool, args=(True,))
+        thread.start()
+        started.wait(5)
+        try:
+            with pytest.raises(ResponseTooLargeError):
+                heavy_tool(False, size=10**12)
+        finally:
+            release.set()
+            thread.join()
+
+    def test_env_override(self, monkeypatch):
+        """Testa que GEODATA_BR_HEAVY_TOOL_CONCURRENCY substitui o limite."""
+        monkeypatch.setenv("GEODATA_BR_HEAVY_TOOL_CONCURRENCY", "3")
+        monkeypatch.setenv("GEODATA_BR_HEAVY_TOOL_TIMEOUT", "0")
+        barrier = threading.Barrier(3, timeout=5)
+
+        @limit_concurrency(1)
+        def heavy_tool() -> int:
+            return barrier.wait()
+
+        threads = [threading.Thread(target=heavy_tool) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not barrier.broken
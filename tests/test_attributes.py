@@ -0,0 +1,147 @@
+"""
+Testes para o módulo attributes.py
+"""
+
+import pytest
+
+from src.geodata_br_mcp.attributes import (
+    build_attributes_table,
+    build_light_collection,
+    build_light_feature,
+    clear_attributes_cache,
+    compute_feature_attributes,
+    find_attributes_by_ibge,
+    load_attributes_with_cache,
+    load_simplified_with_cache,
+    summarize_attributes,
+    validate_geometry_mode,
+)
+
+# Quadrado de 1° x 1° na linha do equador (~12.364 km²)
+EQUATOR_SQUARE = {
+    "type": "Feature",
+    "properties": {"id": "9900001", "name": "Quadrado"},
+    "geometry": {
+        "type": "Polygon",
+        "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]],
+    },
+}
+
+# Polygon com dois anéis disjuntos (ilha), como nos arquivos do IBGE
+WITH_ISLAND = {
+    "type": "Feature",
+    "properties": {"id": "9900002", "name": "Com Ilha"},
+    "geometry": {
+        "type": "Polygon",
+        "coordinates": [
+            [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]],
+            [[2.0, 0.0], [3.0, 0.0], [3.0, 1.0], [2.0, 1.0], [2.0, 0.0]],
+        ],
+    },
+}
+
+
+class TestFeatureAttributes:
+    """Testa cálculo de atributos por feature."""
+
+    def test_compute_feature_attributes(self):
+        """Testa área, perímetro, centroide e bbox."""
+        attrs = compute_feature_attributes(EQUATOR_SQUARE)
+
+        assert attrs["id"] == "9900001"
+        assert attrs["area_km2"] == pytest.approx(12364, rel=0.01)
+        assert attrs["perimeter_km"] == pytest.approx(4 * 111.2, rel=0.01)
+        assert attrs["centroid"] == pytest.approx([0.5, 0.5], abs=1e-3)
+        assert attrs["bbox"] == [0.0, 0.0, 1.0, 1.0]
+
+    def test_disjoint_rings_are_added(self):
+        """Testa que anéis disjuntos somam área em vez de subtrair."""
+        attrs = compute_feature_attributes(WITH_ISLAND)
+
+        assert attrs["area_km2"] == pytest.approx(2 * 12364, rel=0.01)
+        assert attrs["bbox"] == [0.0, 0.0, 3.0, 1.0]
+
+    def test_empty_geometry(self):
+        """Testa feature sem geometria."""
+        attrs = compute_feature_attributes({"properties": {"id": "1"}, "geometry": None})
+        assert attrs["area_km2"] == 0.0
+        assert attrs["centroid"] is None
+        assert attrs["bbox"] is None
+
+
+class TestAttributesTable:
+    """Testa a tabela de atributos e agregados."""
+
+    def test_find_attributes_by_ibge(self, sample_geojson):
+        """Testa busca na tabela por código IBGE."""
+        table = build_attributes_table(sample_geojson["features"])
+        assert find_attributes_by_ibge(table, "3509502")["name"] == "Campinas"
+        assert find_attributes_by_ibge(table, "0000000") is None
+
+    def test_summarize_attributes(self, sample_geojson):
+        """Testa agregados estaduais."""
+        table = build_attributes_table(sample_geojson["features"])
+        summary = summarize_attributes(table)
+
+        assert summary["municipality_count"] == 2
+        assert summary["total_area_km2"] == pytest.approx(sum(r["area_km2"] for r in table))
+        assert summary["largest"]["area_km2"] >= summary["smallest"]["area_km2"]
+
+    def test_summarize_empty(self):
+        """Testa agregados de tabela vazia."""
+        assert summarize_attributes([])["municipality_count"] == 0
+
+    def test_load_attributes_with_cache(self, geojson_dir):
+        """Testa que a tabela fica em cache."""
+        clear_attributes_cache()
+        file_path = geojson_dir / "geojs-14-mun.json"
+
+        first = load_attributes_with_cache(file_path)
+        second = load_attributes_with_cache(file_path)
+
+        assert first is second
+        assert all(row["area_km2"] > 0 for row in first)
+
+
+class TestGeometryModes:
+    """Testa os modos leves de include_geometry."""
+
+    def test_build_light_feature(self):
+        """Testa bbox, centroide e geometria nula a partir dos atributos."""
+        row = compute_feature_attributes(EQUATOR_SQUARE)
+        props = EQUATOR_SQUARE["properties"]
+
+        none = build_light_feature(props, "none", row)
+        assert none["geometry"] is None
+        assert "bbox" not in none
+
+        bbox = build_light_feature(props, "bbox", row)
+        assert bbox["bbox"] == [0.0, 0.0, 1.0, 1.0]
+        assert bbox["geometry"] is None
+
+        centroid = build_light_feature(props, "centroid", row)
+        assert centroid["geometry"]["type"] == "Point"
+        assert centroid["geometry"]["coordinates"] == pytest.approx([0.5, 0.5])
+        assert centroid["properties"] is props
+
+    def test_validate_geometry_mode(self):
+        """Testa a validação do modo."""
+        assert validate_geometry_mode(" BBox ") == "bbox"
+        with pytest.raises(ValueError, match="Modo de geometria inválido"):
+            validate_geometry_mode("wkt")
+
+    def test_light_collection_uses_cached_tables(self, geojson_dir):
+        """Testa o FeatureCollection leve e o cache das geometrias simplificadas."""
+        clear_attributes_cache()
+        file_path = geojson_dir / "geojs-14-mun.json"
+
+        collection = build_light_collection(file_path, "simplified")
+        simplified = load_simplified_with_cache(file_path)
+
+        assert load_simplified_with_cache(file_path) is simplified
+        assert [f["geometry"] for f in collection["features"]] == simplified
+        assert all(f["properties"]["id"] for f in collection["features"])
+
+        centroids = build_light_collection(file_path, "centroid")
+        assert all(f["geometry"]["type"] == "Point" for f in centroids["features"])
+        clear_attributes_cache()
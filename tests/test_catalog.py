@@ -0,0 +1,122 @@
+"""
+Testes para o módulo catalog.py
+"""
+
+import json
+import os
+
+import pytest
+
+from src.geodata_br_mcp.catalog import DataCatalog, count_features_in_file, get_catalog
+
+
+def _write_state(geojson_dir, code, count):
+    """Grava um arquivo geojs-XX-mun.json com `count` features."""
+    features = [
+        {
+            "type": "Feature",
+            "properties": {"id": f"{code}{i:05d}", "name": f"Município {i}"},
+            "geometry": {"type": "Point", "coordinates": [0, 0]},
+        }
+        for i in range(count)
+    ]
+    path = geojson_dir / f"geojs-{code}-mun.json"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return path
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    """Diretório de dados com dois estados."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    _write_state(geojson_dir, "14", 3)
+    _write_state(geojson_dir, "35", 5)
+    (geojson_dir / "outro-arquivo.json").write_text("{}")
+    return tmp_path
+
+
+class TestCountFeatures:
+    """Testa a contagem de features sem parse."""
+
+    def test_count_features(self, data_root):
+        """Testa a contagem em um arquivo gerado."""
+        assert count_features_in_file(data_root / "geojson" / "geojs-35-mun.json") == 5
+
+    def test_count_features_real_file(self, geojson_dir):
+        """Testa que a contagem bate com o parse completo."""
+        path = geojson_dir / "geojs-14-mun.json"
+        with path.open(encoding="utf-8") as f:
+            expected = len(json.load(f)["features"])
+        assert count_features_in_file(path) == expected
+
+    def test_count_features_empty_file(self, tmp_path):
+        """Testa arquivo vazio."""
+        path = tmp_path / "vazio.json"
+        path.write_bytes(b"")
+        assert count_features_in_file(path) == 0
+
+
+class TestDataCatalog:
+    """Testa o catálogo de arquivos."""
+
+    def test_codes_and_states(self, data_root):
+        """Testa a listagem de estados."""
+        catalog = DataCatalog(data_root)
+
+        assert catalog.codes() == ["14", "35"]
+        states = catalog.states()
+        assert states[0]["uf"] == "RR"
+        assert states[1]["ibge_code"] == "35"
+
+    def test_entry_metadata(self, data_root):
+        """Testa caminho, tamanho e contagem."""
+        catalog = DataCatalog(data_root)
+        entry = catalog.get("35")
+
+        assert entry.path.name == "geojs-35-mun.json"
+        assert entry.size == entry.path.stat().st_size
+        assert catalog.feature_count("35") == 5
+        assert catalog.get("33") is None
+        assert catalog.feature_count("33") is None
+
+    def test_cached_until_ttl(self, data_root):
+        """Testa que novos arquivos só aparecem após a expiração."""
+        catalog = DataCatalog(data_root, ttl=3600)
+        assert catalog.codes() == ["14", "35"]
+
+        _write_state(data_root / "geojson", "33", 2)
+        assert catalog.codes() == ["14", "35"]
+
+        catalog.invalidate()
+        assert catalog.codes() == ["14", "33", "35"]
+
+    def test_invalid_ttl_env(self, data_root, monkeypatch):
+        """Testa que um TTL inválido no ambiente usa o padrão."""
+        monkeypatch.setenv("GEODATA_BR_CATALOG_TTL", "cinco")
+        assert DataCatalog(data_root).ttl == 5.0
+
+    def test_count_refreshed_when_file_changes(self, data_root):
+        """Testa que a contagem é recalculada quando o arquivo muda."""
+        catalog = DataCatalog(data_root, ttl=0)
+        assert catalog.feature_count("14") == 3
+
+        path = _write_state(data_root / "geojson", "14", 7)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert catalog.feature_count("14") == 7
+
+    def test_missing_directories(self, tmp_path):
+        """Testa diretório de dados sem geojson/ e diretório inexistente."""
+        catalog = DataCatalog(tmp_path)
+        assert catalog.root_exists
+        assert not catalog.geojson_dir_exists
+        assert catalog.states() == []
+
+        missing = DataCatalog(tmp_path / "inexistente")
+        assert not missing.root_exists
+
+    def test_get_catalog_reuses_instance(self, data_root):
+        """Testa que o catálogo é criado uma vez por diretório."""
+        assert get_catalog(data_root) is get_catalog(data_root)
@@ -0,0 +1,202 @@
+"""
+Testes para o módulo columnar.py
+"""
+
+import json
+
+import pytest
+
+from src.geodata_br_mcp import columnar
+from src.geodata_br_mcp.columnar import (
+    clear_columnar_cache,
+    convert_state,
+    decode_wkb,
+    encode_wkb,
+    get_columnar_path,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_columnar():
+    """Descarta coleções colunares em memória entre testes."""
+    clear_columnar_cache()
+    yield
+    clear_columnar_cache()
+
+
+@pytest.fixture
+def data_root(tmp_path, sample_geojson):
+    """Cria um diretório de dados com um estado (SP) de exemplo."""
+    geojson_dir = tmp_path / "data" / "geojson"
+    geojson_dir.mkdir(parents=True)
+    (geojson_dir / "geojs-35-mun.json").write_text(
+        json.dumps(sample_geojson, ensure_ascii=False), encoding="utf-8"
+    )
+    return tmp_path / "data"
+
+
+class TestWKB:
+    """Testa a codificação WKB."""
+
+    @pytest.mark.parametrize(
+        "geometry",
+        [
+            {"type": "Point", "coordinates": [-46.6, -23.5]},
+            {"type": "LineString", "coordinates": [[0.0, 0.0], [1.5, 2.5]]},
+            {
+                "type": "Polygon",
+                "coordinates": [
+                    [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 0.0]],
+                    [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 1.0]],
+                ],
+            },
+            {"type": "MultiPoint", "coordinates": [[0.0, 0.0], [1.0, 1.0]]},
+            {
+                "type": "MultiPolygon",
+                "coordinates": [
+                    [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+                    [[[5.0, 5.0], [6.0, 5.0], [6.0, 6.0], [5.0, 5.0]]],
+                ],
+            },
+        ],
+    )
+    def test_round_trip(self, geometry):
+        """Testa que decode_wkb(encode_wkb(g)) devolve a geometria original."""
+        assert decode_wkb(encode_wkb(geometry)) == geometry
+
+    def test_point_layout(self):
+        """Testa o layout binário de um ponto (little-endian, tipo 1)."""
+        wkb = encode_wkb({"type": "Point", "coordinates": [1.0, 2.0]})
+
+        assert len(wkb) == 21
+        assert wkb[:5] == b"\x01\x01\x00\x00\x00"
+
+    def test_unsupported_type(self):
+        """Testa geometria sem equivalente WKB."""
+        with pytest.raises(ValueError, match="não suportado"):
+            encode_wkb({"type": "GeometryCollection", "geometries": []})
+
+    def test_real_file_round_trip(self, geojson_dir):
+        """Testa a ida e volta das geometrias de um arquivo real."""
+        with (geojson_dir / "geojs-14-mun.json").open(encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        for feature in features:
+            geometry = feature["geometry"]
+            assert decode_wkb(encode_wkb(geometry)) == geometry
+
+
+class TestConvertState:
+    """Testa a conversão de um estado em colunas."""
+
+    def test_columns(self, data_root, sample_geojson):
+        """Testa que cada município vira uma linha com UF e região."""
+        columns = convert_state(str(data_root / "geojson" / "geojs-35-mun.json"), "35")
+
+        assert list(columns) == list(columnar.COLUMNS)
+        assert columns["id"] == ["3550308", "3509502"]
+        assert columns["state"] == ["SP", "SP"]
+        assert columns["region"] == ["Sudeste", "Sudeste"]
+        assert decode_wkb(columns["geometry"][0]) == sample_geojson["features"][0]["geometry"]
+
+
+class TestColumnarPath:
+    """Testa a escolha do arquivo colunar."""
+
+    def test_default_path(self, tmp_path, monkeypatch):
+        """Testa o caminho padrão dentro do cache."""
+        monkeypatch.delenv("GEODATA_BR_COLUMNAR_PATH", raising=False)
+        assert get_columnar_path(tmp_path) == tmp_path / "municipalities.parquet"
+
+    def test_env_path(self, tmp_path, monkeypatch):
+        """Testa o caminho configurado via env."""
+        monkeypatch.setenv("GEODATA_BR_COLUMNAR_PATH", str(tmp_path / "m.arrow"))
+        assert get_columnar_path(tmp_path / "cache") == tmp_path / "m.arrow"
+
+
+class TestExportColumnar:
+    """Testa a exportação e a leitura do arquivo colunar (requer pyarrow)."""
+
+    @pytest.fixture(autouse=True)
+    def _pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    @pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+    def test_round_trip(self, data_root, tmp_path, sample_geojson, suffix):
+        """Testa que a coleção lida do arquivo é igual à original."""
+        output = tmp_path / f"municipalities{suffix}"
+        counts = columnar.export_columnar(data_root, output, workers=1)
+
+        assert counts == {"35": 2}
+        assert columnar.load_columnar_collection(output, "35") == sample_geojson
+        assert columnar.load_columnar_collection(output, "33")["features"] == []
+        assert len(columnar.load_columnar_collection(output, "100")["features"]) == 2
+
+    def test_geoparquet_metadata(self, data_root, tmp_path):
+        """Testa os metadados GeoParquet da coluna de geometria."""
+        import pyarrow.parquet as pq
+
+        output = tmp_path / "municipalities.parquet"
+        columnar.export_columnar(data_root, output, workers=1)
+
+        geo = json.loads(pq.read_schema(output).metadata[b"geo"])
+        assert geo["primary_column"] == "geometry"
+        assert geo["columns"]["geometry"]["encoding"] == "WKB"
+
+    def test_real_states(self, project_root, tmp_path):
+        """Testa a exportação paralela de estados reais, um row group por estado."""
+        import pyarrow.parquet as pq
+
+        output = tmp_path / "municipalities.parquet"
+        counts = columnar.export_columnar(project_root, output, workers=2, codes=["14", "16"])
+
+        assert list(counts) == ["14", "16"]
+        assert pq.ParquetFile(output).metadata.num_row_groups == 2
+        with (project_root / "geojson" / "geojs-16-mun.json").open(encoding="utf-8") as f:
+            expected = json.load(f)["features"]
+        assert columnar.load_columnar_collection(output, "16")["features"] == expected
+
+    def test_invalid_suffix(self, data_root, tmp_path):
+        """Testa extensão de saída não suportada."""
+        with pytest.raises(ValueError, match="Extensão não suportada"):
+            columnar.export_columnar(data_root, tmp_path / "out.csv")
+
+    def test_cache_invalidated_on_change(self, data_root, tmp_path):
+        """Testa que uma nova exportação invalida o cache em memória."""
+        output = tmp_path / "municipalities.arrow"
+        columnar.export_columnar(data_root, output, workers=1)
+        first = columnar.load_columnar_collection(output, "35")
+        assert columnar.load_columnar_collection(output, "35") is first
+
+        columnar.export_columnar(data_root, output, workers=1)
+        assert columnar.load_columnar_collection(output, "35") is not first
+
+    def test_missing_file(self, tmp_path):
+        """Testa leitura de arquivo inexistente."""
+        with pytest.raises(FileNotFoundError):
+            columnar.load_columnar_collection(tmp_path / "missing.parquet", "35")
+
+    def test_failed_export_leaves_no_temp_file(self, data_root, tmp_path):
+        """Testa que uma conversão interrompida remove o arquivo temporário."""
+        (data_root / "geojson" / "geojs-14-mun.json").write_text("{truncado", encoding="utf-8")
+        output_dir = tmp_path / "out"
+
+        with pytest.raises(ValueError):
+            columnar.export_columnar(data_root, output_dir / "municipalities.parquet", workers=1)
+        assert list(output_dir.iterdir()) == []
+
+    def test_ensure_exports_once(self, data_root, tmp_path, monkeypatch):
+        """Testa que ensure_columnar_file exporta só quando o arquivo não existe."""
+        calls = []
+        export = columnar.export_columnar
+        monkeypatch.setattr(
+            columnar,
+            "export_columnar",
+            lambda *args: calls.append(args) or export(*args, workers=1),
+        )
+        output = tmp_path / "municipalities.parquet"
+
+        assert columnar.ensure_columnar_file(data_root, output) == output
+        assert columnar.ensure_columnar_file(data_root, output) == output
+        assert len(calls) == 1
+        assert len(columnar.load_columnar_collection(output, "35")["features"]) == 2
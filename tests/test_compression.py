@@ -0,0 +1,146 @@
+"""
+Testes para o módulo compression.py
+"""
+
+import base64
+import gzip
+import json
+
+import pytest
+
+from src.geodata_br_mcp.catalog import DataCatalog, count_features_in_file
+from src.geodata_br_mcp.compression import (
+    DEFAULT_BODY_CACHE_SIZE,
+    CompressedBodyCache,
+    compress_bytes,
+    compress_data_files,
+    open_data_file,
+    resolve_data_file,
+    validate_encoding,
+)
+from src.geodata_br_mcp.utils import clear_cache, get_cache_size, load_geojson_with_cache
+
+
+@pytest.fixture
+def gz_data_root(tmp_path, sample_geojson):
+    """Cria um diretório de dados apenas com geojs-35-mun.json.gz."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    raw = json.dumps(sample_geojson, ensure_ascii=False).encode("utf-8")
+    (geojson_dir / "geojs-35-mun.json.gz").write_bytes(gzip.compress(raw))
+    return tmp_path
+
+
+class TestDataFiles:
+    """Testa a leitura transparente de arquivos comprimidos."""
+
+    def test_resolve_prefers_plain_json(self, tmp_path):
+        """Testa que o .json tem preferência sobre as variantes comprimidas."""
+        plain = tmp_path / "geojs-35-mun.json"
+        gz = tmp_path / "geojs-35-mun.json.gz"
+        assert resolve_data_file(plain) == plain
+
+        gz.write_bytes(b"")
+        assert resolve_data_file(plain) == gz
+
+        plain.write_bytes(b"{}")
+        assert resolve_data_file(plain) == plain
+        assert resolve_data_file(gz) == gz
+
+    def test_load_geojson_from_gzip(self, gz_data_root, sample_geojson):
+        """Testa que load_geojson_with_cache lê o .json.gz pelo caminho .json."""
+        clear_cache()
+        path = gz_data_root / "geojson" / "geojs-35-mun.json"
+
+        assert load_geojson_with_cache(path) == sample_geojson
+        assert get_cache_size() == 1
+        clear_cache()
+
+    def test_open_plain_and_gzip(self, gz_data_root, sample_geojson):
+        """Testa o stream descomprimido."""
+        with open_data_file(gz_data_root / "geojson" / "geojs-35-mun.json.gz") as f:
+            assert json.load(f) == sample_geojson
+
+    def test_catalog_and_count(self, gz_data_root):
+        """Testa que o catálogo reconhece o arquivo comprimido e conta as features."""
+        catalog = DataCatalog(gz_data_root, ttl=60)
+        entry = catalog.get("35")
+
+        assert entry is not None
+        assert entry.path.name == "geojs-35-mun.json.gz"
+        assert catalog.feature_count("35") == 2
+        assert count_features_in_file(entry.path) == 2
+
+    def test_compress_data_files(self, tmp_path, sample_geojson):
+        """Testa a geração das versões comprimidas dos arquivos."""
+        geojson_dir = tmp_path / "geojson"
+        geojson_dir.mkdir()
+        (geojson_dir / "geojs-35-mun.json").write_text(json.dumps(sample_geojson, indent=2))
+
+        results = compress_data_files(tmp_path, "gzip", remove_original=True)
+
+        raw_size, compressed_size = results["geojs-35-mun.json"]
+        assert compressed_size < raw_size
+        assert not (geojson_dir / "geojs-35-mun.json").exists()
+        with open_data_file(geojson_dir / "geojs-35-mun.json.gz") as f:
+            assert json.load(f) == sample_geojson
+
+    def test_zstd_round_trip(self, tmp_path, sample_geojson):
+        """Testa arquivos .json.zst (requer zstandard)."""
+        pytest.importorskip("zstandard")
+        path = tmp_path / "geojs-35-mun.json.zst"
+        path.write_bytes(compress_bytes(json.dumps(sample_geojson).encode(), "zstd"))
+
+        with open_data_file(path) as f:
+            assert json.load(f) == sample_geojson
+
+
+class TestCompressedBodyCache:
+    """Testa o cache de corpos comprimidos."""
+
+    def test_payload_round_trip(self, sample_geojson):
+        """Testa que o corpo descomprimido é o JSON da resposta."""
+        cache = CompressedBodyCache(max_entries=2)
+
+        payload = cache.get("sp", 1, "gzip", lambda: sample_geojson)
+
+        body = base64.b64decode(payload["data_base64"])
+        assert payload["size_bytes"] == len(body)
+        assert json.loads(gzip.decompress(body)) == sample_geojson
+        assert payload["uncompressed_bytes"] == len(gzip.decompress(body))
+        assert payload["content_type"] == "application/geo+json"
+
+    def test_hit_and_invalidation(self, sample_geojson):
+        """Testa que o corpo é reaproveitado até a assinatura mudar."""
+        cache = CompressedBodyCache(max_entries=2)
+        calls = []
+
+        def build():
+            calls.append(1)
+            return sample_geojson
+
+        first = cache.get("sp", 1, "gzip", build)
+        assert cache.get("sp", 1, "gzip", build) is first
+        assert len(calls) == 1
+
+        cache.get("sp", 2, "gzip", build)
+        assert len(calls) == 2
+
+    def test_invalid_size_env(self, monkeypatch):
+        """Testa que um tamanho inválido no ambiente usa o padrão."""
+        monkeypatch.setenv("GEODATA_BR_COMPRESSED_CACHE_SIZE", "oito")
+        assert CompressedBodyCache().max_entries == DEFAULT_BODY_CACHE_SIZE
+
+    def test_lru_eviction(self, sample_geojson):
+        """Testa o limite de entradas."""
+        cache = CompressedBodyCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get(key, 1, "gzip", lambda: sample_geojson)
+
+        assert len(cache) == 2
+
+    def test_validate_encoding(self):
+        """Testa a validação da codificação."""
+        assert validate_encoding(" GZIP ") == "gzip"
+        with pytest.raises(ValueError, match="Codificação inválida"):
+            validate_encoding("br")
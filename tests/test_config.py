@@ -8,6 +8,7 @@ from src.geodata_br_mcp.config import (
     IBGE_TO_STATE,
     STATE_TO_IBGE,
     STATES_BY_REGION,
+    env_number,
     get_all_states,
     get_filename_for_state,
     get_state_code,
@@ -143,3 +144,18 @@ class TestStateFunctions:
     def test_get_total_states(self):
         """Testa contar total de estados (excluindo Brasil)."""
         assert get_total_states() == 27  # Exclui o código 100 (Brasil)
+
+
+class TestEnvNumber:
+    """Testa a leitura de números das variáveis de ambiente."""
+
+    def test_values(self, monkeypatch):
+        """Testa valor válido, ausente e inválido."""
+        monkeypatch.setenv("GEODATA_BR_TEST_NUMBER", "2.5")
+        assert env_number("GEODATA_BR_TEST_NUMBER", 1) == 2.5
+
+        monkeypatch.setenv("GEODATA_BR_TEST_NUMBER", "muitos")
+        assert env_number("GEODATA_BR_TEST_NUMBER", 1) == 1
+
+        monkeypatch.delenv("GEODATA_BR_TEST_NUMBER")
+        assert env_number("GEODATA_BR_TEST_NUMBER", 7) == 7
@@ -0,0 +1,200 @@
+"""
+Testes para o módulo database.py
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from src.geodata_br_mcp import database
+from src.geodata_br_mcp.database import (
+    ConnectionPool,
+    MunicipalityStore,
+    build_database,
+    close_stores,
+    get_database_path,
+    get_store,
+)
+from src.geodata_br_mcp.utils import search_features_by_name
+
+
+@pytest.fixture(autouse=True)
+def _clean_stores():
+    """Fecha os bancos abertos entre testes."""
+    close_stores()
+    yield
+    close_stores()
+
+
+@pytest.fixture
+def data_root(tmp_path, sample_geojson):
+    """Cria um diretório de dados com um estado (SP) de exemplo."""
+    geojson_dir = tmp_path / "data" / "geojson"
+    geojson_dir.mkdir(parents=True)
+    (geojson_dir / "geojs-35-mun.json").write_text(
+        json.dumps(sample_geojson, ensure_ascii=False), encoding="utf-8"
+    )
+    return tmp_path / "data"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Caminho do banco de teste."""
+    return tmp_path / "cache" / "municipalities.sqlite"
+
+
+class TestBuildDatabase:
+    """Testa a ingestão dos arquivos no banco."""
+
+    def test_ingest(self, data_root, db_path):
+        """Testa a ingestão de um estado."""
+        assert build_database(data_root, db_path) == {"35": 2}
+        assert db_path.exists()
+
+    def test_incremental(self, data_root, db_path):
+        """Testa que estados inalterados não são reinseridos."""
+        build_database(data_root, db_path)
+        with sqlite3.connect(db_path) as conn:
+            (first_pk,) = conn.execute("SELECT MIN(pk) FROM municipalities").fetchone()
+
+        build_database(data_root, db_path)
+        with sqlite3.connect(db_path) as conn:
+            (same_pk,) = conn.execute("SELECT MIN(pk) FROM municipalities").fetchone()
+        assert same_pk == first_pk
+
+    def test_changed_file_reingested(self, data_root, db_path, sample_geojson):
+        """Testa que um arquivo alterado é reinserido."""
+        build_database(data_root, db_path)
+
+        path = data_root / "geojson" / "geojs-35-mun.json"
+        sample_geojson["features"] = sample_geojson["features"][:1]
+        path.write_text(json.dumps(sample_geojson), encoding="utf-8")
+        os.utime(path, ns=(1, 1))
+
+        assert build_database(data_root, db_path) == {"35": 1}
+
+    def test_removed_file(self, data_root, db_path):
+        """Testa que estados sem arquivo são removidos do banco."""
+        build_database(data_root, db_path)
+        (data_root / "geojson" / "geojs-35-mun.json").unlink()
+
+        assert build_database(data_root, db_path) == {}
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM municipality_bbox").fetchone() == (0,)
+
+    def test_default_path(self, tmp_path, monkeypatch):
+        """Testa o caminho padrão e o configurado via env."""
+        monkeypatch.delenv("GEODATA_BR_DATABASE_PATH", raising=False)
+        assert get_database_path(tmp_path) == tmp_path / "municipalities.sqlite"
+
+        monkeypatch.setenv("GEODATA_BR_DATABASE_PATH", str(tmp_path / "db.sqlite"))
+        assert get_database_path(tmp_path / "cache") == tmp_path / "db.sqlite"
+
+
+class TestMunicipalityStore:
+    """Testa as consultas ao banco."""
+
+    @pytest.fixture
+    def store(self, data_root, db_path):
+        return get_store(data_root, db_path)
+
+    def test_state_collection(self, store, sample_geojson):
+        """Testa que a coleção do estado é igual ao arquivo original."""
+        assert store.state_collection("35") == sample_geojson
+        assert store.state_collection("100") == sample_geojson
+        assert store.state_collection("33")["features"] == []
+
+    def test_get_by_id(self, store, sample_geojson):
+        """Testa a busca por código IBGE."""
+        assert store.get_by_id("3509502") == sample_geojson["features"][1]
+        assert store.get_by_id("9999999") is None
+
+    @pytest.mark.parametrize("term", ["sao paulo", "CAMPINAS", "camp", "São Paulo - SP", "xyz"])
+    def test_find_by_name_matches_utils(self, store, sample_geojson, term):
+        """Testa que a busca por nome segue a regra de search_features_by_name."""
+        expected = search_features_by_name(sample_geojson["features"], term)
+        assert store.find_by_name("35", term) == (expected[0] if expected else None)
+
+    def test_list_properties_and_count(self, store):
+        """Testa a listagem sem geometria e a contagem."""
+        assert [p["id"] for p in store.list_properties("35")] == ["3550308", "3509502"]
+        assert store.count("35") == 2
+        assert store.count() == 2
+        assert store.has_state("35")
+        assert not store.has_state("33")
+
+    def test_query_bbox(self, store):
+        """Testa a consulta pela R*Tree."""
+        assert store.query_bbox(-46.5, -23.9, -46.4, -23.6) == ["3550308"]
+        assert store.query_bbox(-48.0, -25.0, -46.0, -22.0) == ["3550308", "3509502"]
+        assert store.query_bbox(0.0, 0.0, 1.0, 1.0) == []
+
+    def test_real_state(self, project_root, db_path):
+        """Testa a ingestão e a leitura de um estado real."""
+        store = get_store(project_root, db_path)
+        with (project_root / "geojson" / "geojs-14-mun.json").open(encoding="utf-8") as f:
+            expected = json.load(f)
+
+        assert store.state_collection("14") == expected
+
+    def test_get_store_reused(self, data_root, db_path):
+        """Testa que o banco é aberto uma vez por processo."""
+        assert get_store(data_root, db_path) is get_store(data_root, db_path)
+
+
+class TestConnectionPool:
+    """Testa o pool de conexões."""
+
+    def test_reuses_connections(self, data_root, db_path):
+        """Testa que conexões devolvidas são reutilizadas."""
+        build_database(data_root, db_path)
+        pool = ConnectionPool(db_path, size=2)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+        pool.close()
+
+    def test_read_only(self, data_root, db_path):
+        """Testa que as conexões do pool não escrevem no banco."""
+        build_database(data_root, db_path)
+        pool = ConnectionPool(db_path, size=1)
+
+        with pool.connection() as conn, pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM municipalities")
+        pool.close()
+
+    def test_invalid_size_env(self, db_path, monkeypatch):
+        """Testa que um tamanho inválido no ambiente usa o padrão."""
+        monkeypatch.setenv("GEODATA_BR_DB_POOL_SIZE", "quatro")
+        pool = ConnectionPool(db_path)
+
+        assert pool.size == database.DEFAULT_POOL_SIZE
+        pool.close()
+
+    def test_concurrent_queries(self, data_root, db_path):
+        """Testa consultas concorrentes com mais threads que conexões."""
+        build_database(data_root, db_path)
+        store = MunicipalityStore(db_path, pool_size=2)
+        errors: list[Exception] = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    assert store.get_by_id("3550308") is not None
+            except Exception as e:  # pragma: no cover - reportado abaixo
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert store.pool._created <= 2
+        store.close()
@@ -0,0 +1,139 @@
+"""
+Testes para o módulo dissolve.py
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.geodata_br_mcp.dissolve import (
+    build_outlines,
+    clear_outline_cache,
+    dissolve_features,
+    dissolve_geometries,
+    get_outline_path,
+    load_outline_with_cache,
+    load_region_outline_with_cache,
+)
+from src.geodata_br_mcp.geometry import geometry_area_km2, ring_signed_area
+
+
+def _square(x0, y0, x1, y1, clockwise=False):
+    """Cria um Polygon retangular."""
+    ring = [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+    return {"type": "Polygon", "coordinates": [ring[::-1] if clockwise else ring]}
+
+
+class TestDissolve:
+    """Testa o cancelamento de arestas compartilhadas."""
+
+    def test_adjacent_squares_merge(self):
+        """Testa que dois quadrados vizinhos viram um retângulo."""
+        result = dissolve_geometries([_square(0, 0, 1, 1), _square(1, 0, 2, 1, clockwise=True)])
+
+        assert result["type"] == "MultiPolygon"
+        assert len(result["coordinates"]) == 1
+        exterior = result["coordinates"][0][0]
+        # 6 vértices distintos (a aresta interna some, os vértices do meio ficam)
+        assert len(exterior) == 7
+        assert ring_signed_area(exterior) == pytest.approx(2.0)
+
+    def test_disjoint_squares_stay_separate(self):
+        """Testa que geometrias sem aresta comum permanecem separadas."""
+        result = dissolve_geometries([_square(0, 0, 1, 1), _square(5, 5, 6, 6)])
+        assert len(result["coordinates"]) == 2
+
+    def test_ring_of_squares_creates_hole(self):
+        """Testa que um anel de quadrados gera um buraco horário."""
+        squares = [
+            _square(x, y, x + 1, y + 1) for x in range(3) for y in range(3) if (x, y) != (1, 1)
+        ]
+        result = dissolve_geometries(squares)
+
+        assert len(result["coordinates"]) == 1
+        exterior, hole = result["coordinates"][0]
+        assert ring_signed_area(exterior) > 0
+        assert ring_signed_area(hole) < 0
+
+    def test_dissolve_features_preserves_area(self, geojson_dir):
+        """Testa que o contorno de RR tem a área da soma dos municípios."""
+        with (geojson_dir / "geojs-14-mun.json").open(encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        outline = dissolve_features(features)
+        total = sum(geometry_area_km2(feature["geometry"]) for feature in features)
+
+        assert geometry_area_km2(outline) == pytest.approx(total, rel=1e-6)
+
+
+class TestOutlineCache:
+    """Testa a persistência dos contornos."""
+
+    def test_load_outline_writes_cache(self, geojson_dir, tmp_path):
+        """Testa que o contorno é gravado e relido do disco."""
+        clear_outline_cache()
+        file_path = geojson_dir / "geojs-14-mun.json"
+
+        first = load_outline_with_cache(file_path, tmp_path)
+        outline_path = get_outline_path(file_path, tmp_path)
+        assert outline_path.name == "outline-14.json"
+        assert outline_path.exists()
+
+        clear_outline_cache()
+        assert load_outline_with_cache(file_path, tmp_path) == first
+
+    def test_stale_cache_is_rebuilt(self, geojson_dir, tmp_path):
+        """Testa que um cache com assinatura diferente é regenerado."""
+        clear_outline_cache()
+        file_path = geojson_dir / "geojs-14-mun.json"
+        outline_path = get_outline_path(file_path, tmp_path)
+        outline_path.parent.mkdir(parents=True)
+        outline_path.write_text(json.dumps({"source_size": 1, "geometry": "stale"}))
+
+        geometry = load_outline_with_cache(file_path, tmp_path)
+        assert geometry["type"] == "MultiPolygon"
+
+    def test_unwritable_cache(self, geojson_dir, tmp_path):
+        """Testa que falhas ao gravar o cache não impedem o contorno."""
+        clear_outline_cache()
+        blocker = tmp_path / "cache"
+        blocker.write_text("não é um diretório")
+
+        geometry = load_outline_with_cache(geojson_dir / "geojs-14-mun.json", blocker)
+        assert geometry["type"] == "MultiPolygon"
+
+    def test_concurrent_writers(self, geojson_dir, tmp_path):
+        """Testa gravações simultâneas do mesmo contorno (arquivos temporários distintos)."""
+        file_path = geojson_dir / "geojs-14-mun.json"
+
+        def build(_):
+            clear_outline_cache()
+            return load_outline_with_cache(file_path, tmp_path)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(build, range(4)))
+
+        assert all(result == results[0] for result in results)
+        outline_dir = get_outline_path(file_path, tmp_path).parent
+        assert [path.name for path in outline_dir.iterdir()] == ["outline-14.json"]
+
+    def test_region_outline(self, geojson_dir, tmp_path):
+        """Testa o contorno de um par de estados vizinhos."""
+        clear_outline_cache()
+        paths = [geojson_dir / "geojs-14-mun.json", geojson_dir / "geojs-13-mun.json"]
+
+        region = load_region_outline_with_cache("Teste", paths, tmp_path)
+        states = [load_outline_with_cache(path, tmp_path) for path in paths]
+
+        assert geometry_area_km2(region) == pytest.approx(
+            sum(geometry_area_km2(state) for state in states), rel=1e-6
+        )
+        assert (tmp_path / "outlines" / "region-teste.json").exists()
+
+    def test_build_outlines(self, project_root, tmp_path):
+        """Testa a geração de todos os contornos."""
+        results = build_outlines(project_root, tmp_path)
+        assert "35" in results
+        assert "100" not in results
+        assert all(count >= 1 for count in results.values())
@@ -0,0 +1,105 @@
+"""
+Testes para o módulo feature_index.py
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.geodata_br_mcp import feature_index
+from src.geodata_br_mcp.feature_index import (
+    build_all_offsets,
+    build_feature_offsets,
+    clear_offsets_cache,
+    get_offsets_path,
+    load_feature_offsets,
+    read_feature,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_offsets():
+    """Descarta índices em memória entre testes."""
+    clear_offsets_cache()
+    yield
+    clear_offsets_cache()
+
+
+@pytest.fixture
+def geojson_file(tmp_path, sample_geojson):
+    """Grava o GeoJSON de exemplo (com acentos) em geojs-35-mun.json."""
+    path = tmp_path / "geojson" / "geojs-35-mun.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(sample_geojson, ensure_ascii=False, indent=1), encoding="utf-8")
+    return path
+
+
+class TestBuildOffsets:
+    """Testa a varredura de offsets."""
+
+    def test_offsets_slice_features(self, geojson_file, sample_geojson):
+        """Testa que cada trecho contém exatamente a feature."""
+        offsets = build_feature_offsets(geojson_file)
+        raw = geojson_file.read_bytes()
+
+        assert list(offsets) == ["3550308", "3509502"]
+        for feature in sample_geojson["features"]:
+            start, end = offsets[feature["properties"]["id"]]
+            assert json.loads(raw[start:end]) == feature
+
+    def test_offsets_real_file(self, geojson_dir):
+        """Testa o índice de um arquivo real."""
+        path = geojson_dir / "geojs-14-mun.json"
+        with path.open(encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        assert len(build_feature_offsets(path)) == len(features)
+
+    def test_no_features(self, tmp_path):
+        """Testa arquivo sem array de features."""
+        path = tmp_path / "geojs-99-mun.json"
+        path.write_text('{"type": "Feature"}')
+        assert build_feature_offsets(path) == {}
+
+
+class TestReadFeature:
+    """Testa a leitura de uma única feature."""
+
+    def test_read_feature(self, geojson_file, tmp_path, sample_geojson):
+        """Testa leitura com nomes acentuados."""
+        feature = read_feature(geojson_file, "3550308", tmp_path / "cache")
+        assert feature == sample_geojson["features"][0]
+        assert feature["properties"]["name"] == "São Paulo"
+
+    def test_read_feature_not_found(self, geojson_file, tmp_path):
+        """Testa código ausente."""
+        assert read_feature(geojson_file, "3599999", tmp_path / "cache") is None
+
+    def test_index_persisted(self, geojson_file, tmp_path):
+        """Testa que o índice gravado é reutilizado sem nova varredura."""
+        cache_dir = tmp_path / "cache"
+        load_feature_offsets(geojson_file, cache_dir)
+        assert get_offsets_path(geojson_file, cache_dir).exists()
+
+        clear_offsets_cache()
+        with patch.object(feature_index, "build_feature_offsets") as build:
+            read_feature(geojson_file, "3509502", cache_dir)
+        build.assert_not_called()
+
+    def test_index_invalidated(self, geojson_file, tmp_path, sample_geojson):
+        """Testa que o índice é refeito quando o arquivo muda."""
+        cache_dir = tmp_path / "cache"
+        load_feature_offsets(geojson_file, cache_dir)
+
+        sample_geojson["features"].reverse()
+        geojson_file.write_text(json.dumps(sample_geojson), encoding="utf-8")
+        stat = geojson_file.stat()
+        os.utime(geojson_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert read_feature(geojson_file, "3509502", cache_dir) == sample_geojson["features"][0]
+
+    def test_build_all_offsets(self, geojson_file, tmp_path):
+        """Testa a geração para um diretório de dados."""
+        assert build_all_offsets(tmp_path, tmp_path / "cache") == {"35": 2}
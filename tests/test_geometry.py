@@ -0,0 +1,149 @@
+"""
+Testes para o módulo geometry.py
+"""
+
+import pytest
+
+from src.geodata_br_mcp.geometry import (
+    geometry_centroid,
+    haversine_km,
+    iter_polygons,
+    point_in_geometry,
+    representative_point,
+    ring_signed_area,
+    simplify_geometry,
+    split_polygon_rings,
+)
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[[0.0, 0.0], [2.0, 0.0], [2.0, 2.0], [0.0, 2.0], [0.0, 0.0]]],
+}
+
+# Polígono em "C": o centroide cai fora da geometria
+C_SHAPE = {
+    "type": "Polygon",
+    "coordinates": [
+        [
+            [0.0, 0.0],
+            [3.0, 0.0],
+            [3.0, 1.0],
+            [1.0, 1.0],
+            [1.0, 2.0],
+            [3.0, 2.0],
+            [3.0, 3.0],
+            [0.0, 3.0],
+            [0.0, 0.0],
+        ]
+    ],
+}
+
+
+class TestPolygons:
+    """Testa iteração e área de polígonos."""
+
+    def test_iter_polygons_polygon(self):
+        """Testa iteração sobre Polygon."""
+        assert len(list(iter_polygons(SQUARE))) == 1
+
+    def test_iter_polygons_multipolygon(self):
+        """Testa iteração sobre MultiPolygon."""
+        multi = {"type": "MultiPolygon", "coordinates": [SQUARE["coordinates"]] * 2}
+        assert len(list(iter_polygons(multi))) == 2
+
+    def test_iter_polygons_other_types(self):
+        """Testa que outros tipos não retornam polígonos."""
+        assert list(iter_polygons({"type": "Point", "coordinates": [0, 0]})) == []
+
+    def test_split_polygon_rings(self):
+        """Testa separação de ilhas e buracos em um Polygon com vários anéis."""
+        outer = [[0.0, 0.0], [4.0, 0.0], [4.0, 4.0], [0.0, 4.0], [0.0, 0.0]]
+        hole = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0], [1.0, 1.0]]
+        island = [[5.0, 0.0], [6.0, 0.0], [6.0, 1.0], [5.0, 1.0], [5.0, 0.0]]
+
+        polygons = split_polygon_rings([outer, hole, island])
+
+        assert polygons == [[outer, hole], [island]]
+
+    def test_ring_signed_area(self):
+        """Testa área com sinal (anti-horário positivo)."""
+        ring = SQUARE["coordinates"][0]
+        assert ring_signed_area(ring) == pytest.approx(4.0)
+        assert ring_signed_area(ring[::-1]) == pytest.approx(-4.0)
+
+
+class TestCentroid:
+    """Testa centroides e pontos representativos."""
+
+    def test_centroid_square(self):
+        """Testa centroide de um quadrado."""
+        assert geometry_centroid(SQUARE) == pytest.approx((1.0, 1.0))
+
+    def test_centroid_with_hole(self):
+        """Testa que buracos deslocam o centroide."""
+        polygon = {
+            "type": "Polygon",
+            "coordinates": [
+                SQUARE["coordinates"][0],
+                [[1.0, 0.0], [2.0, 0.0], [2.0, 2.0], [1.0, 2.0], [1.0, 0.0]],
+            ],
+        }
+        assert geometry_centroid(polygon) == pytest.approx((0.5, 1.0))
+
+    def test_centroid_empty(self):
+        """Testa geometria sem coordenadas."""
+        assert geometry_centroid({"type": "Polygon", "coordinates": []}) is None
+
+    def test_point_in_geometry(self):
+        """Testa ponto-em-polígono."""
+        assert point_in_geometry(1.0, 1.0, SQUARE)
+        assert not point_in_geometry(3.0, 1.0, SQUARE)
+
+    def test_representative_point_inside(self):
+        """Testa que o ponto representativo fica dentro de um polígono em C."""
+        centroid = geometry_centroid(C_SHAPE)
+        assert centroid is not None
+        assert not point_in_geometry(centroid[0], centroid[1], C_SHAPE)
+
+        point = representative_point(C_SHAPE)
+        assert point is not None
+        assert point_in_geometry(point[0], point[1], C_SHAPE)
+
+
+class TestHaversine:
+    """Testa distâncias de grande círculo."""
+
+    def test_haversine_zero(self):
+        """Testa distância de um ponto para ele mesmo."""
+        assert haversine_km(-23.55, -46.63, -23.55, -46.63) == 0.0
+
+    def test_haversine_sao_paulo_rio(self):
+        """Testa distância aproximada São Paulo - Rio de Janeiro."""
+        distance = haversine_km(-23.55, -46.63, -22.91, -43.17)
+        assert 355 < distance < 365
+
+
+class TestSimplify:
+    """Testa a simplificação de geometrias."""
+
+    def test_collinear_points_removed(self):
+        """Testa que vértices colineares são descartados e o anel continua fechado."""
+        ring = [[0.0, 0.0], [0.5, 0.0], [1.0, 0.0], [1.0, 0.5], [1.0, 1.0], [0.0, 1.0]]
+        geometry = {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+        simplified = simplify_geometry(geometry, 0.01)
+
+        exterior = simplified["coordinates"][0]
+        assert simplified["type"] == "Polygon"
+        assert exterior[0] == exterior[-1]
+        assert [0.5, 0.0] not in exterior
+        assert len(exterior) == 5
+
+    def test_small_rings_are_kept(self):
+        """Testa que anéis pequenos não degeneram, mesmo com tolerância grande."""
+        hole = [[0.5, 0.5], [0.6, 0.5], [0.5, 0.6], [0.5, 0.5]]
+        geometry = {"type": "MultiPolygon", "coordinates": [SQUARE["coordinates"] + [hole]]}
+
+        simplified = simplify_geometry(geometry, 5.0)
+
+        assert simplified == geometry
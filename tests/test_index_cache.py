@@ -0,0 +1,264 @@
+"""
+Testes para o módulo index_cache.py
+"""
+
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.geodata_br_mcp import attributes, index_cache
+from src.geodata_br_mcp.attributes import clear_attributes_cache, load_attributes_with_cache
+from src.geodata_br_mcp.config import MCP_SERVER_VERSION
+from src.geodata_br_mcp.index_cache import (
+    IndexCache,
+    build_indexes,
+    get_indexes_directory,
+    prune_index_cache,
+)
+from src.geodata_br_mcp.manifest import file_checksum, get_manifest
+from src.geodata_br_mcp.model import clear_model_cache, load_state_arrays
+
+
+@pytest.fixture
+def geojson_file(tmp_path, sample_geojson):
+    """Cria um arquivo geojs-35-mun.json de teste."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    path = geojson_dir / "geojs-35-mun.json"
+    path.write_text(json.dumps(sample_geojson), encoding="utf-8")
+    return path
+
+
+def _touch_later(path):
+    """Avança o mtime do arquivo (garante assinatura diferente)."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestIndexCache:
+    """Testa o armazenamento dos índices em disco."""
+
+    def test_persisted_across_instances(self, geojson_file, tmp_path):
+        """Testa que uma nova instância (outro processo) lê o índice gravado."""
+        cache_dir = tmp_path / "cache"
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {"3550308": [1, 2]}
+
+        assert IndexCache(cache_dir).get_or_build("offsets", [geojson_file], build) == {
+            "3550308": [1, 2]
+        }
+        assert IndexCache(cache_dir).get_or_build("offsets", [geojson_file], build) == {
+            "3550308": [1, 2]
+        }
+        assert len(calls) == 1
+
+        path = IndexCache(cache_dir).entry_path("offsets", [geojson_file])
+        assert path.parent.parent == get_indexes_directory(cache_dir)
+        assert MCP_SERVER_VERSION in str(path)
+        assert path.name == f"35-{file_checksum(geojson_file).split(':')[1]}.pickle"
+
+    def test_key_follows_content(self, geojson_file, tmp_path, sample_geojson):
+        """Testa que o índice é refeito quando o conteúdo muda e o antigo é removido."""
+        cache = IndexCache(tmp_path / "cache")
+        first = cache.entry_path("attributes", [geojson_file])
+        cache.get_or_build("attributes", [geojson_file], lambda: "v1")
+
+        sample_geojson["features"].reverse()
+        geojson_file.write_text(json.dumps(sample_geojson), encoding="utf-8")
+        _touch_later(geojson_file)
+
+        assert cache.get_or_build("attributes", [geojson_file], lambda: "v2") == "v2"
+        assert not first.exists()
+        assert len(list(first.parent.glob("35-*.pickle"))) == 1
+
+    def test_touched_file_keeps_entry(self, geojson_file, tmp_path):
+        """Testa que só mudar o mtime não invalida o índice (chave é o checksum)."""
+        cache = IndexCache(tmp_path / "cache")
+        cache.get_or_build("attributes", [geojson_file], lambda: "v1")
+
+        _touch_later(geojson_file)
+
+        assert cache.get_or_build("attributes", [geojson_file], lambda: "v2") == "v1"
+
+    def test_combined_key(self, geojson_file, tmp_path):
+        """Testa a chave de vários arquivos (índices nacionais)."""
+        other = geojson_file.with_name("geojs-33-mun.json")
+        other.write_text('{"type": "FeatureCollection", "features": []}')
+        cache = IndexCache(tmp_path / "cache")
+
+        key = cache.key_for([geojson_file, other])
+
+        assert key != cache.key_for([other, geojson_file])
+        assert cache.entry_path("centroids", [geojson_file, other], "brazil").name == (
+            f"brazil-{key}.pickle"
+        )
+
+    def test_params_in_key(self, geojson_file, tmp_path):
+        """Testa que os parâmetros do construtor mudam a chave."""
+        cache = IndexCache(tmp_path / "cache")
+        cache.get_or_build("simplified", [geojson_file], lambda: "v1", params={"tolerance": 1})
+
+        assert cache.key_for([geojson_file], {"tolerance": 1}) != cache.key_for([geojson_file])
+        assert cache.key_for([geojson_file], {"a": 1, "b": 2}) == (
+            cache.key_for([geojson_file], {"b": 2, "a": 1})
+        )
+        rebuilt = cache.get_or_build(
+            "simplified", [geojson_file], lambda: "v2", params={"tolerance": 2}
+        )
+        assert rebuilt == "v2"
+
+    def test_params_entries_coexist(self, geojson_file, tmp_path, sample_geojson):
+        """Testa que entradas com parâmetros diferentes não removem uma à outra."""
+        cache = IndexCache(tmp_path / "cache")
+        for tolerance in (1, 2):
+            cache.get_or_build(
+                "simplified",
+                [geojson_file],
+                lambda value=tolerance: value,
+                params={"tolerance": tolerance},
+            )
+
+        calls = []
+        for tolerance in (1, 2):
+            value = cache.get_or_build(
+                "simplified",
+                [geojson_file],
+                lambda: calls.append(1),
+                params={"tolerance": tolerance},
+            )
+            assert value == tolerance
+        assert calls == []
+
+        # Com o arquivo alterado, só a entrada antiga de mesmos parâmetros sai
+        stale = cache.entry_path("simplified", [geojson_file], params={"tolerance": 1})
+        sample_geojson["features"].reverse()
+        geojson_file.write_text(json.dumps(sample_geojson), encoding="utf-8")
+        _touch_later(geojson_file)
+        cache.get_or_build("simplified", [geojson_file], lambda: "v3", params={"tolerance": 1})
+
+        assert not stale.exists()
+        assert len(list(stale.parent.glob("*.pickle"))) == 2
+
+    def test_unreadable_entry_rebuilt(self, geojson_file, tmp_path):
+        """Testa que uma entrada truncada ou de outra versão é refeita."""
+        cache = IndexCache(tmp_path / "cache")
+        path = cache.entry_path("attributes", [geojson_file])
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"\x80\x05truncado")
+
+        assert cache.get_or_build("attributes", [geojson_file], lambda: "novo") == "novo"
+
+        with patch.object(index_cache, "INDEX_CACHE_VERSION", 99):
+            assert cache.load(path) is None
+
+    def test_concurrent_build_once(self, geojson_file, tmp_path):
+        """Testa que chamadas concorrentes constroem o índice uma única vez."""
+        cache = IndexCache(tmp_path / "cache")
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.05)
+            return "pronto"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get_or_build("attributes", [geojson_file], build)
+                )
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["pronto"] * 4
+        assert len(calls) == 1
+
+    def test_prune(self, tmp_path):
+        """Testa a remoção dos diretórios de outras versões."""
+        cache_dir = tmp_path / "cache"
+        old = cache_dir / "indexes" / "0.0.1-v1"
+        old.mkdir(parents=True)
+        get_indexes_directory(cache_dir).mkdir(parents=True)
+
+        assert prune_index_cache(cache_dir) == ["0.0.1-v1"]
+        assert get_indexes_directory(cache_dir).exists()
+
+
+class TestDerivedIndexes:
+    """Testa os índices que passam pelo cache em disco."""
+
+    def test_attributes_without_parse(self, geojson_file, tmp_path):
+        """Testa que a tabela de atributos é lida do disco sem carregar o GeoJSON."""
+        cache_dir = tmp_path / "cache"
+        clear_attributes_cache()
+        table = load_attributes_with_cache(geojson_file, cache_dir)
+
+        clear_attributes_cache()
+        with patch.object(attributes, "load_geojson_with_cache") as load:
+            assert load_attributes_with_cache(geojson_file, cache_dir) == table
+        load.assert_not_called()
+        clear_attributes_cache()
+
+    def test_simplified_follows_tolerance(self, geojson_file, tmp_path):
+        """Testa que mudar a tolerância não reaproveita as geometrias gravadas."""
+        cache_dir = tmp_path / "cache"
+        clear_attributes_cache()
+        attributes.load_simplified_with_cache(geojson_file, cache_dir)
+
+        clear_attributes_cache()
+        with (
+            patch.object(attributes, "SIMPLIFY_TOLERANCE_DEG", 0.5),
+            patch.object(attributes, "simplify_feature_geometry", return_value=None) as build,
+        ):
+            assert attributes.load_simplified_with_cache(geojson_file, cache_dir) == [None, None]
+        assert build.call_count == 2
+        clear_attributes_cache()
+
+    def test_state_arrays(self, geojson_file, tmp_path, sample_geojson):
+        """Testa a representação compacta lida do cache em disco."""
+        cache_dir = tmp_path / "cache"
+        clear_model_cache()
+        load_state_arrays(geojson_file, cache_dir)
+
+        clear_model_cache()
+        with patch("src.geodata_br_mcp.model._read_state_arrays") as read:
+            table = load_state_arrays(geojson_file, cache_dir)
+        read.assert_not_called()
+        assert table.to_collection()["features"] == sample_geojson["features"]
+        clear_model_cache()
+
+    def test_manifest_checksum(self, geojson_file, tmp_path):
+        """Testa que o checksum vem do manifesto quando a entrada está em dia."""
+        manifest = get_manifest(tmp_path / "cache")
+        expected = file_checksum(geojson_file)
+        assert manifest.checksum(geojson_file) == expected
+
+        manifest.get(geojson_file)
+        with patch("src.geodata_br_mcp.manifest.file_checksum") as checksum:
+            assert manifest.checksum(geojson_file) == expected
+        checksum.assert_not_called()
+
+    def test_build_indexes(self, geojson_file, tmp_path):
+        """Testa a pré-geração de todos os índices de um diretório de dados."""
+        clear_attributes_cache()
+        clear_model_cache()
+
+        counts = build_indexes(tmp_path, tmp_path / "cache", workers=1)
+
+        assert counts == {"35": {"attributes": 2, "simplified": 2, "compact": 2, "offsets": 2}}
+        kinds = {path.name for path in get_indexes_directory(tmp_path / "cache").iterdir()}
+        assert kinds == {"attributes", "simplified", "compact", "offsets"}
+        clear_attributes_cache()
+        clear_model_cache()
@@ -0,0 +1,114 @@
+"""
+Testes para o módulo manifest.py
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.geodata_br_mcp import manifest as manifest_module
+from src.geodata_br_mcp.manifest import (
+    Manifest,
+    build_file_manifest,
+    build_manifest,
+    clear_manifest_cache,
+    file_checksum,
+    get_file_summary,
+    get_manifest,
+)
+from src.geodata_br_mcp.utils import get_geojson_summary
+
+
+@pytest.fixture
+def geojson_file(tmp_path, sample_geojson):
+    """Grava o GeoJSON de exemplo em um arquivo geojs-35-mun.json."""
+    path = tmp_path / "geojson" / "geojs-35-mun.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(sample_geojson), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _clean_manifests():
+    """Descarta manifestos em memória entre testes."""
+    clear_manifest_cache()
+    yield
+    clear_manifest_cache()
+
+
+def _touch(path, content=None):
+    """Reescreve (opcionalmente) o arquivo e avança o mtime."""
+    if content is not None:
+        path.write_text(content, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestBuildFileManifest:
+    """Testa a geração de entradas do manifesto."""
+
+    def test_build_file_manifest(self, geojson_file):
+        """Testa os metadados gerados."""
+        entry = build_file_manifest(geojson_file)
+
+        assert entry["type"] == "FeatureCollection"
+        assert entry["feature_count"] == 2
+        assert entry["geometry_types"] == {"Polygon": 2}
+        assert entry["property_keys"] == ["id", "name", "description"]
+        assert entry["bbox"] == [-47.247, -24.008, -46.365, -22.69]
+        assert entry["checksum"] == file_checksum(geojson_file)
+
+    def test_summary_matches_full_parse(self, geojson_file, tmp_path, sample_geojson):
+        """Testa que o resumo do manifesto é igual ao de get_geojson_summary."""
+        summary = get_file_summary(geojson_file, tmp_path / "cache")
+        assert summary == get_geojson_summary(sample_geojson)
+
+
+class TestManifest:
+    """Testa validação e persistência do manifesto."""
+
+    def test_persisted_and_reloaded(self, geojson_file, tmp_path):
+        """Testa que o manifesto gravado é reutilizado sem reprocessar o arquivo."""
+        cache_dir = tmp_path / "cache"
+        get_manifest(cache_dir).get(geojson_file)
+        assert (cache_dir / "manifest.json").exists()
+
+        clear_manifest_cache()
+        with patch.object(manifest_module, "build_file_manifest") as build:
+            entry = get_manifest(cache_dir).get(geojson_file)
+
+        build.assert_not_called()
+        assert entry["feature_count"] == 2
+
+    def test_touched_file_keeps_entry(self, geojson_file, tmp_path):
+        """Testa que um arquivo apenas tocado não é reprocessado."""
+        manifest = Manifest(tmp_path / "manifest.json")
+        manifest.get(geojson_file)
+        _touch(geojson_file)
+
+        with patch.object(manifest_module, "build_file_manifest") as build:
+            entry = manifest.get(geojson_file)
+
+        build.assert_not_called()
+        assert entry["mtime_ns"] == geojson_file.stat().st_mtime_ns
+
+    def test_changed_file_regenerates_entry(self, geojson_file, tmp_path, sample_geojson):
+        """Testa que um conteúdo novo regenera a entrada."""
+        manifest = Manifest(tmp_path / "manifest.json")
+        assert manifest.get(geojson_file)["feature_count"] == 2
+
+        sample_geojson["features"] = sample_geojson["features"][:1]
+        _touch(geojson_file, json.dumps(sample_geojson))
+
+        assert manifest.get(geojson_file)["feature_count"] == 1
+
+    def test_missing_file(self, tmp_path):
+        """Testa arquivo inexistente."""
+        with pytest.raises(FileNotFoundError):
+            Manifest(tmp_path / "manifest.json").get(tmp_path / "geojs-99-mun.json")
+
+    def test_build_manifest(self, geojson_file, tmp_path):
+        """Testa a geração para um diretório de dados."""
+        assert build_manifest(tmp_path, tmp_path / "cache") == {"35": 2}
@@ -0,0 +1,184 @@
+"""
+Testes para o módulo metrics.py
+"""
+
+import pytest
+
+from src.geodata_br_mcp import metrics
+from src.geodata_br_mcp.metrics import (
+    LATENCY_BUCKETS_MS,
+    Histogram,
+    MetricsRegistry,
+    cache_hit_ratios,
+    dump_metrics,
+    estimate_payload_bytes,
+    instrument_tool,
+    record_cache_lookup,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    """Começa cada teste com o registro global vazio."""
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+class TestHistogram:
+    """Testa o histograma de buckets fixos."""
+
+    def test_observe(self):
+        """Testa contagem e soma."""
+        hist = Histogram((1, 10, 100))
+        for value in (0.5, 5, 50, 500):
+            hist.observe(value)
+
+        assert hist.count == 4
+        assert hist.sum == 555.5
+        assert hist.counts == [1, 1, 1, 1]
+
+    def test_percentile(self):
+        """Testa a estimativa de percentis."""
+        hist = Histogram((10, 20))
+        for _ in range(10):
+            hist.observe(15)
+
+        assert 10 <= hist.percentile(0.5) <= 20
+        assert hist.percentile(0.99) <= 20
+
+    def test_percentile_empty(self):
+        """Testa percentil sem observações."""
+        assert Histogram((1,)).percentile(0.5) is None
+
+
+class TestRegistry:
+    """Testa o registro de métricas."""
+
+    def test_counters_with_labels(self):
+        """Testa contadores separados por rótulo."""
+        registry = MetricsRegistry()
+        registry.inc("calls", tool="a")
+        registry.inc("calls", tool="a")
+        registry.inc("calls", tool="b")
+
+        assert registry.get_counter("calls", tool="a") == 2
+        assert registry.get_counter("calls", tool="b") == 1
+        assert registry.get_counter("calls", tool="c") == 0
+
+    def test_render_prometheus(self):
+        """Testa o formato texto do Prometheus."""
+        registry = MetricsRegistry()
+        registry.inc("calls_total", tool="a")
+        registry.observe("latency_ms", 3.0, LATENCY_BUCKETS_MS, tool="a")
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE geodata_calls_total counter" in text
+        assert 'geodata_calls_total{tool="a"} 1' in text
+        assert 'geodata_latency_ms_bucket{tool="a",le="+Inf"} 1' in text
+        assert 'geodata_latency_ms_count{tool="a"} 1' in text
+
+    def test_snapshot(self):
+        """Testa o resumo em dicionário."""
+        registry = MetricsRegistry()
+        registry.observe("latency_ms", 3.0, LATENCY_BUCKETS_MS, tool="a")
+
+        snapshot = registry.snapshot()
+        entry = snapshot["histograms"]["latency_ms"][0]
+
+        assert entry["labels"] == {"tool": "a"}
+        assert entry["count"] == 1
+
+
+class TestInstrumentTool:
+    """Testa o decorator de instrumentação."""
+
+    def test_records_latency_and_calls(self):
+        """Testa latência, chamadas e tamanho da resposta."""
+
+        @instrument_tool
+        def sample_tool(value: int) -> dict:
+            """Docstring original."""
+            return {"value": value}
+
+        assert sample_tool(1) == {"value": 1}
+        assert sample_tool.__name__ == "sample_tool"
+        assert sample_tool.__doc__ == "Docstring original."
+
+        registry = metrics.registry
+        assert registry.get_counter("tool_calls_total", tool="sample_tool", status="ok") == 1
+        assert registry.get_histogram("tool_latency_ms", tool="sample_tool").count == 1
+        # A primeira chamada sempre mede o tamanho da resposta
+        assert registry.get_histogram("tool_response_bytes", tool="sample_tool").sum == 11
+
+    def test_records_errors(self):
+        """Testa que exceções são contadas e propagadas."""
+
+        @instrument_tool
+        def failing_tool():
+            raise ValueError("falhou")
+
+        with pytest.raises(ValueError):
+            failing_tool()
+
+        assert (
+            metrics.registry.get_counter("tool_calls_total", tool="failing_tool", status="error")
+            == 1
+        )
+
+    def test_declared_payload_size(self):
+        """Testa que respostas com size_bytes não são serializadas."""
+        assert estimate_payload_bytes({"size_bytes": 5, "data_base64": "x" * 100}) == 5
+        assert estimate_payload_bytes("ação") == 6
+
+    def test_payload_opt_out(self):
+        """Testa tools que só registram o tamanho informado pela resposta."""
+
+        @instrument_tool(serialize_payload=False)
+        def heavy_tool(encoding: str) -> dict:
+            if encoding == "gzip":
+                return {"encoding": "gzip", "size_bytes": 42}
+            return {"type": "FeatureCollection", "features": []}
+
+        assert heavy_tool("identity")["features"] == []
+        assert metrics.registry.get_histogram("tool_response_bytes", tool="heavy_tool") is None
+
+        metrics.registry.reset()
+        heavy_tool("gzip")
+        assert metrics.registry.get_histogram("tool_response_bytes", tool="heavy_tool").sum == 42
+
+    def test_invalid_dump_interval(self, monkeypatch, tmp_path):
+        """Testa que um intervalo inválido não derruba as tools."""
+        monkeypatch.setenv("GEODATA_BR_METRICS_DUMP_INTERVAL", "quinze")
+        assert metrics._dump_interval() == 15.0
+
+        monkeypatch.setenv("GEODATA_BR_METRICS_FILE", str(tmp_path / "geodata.prom"))
+
+        @instrument_tool
+        def dumping_tool() -> str:
+            return "ok"
+
+        assert dumping_tool() == "ok"
+
+
+class TestCacheMetrics:
+    """Testa métricas de cache e gravação em arquivo."""
+
+    def test_cache_hit_ratio(self):
+        """Testa a taxa de acerto."""
+        record_cache_lookup("geojson", False)
+        record_cache_lookup("geojson", True)
+        record_cache_lookup("geojson", True)
+        record_cache_lookup("geojson", True)
+
+        assert cache_hit_ratios() == {"geojson": 0.75}
+
+    def test_dump_metrics(self, tmp_path):
+        """Testa a gravação do arquivo Prometheus."""
+        record_cache_lookup("geojson", True)
+        path = tmp_path / "metrics" / "geodata.prom"
+
+        dump_metrics(path)
+
+        assert 'cache="geojson"' in path.read_text(encoding="utf-8")
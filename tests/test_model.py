@@ -0,0 +1,110 @@
+"""
+Testes para o módulo model.py
+"""
+
+import json
+
+import pytest
+
+from src.geodata_br_mcp.model import (
+    Municipality,
+    StateArrays,
+    clear_model_cache,
+    load_state_arrays,
+)
+from src.geodata_br_mcp.utils import clear_cache, get_cache_size, search_features_by_name
+
+MULTI = {
+    "type": "Feature",
+    "properties": {"id": "9900001", "name": "Arquipélago", "description": "Ilhas", "extra": 1},
+    "geometry": {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+            [
+                [[2.0, 0.0], [4.0, 0.0], [4.0, 2.0], [2.0, 0.0]],
+                [[3.0, 0.2], [3.5, 0.2], [3.5, 0.5], [3.0, 0.2]],
+            ],
+        ],
+    },
+}
+
+
+class TestStateArrays:
+    """Testa a conversão para colunas e os adaptadores GeoJSON."""
+
+    def test_round_trip(self, sample_geojson):
+        """Testa que to_collection reproduz o GeoJSON original."""
+        features = sample_geojson["features"] + [MULTI]
+        table = StateArrays.from_features(features, "35")
+
+        assert len(table) == 3
+        assert table.to_collection() == {"type": "FeatureCollection", "features": features}
+        assert table.vertex_count() == 4 + 4 + 4 + 4 + 4
+
+    def test_description_shares_name(self, sample_geojson):
+        """Testa que a descrição igual ao nome não duplica a string."""
+        table = StateArrays.from_features(sample_geojson["features"])
+        assert table.descriptions[0] is table.names[0]
+
+    def test_records(self, sample_geojson):
+        """Testa o registro Municipality (com __slots__)."""
+        table = StateArrays.from_features(sample_geojson["features"])
+
+        municipality = table[1]
+        assert isinstance(municipality, Municipality)
+        assert not hasattr(municipality, "__dict__")
+        assert municipality.id == "3509502"
+        assert municipality.name == "Campinas"
+        assert municipality == table[-1]
+        assert municipality.to_feature() == sample_geojson["features"][1]
+        assert [m.id for m in table] == ["3550308", "3509502"]
+        with pytest.raises(IndexError):
+            table[2]
+
+    def test_lookups(self, sample_geojson):
+        """Testa as buscas por código IBGE e por nome."""
+        features = sample_geojson["features"]
+        table = StateArrays.from_features(features)
+
+        assert table.find_by_id("3550308") == table[0]
+        assert table.find_by_id("3599999") is None
+        assert table.find_by_id("abc") is None
+        for term in ("sao paulo", "CAMPINAS", "a", "xyz"):
+            expected = search_features_by_name(features, term)
+            assert [m.to_feature() for m in table.find_by_name(term)] == expected
+            first = table.match_name(term)
+            assert (first.to_feature() if first else None) == (expected[0] if expected else None)
+
+    def test_invalid_features(self):
+        """Testa id não numérico e geometria não suportada."""
+        with pytest.raises(ValueError, match="Código IBGE inválido"):
+            StateArrays.from_features([{"properties": {"id": "abc"}, "geometry": None}])
+        with pytest.raises(ValueError, match="Geometria não suportada"):
+            StateArrays.from_features(
+                [{"properties": {"id": "1"}, "geometry": {"type": "Point", "coordinates": [0, 0]}}]
+            )
+
+
+class TestLoadStateArrays:
+    """Testa o carregamento direto do arquivo com cache."""
+
+    def test_load_with_cache(self, tmp_path, sample_geojson):
+        """Testa que o arquivo não entra no cache de dicionários de utils."""
+        clear_cache()
+        clear_model_cache()
+        path = tmp_path / "geojs-35-mun.json"
+        path.write_text(json.dumps(sample_geojson))
+
+        table = load_state_arrays(path)
+
+        assert table.code == "35"
+        assert load_state_arrays(path) is table
+        assert get_cache_size() == 0
+        assert table.to_collection() == sample_geojson
+        clear_model_cache()
+
+    def test_missing_file(self, tmp_path):
+        """Testa arquivo inexistente."""
+        with pytest.raises(FileNotFoundError):
+            load_state_arrays(tmp_path / "geojs-99-mun.json")
@@ -0,0 +1,132 @@
+"""
+Testes para o módulo overlay.py
+"""
+
+import json
+
+import pytest
+
+from src.geodata_br_mcp.dissolve import dissolve_features
+from src.geodata_br_mcp.geometry import geometry_area_km2
+from src.geodata_br_mcp.overlay import PreparedPolygon, intersection_area_km2, intersects
+
+
+def _square(x0, y0, x1, y1, clockwise=False, hole=None):
+    """Cria um Polygon retangular (opcionalmente com um buraco retangular)."""
+    ring = [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+    rings = [ring[::-1] if clockwise else ring]
+    if hole:
+        hx0, hy0, hx1, hy1 = hole
+        rings.append([[hx0, hy0], [hx0, hy1], [hx1, hy1], [hx1, hy0], [hx0, hy0]])
+    return {"type": "Polygon", "coordinates": rings}
+
+
+def _overlap(a, b):
+    return intersection_area_km2(PreparedPolygon(a), PreparedPolygon(b))
+
+
+class TestPreparedPolygon:
+    """Testa a preparação e o ponto-em-polígono."""
+
+    def test_area_matches_geometry(self):
+        """Testa que a área é a mesma de geometry_area_km2, em qualquer orientação."""
+        square = _square(-47, -24, -46, -23)
+        expected = geometry_area_km2(square)
+
+        assert PreparedPolygon(square).area_km2 == pytest.approx(expected)
+        assert PreparedPolygon(_square(-47, -24, -46, -23, clockwise=True)).area_km2 == (
+            pytest.approx(expected)
+        )
+
+    def test_contains_respects_holes(self):
+        """Testa pontos dentro, fora e no buraco."""
+        polygon = PreparedPolygon(_square(0, 0, 10, 10, hole=(4, 4, 6, 6)))
+
+        assert polygon.contains(1, 1)
+        assert not polygon.contains(5, 5)
+        assert not polygon.contains(11, 5)
+
+    def test_edges_near(self):
+        """Testa a busca de arestas por janela."""
+        polygon = PreparedPolygon(_square(0, 0, 10, 10))
+
+        assert len(polygon.edges_near(-1, 4, 1, 6)) == 1
+        assert polygon.edges_near(2, 2, 8, 8) == []
+        assert polygon.edges_near(20, 20, 30, 30) == []
+
+    def test_invalid_geometry(self):
+        """Testa geometria sem anéis válidos."""
+        with pytest.raises(ValueError, match="sem anéis válidos"):
+            PreparedPolygon({"type": "Polygon", "coordinates": [[[0, 0], [1, 1], [0, 0]]]})
+
+
+class TestIntersectionArea:
+    """Testa a área de sobreposição."""
+
+    def test_partial_overlap(self):
+        """Testa a sobreposição de dois quadrados deslocados."""
+        overlap = _overlap(_square(0, 0, 2, 2), _square(1, 1, 3, 3))
+        assert overlap == pytest.approx(geometry_area_km2(_square(1, 1, 2, 2)))
+
+    def test_identical_and_contained(self):
+        """Testa polígono igual (bordas comuns) e polígono contido (sem cortes)."""
+        square = _square(0, 0, 1, 1)
+        inner = _square(0.2, 0.2, 0.4, 0.4)
+
+        assert _overlap(square, square) == pytest.approx(geometry_area_km2(square))
+        assert _overlap(square, inner) == pytest.approx(geometry_area_km2(inner))
+        assert _overlap(inner, square) == pytest.approx(geometry_area_km2(inner))
+
+    def test_shared_edges_and_disjoint(self):
+        """Testa vizinhos com aresta comum e polígonos distantes."""
+        assert _overlap(_square(0, 0, 1, 1), _square(1, 0, 2, 1)) == 0.0
+        assert _overlap(_square(0, 0, 1, 1), _square(5, 5, 6, 6)) == 0.0
+        # Meio quadrado com três lados sobre a borda do outro
+        half = _square(0, 0, 0.5, 1)
+        assert _overlap(_square(0, 0, 1, 1), half) == pytest.approx(geometry_area_km2(half))
+
+    def test_hole_is_excluded(self):
+        """Testa que a área do buraco da consulta não conta."""
+        query = _square(0, 0, 10, 10, hole=(4, 4, 6, 6))
+        other = _square(3, 3, 7, 7)
+        expected = geometry_area_km2(other) - geometry_area_km2(_square(4, 4, 6, 6))
+
+        assert _overlap(query, other) == pytest.approx(expected)
+        assert _overlap(query, _square(4.5, 4.5, 5.5, 5.5)) == 0.0
+
+    def test_multipolygon_query(self):
+        """Testa uma consulta com duas partes sobre o mesmo polígono."""
+        query = {
+            "type": "MultiPolygon",
+            "coordinates": [
+                _square(0, 0, 1, 1)["coordinates"],
+                _square(2, 0, 3, 1)["coordinates"],
+            ],
+        }
+        expected = 2 * geometry_area_km2(_square(0.5, 0, 1, 1))
+        assert _overlap(query, _square(0.5, 0, 2.5, 1)) == pytest.approx(expected)
+
+    def test_state_outline_covers_municipalities(self, geojson_dir):
+        """Testa que o contorno de RR cobre cada município inteiro."""
+        with (geojson_dir / "geojs-14-mun.json").open(encoding="utf-8") as f:
+            features = json.load(f)["features"]
+        outline = PreparedPolygon(dissolve_features(features))
+
+        for feature in features:
+            municipality = PreparedPolygon(feature["geometry"])
+            overlap = intersection_area_km2(outline, municipality)
+            assert overlap == pytest.approx(municipality.area_km2, rel=1e-6)
+
+
+class TestIntersects:
+    """Testa o predicado de interseção."""
+
+    def test_cases(self):
+        """Testa cruzamento, contenção, toque na borda e polígonos distantes."""
+        square = PreparedPolygon(_square(0, 0, 2, 2))
+
+        assert intersects(square, PreparedPolygon(_square(1, 1, 3, 3)))
+        assert intersects(square, PreparedPolygon(_square(0.5, 0.5, 1, 1)))
+        assert intersects(PreparedPolygon(_square(0.5, 0.5, 1, 1)), square)
+        assert intersects(square, PreparedPolygon(_square(2, 0, 3, 1)))
+        assert not intersects(square, PreparedPolygon(_square(5, 5, 6, 6)))
@@ -0,0 +1,99 @@
+"""
+Testes para o módulo parallel.py
+"""
+
+import gzip
+import json
+
+import pytest
+
+from src.geodata_br_mcp.parallel import (
+    find_state_files,
+    imap_states,
+    largest_first,
+    map_states,
+    resolve_workers,
+)
+
+
+def count_features(file_path: str, code: str, prefix: str = "") -> str:
+    """Função de estado usada nos testes (precisa ser importável pelos processos)."""
+    with open(file_path, encoding="utf-8") as f:
+        return f"{prefix}{code}:{len(json.load(f)['features'])}"
+
+
+def fail_on_code(file_path: str, code: str) -> None:
+    """Função de estado que falha em um estado específico."""
+    if code == "33":
+        raise ValueError(f"Falha no estado {code}")
+
+
+@pytest.fixture
+def data_root(tmp_path, sample_geojson):
+    """Cria três estados de tamanhos diferentes (RJ comprimido)."""
+    geojson_dir = tmp_path / "geojson"
+    geojson_dir.mkdir()
+    features = sample_geojson["features"]
+    for code, count in (("35", 2), ("14", 1), ("31", 3)):
+        collection = {**sample_geojson, "features": (features * 2)[:count]}
+        (geojson_dir / f"geojs-{code}-mun.json").write_text(json.dumps(collection))
+    raw = json.dumps({**sample_geojson, "features": features * 10}).encode("utf-8")
+    (geojson_dir / "geojs-33-mun.json.gz").write_bytes(gzip.compress(raw))
+    return tmp_path
+
+
+class TestScheduling:
+    """Testa a listagem e a ordem dos arquivos."""
+
+    def test_find_state_files(self, data_root):
+        """Testa a ordem dos códigos e o filtro de arquivos comprimidos."""
+        files = find_state_files(data_root)
+        assert list(files) == ["14", "31", "33", "35"]
+        assert files["33"].name == "geojs-33-mun.json"
+
+        assert list(find_state_files(data_root, compressed=False)) == ["14", "31", "35"]
+        assert list(find_state_files(data_root, ["35", "11"])) == ["35"]
+
+    def test_largest_first(self, data_root):
+        """Testa a ordenação pelo tamanho em disco."""
+        files = find_state_files(data_root, compressed=False)
+        assert largest_first(files) == ["31", "35", "14"]
+
+    def test_resolve_workers(self):
+        """Testa os limites do número de processos."""
+        assert resolve_workers(8, 3) == 3
+        assert resolve_workers(2, 27) == 2
+        assert resolve_workers(None, 0) == 1
+
+
+class TestMapStates:
+    """Testa a execução por estado."""
+
+    def test_inline(self, data_root):
+        """Testa a execução no próprio processo (ordem de conclusão e de entrada)."""
+        files = find_state_files(data_root, compressed=False)
+
+        assert [code for code, _ in imap_states(count_features, files, workers=1)] == [
+            "31",
+            "35",
+            "14",
+        ]
+        assert map_states(count_features, files, "x", workers=1) == {
+            "14": "x14:1",
+            "31": "x31:3",
+            "35": "x35:2",
+        }
+
+    def test_process_pool(self, data_root):
+        """Testa o pool de processos com janela limitada."""
+        files = find_state_files(data_root, compressed=False)
+
+        results = dict(imap_states(count_features, files, workers=2, window=2))
+
+        assert results == {"14": "14:1", "31": "31:3", "35": "35:2"}
+
+    def test_worker_error(self, data_root):
+        """Testa que a exceção de um estado chega ao chamador."""
+        files = find_state_files(data_root)
+        with pytest.raises(ValueError, match="Falha no estado 33"):
+            map_states(fail_on_code, files, workers=2)
@@ -0,0 +1,164 @@
+"""
+Testes para o módulo profiling.py
+"""
+
+import pstats
+import time
+from collections import Counter
+
+import pytest
+
+from src.geodata_br_mcp.profiling import (
+    StackSampler,
+    get_profile_dir,
+    load_profiling_config,
+    profile_tool,
+    write_folded,
+)
+
+
+def _busy(ms: float):
+    """Mantém a CPU ocupada por alguns milissegundos."""
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Ativa o profiling gravando em um diretório temporário."""
+    monkeypatch.setenv("GEODATA_BR_PROFILE_THRESHOLD_MS", "20")
+    monkeypatch.setenv("GEODATA_BR_PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("GEODATA_BR_PROFILE_INTERVAL_MS", "1")
+    return tmp_path
+
+
+class TestConfig:
+    """Testa a leitura da configuração."""
+
+    def test_disabled_by_default(self, monkeypatch):
+        """Testa que o profiling fica desligado sem o limite."""
+        monkeypatch.delenv("GEODATA_BR_PROFILE_THRESHOLD_MS", raising=False)
+        assert load_profiling_config() is None
+
+    def test_config_from_env(self, profile_dir, monkeypatch):
+        """Testa os valores lidos do ambiente."""
+        monkeypatch.setenv("GEODATA_BR_PROFILE_MODE", "cprofile")
+        monkeypatch.setenv("GEODATA_BR_PROFILE_SAMPLE_RATE", "0.25")
+
+        config = load_profiling_config()
+
+        assert config.threshold_ms == 20
+        assert config.mode == "cprofile"
+        assert config.sample_rate == 0.25
+        assert config.directory == profile_dir
+
+    def test_default_dir_inside_cache(self, tmp_path, monkeypatch):
+        """Testa o diretório padrão dentro do cache."""
+        monkeypatch.delenv("GEODATA_BR_PROFILE_DIR", raising=False)
+        monkeypatch.setenv("GEODATA_BR_CACHE_PATH", str(tmp_path))
+        assert get_profile_dir() == tmp_path / "profiles"
+
+    def test_default_dir_follows_server(self, tmp_path, monkeypatch):
+        """Testa que o diretório padrão é o cache do servidor (DATA_ROOT)."""
+        from src.geodata_br_mcp import server
+
+        monkeypatch.delenv("GEODATA_BR_PROFILE_DIR", raising=False)
+        monkeypatch.delenv("GEODATA_BR_CACHE_PATH", raising=False)
+        monkeypatch.setattr(server, "DATA_ROOT", tmp_path)
+
+        assert get_profile_dir() == tmp_path / ".geodata-cache" / "profiles"
+        assert get_profile_dir(tmp_path / "cache") == tmp_path / "cache" / "profiles"
+
+
+class TestProfileTool:
+    """Testa o decorator de profiling."""
+
+    def test_slow_call_writes_folded_profile(self, profile_dir):
+        """Testa o modo de amostragem em uma chamada lenta."""
+
+        @profile_tool
+        def slow_tool():
+            _busy(60)
+            return "ok"
+
+        assert slow_tool() == "ok"
+
+        profiles = list(profile_dir.glob("*-slow_tool-*.folded"))
+        assert len(profiles) == 1
+        assert "_busy" in profiles[0].read_text(encoding="utf-8")
+
+    def test_fast_call_writes_nothing(self, profile_dir):
+        """Testa que chamadas rápidas não geram perfil."""
+
+        @profile_tool
+        def fast_tool():
+            return 1
+
+        fast_tool()
+        assert list(profile_dir.iterdir()) == []
+
+    def test_cprofile_mode(self, profile_dir, monkeypatch):
+        """Testa o modo cProfile."""
+        monkeypatch.setenv("GEODATA_BR_PROFILE_MODE", "cprofile")
+
+        @profile_tool
+        def slow_tool():
+            _busy(30)
+
+        slow_tool()
+
+        profiles = list(profile_dir.glob("*.prof"))
+        assert len(profiles) == 1
+        stats = pstats.Stats(str(profiles[0]))
+        assert any(func[2] == "_busy" for func in stats.stats)
+
+    def test_rotation(self, profile_dir, monkeypatch):
+        """Testa que apenas os perfis mais recentes são mantidos."""
+        monkeypatch.setenv("GEODATA_BR_PROFILE_KEEP", "2")
+        monkeypatch.setenv("GEODATA_BR_PROFILE_THRESHOLD_MS", "0")
+        monkeypatch.setenv("GEODATA_BR_PROFILE_MODE", "cprofile")
+
+        @profile_tool
+        def tool():
+            return None
+
+        for _ in range(4):
+            tool()
+
+        assert len(list(profile_dir.glob("*.prof"))) == 2
+
+    def test_exceptions_propagate(self, profile_dir):
+        """Testa que erros da tool não são alterados."""
+
+        @profile_tool
+        def failing_tool():
+            raise ValueError("falhou")
+
+        with pytest.raises(ValueError, match="falhou"):
+            failing_tool()
+
+
+class TestStackSampler:
+    """Testa o amostrador de pilhas."""
+
+    def test_samples_registered_thread(self):
+        """Testa que a thread registrada é amostrada."""
+        import threading
+
+        sampler = StackSampler(interval_ms=1)
+        sampler.start(threading.get_ident())
+        _busy(30)
+        stacks = sampler.stop(threading.get_ident())
+
+        assert sum(stacks.values()) > 0
+        # A cópia devolvida não muda depois do stop
+        counted = dict(stacks)
+        _busy(10)
+        assert stacks == counted
+
+    def test_write_folded(self, tmp_path):
+        """Testa o formato folded."""
+        path = tmp_path / "out.folded"
+        write_folded(path, Counter({"main;work": 3, "main": 1}))
+        assert path.read_text(encoding="utf-8") == "main;work 3\nmain 1\n"
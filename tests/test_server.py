@@ -101,6 +101,17 @@ class TestGetStateInfo:
         with pytest.raises(ValueError):
             server.get_state_info("XX")
 
+    def test_get_state_info_does_not_parse_geojson(self):
+        """Testa que a contagem vem do manifesto, sem carregar o GeoJSON."""
+        from src.geodata_br_mcp.utils import clear_cache, get_cache_size
+
+        clear_cache()
+        info = server.get_state_info("RR")
+
+        assert info["total_municipalities"] == 15
+        assert len(info["bbox"]) == 4
+        assert get_cache_size() == 0
+
 
 class TestListMunicipalities:
     """Testes para a ferramenta list_municipalities."""
@@ -185,6 +196,21 @@ class TestSearchMunicipalityByIBGE:
         with pytest.raises(ValueError, match="Código de estado inválido"):
             server.search_municipality_by_ibge("9999999")
 
+    def test_search_municipality_by_ibge_cold_reads_single_feature(self, tmp_path, monkeypatch):
+        """Testa que a busca a frio não carrega o estado inteiro."""
+        from src.geodata_br_mcp.utils import clear_cache, get_cache_size, load_geojson_with_cache
+
+        monkeypatch.setenv("GEODATA_BR_CACHE_PATH", str(tmp_path))
+        clear_cache()
+
+        municipality = server.search_municipality_by_ibge("3550308")
+
+        assert municipality["properties"]["name"] == "São Paulo"
+        assert get_cache_size() == 0
+        assert municipality == server.search_features_by_ibge(
+            load_geojson_with_cache(server._get_state_file("35"))["features"], "3550308"
+        )
+
 
 class TestLoadStateGeoJSON:
     """Testes para a função _load_state_geojson (privada mas testável)."""
@@ -208,6 +234,176 @@ class TestLoadStateGeoJSON:
             server._load_state_geojson("XX")
 
 
+class TestBatchLookups:
+    """Testes para as tools em lote (código IBGE e nome)."""
+
+    def test_ibge_batch_matches_single_calls(self):
+        """Testa que cada item equivale à busca individual, na ordem da entrada."""
+        codes = ["3550308", "1400100", "3509502", "1400100"]
+
+        results = server.search_municipality_by_ibge_batch(codes, include_geometry=True)
+
+        assert [item["query"] for item in results] == codes
+        for code, item in zip(codes, results, strict=True):
+            single = server.search_municipality_by_ibge(code)
+            assert item["found"] is True
+            assert item["id"] == code
+            assert item["name"] == single["properties"]["name"]
+            assert item["geometry"] == single["geometry"]
+
+    def test_ibge_batch_per_item_errors(self):
+        """Testa que erros de um item não interrompem o lote."""
+        results = server.search_municipality_by_ibge_batch(["9999999", "1499999", "1400100", "x"])
+
+        assert [item["found"] for item in results] == [False, False, True, False]
+        assert "inválido" in results[0]["error"]
+        assert "não encontrado" in results[1]["error"]
+        assert "geometry" not in results[2]
+
+    def test_name_batch_matches_single_calls(self):
+        """Testa que a busca por nome segue get_municipality_geojson."""
+        queries = [["SP", "campinas"], ["rr", "Boa Vista"], ["35", "SAO PAULO"]]
+
+        results = server.get_municipality_geojson_batch(queries)
+
+        for query, item in zip(queries, results, strict=True):
+            single = server.get_municipality_geojson(*query)
+            assert item["query"] == query
+            assert item["id"] == single["properties"]["id"]
+            assert "geometry" not in item
+
+    def test_name_batch_per_item_errors(self):
+        """Testa UF inválida, par malformado e município inexistente."""
+        results = server.get_municipality_geojson_batch(
+            [["XX", "Campinas"], ["SP"], ["RR", "Xyzabc"], ["RR", "Caracaraí"]]
+        )
+
+        assert [item["found"] for item in results] == [False, False, False, True]
+        assert "não encontrado em RR" in results[2]["error"]
+
+    def test_batch_limits(self, monkeypatch):
+        """Testa lote vazio e lote acima do limite."""
+        with pytest.raises(ValueError, match="vazia"):
+            server.search_municipality_by_ibge_batch([])
+
+        monkeypatch.setattr(server, "BATCH_MAX_ITEMS", 2)
+        with pytest.raises(ValueError, match="Lote grande demais"):
+            server.get_municipality_geojson_batch([["SP", "a"], ["SP", "b"], ["SP", "c"]])
+
+
+class TestColumnarBackend:
+    """Testes do backend colunar (GEODATA_BR_BACKEND=columnar)."""
+
+    def test_invalid_backend(self, monkeypatch):
+        """Testa backend desconhecido."""
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "csv")
+        with pytest.raises(ValueError, match="Backend inválido"):
+            server._load_state_geojson("RR")
+
+    def test_columnar_matches_geojson(self, tmp_path, monkeypatch):
+        """Testa que o backend colunar devolve as mesmas features."""
+        pytest.importorskip("pyarrow")
+        from src.geodata_br_mcp.columnar import clear_columnar_cache, export_columnar
+
+        output = tmp_path / "municipalities.arrow"
+        export_columnar(server.DATA_ROOT, output, workers=1, codes=["14", "16"])
+        expected = server._load_state_geojson("RR")
+        expected_list = server.list_municipalities("AP")
+
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "columnar")
+        monkeypatch.setenv("GEODATA_BR_COLUMNAR_PATH", str(output))
+        clear_columnar_cache()
+        try:
+            assert server._load_state_geojson("RR") == expected
+            assert server.list_municipalities("AP") == expected_list
+        finally:
+            clear_columnar_cache()
+
+    def test_exports_on_demand(self, tmp_path, monkeypatch):
+        """Testa que o arquivo colunar é gerado na primeira consulta, sem exportação prévia."""
+        pytest.importorskip("pyarrow")
+        from src.geodata_br_mcp.columnar import clear_columnar_cache
+
+        calls = [
+            (server.list_municipalities, ("AP",)),
+            (server.get_municipality_geojson, ("RR", "boa vista")),
+        ]
+        expected = [func(*args) for func, args in calls]
+
+        output = tmp_path / "municipalities.parquet"
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "columnar")
+        monkeypatch.setenv("GEODATA_BR_COLUMNAR_PATH", str(output))
+        clear_columnar_cache()
+        try:
+            assert [func(*args) for func, args in calls] == expected
+            assert output.exists()
+        finally:
+            clear_columnar_cache()
+
+
+class TestSQLiteBackend:
+    """Testes do backend SQLite (GEODATA_BR_BACKEND=sqlite)."""
+
+    @pytest.fixture
+    def sqlite_backend(self, tmp_path, monkeypatch):
+        from src.geodata_br_mcp.database import close_stores
+
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "sqlite")
+        monkeypatch.setenv("GEODATA_BR_DATABASE_PATH", str(tmp_path / "municipalities.sqlite"))
+        close_stores()
+        yield
+        close_stores()
+
+    def test_tools_match_geojson(self, monkeypatch, sqlite_backend):
+        """Testa que as tools devolvem o mesmo resultado nos dois backends."""
+        calls = [
+            (server._load_state_geojson, ("RR",)),
+            (server.list_municipalities, ("AP",)),
+            (server.get_municipality_geojson, ("RR", "boa vista")),
+            (server.search_municipality_by_ibge, ("1600303",)),
+            (server.search_municipality_by_ibge_batch, (["1600303", "1699999", "1400100"],)),
+            (server.get_municipality_geojson_batch, ([["AP", "macapa"], ["RR", "xyz"]], True)),
+        ]
+        results = [func(*args) for func, args in calls]
+
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "geojson")
+        assert results == [func(*args) for func, args in calls]
+
+    def test_not_found(self, sqlite_backend):
+        """Testa município inexistente no backend SQLite."""
+        with pytest.raises(ValueError, match="não encontrado"):
+            server.search_municipality_by_ibge("1499999")
+        with pytest.raises(ValueError, match="não encontrado"):
+            server.get_municipality_geojson("RR", "Xyzabc")
+
+
+class TestCompactBackend:
+    """Testes do backend compacto (GEODATA_BR_BACKEND=compact)."""
+
+    def test_tools_match_geojson(self, monkeypatch):
+        """Testa que as tools devolvem o mesmo resultado nos dois backends."""
+        from src.geodata_br_mcp.model import clear_model_cache
+
+        calls = [
+            (server._load_state_geojson, ("RR",)),
+            (server.list_municipalities, ("AP",)),
+            (server.get_municipality_geojson, ("RR", "boa vista")),
+            (server.search_municipality_by_ibge, ("1600303",)),
+            (server.search_municipality_by_ibge_batch, (["1600303", "1699999", "1400100"],)),
+            (server.get_municipality_geojson_batch, ([["AP", "macapa"], ["RR", "xyz"]], True)),
+        ]
+        expected = [func(*args) for func, args in calls]
+
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "compact")
+        clear_model_cache()
+        try:
+            assert [func(*args) for func, args in calls] == expected
+            with pytest.raises(ValueError, match="não encontrado"):
+                server.get_municipality_geojson("RR", "Xyzabc")
+        finally:
+            clear_model_cache()
+
+
 class TestGetBrazilGeoJSON:
     """Testes para a ferramenta get_brazil_geojson."""
 
@@ -247,3 +443,404 @@ class TestAppInstance:
     def test_app_name(self):
         """Testa se o app tem o nome correto."""
         assert server.MCP_SERVER_NAME in str(server.app.name)
+
+
+class TestNearestMunicipalities:
+    """Testes para as ferramentas de vizinhos mais próximos."""
+
+    def test_nearest_municipalities(self):
+        """Testa busca pelos municípios mais próximos de um ponto."""
+        # Ponto no centro de Boa Vista/RR
+        results = server.nearest_municipalities(2.82, -60.67, k=3)
+
+        assert len(results) == 3
+        assert results[0]["id"] == "1400100"
+        distances = [r["distance_km"] for r in results]
+        assert distances == sorted(distances)
+
+    def test_nearest_municipalities_offshore(self):
+        """Testa ponto no mar (sem município que o contenha)."""
+        results = server.nearest_municipalities(-23.2, -45.0, k=1, max_km=100)
+        assert len(results) == 1
+        assert results[0]["id"].startswith(("33", "35"))
+
+    def test_nearest_municipalities_invalid_lat(self):
+        """Testa latitude inválida."""
+        with pytest.raises(ValueError, match="Latitude inválida"):
+            server.nearest_municipalities(91.0, -60.0)
+
+    def test_nearest_municipalities_batch(self):
+        """Testa a variante em lote."""
+        results = server.nearest_municipalities_batch(
+            [[2.82, -60.67], [-23.55, -46.63]], k=2, max_km=None
+        )
+
+        assert len(results) == 2
+        assert results[0][0]["id"] == "1400100"
+        assert len(results[1]) == 2
+
+    def test_nearest_municipalities_batch_invalid_point(self):
+        """Testa ponto mal formado no lote."""
+        with pytest.raises(ValueError, match="Ponto inválido"):
+            server.nearest_municipalities_batch([[1.0]], k=1, max_km=None)
+
+
+class TestDistanceMatrix:
+    """Testes para a matriz de distâncias entre municípios."""
+
+    def test_dense_matrix(self):
+        """Testa a matriz entre capitais e a ordem das linhas e colunas."""
+        result = server.distance_matrix(["3550308", "3304557"], ["3509502"], max_km=None)
+
+        assert result["codes_a"] == ["3550308", "3304557"]
+        assert result["codes_b"] == ["3509502"]
+        assert len(result["distances"]) == 2
+        # São Paulo -> Campinas ~ 90 km; Rio -> Campinas ~ 370 km
+        assert 80 < result["distances"][0][0] < 110
+        assert 340 < result["distances"][1][0] < 400
+
+    def test_state_code_and_radius(self):
+        """Testa a expansão do estado e o filtro por raio contra a matriz densa."""
+        dense = server.distance_matrix(["3550308"], ["35"], max_km=None)
+        sparse = server.distance_matrix(["3550308"], ["35"], max_km=30)
+
+        assert len(dense["codes_b"]) == 645
+        expected = sorted(
+            (d, code)
+            for d, code in zip(dense["distances"][0], dense["codes_b"], strict=True)
+            if d <= 30
+        )
+        assert [(p["distance_km"], p["b"]) for p in sparse["pairs"]] == expected
+        assert sparse["pair_count"] == len(expected)
+
+    def test_invalid_arguments(self):
+        """Testa códigos inexistentes, raio inválido e matriz grande demais."""
+        with pytest.raises(ValueError, match="não encontrados"):
+            server.distance_matrix(["0000000"], ["35"], max_km=None)
+        with pytest.raises(ValueError, match="max_km deve ser positivo"):
+            server.distance_matrix(["35"], ["35"], max_km=0)
+        with pytest.raises(ValueError, match="Matriz muito grande"):
+            all_states = [code[:2] for code in server.STATE_CODES]
+            server.distance_matrix(all_states, all_states, max_km=None)
+
+
+class TestIntersectMunicipalities:
+    """Testes para a interseção de um polígono com os municípios."""
+
+    def test_municipality_geometry(self):
+        """Testa que a geometria de um município o cobre inteiro e só a ele."""
+        feature = server.search_municipality_by_ibge("1400100")
+        result = server.intersect_municipalities(feature, area_weighted=True)
+
+        assert result["count"] == 1
+        match = result["municipalities"][0]
+        assert match["id"] == "1400100"
+        assert match["overlap_fraction"] == pytest.approx(1.0, abs=1e-6)
+        assert match["query_fraction"] == pytest.approx(1.0, abs=1e-6)
+
+    def test_box_across_states(self):
+        """Testa um retângulo na divisa SP/RJ/MG, ponderado e só o predicado."""
+        ring = [[-45.0, -22.8], [-44.0, -22.8], [-44.0, -22.3], [-45.0, -22.3], [-45.0, -22.8]]
+        box = {"type": "Polygon", "coordinates": [ring]}
+
+        weighted = server.intersect_municipalities(box, area_weighted=True)
+        plain = server.intersect_municipalities(box, area_weighted=False)
+
+        states = {item["id"][:2] for item in weighted["municipalities"]}
+        assert {"33", "35"} <= states
+        assert sum(item["query_fraction"] for item in weighted["municipalities"]) == (
+            pytest.approx(1.0, abs=1e-3)
+        )
+        overlaps = [item["overlap_km2"] for item in weighted["municipalities"]]
+        assert overlaps == sorted(overlaps, reverse=True)
+        assert {item["id"] for item in weighted["municipalities"]} <= {
+            item["id"] for item in plain["municipalities"]
+        }
+
+    def test_invalid_geometry(self):
+        """Testa tipo de geometria, coordenadas e anéis inválidos."""
+        with pytest.raises(ValueError, match="Geometria inválida"):
+            server.intersect_municipalities({"type": "Point", "coordinates": [-46, -23]})
+        with pytest.raises(ValueError, match="pelo menos 4 posições"):
+            server.intersect_municipalities(
+                {"type": "Polygon", "coordinates": [[[-46, -23], [-45, -23], [-46, -23]]]}
+            )
+        with pytest.raises(ValueError, match="fora de lon/lat"):
+            server.intersect_municipalities(
+                {"type": "Polygon", "coordinates": [[[0, 0], [200, 0], [0, 1], [0, 0]]]}
+            )
+        with pytest.raises(ValueError, match="Coordenadas inválidas"):
+            server.intersect_municipalities({"type": "Polygon"})
+
+
+class TestMunicipalityStats:
+    """Testes para os atributos derivados expostos pelo servidor."""
+
+    def test_get_municipality_stats(self):
+        """Testa atributos de Boa Vista/RR."""
+        stats = server.get_municipality_stats("1400100")
+
+        assert stats["name"] == "Boa Vista"
+        assert stats["area_km2"] > 5000
+        assert stats["perimeter_km"] > 0
+        assert len(stats["centroid"]) == 2
+        assert len(stats["bbox"]) == 4
+
+    def test_get_municipality_stats_not_found(self):
+        """Testa código inexistente."""
+        with pytest.raises(ValueError, match="não encontrado"):
+            server.get_municipality_stats("1499999")
+
+    def test_list_municipalities_with_stats(self):
+        """Testa campos opcionais em list_municipalities."""
+        municipalities = server.list_municipalities("RR", include_stats=True)
+        assert "area_km2" in municipalities[0]
+        assert "bbox" in municipalities[0]
+
+        plain = server.list_municipalities("RR")
+        assert "area_km2" not in plain[0]
+
+    def test_get_state_info_with_stats(self):
+        """Testa agregados estaduais em get_state_info."""
+        info = server.get_state_info("RR", include_stats=True)
+
+        stats = info["stats"]
+        assert stats["municipality_count"] == info["total_municipalities"]
+        assert 200_000 < stats["total_area_km2"] < 250_000
+        assert stats["largest"]["area_km2"] >= stats["smallest"]["area_km2"]
+
+
+class TestGetRegionGeoJSON:
+    """Testes para a ferramenta get_region_geojson."""
+
+    def test_get_region_geojson(self):
+        """Testa carregamento de uma região inteira."""
+        geojson = server.get_region_geojson("Norte")
+
+        assert geojson["type"] == "FeatureCollection"
+        assert geojson["region"] == "Norte"
+        assert geojson["states"] == ["RO", "AC", "AM", "RR", "PA", "AP", "TO"]
+
+        state_codes = {f["properties"]["id"][:2] for f in geojson["features"]}
+        assert state_codes == {"11", "12", "13", "14", "15", "16", "17"}
+
+    def test_get_region_geojson_normalized_name(self):
+        """Testa nome de região sem acento e em minúsculas."""
+        geojson = server.get_region_geojson("centro oeste")
+        assert geojson["region"] == "Centro-Oeste"
+
+    def test_get_region_geojson_invalid(self):
+        """Testa região inválida."""
+        with pytest.raises(ValueError, match="Região inválida"):
+            server.get_region_geojson("Atlântida")
+
+
+class TestAdmissionControl:
+    """Testes para a recusa de respostas grandes antes da carga."""
+
+    def test_region_too_large(self, monkeypatch):
+        """Testa que a região é recusada sem carregar os estados."""
+        from src.geodata_br_mcp.admission import ResponseTooLargeError
+
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "100000")
+        with patch.object(server, "_load_state_collections") as load:
+            with pytest.raises(ResponseTooLargeError, match="outlines_only"):
+                server.get_region_geojson("Norte")
+        load.assert_not_called()
+
+    def test_region_outlines_allowed(self, monkeypatch):
+        """Testa que os contornos não passam pela estimativa de municípios."""
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "100000")
+        result = server.get_region_geojson("Norte", outlines_only=True)
+        assert len(result["features"]) == 8
+
+    def test_brazil_light_mode_estimate(self):
+        """Testa que os modos leves e a compressão reduzem a estimativa."""
+        full = server._estimate_response(["35"])
+        assert full > 1_000_000
+        assert server._estimate_response(["35"], "bbox") < full / 10
+        assert server._estimate_response(["35"], encoding="gzip") < full / 2
+
+    def test_batch_geometry_too_large(self, monkeypatch):
+        """Testa a estimativa proporcional dos lotes com geometria."""
+        from src.geodata_br_mcp.admission import ResponseTooLargeError
+
+        monkeypatch.setenv("GEODATA_BR_MAX_RESPONSE_BYTES", "1000")
+        codes = ["3550308", "3509502"]
+        with pytest.raises(ResponseTooLargeError, match="include_geometry=false"):
+            server.search_municipality_by_ibge_batch(codes, include_geometry=True)
+
+        results = server.search_municipality_by_ibge_batch(codes, include_geometry=False)
+        assert all(item["found"] for item in results)
+
+        one = server._estimate_response(["35"], counts={"35": 1})
+        assert 0 < one < server._estimate_response(["35"]) / 100
+
+
+class TestCompressedResponses:
+    """Testes do parâmetro encoding das tools de FeatureCollections grandes."""
+
+    def test_region_gzip_matches_identity(self):
+        """Testa que o corpo gzip descomprimido é a resposta sem compressão."""
+        import base64
+        import gzip
+        import json
+
+        expected = server.get_region_geojson("Norte")
+        payload = server.get_region_geojson("Norte", encoding="gzip")
+
+        body = gzip.decompress(base64.b64decode(payload["data_base64"]))
+        assert json.loads(body) == expected
+        assert payload["size_bytes"] < payload["uncompressed_bytes"] / 2
+        assert server.get_region_geojson("norte", encoding="gzip") is payload
+
+    def test_invalid_encoding(self):
+        """Testa codificação inválida."""
+        with pytest.raises(ValueError, match="Codificação inválida"):
+            server.get_region_geojson("Sul", encoding="brotli")
+
+
+class TestGeometryModes:
+    """Testes do parâmetro include_geometry das tools que retornam features."""
+
+    @pytest.mark.parametrize("mode", ["none", "bbox", "centroid", "simplified"])
+    def test_light_modes_keep_properties(self, mode):
+        """Testa que os modos leves mantêm as propriedades e reduzem a resposta."""
+        import json
+
+        full = server.search_municipality_by_ibge("1400100")
+        light = server.search_municipality_by_ibge("1400100", include_geometry=mode)
+
+        assert light["type"] == "Feature"
+        assert light["properties"] == full["properties"]
+        assert len(json.dumps(light)) < len(json.dumps(full))
+
+    def test_modes_match_attributes(self):
+        """Testa que bbox e centroide são os mesmos de get_municipality_stats."""
+        stats = server.get_municipality_stats("1400100")
+
+        bbox = server.get_municipality_geojson("RR", "Boa Vista", include_geometry="bbox")
+        centroid = server.get_municipality_geojson("RR", "Boa Vista", include_geometry="centroid")
+
+        assert bbox["bbox"] == stats["bbox"]
+        assert bbox["geometry"] is None
+        assert centroid["geometry"] == {"type": "Point", "coordinates": stats["centroid"]}
+
+    def test_invalid_mode(self):
+        """Testa modo de geometria inválido."""
+        with pytest.raises(ValueError, match="Modo de geometria inválido"):
+            server.search_municipality_by_ibge("1400100", include_geometry="wkt")
+
+    def test_brazil_light_mode(self, tmp_path, monkeypatch):
+        """Testa get_brazil_geojson sem geometria e comprimido (sem o arquivo nacional)."""
+        import base64
+        import gzip
+        import json
+
+        from src.geodata_br_mcp.attributes import clear_attributes_cache
+
+        monkeypatch.setenv("GEODATA_BR_CACHE_PATH", str(tmp_path))
+        result = server.get_brazil_geojson(include_geometry="none")
+        payload = server.get_brazil_geojson(encoding="gzip", include_geometry="centroid")
+
+        expected = [
+            props for code in server.STATE_CODES for props in server._load_state_properties(code)
+        ]
+        assert [f["properties"] for f in result["features"]] == expected
+        assert all(f["geometry"] is None for f in result["features"])
+        body = json.loads(gzip.decompress(base64.b64decode(payload["data_base64"])))
+        assert len(body["features"]) == len(expected)
+        assert {f["geometry"]["type"] for f in body["features"]} == {"Point"}
+
+        # O backend configurado fornece as propriedades
+        monkeypatch.setenv("GEODATA_BR_BACKEND", "compact")
+        compact = server.get_brazil_geojson(include_geometry="none")
+        clear_attributes_cache()
+
+        assert compact == result
+
+
+class TestOutlines:
+    """Testes para os contornos dissolvidos de estados e regiões."""
+
+    @pytest.fixture(autouse=True)
+    def _cache_dir(self, tmp_path, monkeypatch):
+        """Usa um diretório de cache temporário."""
+        monkeypatch.setenv("GEODATA_BR_CACHE_PATH", str(tmp_path))
+
+    def test_get_state_info_with_geometry(self):
+        """Testa contorno do estado em get_state_info."""
+        info = server.get_state_info("RR", include_geometry=True)
+
+        assert info["geometry"]["type"] == "MultiPolygon"
+        assert len(info["geometry"]["coordinates"]) >= 1
+
+    def test_get_state_info_without_geometry(self):
+        """Testa que o contorno não é incluído por padrão."""
+        assert "geometry" not in server.get_state_info("RR")
+
+    def test_get_region_geojson_outlines_only(self):
+        """Testa contornos de estados e região."""
+        geojson = server.get_region_geojson("Sul", outlines_only=True)
+
+        levels = [f["properties"]["level"] for f in geojson["features"]]
+        assert levels == ["state", "state", "state", "region"]
+        assert geojson["features"][0]["properties"]["id"] == "41"
+
+
+class TestGetVectorTile:
+    """Testes para a ferramenta get_vector_tile."""
+
+    @pytest.fixture(autouse=True)
+    def _tile_cache(self, tmp_path, monkeypatch):
+        """Usa um diretório de cache temporário e um cache de tiles novo."""
+        monkeypatch.setenv("GEODATA_BR_CACHE_PATH", str(tmp_path))
+        monkeypatch.setattr(server, "_tile_cache", None)
+
+    def test_get_vector_tile(self):
+        """Testa um tile sobre a cidade de São Paulo."""
+        import base64
+
+        tile = server.get_vector_tile(10, 379, 594 - 14)
+
+        assert tile["layer"] == "municipalities"
+        assert tile["size_bytes"] > 0
+        assert len(base64.b64decode(tile["data_base64"])) == tile["size_bytes"]
+
+    def test_get_vector_tile_empty(self):
+        """Testa um tile no oceano."""
+        tile = server.get_vector_tile(10, 0, 0)
+        assert tile["size_bytes"] == 0
+
+    def test_get_vector_tile_invalid(self):
+        """Testa coordenadas inválidas."""
+        with pytest.raises(ValueError, match="Tile inválido"):
+            server.get_vector_tile(2, 9, 0)
+
+
+class TestServerMetrics:
+    """Testes para a ferramenta get_server_metrics."""
+
+    def test_get_server_metrics_json(self):
+        """Testa que as chamadas de tools aparecem nas métricas."""
+        server.list_states()
+        server.get_municipality_geojson("RR", "Boa Vista")
+
+        result = server.get_server_metrics()
+
+        tools = {entry["labels"]["tool"] for entry in result["histograms"]["tool_latency_ms"]}
+        assert {"list_states", "get_municipality_geojson"} <= tools
+        assert "geojson" in result["caches"]["hit_ratio"]
+
+    def test_get_server_metrics_prometheus(self):
+        """Testa o formato Prometheus."""
+        server.list_states()
+
+        result = server.get_server_metrics(format="prometheus")
+
+        assert "geodata_tool_latency_ms_bucket" in result["text"]
+
+    def test_get_server_metrics_invalid_format(self):
+        """Testa formato inválido."""
+        with pytest.raises(ValueError, match="Formato inválido"):
+            server.get_server_metrics(format="xml")
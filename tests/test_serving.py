@@ -0,0 +1,187 @@
+"""
+Testes para o módulo serving.py
+"""
+
+import threading
+import time
+
+import anyio
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.geodata_br_mcp.admission import limit_concurrency
+from src.geodata_br_mcp.serving import (
+    ServerBusyError,
+    ToolLimiter,
+    load_serving_config,
+    offload_tools,
+    parse_serving_args,
+)
+
+
+def pause(seconds: float) -> float:
+    """Tool de teste que só espera."""
+    time.sleep(seconds)
+    return seconds
+
+
+class TestServingConfig:
+    """Testa a leitura da configuração."""
+
+    def test_defaults(self, monkeypatch):
+        """Testa os valores padrão (stdio)."""
+        monkeypatch.delenv("GEODATA_BR_TRANSPORT", raising=False)
+        config = load_serving_config()
+        assert config.transport == "stdio"
+        assert config.max_concurrency >= 1
+
+    def test_env_and_args(self, monkeypatch):
+        """Testa que os argumentos sobrepõem o ambiente."""
+        monkeypatch.setenv("GEODATA_BR_TRANSPORT", "sse")
+        monkeypatch.setenv("GEODATA_BR_MAX_QUEUE", "5")
+        monkeypatch.setenv("GEODATA_BR_MAX_CONCURRENCY", "inválido")
+
+        config = parse_serving_args(["--port", "9000", "--max-concurrency", "0"])
+
+        assert config.transport == "sse"
+        assert config.port == 9000
+        assert config.max_queue == 5
+        assert config.max_concurrency == 1
+
+    def test_invalid_transport(self, monkeypatch):
+        """Testa transporte inválido no ambiente."""
+        monkeypatch.setenv("GEODATA_BR_TRANSPORT", "websocket")
+        with pytest.raises(ValueError, match="Transporte inválido"):
+            load_serving_config()
+
+
+class TestToolLimiter:
+    """Testa o limite de concorrência e a fila."""
+
+    def test_runs_in_threads_with_limit(self):
+        """Testa que no máximo max_concurrency chamadas executam ao mesmo tempo."""
+        limiter = ToolLimiter(max_concurrency=2, max_queue=10, queue_timeout=5)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        threads = set()
+
+        def work(value):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            threads.add(threading.get_ident())
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return value * 2
+
+        async def scenario():
+            results = []
+
+            async def call(value):
+                results.append(await limiter.run("work", work, value=value))
+
+            async with anyio.create_task_group() as tg:
+                for value in range(6):
+                    tg.start_soon(call, value)
+            return sorted(results)
+
+        assert anyio.run(scenario) == [0, 2, 4, 6, 8, 10]
+        assert state["peak"] == 2
+        assert threading.get_ident() not in threads
+
+    def test_queue_full(self):
+        """Testa a recusa imediata com a fila cheia."""
+        limiter = ToolLimiter(max_concurrency=1, max_queue=1, queue_timeout=5)
+
+        async def scenario():
+            outcomes = []
+
+            async def call():
+                try:
+                    await limiter.run("work", pause, seconds=0.05)
+                    outcomes.append("ok")
+                except ServerBusyError:
+                    outcomes.append("busy")
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(3):
+                    tg.start_soon(call)
+                    await anyio.sleep(0.005)
+            return sorted(outcomes)
+
+        assert anyio.run(scenario) == ["busy", "ok", "ok"]
+
+    def test_queue_timeout(self):
+        """Testa a recusa quando a espera na fila expira."""
+        limiter = ToolLimiter(max_concurrency=1, max_queue=5, queue_timeout=0.01)
+
+        async def scenario():
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(lambda: limiter.run("work", pause, seconds=0.1))
+                await anyio.sleep(0.005)
+                with pytest.raises(ServerBusyError, match="esperou"):
+                    await limiter.run("work", pause, seconds=0)
+
+        anyio.run(scenario)
+        assert limiter.waiting == 0
+
+    def test_heavy_tools_wait_outside_global_slots(self):
+        """Testa que chamadas pesadas na espera não bloqueiam as demais tools."""
+        limiter = ToolLimiter(max_concurrency=2, max_queue=10, queue_timeout=30)
+        heavy = limit_concurrency(1)(pause)
+
+        async def scenario():
+            finished = {}
+            started = time.perf_counter()
+
+            async def call(name, func, seconds):
+                await limiter.run(name, func, seconds=seconds)
+                finished[name] = time.perf_counter() - started
+
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(call, "heavy_1", heavy, 0.3)
+                tg.start_soon(call, "heavy_2", heavy, 0.3)
+                await anyio.sleep(0.02)
+                tg.start_soon(call, "light", pause, 0)
+            return finished
+
+        finished = anyio.run(scenario)
+        assert finished["light"] < 0.2
+        assert max(finished["heavy_1"], finished["heavy_2"]) >= 0.55
+
+    def test_heavy_tool_timeout(self, monkeypatch):
+        """Testa a recusa quando a espera pela vaga da tool pesada expira."""
+        monkeypatch.setenv("GEODATA_BR_HEAVY_TOOL_TIMEOUT", "0.01")
+        limiter = ToolLimiter(max_concurrency=4, max_queue=10, queue_timeout=5)
+        heavy = limit_concurrency(1)(pause)
+
+        async def scenario():
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(lambda: limiter.run("heavy", heavy, seconds=0.1))
+                await anyio.sleep(0.005)
+                with pytest.raises(ServerBusyError, match="heavy"):
+                    await limiter.run("heavy", heavy, seconds=0)
+
+        anyio.run(scenario)
+
+
+class TestOffloadTools:
+    """Testa a execução das tools síncronas em threads."""
+
+    def test_offload(self):
+        """Testa que as tools continuam respondendo pelo FastMCP."""
+        app = FastMCP("teste")
+        called_in = []
+
+        @app.tool()
+        def echo(text: str) -> str:
+            called_in.append(threading.get_ident())
+            return text.upper()
+
+        assert offload_tools(app, ToolLimiter(2, 2, 1)) == 1
+
+        result = anyio.run(app.call_tool, "echo", {"text": "abc"})
+
+        assert "ABC" in str(result)
+        assert called_in and called_in[0] != threading.get_ident()
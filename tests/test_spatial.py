@@ -0,0 +1,146 @@
+"""
+Testes para o módulo spatial.py
+"""
+
+import random
+
+import pytest
+
+from src.geodata_br_mcp.geometry import haversine_km
+from src.geodata_br_mcp.spatial import (
+    CentroidIndex,
+    KDTree,
+    chord_to_km,
+    iter_distance_rows,
+    km_to_chord,
+    to_unit_vector,
+)
+
+
+class TestConversions:
+    """Testa conversões entre corda e quilômetros."""
+
+    def test_chord_roundtrip(self):
+        """Testa ida e volta km -> corda -> km."""
+        assert chord_to_km(km_to_chord(123.4)) == pytest.approx(123.4)
+
+    def test_chord_matches_haversine(self):
+        """Testa que a corda entre vetores corresponde ao haversine."""
+        a = to_unit_vector(-23.55, -46.63)
+        b = to_unit_vector(-22.91, -43.17)
+        chord = sum((x - y) ** 2 for x, y in zip(a, b, strict=True)) ** 0.5
+        assert chord_to_km(chord) == pytest.approx(haversine_km(-23.55, -46.63, -22.91, -43.17))
+
+
+class TestKDTree:
+    """Testa a KD-tree."""
+
+    def test_empty_tree(self):
+        """Testa consulta em árvore vazia."""
+        assert KDTree([]).query((0.0, 0.0, 1.0), k=3) == []
+
+    def test_query_matches_brute_force(self):
+        """Testa que a árvore devolve os mesmos vizinhos da força bruta."""
+        rng = random.Random(42)
+        points = [to_unit_vector(rng.uniform(-34, 5), rng.uniform(-74, -34)) for _ in range(500)]
+        tree = KDTree(points)
+
+        for _ in range(50):
+            query = to_unit_vector(rng.uniform(-34, 5), rng.uniform(-74, -34))
+            expected = sorted(
+                range(len(points)),
+                key=lambda i: sum((p - q) ** 2 for p, q in zip(points[i], query, strict=True)),
+            )[:4]
+            assert [index for _, index in tree.query(query, k=4)] == expected
+
+    def test_query_max_distance(self):
+        """Testa o limite de distância."""
+        tree = KDTree([to_unit_vector(0.0, 0.0), to_unit_vector(0.0, 10.0)])
+        hits = tree.query(to_unit_vector(0.0, 0.1), k=2, max_distance=km_to_chord(100))
+        assert len(hits) == 1
+
+    def test_query_radius_matches_brute_force(self):
+        """Testa que a busca por raio devolve exatamente os pontos dentro do raio."""
+        rng = random.Random(7)
+        points = [to_unit_vector(rng.uniform(-34, 5), rng.uniform(-74, -34)) for _ in range(500)]
+        tree = KDTree(points)
+        radius = km_to_chord(300)
+
+        for _ in range(20):
+            query = to_unit_vector(rng.uniform(-34, 5), rng.uniform(-74, -34))
+            expected = {
+                i
+                for i, p in enumerate(points)
+                if sum((a - b) ** 2 for a, b in zip(p, query, strict=True)) <= radius**2
+            }
+            hits = tree.query_radius(query, radius)
+            assert {index for _, index in hits} == expected
+            assert [d for d, _ in hits] == sorted(d for d, _ in hits)
+
+    def test_query_radius_empty_tree(self):
+        """Testa busca por raio em árvore vazia."""
+        assert KDTree([]).query_radius((0.0, 0.0, 1.0), 1.0) == []
+
+
+class TestDistanceRows:
+    """Testa o cálculo da matriz de distâncias em blocos."""
+
+    def test_chunks_match_haversine(self):
+        """Testa os blocos contra o haversine e o limite de linhas por bloco."""
+        coords = [(-23.55, -46.63), (-22.91, -43.17), (-15.79, -47.88)]
+        vectors = [to_unit_vector(lat, lon) for lat, lon in coords]
+
+        chunks = list(iter_distance_rows(vectors, vectors, chunk_rows=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        rows = [row for chunk in chunks for row in chunk]
+        for i, (lat1, lon1) in enumerate(coords):
+            assert rows[i][i] == 0.0
+            for j, (lat2, lon2) in enumerate(coords):
+                assert rows[i][j] == pytest.approx(haversine_km(lat1, lon1, lat2, lon2), abs=1e-3)
+
+
+class TestCentroidIndex:
+    """Testa o índice de centroides."""
+
+    def test_nearest(self, sample_geojson):
+        """Testa busca do município mais próximo."""
+        index = CentroidIndex(sample_geojson["features"])
+        assert len(index) == 2
+
+        results = index.nearest(-22.85, -47.0, k=1)
+        assert results[0]["id"] == "3509502"
+        assert results[0]["distance_km"] >= 0
+        assert len(results[0]["centroid"]) == 2
+        assert len(results[0]["representative_point"]) == 2
+
+    def test_nearest_max_km(self, sample_geojson):
+        """Testa que max_km filtra municípios distantes."""
+        index = CentroidIndex(sample_geojson["features"])
+        assert index.nearest(0.0, 0.0, k=2, max_km=10) == []
+
+    def test_resolve_codes(self, sample_geojson):
+        """Testa a expansão de códigos de estado e a remoção de repetidos."""
+        index = CentroidIndex(sample_geojson["features"])
+
+        assert index.resolve_codes(["3509502", "35", "3509502"]) == [
+            index.positions["3509502"],
+            index.positions["3550308"],
+        ]
+        with pytest.raises(ValueError, match="não encontrados: 9999999"):
+            index.resolve_codes(["9999999"])
+
+    def test_distance_matrix_and_pairs(self, sample_geojson):
+        """Testa que os pares com raio coincidem com a matriz densa filtrada."""
+        index = CentroidIndex(sample_geojson["features"])
+        positions = index.resolve_codes(["35"])
+
+        matrix = index.distance_matrix(positions, positions)
+        assert matrix[0][0] == 0.0
+        assert matrix[0][1] == matrix[1][0] > 0
+
+        pairs = index.pairs_within(positions, positions, max_km=matrix[0][1] + 1)
+        assert len(pairs) == 4
+        assert index.pairs_within(positions, positions, max_km=matrix[0][1] / 2) == [
+            {"a": index.ids[i], "b": index.ids[i], "distance_km": 0.0} for i in positions
+        ]
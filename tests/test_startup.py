@@ -0,0 +1,70 @@
+"""
+Testes de tempo de inicialização do servidor (python -X importtime).
+"""
+
+import pytest
+
+from benchmarks.startup import (
+    DEFERRED_MODULES,
+    PACKAGE_IMPORT_BUDGET_MS,
+    SERVER_MODULE,
+    TOTAL_IMPORT_BUDGET_MS,
+    measure_import,
+    parse_importtime,
+)
+
+
+@pytest.fixture(scope="module")
+def measurements():
+    """Mede o import do servidor três vezes em processos novos."""
+    return [measure_import(SERVER_MODULE) for _ in range(3)]
+
+
+class TestParseImporttime:
+    """Testa a interpretação da saída do -X importtime."""
+
+    def test_parse(self):
+        """Testa cabeçalho e linhas de módulos."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+            "outra linha qualquer\n"
+        )
+        assert parse_importtime(stderr) == {"json.decoder": (120, 120), "json": (300, 420)}
+
+
+class TestStartup:
+    """Testa o orçamento de inicialização do servidor."""
+
+    def test_heavy_modules_are_deferred(self, measurements):
+        """Testa que módulos pesados não são importados na inicialização."""
+        imported = measurements[0]["modules"]
+        assert [name for name in DEFERRED_MODULES if name in imported] == []
+
+    def test_package_import_budget(self, measurements):
+        """Testa o tempo próprio dos módulos do projeto (melhor de 3)."""
+        best = min(m["package_ms"] for m in measurements)
+        assert best < PACKAGE_IMPORT_BUDGET_MS
+
+    def test_total_import_budget(self, measurements):
+        """Testa o tempo total de import, incluindo FastMCP (melhor de 3)."""
+        best = min(m["import_ms"] for m in measurements)
+        assert best < TOTAL_IMPORT_BUDGET_MS
+
+    def test_import_does_not_configure_logging(self):
+        """Testa que o logging só é configurado ao iniciar o servidor."""
+        import ast
+        from pathlib import Path
+
+        from src.geodata_br_mcp import server
+
+        tree = ast.parse(Path(server.__file__).read_text(encoding="utf-8"))
+        module_calls = [
+            node.value.func.attr
+            for node in tree.body
+            if isinstance(node, ast.Expr)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Attribute)
+        ]
+        assert "basicConfig" not in module_calls
@@ -0,0 +1,186 @@
+"""
+Testes para o módulo tiles.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.geodata_br_mcp import tiles
+from src.geodata_br_mcp.tiles import (
+    TileCache,
+    TileSource,
+    encode_polygon_commands,
+    encode_tile,
+    project_geometry,
+    seed_tiles,
+    simplify_ring,
+    tile_bounds,
+    tiles_for_bounds,
+    validate_tile,
+)
+
+
+class TestTileCoordinates:
+    """Testa conversões de coordenadas de tile."""
+
+    def test_tile_bounds_world(self):
+        """Testa o bbox do tile 0/0/0."""
+        min_lon, min_lat, max_lon, max_lat = tile_bounds(0, 0, 0)
+        assert (min_lon, max_lon) == (-180.0, 180.0)
+        assert max_lat == pytest.approx(85.0511, abs=1e-4)
+        assert min_lat == pytest.approx(-85.0511, abs=1e-4)
+
+    def test_tiles_for_bounds(self):
+        """Testa que os tiles listados cobrem o bbox."""
+        tiles = tiles_for_bounds((-47.0, -24.0, -46.0, -23.0), 8)
+        assert tiles
+        for z, x, y in tiles:
+            min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+            assert min_lon <= -46.0 and max_lon >= -47.0
+            assert min_lat <= -23.0 and max_lat >= -24.0
+
+    def test_validate_tile(self):
+        """Testa validação de coordenadas."""
+        validate_tile(3, 7, 7)
+        with pytest.raises(ValueError, match="Tile inválido"):
+            validate_tile(3, 8, 0)
+        with pytest.raises(ValueError, match="Zoom inválido"):
+            validate_tile(30, 0, 0)
+
+
+class TestGeometryProcessing:
+    """Testa projeção, recorte e simplificação."""
+
+    def test_simplify_ring_removes_collinear_points(self):
+        """Testa que pontos colineares são removidos."""
+        ring = [(0, 0), (5, 0), (10, 0), (10, 10), (5, 10), (0, 10)]
+        assert simplify_ring(ring, 0.5) == [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+    def test_project_geometry_clips_to_tile(self, sample_geojson):
+        """Testa que as coordenadas ficam dentro do tile mais a margem."""
+        geometry = sample_geojson["features"][0]["geometry"]
+        z, x, y = tiles_for_bounds((-46.6, -23.8, -46.6, -23.8), 10)[0]
+
+        polygons = project_geometry(geometry, z, x, y)
+
+        assert polygons
+        for polygon in polygons:
+            for ring in polygon:
+                assert all(-64 <= px <= 4096 + 64 and -64 <= py <= 4096 + 64 for px, py in ring)
+
+    def test_project_geometry_outside_tile(self, sample_geojson):
+        """Testa geometria fora do tile."""
+        geometry = sample_geojson["features"][0]["geometry"]
+        assert project_geometry(geometry, 10, 0, 0) == []
+
+    def test_exterior_ring_has_positive_area(self, sample_geojson):
+        """Testa a orientação exigida pelo MVT (exterior com área positiva)."""
+        geometry = sample_geojson["features"][0]["geometry"]
+        ring = project_geometry(geometry, 0, 0, 0)[0][0]
+        area2 = sum(
+            ring[i][0] * ring[(i + 1) % len(ring)][1] - ring[(i + 1) % len(ring)][0] * ring[i][1]
+            for i in range(len(ring))
+        )
+        assert area2 > 0
+
+
+class TestEncoding:
+    """Testa a codificação protobuf."""
+
+    def test_encode_polygon_commands(self):
+        """Testa comandos de um quadrado (exemplo da especificação MVT)."""
+        commands = encode_polygon_commands([[[(3, 6), (8, 12), (20, 34)]]])
+        assert commands == [9, 6, 12, 18, 10, 12, 24, 44, 15]
+
+    def test_encode_tile_empty(self):
+        """Testa tile sem features."""
+        assert encode_tile([]) == b""
+
+    def test_encode_tile_layer(self):
+        """Testa a estrutura básica da camada."""
+        tile = encode_tile(
+            [{"id": 1, "properties": {"name": "A"}, "polygons": [[[(0, 0), (0, 10), (10, 0)]]]}]
+        )
+        # Campo 3 (layers), wire type 2
+        assert tile[0] == 0x1A
+        assert b"municipalities" in tile
+        assert b"name" in tile
+
+
+class TestTileSourceAndCache:
+    """Testa geração e cache de tiles."""
+
+    def test_render(self, sample_geojson):
+        """Testa que o tile que contém os municípios não é vazio."""
+        source = TileSource(sample_geojson["features"])
+        z, x, y = tiles_for_bounds((-46.6, -23.8, -46.6, -23.8), 6)[0]
+
+        assert b"Paulo" in source.render(z, x, y)
+        assert source.render(6, 0, 0) == b""
+
+    def test_tile_cache(self, sample_geojson, tmp_path):
+        """Testa cache em memória e em disco."""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return TileSource(sample_geojson["features"])
+
+        cache = TileCache(factory, tmp_path, "test")
+        first = cache.get(0, 0, 0)
+        second = cache.get(0, 0, 0)
+
+        assert first == second
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert (tmp_path / "tiles" / "test" / "0" / "0" / "0.mvt").read_bytes() == first
+
+        # Um novo cache reaproveita o disco sem criar a fonte de dados
+        other = TileCache(factory, tmp_path, "test")
+        assert other.get(0, 0, 0) == first
+        assert len(calls) == 1
+
+    def test_concurrent_gets(self, sample_geojson, tmp_path):
+        """Testa chamadas concorrentes: a fonte é criada uma vez e o LRU fica consistente."""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return TileSource(sample_geojson["features"])
+
+        cache = TileCache(factory, tmp_path, "test")
+        keys = [(2, x, y) for x in range(4) for y in range(4)] * 4
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda key: cache.get(*key), keys))
+
+        assert len(calls) == 1
+        assert results[:16] == results[16:32]
+        assert cache.hits + cache.misses == len(keys)
+
+    def test_unwritable_cache(self, sample_geojson, tmp_path):
+        """Testa que falhas ao gravar o disco não impedem o tile."""
+        blocker = tmp_path / "cache"
+        blocker.write_text("não é um diretório")
+
+        cache = TileCache(lambda: TileSource(sample_geojson["features"]), blocker, "test")
+        assert cache.get(0, 0, 0)
+
+    def test_concurrent_writes(self, tmp_path):
+        """Testa gravações simultâneas do mesmo arquivo (temporários distintos)."""
+        path = tmp_path / "0" / "0" / "0.mvt"
+
+        def write(_):
+            return all(tiles._write_atomic(path, b"tile") for _ in range(50))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(pool.map(write, range(8)))
+        assert [p.name for p in path.parent.iterdir()] == ["0.mvt"]
+
+    def test_seed_tiles(self, project_root, tmp_path):
+        """Testa a pré-geração dos primeiros zooms."""
+        result = seed_tiles(project_root, tmp_path, min_zoom=0, max_zoom=1, workers=1)
+
+        assert result["tiles"] >= 2
+        assert result["bytes"] > 0
+        assert list((tmp_path / "tiles").glob("*/0/0/0.mvt"))
@@ -14,6 +14,7 @@ from src.geodata_br_mcp.utils import (
     filter_features_by_pattern,
     get_cache_size,
     get_geojson_summary,
+    load_geojson_files_parallel,
     normalize_text,
     search_features_by_ibge,
     search_features_by_name,
@@ -239,3 +240,18 @@ class TestCache:
         size = get_cache_size()
         assert isinstance(size, int)
         assert size >= 0
+
+    def test_load_geojson_files_parallel(self, geojson_dir):
+        """Testa carregamento paralelo preservando a ordem."""
+        clear_cache()
+        paths = [geojson_dir / "geojs-14-mun.json", geojson_dir / "geojs-12-mun.json"]
+
+        results = load_geojson_files_parallel(paths)
+
+        assert [r["features"][0]["properties"]["id"][:2] for r in results] == ["14", "12"]
+        assert get_cache_size() == 2
+
+    def test_load_geojson_files_parallel_missing(self, tmp_path):
+        """Testa erro quando algum arquivo não existe."""
+        with pytest.raises(FileNotFoundError):
+            load_geojson_files_parallel([tmp_path / "a.json", tmp_path / "b.json"])
@@ -0,0 +1,174 @@
+"""
+Testes para o módulo validation.py
+"""
+
+import json
+
+from src.geodata_br_mcp.validation import (
+    find_self_intersection,
+    main,
+    validate_data_directory,
+    validate_feature,
+)
+
+# Quadrado no sentido horário (como nos arquivos do IBGE)
+SQUARE_CW = [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]]
+
+
+def _feature(coordinates, geom_type="Polygon", feature_id="3550308"):
+    return {
+        "type": "Feature",
+        "properties": {"id": feature_id, "name": "Teste"},
+        "geometry": {"type": geom_type, "coordinates": coordinates},
+    }
+
+
+def _issues(issues):
+    return sorted(issue["issue"] for issue in issues)
+
+
+class TestValidateFeature:
+    """Testa as verificações e reparos de uma feature."""
+
+    def test_valid_feature_is_unchanged(self):
+        """Testa que uma feature válida é devolvida sem cópia."""
+        feature = _feature([SQUARE_CW])
+
+        repaired, issues = validate_feature(feature)
+
+        assert issues == []
+        assert repaired is feature
+
+    def test_unclosed_and_duplicates_are_repaired(self):
+        """Testa fechamento do anel e remoção de vértices duplicados."""
+        ring = [[0.0, 0.0], [0.0, 1.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+        feature = _feature([ring])
+
+        repaired, issues = validate_feature(feature)
+
+        assert _issues(issues) == ["duplicate_vertices", "unclosed_ring"]
+        assert repaired["geometry"]["coordinates"] == [SQUARE_CW]
+        assert feature["geometry"]["coordinates"] == [ring]
+
+    def test_hole_winding(self):
+        """Testa que buracos no mesmo sentido do exterior são invertidos."""
+        exterior = [[0.0, 0.0], [0.0, 4.0], [4.0, 4.0], [4.0, 0.0], [0.0, 0.0]]
+        hole = [[1.0, 1.0], [1.0, 2.0], [2.0, 2.0], [2.0, 1.0], [1.0, 1.0]]
+
+        repaired, issues = validate_feature(_feature([exterior, hole]))
+
+        assert [(i["issue"], i["location"]) for i in issues] == [("wrong_winding", "1")]
+        assert repaired["geometry"]["coordinates"] == [exterior, hole[::-1]]
+
+    def test_rfc7946_winding(self):
+        """Testa a exigência de exteriores anti-horários."""
+        _, issues = validate_feature(_feature([SQUARE_CW]), rfc7946=True)
+        assert _issues(issues) == ["wrong_winding"]
+
+    def test_island_rings_become_multipolygon(self):
+        """Testa que um Polygon com exteriores disjuntos (ilhas) vira MultiPolygon."""
+        island = [[x + 3.0, y] for x, y in SQUARE_CW]
+
+        repaired, issues = validate_feature(_feature([SQUARE_CW, island]))
+
+        assert issues == [
+            {
+                "id": "3550308",
+                "issue": "multiple_exteriors",
+                "location": "geometry",
+                "detail": "2 exteriores",
+            }
+        ]
+        assert repaired["geometry"] == {
+            "type": "MultiPolygon",
+            "coordinates": [[SQUARE_CW], [island]],
+        }
+
+    def test_islands_keep_their_holes(self):
+        """Testa que cada buraco fica no polígono do exterior que o contém."""
+        exterior = [[0.0, 0.0], [0.0, 4.0], [4.0, 4.0], [4.0, 0.0], [0.0, 0.0]]
+        hole = [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], [1.0, 2.0], [1.0, 1.0]]
+        island = [[x + 5.0, y] for x, y in SQUARE_CW]
+
+        repaired, issues = validate_feature(_feature([island, exterior, hole]))
+
+        assert _issues(issues) == ["multiple_exteriors"]
+        assert sorted(repaired["geometry"]["coordinates"]) == sorted([[island], [exterior, hole]])
+
+    def test_degenerate_ring_is_dropped(self):
+        """Testa o descarte de anéis degenerados em um MultiPolygon."""
+        degenerate = [[5.0, 5.0], [6.0, 6.0], [5.0, 5.0]]
+        feature = _feature([[SQUARE_CW], [degenerate]], "MultiPolygon")
+
+        repaired, issues = validate_feature(feature)
+
+        assert [(i["issue"], i["location"]) for i in issues] == [("too_few_vertices", "1/0")]
+        assert repaired["geometry"]["coordinates"] == [[SQUARE_CW]]
+
+    def test_self_intersection_is_reported(self):
+        """Testa que a gravata-borboleta é reportada (sem reparo)."""
+        bowtie = [[0.0, 0.0], [1.0, 1.0], [1.0, 0.0], [0.0, 1.0], [0.0, 0.0]]
+
+        _, issues = validate_feature(_feature([bowtie]))
+
+        assert "self_intersection" in _issues(issues)
+
+    def test_invalid_id_and_coordinates(self):
+        """Testa id e coordenadas inválidos."""
+        ring = [[0.0, 0.0], [0.0, 100.0], [1.0, 1.0], [0.0, 0.0]]
+        _, issues = validate_feature(_feature([ring], feature_id="abc"))
+        assert _issues(issues) == ["invalid_coordinates", "invalid_id"]
+
+
+class TestFindSelfIntersection:
+    """Testa a varredura de autointerseção."""
+
+    def test_simple_ring(self):
+        """Testa anel simples (sem interseção)."""
+        xs = [point[0] for point in SQUARE_CW]
+        ys = [point[1] for point in SQUARE_CW]
+        assert find_self_intersection(xs, ys) is None
+
+    def test_touching_vertex(self):
+        """Testa anel que toca a si mesmo em um vértice."""
+        ring = [[0, 0], [2, 0], [2, 2], [1, 0], [0, 2], [0, 0]]
+        xs = [float(p[0]) for p in ring]
+        ys = [float(p[1]) for p in ring]
+        assert find_self_intersection(xs, ys) is not None
+
+
+class TestValidateDataDirectory:
+    """Testa o pipeline sobre um diretório de dados."""
+
+    def test_report_and_snapshot(self, tmp_path):
+        """Testa relatório por código IBGE e snapshot limpo."""
+        geojson_dir = tmp_path / "data" / "geojson"
+        geojson_dir.mkdir(parents=True)
+        features = [
+            _feature([SQUARE_CW], feature_id="3500105"),
+            _feature([SQUARE_CW[:-1]], feature_id="3500204"),
+        ]
+        (geojson_dir / "geojs-35-mun.json").write_text(
+            json.dumps({"type": "FeatureCollection", "features": features})
+        )
+        output_root = tmp_path / "cleaned"
+
+        report = validate_data_directory(tmp_path / "data", output_root, workers=1)
+
+        assert report["files"] == 1
+        assert report["features"] == 2
+        assert report["unrepaired"] == 0
+        assert report["counts"] == {"unclosed_ring": 1}
+        assert report["by_ibge"] == {
+            "3500204": [{"issue": "unclosed_ring", "location": "0", "repaired": True}]
+        }
+        cleaned = json.loads((output_root / "geojson" / "geojs-35-mun.json").read_text())
+        assert cleaned["features"][1]["geometry"]["coordinates"] == [SQUARE_CW]
+
+    def test_real_state_is_valid(self, project_root, tmp_path):
+        """Testa que um estado real não tem problemas sem reparo (CLI)."""
+        report_path = tmp_path / "report.json"
+        argv = ["--data-path", str(project_root), "--states", "14", "--no-output"]
+
+        assert main([*argv, "--report", str(report_path)]) == 0
+        assert json.loads(report_path.read_text())["features"] == 15